@@ -20,18 +20,32 @@ from rich.table import Table
 from opencode.core.multiagent import Coordinator, MultiAgentConfig
 from opencode.core.multiagent.models import AgentType, AgentState
 from opencode.core.multiagent.messaging import MessageBus
-from opencode.core.multiagent.worktree import WorktreeManager
+from opencode.core.multiagent.worktree import WorktreeManager, WorktreePool
 
 app = typer.Typer(help="Multi-agent orchestration commands")
 console = Console()
 
 
 def get_coordinator() -> Coordinator:
-    """Get a coordinator instance."""
+    """
+    Get a coordinator instance for a single command.
+    
+    Ready pooled worktrees are used, but the pool is not refilled: each
+    command exits right away and would otherwise wait for the checkouts.
+    Fill it with ``worktree warm``.
+    """
     config = MultiAgentConfig()
     message_bus = MessageBus(config.message_db_path)
     worktree_manager = WorktreeManager(config.worktree_base)
-    return Coordinator(message_bus=message_bus, worktree_manager=worktree_manager)
+    worktree_pool = None
+    if config.worktree_pool_size > 0:
+        worktree_pool = WorktreePool(worktree_manager, size=config.worktree_pool_size, refill=False)
+    return Coordinator(
+        message_bus=message_bus,
+        worktree_manager=worktree_manager,
+        worktree_pool=worktree_pool,
+        warm_pool=False,
+    )
 
 
 @app.command("init")
@@ -346,6 +360,25 @@ def delete_worktree(
     console.print(f"[green]Deleted worktree:[/green] {agent_id}")
 
 
+@wt_app.command("warm")
+def warm_worktrees(
+    size: Optional[int] = typer.Option(None, "--size", "-s", help="Worktrees to keep ready (defaults to the config)"),
+):
+    """Check out worktrees ahead of agent spawns."""
+    config = MultiAgentConfig()
+    size = config.worktree_pool_size if size is None else size
+    if size <= 0:
+        console.print("[yellow]Worktree pool is disabled (worktree_pool_size is 0)[/yellow]")
+        return
+    
+    pool = WorktreePool(WorktreeManager(config.worktree_base), size=size)
+    try:
+        pool.warm(wait=True)
+    finally:
+        pool.close()
+    console.print(f"[green]Worktrees ready:[/green] {pool.ready_count}")
+
+
 @wt_app.command("status")
 def worktree_status(
     agent_id: Optional[str] = typer.Argument(None, help="Agent ID (optional)"),
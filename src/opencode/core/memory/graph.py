@@ -4,7 +4,8 @@ Graph operations for the memory module.
 Based on beads (https://github.com/steveyegge/beads)
 """
 
-from typing import List, Optional, Set
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
 from .models import Task, TaskStatus, TaskRelationship, RelationshipType, Message
 from .store import MemoryStore
 from .ids import generate_task_id, generate_relationship_id
@@ -63,6 +64,10 @@ class MemoryGraph:
         """Get a task by ID."""
         return self.store.get_task(task_id)
     
+    def get_tasks(self, task_ids: List[str]) -> List[Task]:
+        """Get several tasks by ID in one round trip."""
+        return self.store.get_tasks(task_ids)
+    
     def update_task(self, task: Task, actor: str = "system") -> Task:
         """Update an existing task."""
         return self.store.update_task(task, actor)
@@ -185,26 +190,18 @@ class MemoryGraph:
         )
         return self.store.add_relationship(rel)
     
-    def get_blockers(self, task_id: str) -> List[Task]:
+    def get_blockers(self, task_id: str, recursive: bool = False) -> List[Task]:
         """
         Get all tasks that block the given task.
         
         Args:
             task_id: Task ID to get blockers for
+            recursive: Also include blockers of blockers, transitively
         
         Returns:
             List of blocking tasks
         """
-        relationships = self.store.get_relationships(task_id)
-        blockers = []
-        
-        for rel in relationships:
-            if rel.relationship_type == RelationshipType.BLOCKS and rel.source_id == task_id:
-                blocker = self.store.get_task(rel.target_id)
-                if blocker:
-                    blockers.append(blocker)
-        
-        return blockers
+        return self.store.get_blockers(task_id, recursive=recursive)
     
     def get_blocked_tasks(self, task_id: str) -> List[Task]:
         """
@@ -216,16 +213,7 @@ class MemoryGraph:
         Returns:
             List of blocked tasks
         """
-        relationships = self.store.get_relationships(task_id)
-        blocked = []
-        
-        for rel in relationships:
-            if rel.relationship_type == RelationshipType.BLOCKS and rel.target_id == task_id:
-                blocked_task = self.store.get_task(rel.source_id)
-                if blocked_task:
-                    blocked.append(blocked_task)
-        
-        return blocked
+        return self.store.get_blocked_tasks(task_id)
     
     def is_ready(self, task_id: str) -> bool:
         """
@@ -282,43 +270,41 @@ class MemoryGraph:
         """
         Detect cycles in the dependency graph.
         
+        All BLOCKS edges are loaded in one query and walked in memory.
+        
         Returns:
             List of cycles, where each cycle is a list of task IDs
         """
+        edges: Dict[str, List[str]] = defaultdict(list)
+        for source_id, target_id in self.store.get_dependency_edges():
+            edges[source_id].append(target_id)
+        
         cycles = []
-        visited = set()
-        rec_stack = set()
+        visited: Set[str] = set()
         
-        def dfs(task_id: str, path: List[str]) -> bool:
-            visited.add(task_id)
-            rec_stack.add(task_id)
-            path.append(task_id)
-            
-            # Get all blocked tasks (outgoing edges)
-            relationships = self.store.get_relationships(task_id)
+        for root in list(edges):
+            if root in visited:
+                continue
             
-            for rel in relationships:
-                if rel.relationship_type == RelationshipType.BLOCKS:
-                    blocked_task_id = rel.target_id
-                    
-                    if blocked_task_id not in visited:
-                        if dfs(blocked_task_id, path.copy()):
-                            return True
-                    elif blocked_task_id in rec_stack:
-                        # Found a cycle
-                        cycle_start = path.index(blocked_task_id)
-                        cycle = path[cycle_start:] + [blocked_task_id]
-                        cycles.append(cycle)
+            # Iterative DFS so long dependency chains cannot hit the recursion limit
+            path = [root]
+            on_path = {root}
+            stack = [iter(edges[root])]
+            visited.add(root)
             
-            rec_stack.remove(task_id)
-            return False
-        
-        # Get all tasks
-        all_tasks = self.store.list_tasks()
-        
-        for task in all_tasks:
-            if task.id not in visited:
-                dfs(task.id, [])
+            while stack:
+                next_id = next(stack[-1], None)
+                if next_id is None:
+                    stack.pop()
+                    on_path.discard(path.pop())
+                elif next_id in on_path:
+                    cycle_start = path.index(next_id)
+                    cycles.append(path[cycle_start:] + [next_id])
+                elif next_id not in visited:
+                    visited.add(next_id)
+                    path.append(next_id)
+                    on_path.add(next_id)
+                    stack.append(iter(edges.get(next_id, ())))
         
         return cycles
     
@@ -370,14 +356,16 @@ class MemoryGraph:
             parent_id: Parent task ID
         
         Returns:
-            List of all descendant tasks
+            List of all descendant tasks, depth-first
         """
+        children = self._children_by_parent(self.store.get_descendants(parent_id))
         descendants = []
-        children = self.store.list_tasks(parent_id=parent_id)
+        stack = list(reversed(children.get(parent_id, [])))
         
-        for child in children:
-            descendants.append(child)
-            descendants.extend(self.get_descendants(child.id))
+        while stack:
+            task = stack.pop()
+            descendants.append(task)
+            stack.extend(reversed(children.get(task.id, [])))
         
         return descendants
     
@@ -385,6 +373,8 @@ class MemoryGraph:
         """
         Get the full epic tree for a task.
         
+        The whole subtree is loaded with a single recursive query.
+        
         Args:
             task_id: Task ID to get tree for
         
@@ -395,14 +385,32 @@ class MemoryGraph:
         if task is None:
             return {}
         
-        def build_tree(t: Task) -> dict:
-            children = self.store.list_tasks(parent_id=t.id)
+        children = self._children_by_parent(self.store.get_descendants(task_id))
+        
+        def make_node(t: Task) -> dict:
             return {
                 "id": t.id,
                 "title": t.title,
-                "status": t.status.value,
+                "status": TaskStatus(t.status).value,
                 "priority": t.priority,
-                "children": [build_tree(c) for c in children],
+                "children": [],
             }
         
-        return build_tree(task)
+        tree = make_node(task)
+        stack = [(task, tree)]
+        while stack:
+            parent, node = stack.pop()
+            for child in children.get(parent.id, []):
+                child_node = make_node(child)
+                node["children"].append(child_node)
+                stack.append((child, child_node))
+        
+        return tree
+    
+    @staticmethod
+    def _children_by_parent(tasks: List[Task]) -> Dict[str, List[Task]]:
+        """Group tasks by parent ID, keeping their order."""
+        children: Dict[str, List[Task]] = defaultdict(list)
+        for task in tasks:
+            children[task.parent_id].append(task)
+        return children
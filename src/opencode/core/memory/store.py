@@ -7,7 +7,7 @@ Based on beads (https://github.com/steveyegge/beads)
 import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import json
 
 from .models import Task, TaskStatus, Message, TaskRelationship, AuditEntry, RelationshipType
@@ -21,6 +21,9 @@ class MemoryStore:
     for version-controlled SQL database with cell-level merge.
     """
     
+    # Stay well below SQLite's default host parameter limit (999)
+    MAX_QUERY_PARAMS = 500
+    
     def __init__(self, db_path: str = ".beads/memory.db"):
         """
         Initialize the memory store.
@@ -119,6 +122,10 @@ class MemoryStore:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_parent ON tasks(parent_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_relationships_source ON relationships(source_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_relationships_target ON relationships(target_id)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_relationships_edge "
+            "ON relationships(source_id, target_id, relationship_type)"
+        )
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_task ON messages(task_id)")
         
         self.conn.commit()
@@ -168,6 +175,29 @@ class MemoryStore:
         
         return self._row_to_task(row)
     
+    def get_tasks(self, task_ids: List[str]) -> List[Task]:
+        """
+        Get several tasks by ID in as few queries as possible.
+        
+        Args:
+            task_ids: Task IDs to load
+        
+        Returns:
+            Tasks in the order of task_ids, skipping IDs that do not exist
+        """
+        unique_ids = list(dict.fromkeys(task_ids))
+        found = {}
+        cursor = self.conn.cursor()
+        
+        for start in range(0, len(unique_ids), self.MAX_QUERY_PARAMS):
+            chunk = unique_ids[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"SELECT * FROM tasks WHERE id IN ({placeholders})", chunk)
+            for row in cursor.fetchall():
+                found[row["id"]] = self._row_to_task(row)
+        
+        return [found[task_id] for task_id in task_ids if task_id in found]
+    
     def update_task(self, task: Task, actor: str = "system") -> Task:
         """Update an existing task."""
         cursor = self.conn.cursor()
@@ -267,6 +297,32 @@ class MemoryStore:
         
         return [self._row_to_task(row) for row in cursor.fetchall()]
     
+    def get_descendants(self, task_id: str) -> List[Task]:
+        """
+        Get all descendants of a task with a single recursive query.
+        
+        Args:
+            task_id: Root task ID
+        
+        Returns:
+            Descendant tasks in insertion order (the root is never included)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            WITH RECURSIVE descendants(id) AS (
+                SELECT id FROM tasks WHERE parent_id = ?
+                UNION
+                SELECT t.id FROM tasks t
+                JOIN descendants d ON t.parent_id = d.id
+            )
+            SELECT t.* FROM tasks t
+            JOIN descendants d ON t.id = d.id
+            WHERE t.id != ?
+            ORDER BY t.rowid
+        """, (task_id, task_id))
+        
+        return [self._row_to_task(row) for row in cursor.fetchall()]
+    
     # Relationship operations
     
     def add_relationship(self, rel: TaskRelationship) -> TaskRelationship:
@@ -295,6 +351,80 @@ class MemoryStore:
         
         return [self._row_to_relationship(row) for row in cursor.fetchall()]
     
+    def get_blockers(self, task_id: str, recursive: bool = False) -> List[Task]:
+        """
+        Get the tasks that block a task.
+        
+        Args:
+            task_id: Blocked task ID
+            recursive: Also include blockers of blockers, transitively
+        
+        Returns:
+            Blocking tasks
+        """
+        cursor = self.conn.cursor()
+        
+        if not recursive:
+            cursor.execute("""
+                SELECT t.* FROM relationships r
+                JOIN tasks t ON t.id = r.target_id
+                WHERE r.source_id = ? AND r.relationship_type = ?
+                ORDER BY r.rowid
+            """, (task_id, RelationshipType.BLOCKS.value))
+        else:
+            cursor.execute("""
+                WITH RECURSIVE blockers(id) AS (
+                    SELECT target_id FROM relationships
+                    WHERE source_id = ? AND relationship_type = ?
+                    UNION
+                    SELECT r.target_id FROM relationships r
+                    JOIN blockers b ON r.source_id = b.id
+                    WHERE r.relationship_type = ?
+                )
+                SELECT t.* FROM tasks t
+                JOIN blockers b ON t.id = b.id
+                WHERE t.id != ?
+                ORDER BY t.rowid
+            """, (task_id, RelationshipType.BLOCKS.value, RelationshipType.BLOCKS.value, task_id))
+        
+        return [self._row_to_task(row) for row in cursor.fetchall()]
+    
+    def get_blocked_tasks(self, task_id: str) -> List[Task]:
+        """
+        Get the tasks directly blocked by a task.
+        
+        Args:
+            task_id: Blocking task ID
+        
+        Returns:
+            Blocked tasks
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT t.* FROM relationships r
+            JOIN tasks t ON t.id = r.source_id
+            WHERE r.target_id = ? AND r.relationship_type = ?
+            ORDER BY r.rowid
+        """, (task_id, RelationshipType.BLOCKS.value))
+        
+        return [self._row_to_task(row) for row in cursor.fetchall()]
+    
+    def get_dependency_edges(self) -> List[Tuple[str, str]]:
+        """
+        Get every BLOCKS edge in the graph.
+        
+        Returns:
+            (blocked task ID, blocking task ID) pairs
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT source_id, target_id FROM relationships
+            WHERE relationship_type = ?
+            ORDER BY rowid
+        """, (RelationshipType.BLOCKS.value,))
+        
+        return [(row["source_id"], row["target_id"]) for row in cursor.fetchall()]
+    
     def remove_relationship(self, rel_id: str) -> bool:
         """Remove a relationship."""
         cursor = self.conn.cursor()
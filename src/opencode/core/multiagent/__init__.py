@@ -14,8 +14,8 @@ for complex, long-horizon tasks through:
 
 from .models import AgentType, AgentState, Agent, Message, Worktree
 from .coordinator import Coordinator
-from .messaging import MessageBus
-from .worktree import WorktreeManager
+from .messaging import AsyncMessageBus, MessageBus
+from .worktree import WorktreeManager, WorktreePool
 from .config import MultiAgentConfig
 
 __all__ = [
@@ -26,6 +26,8 @@ __all__ = [
     "Worktree",
     "Coordinator",
     "MessageBus",
+    "AsyncMessageBus",
     "WorktreeManager",
+    "WorktreePool",
     "MultiAgentConfig",
 ]
@@ -28,6 +28,11 @@ class MultiAgentConfig(BaseModel):
         description="Path to message database"
     )
     
+    worktree_pool_size: int = Field(
+        default=0,
+        description="Number of worktrees to keep checked out ahead of agent spawns (0 disables the pool)"
+    )
+    
     # Agent settings
     default_runtime: str = Field(
         default="claude",
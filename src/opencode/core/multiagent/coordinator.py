@@ -17,7 +17,7 @@ from .models import (
     Message, MessageType, OrchestrationRun
 )
 from .messaging import MessageBus
-from .worktree import WorktreeManager
+from .worktree import WorktreeManager, WorktreePool
 
 
 class Coordinator:
@@ -38,6 +38,8 @@ class Coordinator:
         agent_id: str = "coordinator",
         message_bus: Optional[MessageBus] = None,
         worktree_manager: Optional[WorktreeManager] = None,
+        worktree_pool: Optional[WorktreePool] = None,
+        warm_pool: bool = True,
     ):
         """
         Initialize the coordinator.
@@ -46,10 +48,17 @@ class Coordinator:
             agent_id: Unique identifier for this coordinator
             message_bus: Message bus for communication
             worktree_manager: Worktree manager for agent isolation
+            worktree_pool: Optional pool of pre-created worktrees to hand
+                to spawned agents
+            warm_pool: Start filling the pool in the background. One-shot
+                commands pass False so they do not wait for checkouts on exit.
         """
         self.agent_id = agent_id
         self.message_bus = message_bus or MessageBus()
-        self.worktree_manager = worktree_manager or WorktreeManager()
+        self.worktree_manager = worktree_manager or (worktree_pool.manager if worktree_pool else WorktreeManager())
+        self.worktree_pool = worktree_pool
+        if worktree_pool and warm_pool:
+            worktree_pool.warm()
         
         # Create coordinator agent
         self.agent = Agent(
@@ -132,7 +141,10 @@ class Coordinator:
         branch = None
         if agent_type not in [AgentType.COORDINATOR, AgentType.SUPERVISOR]:
             try:
-                worktree = self.worktree_manager.create_worktree(agent_id)
+                if self.worktree_pool:
+                    worktree = self.worktree_pool.acquire(agent_id)
+                else:
+                    worktree = self.worktree_manager.create_worktree(agent_id)
                 worktree_path = worktree.path
                 branch = worktree.branch
             except Exception:
@@ -182,7 +194,10 @@ class Coordinator:
         # Clean up worktree
         if agent.worktree_path:
             try:
-                self.worktree_manager.remove_worktree(agent_id, force=True)
+                if self.worktree_pool:
+                    self.worktree_pool.release(agent_id)
+                else:
+                    self.worktree_manager.remove_worktree(agent_id, force=True)
             except Exception:
                 pass
         
@@ -3,13 +3,21 @@ Inter-agent messaging system.
 
 Based on overstory (https://github.com/jayminwest/overstory)
 
-SQLite-based messaging with ~1-5ms per query target.
+SQLite-based messaging with ~1-5ms per query target. The database runs
+in WAL mode so readers in other processes never block a sender, and
+inbox queries are served by composite indexes. Recipients in the same
+process are woken through subscriber queues as soon as a message is
+committed; messages written by other processes are picked up by
+watching SQLite's data version instead of re-querying inboxes.
 """
 
+import asyncio
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
 import uuid
 import json
 
@@ -25,6 +33,11 @@ class MessageBus:
     - Broadcasts
     - Message threading
     - Priority handling
+    - Batched commits (see batch())
+    - Push delivery to in-process subscribers (see subscribe())
+    
+    The connection may be used from several threads; access is serialized
+    by an internal lock.
     """
     
     def __init__(self, db_path: str = ".overstory/mail.db"):
@@ -36,15 +49,32 @@ class MessageBus:
         """
         self.db_path = db_path
         self._ensure_db_directory()
-        self.conn = sqlite3.connect(db_path, timeout=30.0)
+        self.conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._undelivered: List[Message] = []
+        self._uncommitted_rowids: List[int] = []
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._configure()
         self._init_schema()
+        
+        # Position for picking up messages written by other connections
+        self._data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        self._last_rowid = self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM messages").fetchone()[0]
+        self._local_rowids: Set[int] = set()
     
     def _ensure_db_directory(self):
         """Create database directory if it doesn't exist."""
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
     
+    def _configure(self):
+        """Set connection pragmas."""
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+    
     def _init_schema(self):
         """Initialize database schema."""
         cursor = self.conn.cursor()
@@ -67,14 +97,53 @@ class MessageBus:
             )
         """)
         
-        # Indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_to ON messages(to_agent)")
+        # Indexes. Inbox queries filter on recipient and read state and sort
+        # by time, so the composite indexes serve them without a sort.
+        cursor.execute("DROP INDEX IF EXISTS idx_messages_to")
+        cursor.execute("DROP INDEX IF EXISTS idx_messages_thread")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_messages_inbox ON messages(to_agent, read_at, created_at)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_messages_to_created ON messages(to_agent, created_at)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_messages_thread_created ON messages(thread_id, created_at)"
+        )
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_from ON messages(from_agent)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages(thread_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_type ON messages(message_type)")
         
         self.conn.commit()
     
+    @contextmanager
+    def batch(self) -> Iterator["MessageBus"]:
+        """
+        Group writes into a single commit.
+        
+        Sends and updates made inside the block are committed together
+        when the outermost batch exits, and subscribers are notified
+        after that commit. Batches may be nested.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self.conn.rollback()
+                    self._undelivered.clear()
+                    self._uncommitted_rowids.clear()
+                raise
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.conn.commit()
+                for rowid in self._uncommitted_rowids:
+                    self._note_local_row(rowid)
+                self._uncommitted_rowids.clear()
+                delivered, self._undelivered = self._undelivered, []
+                self._deliver(delivered)
+    
     def send(
         self,
         from_agent: str,
@@ -104,8 +173,6 @@ class MessageBus:
         Returns:
             The created message
         """
-        cursor = self.conn.cursor()
-        
         message_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat()
         
@@ -113,28 +180,7 @@ class MessageBus:
         if thread_id is None and (reply_to is not None or message_type in [MessageType.QUESTION, MessageType.ERROR]):
             thread_id = message_id
         
-        cursor.execute("""
-            INSERT INTO messages 
-            (id, from_agent, to_agent, subject, body, message_type, priority, 
-             thread_id, reply_to, task_id, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            message_id,
-            from_agent,
-            to_agent,
-            subject,
-            body,
-            message_type.value,
-            priority.value,
-            thread_id,
-            reply_to,
-            task_id,
-            now,
-        ))
-        
-        self.conn.commit()
-        
-        return Message(
+        message = Message(
             id=message_id,
             from_agent=from_agent,
             to_agent=to_agent,
@@ -147,68 +193,201 @@ class MessageBus:
             task_id=task_id,
             created_at=datetime.fromisoformat(now),
         )
+        
+        with self.batch():
+            cursor = self.conn.execute("""
+                INSERT INTO messages
+                (id, from_agent, to_agent, subject, body, message_type, priority,
+                 thread_id, reply_to, task_id, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                message_id,
+                from_agent,
+                to_agent,
+                subject,
+                body,
+                MessageType(message_type).value,
+                MessagePriority(priority).value,
+                thread_id,
+                reply_to,
+                task_id,
+                now,
+            ))
+            self._uncommitted_rowids.append(cursor.lastrowid)
+            self._undelivered.append(message)
+        
+        return message
+    
+    def send_many(self, messages: List[Dict[str, Any]]) -> List[Message]:
+        """
+        Send several messages in one commit.
+        
+        Args:
+            messages: Keyword arguments for send(), one dict per message
+        
+        Returns:
+            The created messages, in order
+        """
+        with self.batch():
+            return [self.send(**kwargs) for kwargs in messages]
     
-    def receive(self, agent_id: str, unread_only: bool = True) -> List[Message]:
+    def receive(self, agent_id: str, unread_only: bool = True, limit: Optional[int] = None) -> List[Message]:
         """
         Get messages for an agent.
         
         Args:
             agent_id: Recipient agent ID
             unread_only: Only return unread messages
+            limit: Maximum number of messages to return
         
         Returns:
-            List of messages
+            List of messages, newest first
         """
-        cursor = self.conn.cursor()
-        
         query = "SELECT * FROM messages WHERE to_agent = ?"
-        params = [agent_id]
+        params: List[Any] = [agent_id]
         
         if unread_only:
             query += " AND read_at IS NULL"
         
         query += " ORDER BY created_at DESC"
         
-        cursor.execute(query, params)
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
         
-        return [self._row_to_message(row) for row in cursor.fetchall()]
+        return [self._row_to_message(row) for row in rows]
     
     def mark_read(self, message_id: str):
         """Mark a message as read."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "UPDATE messages SET read_at = ? WHERE id = ?",
-            (datetime.utcnow().isoformat(), message_id)
-        )
-        self.conn.commit()
+        self.mark_read_many([message_id])
+    
+    def mark_read_many(self, message_ids: List[str]):
+        """Mark several messages as read in one commit."""
+        now = datetime.utcnow().isoformat()
+        with self.batch():
+            self.conn.executemany(
+                "UPDATE messages SET read_at = ? WHERE id = ?",
+                [(now, message_id) for message_id in message_ids],
+            )
     
     def get_thread(self, thread_id: str) -> List[Message]:
         """Get all messages in a thread."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT * FROM messages WHERE thread_id = ? ORDER BY created_at ASC",
-            (thread_id,)
-        )
-        return [self._row_to_message(row) for row in cursor.fetchall()]
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM messages WHERE thread_id = ? ORDER BY created_at ASC",
+                (thread_id,)
+            ).fetchall()
+        return [self._row_to_message(row) for row in rows]
     
     def get_unread_count(self, agent_id: str) -> int:
         """Get count of unread messages for an agent."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT COUNT(*) FROM messages WHERE to_agent = ? AND read_at IS NULL",
-            (agent_id,)
-        )
-        return cursor.fetchone()[0]
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE to_agent = ? AND read_at IS NULL",
+                (agent_id,)
+            ).fetchone()[0]
     
     def delete_message(self, message_id: str):
         """Delete a message."""
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM messages WHERE id = ?", (message_id,))
-        self.conn.commit()
+        with self.batch():
+            self.conn.execute("DELETE FROM messages WHERE id = ?", (message_id,))
+    
+    def subscribe(self, agent_id: str) -> asyncio.Queue:
+        """
+        Get a queue that receives each new message for an agent.
+        
+        Must be called from a running event loop. Messages sent through
+        this bus are queued when their commit completes; messages from
+        other processes are queued by poll_changes().
+        
+        Args:
+            agent_id: Recipient agent ID
+        
+        Returns:
+            Queue of Message objects
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(agent_id, []).append((loop, queue))
+        return queue
+    
+    def unsubscribe(self, agent_id: str, queue: asyncio.Queue):
+        """Stop delivering messages to a queue returned by subscribe()."""
+        with self._lock:
+            subscribers = self._subscribers.get(agent_id, [])
+            subscribers[:] = [entry for entry in subscribers if entry[1] is not queue]
+            if not subscribers:
+                self._subscribers.pop(agent_id, None)
+    
+    @property
+    def has_subscribers(self) -> bool:
+        """Whether any in-process subscriber is registered."""
+        return bool(self._subscribers)
+    
+    def poll_changes(self) -> List[Message]:
+        """
+        Deliver messages committed by other connections since the last call.
+        
+        This only reads the table when SQLite's data version shows that
+        another connection has written to the database.
+        
+        Returns:
+            The newly seen messages
+        """
+        with self._lock:
+            if self._batch_depth:
+                # Rows from the open batch may still be rolled back; look
+                # again once it has committed.
+                return []
+            version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return []
+            self._data_version = version
+            rows = self.conn.execute(
+                "SELECT rowid AS _rowid, * FROM messages WHERE rowid > ? ORDER BY rowid",
+                (self._last_rowid,)
+            ).fetchall()
+            messages = []
+            for row in rows:
+                self._last_rowid = max(self._last_rowid, row["_rowid"])
+                if row["_rowid"] in self._local_rowids:
+                    self._local_rowids.discard(row["_rowid"])
+                    continue
+                messages.append(self._row_to_message(row))
+            self._deliver(messages)
+        return messages
     
     def close(self):
         """Close the database connection."""
-        self.conn.close()
+        with self._lock:
+            self.conn.close()
+    
+    def __enter__(self) -> "MessageBus":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _note_local_row(self, rowid: int):
+        """Keep poll_changes() from reporting a row this bus committed."""
+        if rowid == self._last_rowid + 1:
+            self._last_rowid = rowid
+        else:
+            self._local_rowids.add(rowid)
+    
+    def _deliver(self, messages: List[Message]):
+        """Push committed messages to in-process subscribers."""
+        for message in messages:
+            for loop, queue in list(self._subscribers.get(message.to_agent, ())):
+                try:
+                    loop.call_soon_threadsafe(queue.put_nowait, message)
+                except RuntimeError:
+                    # The subscriber's event loop has been closed
+                    self.unsubscribe(message.to_agent, queue)
     
     def _row_to_message(self, row: sqlite3.Row) -> Message:
         """Convert a database row to a Message object."""
@@ -228,33 +407,168 @@ class MessageBus:
         )
 
 
+class AsyncMessageBus:
+    """
+    Asyncio front end for MessageBus.
+    
+    Database work runs in a worker thread so the event loop never blocks
+    on SQLite. Sends issued concurrently are coalesced into one commit.
+    Recipients await messages instead of polling receive(): local sends
+    wake them directly, and a watcher task picks up messages from other
+    processes while anyone is listening.
+    
+    Example:
+        bus = AsyncMessageBus(".overstory/mail.db")
+        async for message in bus.listen("builder-1"):
+            ...
+    """
+    
+    def __init__(
+        self,
+        db_path: str = ".overstory/mail.db",
+        bus: Optional[MessageBus] = None,
+        watch_interval: float = 0.05,
+    ):
+        """
+        Initialize the async message bus.
+        
+        Args:
+            db_path: Path to SQLite database
+            bus: Existing MessageBus to wrap instead of opening db_path
+            watch_interval: Seconds between checks for writes from other processes
+        """
+        self.bus = bus or MessageBus(db_path)
+        self.watch_interval = watch_interval
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._watch_task: Optional[asyncio.Task] = None
+    
+    async def send(self, from_agent: str, to_agent: str, subject: str, body: str, **kwargs: Any) -> Message:
+        """
+        Send a message; see MessageBus.send().
+        
+        Returns:
+            The created message, once committed
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((dict(from_agent=from_agent, to_agent=to_agent, subject=subject, body=body, **kwargs), future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+        return await future
+    
+    async def _flush(self):
+        """Commit queued sends in batches until none are left."""
+        # Yield once so sends issued in the same loop iteration share a commit
+        await asyncio.sleep(0)
+        while self._pending:
+            pending, self._pending = self._pending, []
+            try:
+                messages = await asyncio.to_thread(self.bus.send_many, [kwargs for kwargs, _ in pending])
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), message in zip(pending, messages):
+                if not future.done():
+                    future.set_result(message)
+    
+    async def receive(self, agent_id: str, unread_only: bool = True, limit: Optional[int] = None) -> List[Message]:
+        """Get messages for an agent; see MessageBus.receive()."""
+        return await asyncio.to_thread(self.bus.receive, agent_id, unread_only, limit)
+    
+    async def mark_read(self, *message_ids: str):
+        """Mark messages as read in one commit."""
+        await asyncio.to_thread(self.bus.mark_read_many, list(message_ids))
+    
+    async def get_thread(self, thread_id: str) -> List[Message]:
+        """Get all messages in a thread."""
+        return await asyncio.to_thread(self.bus.get_thread, thread_id)
+    
+    async def get_unread_count(self, agent_id: str) -> int:
+        """Get count of unread messages for an agent."""
+        return await asyncio.to_thread(self.bus.get_unread_count, agent_id)
+    
+    async def listen(self, agent_id: str) -> AsyncIterator[Message]:
+        """
+        Yield messages for an agent as they arrive.
+        
+        Only messages sent after listening starts are yielded; call
+        receive() first to drain the existing inbox.
+        """
+        queue = self.bus.subscribe(agent_id)
+        self._ensure_watcher()
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.bus.unsubscribe(agent_id, queue)
+    
+    async def wait_for_message(self, agent_id: str, timeout: Optional[float] = None) -> Message:
+        """
+        Wait for the next message to an agent.
+        
+        Raises:
+            asyncio.TimeoutError: If no message arrives in time
+        """
+        queue = self.bus.subscribe(agent_id)
+        self._ensure_watcher()
+        try:
+            return await asyncio.wait_for(queue.get(), timeout)
+        finally:
+            self.bus.unsubscribe(agent_id, queue)
+    
+    def _ensure_watcher(self):
+        """Start watching for writes from other processes."""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch())
+    
+    async def _watch(self):
+        """Poll SQLite's data version while there are subscribers."""
+        while self.bus.has_subscribers:
+            await asyncio.to_thread(self.bus.poll_changes)
+            await asyncio.sleep(self.watch_interval)
+    
+    async def close(self):
+        """Flush pending sends, stop watching and close the database."""
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+        self.bus.close()
+
+
 # Convenience functions for common message patterns
 
 def send_status(from_agent: str, to_agent: str, subject: str, body: str, task_id: Optional[str] = None):
     """Send a status update message."""
-    bus = MessageBus()
-    bus.send(from_agent, to_agent, subject, body, MessageType.STATUS, task_id=task_id)
+    with MessageBus() as bus:
+        bus.send(from_agent, to_agent, subject, body, MessageType.STATUS, task_id=task_id)
 
 
 def send_question(from_agent: str, to_agent: str, subject: str, body: str, task_id: Optional[str] = None):
     """Send a question message."""
-    bus = MessageBus()
-    bus.send(from_agent, to_agent, subject, body, MessageType.QUESTION, MessagePriority.NORMAL, task_id=task_id)
+    with MessageBus() as bus:
+        bus.send(from_agent, to_agent, subject, body, MessageType.QUESTION, MessagePriority.NORMAL, task_id=task_id)
 
 
 def send_error(from_agent: str, to_agent: str, subject: str, body: str, task_id: Optional[str] = None):
     """Send an error message (high priority)."""
-    bus = MessageBus()
-    bus.send(from_agent, to_agent, subject, body, MessageType.ERROR, MessagePriority.HIGH, task_id=task_id)
+    with MessageBus() as bus:
+        bus.send(from_agent, to_agent, subject, body, MessageType.ERROR, MessagePriority.HIGH, task_id=task_id)
 
 
 def send_done(from_agent: str, to_agent: str, subject: str, body: str, task_id: Optional[str] = None):
     """Send a worker done message."""
-    bus = MessageBus()
-    bus.send(from_agent, to_agent, subject, body, MessageType.WORKER_DONE, task_id=task_id)
+    with MessageBus() as bus:
+        bus.send(from_agent, to_agent, subject, body, MessageType.WORKER_DONE, task_id=task_id)
 
 
 def send_merge_ready(from_agent: str, to_agent: str, subject: str, body: str, task_id: Optional[str] = None):
     """Send a merge ready message."""
-    bus = MessageBus()
-    bus.send(from_agent, to_agent, subject, body, MessageType.MERGE_READY, task_id=task_id)
+    with MessageBus() as bus:
+        bus.send(from_agent, to_agent, subject, body, MessageType.MERGE_READY, task_id=task_id)
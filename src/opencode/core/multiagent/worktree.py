@@ -8,6 +8,8 @@ Provides worktree isolation for agents to prevent conflicting changes.
 
 import subprocess
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
 import uuid
@@ -125,7 +127,8 @@ class WorktreeManager:
             return worktrees
         
         for agent_dir in self.base_path.iterdir():
-            if agent_dir.is_dir():
+            # Hidden directories hold pooled worktrees, not agents
+            if agent_dir.is_dir() and not agent_dir.name.startswith("."):
                 agent_id = agent_dir.name
                 
                 # Get branch
@@ -191,3 +194,225 @@ class WorktreeManager:
                 count += 1
         
         return count
+
+
+class WorktreePool:
+    """
+    Keeps clean worktrees checked out ahead of time for new agents.
+    
+    Checking out a large repository takes seconds, so the pool keeps
+    ``size`` detached worktrees ready under ``<base_path>/.pool`` and
+    refills it on a background thread. Handing one to an agent only
+    creates its branch (``git switch -c``) and moves the directory into
+    place. Released worktrees are reset, cleaned with ``git clean`` and
+    returned to the pool. Ready worktrees left on disk by an earlier
+    process are reused.
+    
+    Agents get the same paths and branches as with
+    WorktreeManager.create_worktree(), which is also the fallback when the
+    pool is empty.
+    """
+    
+    POOL_DIR = ".pool"
+    
+    def __init__(
+        self,
+        manager: Optional[WorktreeManager] = None,
+        size: int = 2,
+        from_branch: str = "main",
+        refill: bool = True,
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            manager: Worktree manager whose base path the pool shares
+            size: Number of ready worktrees to maintain
+            from_branch: Branch new agent branches start from
+            refill: Top the pool up in the background after handing out a
+                worktree. Short-lived processes pass False so they do not
+                wait for checkouts on exit.
+        """
+        self.manager = manager or WorktreeManager()
+        self.size = size
+        self.from_branch = from_branch
+        self.refill = refill
+        self.pool_path = (self.manager.base_path / self.POOL_DIR).resolve()
+        self.pool_path.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._ready: List[Path] = []
+        self._creating = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="worktree-pool")
+        self._adopt_existing()
+    
+    def _git(self, *args: str, cwd: Optional[Path] = None) -> str:
+        """Run a git command and return its output."""
+        cmd = ["git"]
+        if cwd is not None:
+            cmd += ["-C", str(cwd)]
+        result = subprocess.run(cmd + list(args), capture_output=True, text=True, check=True)
+        return result.stdout
+    
+    def _adopt_existing(self):
+        """Reuse ready worktrees from an earlier run and drop broken ones."""
+        try:
+            self._git("worktree", "prune")
+        except (subprocess.CalledProcessError, OSError):
+            return
+        for slot in sorted(self.pool_path.iterdir()):
+            if (slot / ".git").is_file():
+                self._ready.append(slot)
+    
+    @property
+    def ready_count(self) -> int:
+        """Number of worktrees ready to hand out."""
+        return len(self._ready)
+    
+    def warm(self, wait: bool = False) -> Optional[Future]:
+        """
+        Top the pool up to its size in the background.
+        
+        Args:
+            wait: Block until the pool is full
+        
+        Returns:
+            Future for the refill, or None if the pool is already full
+        """
+        with self._lock:
+            missing = self.size - len(self._ready) - self._creating
+            if missing > 0:
+                self._creating += missing
+        if missing <= 0:
+            if wait:
+                # The executor runs jobs in order, so this waits for refills in flight
+                self._executor.submit(lambda: None).result()
+            return None
+        future = self._executor.submit(self._fill, missing)
+        if wait:
+            future.result()
+        return future
+    
+    def _fill(self, count: int):
+        """Create detached worktrees for the pool."""
+        for created in range(count):
+            with self._lock:
+                # Released worktrees may have filled the pool meanwhile
+                if len(self._ready) >= self.size:
+                    self._creating -= count - created
+                    return
+            slot = self.pool_path / uuid.uuid4().hex[:8]
+            try:
+                self._git("worktree", "add", "--detach", str(slot), self.from_branch)
+            except (subprocess.CalledProcessError, OSError):
+                with self._lock:
+                    self._creating -= 1
+                continue
+            with self._lock:
+                self._creating -= 1
+                self._ready.append(slot)
+    
+    def acquire(
+        self,
+        agent_id: str,
+        branch: Optional[str] = None,
+        from_branch: Optional[str] = None,
+    ) -> Worktree:
+        """
+        Get a worktree for an agent, from the pool when one is ready.
+        
+        Args:
+            agent_id: Agent ID to create worktree for
+            branch: Branch name (auto-generated if not provided)
+            from_branch: Branch to create from (defaults to the pool's)
+        
+        Returns:
+            Worktree object
+        """
+        branch = branch or f"agent/{agent_id}"
+        from_branch = from_branch or self.from_branch
+        target = (self.manager.base_path / agent_id).resolve()
+        
+        with self._lock:
+            slot = self._ready.pop() if self._ready and not target.exists() else None
+        if slot is None:
+            worktree = self.manager.create_worktree(agent_id, branch, from_branch)
+            if self.refill:
+                self.warm()
+            return worktree
+        if self.refill:
+            self.warm()
+        
+        try:
+            self._git("switch", "-q", "-c", branch, from_branch, cwd=slot)
+        except subprocess.CalledProcessError as e:
+            with self._lock:
+                self._ready.append(slot)
+            raise RuntimeError(f"Failed to create worktree: {e.stderr or e}")
+        try:
+            self._git("worktree", "move", str(slot), str(target))
+        except subprocess.CalledProcessError as e:
+            self._discard(slot)
+            raise RuntimeError(f"Failed to create worktree: {e.stderr or e}")
+        
+        return Worktree(
+            path=str(self.manager.base_path / agent_id),
+            branch=branch,
+            agent_id=agent_id,
+            is_clean=True,
+            last_commit=self._git("rev-parse", "HEAD", cwd=target).strip(),
+        )
+    
+    def release(self, agent_id: str):
+        """
+        Return an agent's worktree to the pool.
+        
+        Local changes and untracked files are discarded; commits stay on
+        the agent's branch. A recycled worktree takes the place of any
+        refill still pending; when the pool is already full the worktree
+        is removed instead.
+        
+        Args:
+            agent_id: Agent ID whose worktree to release
+        """
+        path = (self.manager.base_path / agent_id).resolve()
+        if not path.exists():
+            return
+        with self._lock:
+            full = len(self._ready) >= self.size
+        if full:
+            self.manager.remove_worktree(agent_id, force=True)
+            return
+        
+        slot = self.pool_path / uuid.uuid4().hex[:8]
+        try:
+            self._git("reset", "-q", "--hard", cwd=path)
+            self._git("clean", "-q", "-ffdx", cwd=path)
+            self._git("switch", "-q", "--detach", self.from_branch, cwd=path)
+            self._git("worktree", "move", str(path), str(slot))
+        except subprocess.CalledProcessError:
+            self.manager.remove_worktree(agent_id, force=True)
+            return
+        with self._lock:
+            self._ready.append(slot)
+    
+    def _discard(self, slot: Path):
+        """Remove a pooled worktree that could not be used."""
+        try:
+            self._git("worktree", "remove", "--force", str(slot))
+        except subprocess.CalledProcessError:
+            pass
+    
+    def close(self, remove: bool = False):
+        """
+        Stop background work.
+        
+        Args:
+            remove: Also remove the ready worktrees from disk
+        """
+        self._executor.shutdown(wait=True)
+        if remove:
+            with self._lock:
+                slots, self._ready = self._ready, []
+            for slot in slots:
+                self._discard(slot)
@@ -7,7 +7,21 @@ A powerful AI-powered coding assistant that runs in your terminal.
 __version__ = "1.0.0"
 __author__ = "OpenCode Community"
 
-from opencode.core.config import Config
-from opencode.core.session import Session
-
 __all__ = ["__version__", "Config", "Session"]
+
+# Imported on first access so `opencode --version` stays fast
+_LAZY_ATTRIBUTES = {
+    "Config": "opencode.core.config:Config",
+    "Session": "opencode.core.session:Session",
+}
+
+
+def __getattr__(name: str):
+    """Lazily import package attributes on first access."""
+    if name in _LAZY_ATTRIBUTES:
+        module_path, attribute = _LAZY_ATTRIBUTES[name].split(":")
+        import importlib
+        value = getattr(importlib.import_module(module_path), attribute)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
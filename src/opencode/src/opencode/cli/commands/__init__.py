@@ -1,23 +1,9 @@
 """
 CLI commands for OpenCode.
-"""
-
-from opencode.cli.commands.run import run_command
-from opencode.cli.commands.serve import serve_command
-from opencode.cli.commands.auth import auth_app
-from opencode.cli.commands.config import config_app
-from opencode.cli.commands.rag import app as rag_app
-from opencode.cli.commands.debug_cmd import app as debug_app
-from opencode.cli.commands.github import app as github_app
 
-# RAG sub-modules for direct access
-from opencode.cli.commands.rag_create import app as rag_create_app
-from opencode.cli.commands.rag_query import app as rag_query_app
-from opencode.cli.commands.rag_manage import app as rag_manage_app
-from opencode.cli.commands.rag_validation import app as rag_validation_app
-from opencode.cli.commands.rag_share import app as rag_share_app
-from opencode.cli.commands.rag_audit import app as rag_audit_app
-from opencode.cli.commands.skills import app as skills_app
+Command modules are imported lazily via __getattr__, so loading one
+command does not import the others.
+"""
 
 __all__ = [
     "run_command",
@@ -35,3 +21,31 @@ __all__ = [
     "rag_share_app",
     "rag_audit_app",
 ]
+
+_LAZY_ATTRIBUTES = {
+    "run_command": ".run:run_command",
+    "serve_command": ".serve:serve_command",
+    "auth_app": ".auth:auth_app",
+    "config_app": ".config:config_app",
+    "rag_app": ".rag:app",
+    "debug_app": ".debug_cmd:app",
+    "github_app": ".github:app",
+    "skills_app": ".skills:app",
+    # RAG sub-modules for direct access
+    "rag_create_app": ".rag_create:app",
+    "rag_query_app": ".rag_query:app",
+    "rag_manage_app": ".rag_manage:app",
+    "rag_validation_app": ".rag_validation:app",
+    "rag_share_app": ".rag_share:app",
+    "rag_audit_app": ".rag_audit:app",
+}
+
+
+def __getattr__(name: str):
+    """Lazily import command modules on first access."""
+    if name in _LAZY_ATTRIBUTES:
+        module_path, attribute = _LAZY_ATTRIBUTES[name].split(":")
+        import importlib
+        module = importlib.import_module(module_path, package=__name__)
+        return getattr(module, attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -317,6 +317,9 @@ def calibrate(
     models: list[str] = typer.Option(..., "--model", "-m", help="Models to calibrate"),
     objective: str = typer.Option("balanced", "--objective", "-o", help="Calibration objective"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Simulate without running"),
+    max_samples: int = typer.Option(10, "--max-samples", help="Maximum runs per prompt"),
+    budget: Optional[float] = typer.Option(None, "--budget", help="Time budget per model in seconds"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", help="Parallel prompts per model (default: OLLAMA_NUM_PARALLEL)"),
     output: Optional[Path] = typer.Option(None, "--output", help="Output file for results"),
     policy_out: Optional[Path] = typer.Option(None, "--policy-out", help="Output file for policy"),
 ):
@@ -324,7 +327,11 @@ def calibrate(
     
     Objectives: speed, quality, balanced, cost
     """
-    from ...llmchecker.calibration import CalibrationManager, CalibrationObjective
+    from ...llmchecker.calibration import (
+        CalibrationManager,
+        CalibrationObjective,
+        CalibrationSchedule,
+    )
     
     manager = CalibrationManager()
     
@@ -359,6 +366,12 @@ def calibrate(
                 objective=obj,
                 dry_run=dry_run,
                 progress_callback=progress,
+                schedule=CalibrationSchedule(
+                    min_samples=min(3, max_samples),
+                    max_samples=max_samples,
+                    budget_seconds=budget,
+                    concurrency=concurrency,
+                ),
             )
     
     result = asyncio.run(run_calibration())
@@ -372,6 +385,7 @@ def calibrate(
     table = Table(title="Model Results")
     table.add_column("Model", style="cyan")
     table.add_column("Avg Speed", style="green")
+    table.add_column("p50 / p95", style="blue")
     table.add_column("Avg Quality", style="yellow")
     table.add_column("Success Rate", style="magenta")
     table.add_column("Score", style="bold")
@@ -380,6 +394,7 @@ def calibrate(
         table.add_row(
             mr.model,
             f"{mr.avg_tokens_per_second:.1f} tok/s",
+            f"{mr.p50_latency:.2f}s / {mr.p95_latency:.2f}s",
             f"{mr.avg_quality_score:.0f}",
             f"{mr.success_rate * 100:.0f}%",
             f"{mr.overall_score:.0f}",
@@ -247,6 +247,7 @@ async def _run_multi_model(
     """Execute a multi-model pattern."""
     from opencode.workflow.templates import get_template
     from opencode.workflow.engine import WorkflowEngine
+    from opencode.provider.pool import get_provider_pool
     
     # Get pattern configuration
     if pattern_name:
@@ -281,6 +282,7 @@ async def _run_multi_model(
         console.print(f"  [dim]Model {i+1}: {m.model} ({m.provider})[/dim]")
     console.print()
     
+    engine = None
     try:
         # Get template and build workflow
         template = get_template(mm_config.pattern.value, mm_config)
@@ -315,6 +317,10 @@ async def _run_multi_model(
     except Exception as e:
         console.print(f"[red]Error executing multi-model pattern: {e}[/red]")
         raise typer.Exit(1)
+    finally:
+        if engine is not None:
+            await engine.close()
+        await get_provider_pool().close_all()
 
 
 def _build_adhoc_pattern(
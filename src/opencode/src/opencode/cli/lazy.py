@@ -0,0 +1,91 @@
+"""
+Lazy subcommand loading for the OpenCode CLI.
+
+Subcommand groups are registered by import path and only imported when
+they are invoked, so ``opencode --version`` and ``--help`` do not pay for
+the RAG, LLM checker or GitHub dependencies.
+"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Type
+
+import typer
+from typer.core import TyperGroup
+
+
+@dataclass(frozen=True)
+class LazySubcommand:
+    """A Typer sub-app resolved on first use."""
+    import_path: str  # "package.module:attribute"
+    help: Optional[str] = None
+
+
+class LazyTyperGroup(TyperGroup):
+    """
+    Typer group that imports registered sub-apps on demand.
+    
+    Help output and shell completion list lazy subcommands from their
+    registered help text without importing them; a subcommand's module is
+    imported when it is resolved for invocation.
+    """
+    
+    lazy_subcommands: Dict[str, LazySubcommand] = {}
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._describing = False
+    
+    def list_commands(self, ctx) -> List[str]:
+        """List eager commands followed by lazy ones."""
+        names = super().list_commands(ctx)
+        return names + [name for name in self.lazy_subcommands if name not in self.commands]
+    
+    def get_command(self, ctx, cmd_name: str):
+        """Get a command, importing a lazy subcommand unless only describing it."""
+        command = super().get_command(ctx, cmd_name)
+        if command is not None or cmd_name not in self.lazy_subcommands:
+            return command
+        if self._describing or ctx.resilient_parsing:
+            return TyperGroup(name=cmd_name, help=self.lazy_subcommands[cmd_name].help)
+        return self.load(cmd_name)
+    
+    def resolve_command(self, ctx, args: List[str]) -> Tuple:
+        """Import the invoked subcommand before Typer resolves it."""
+        if args and args[0] in self.lazy_subcommands and args[0] not in self.commands:
+            self.load(args[0])
+        return super().resolve_command(ctx, args)
+    
+    def format_help(self, ctx, formatter) -> None:
+        """Format help without importing lazy subcommands."""
+        self._describing = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._describing = False
+    
+    def load(self, cmd_name: str):
+        """Import a lazy subcommand and register it as a regular command."""
+        entry = self.lazy_subcommands[cmd_name]
+        module_path, attribute = entry.import_path.split(":")
+        sub_app = getattr(importlib.import_module(module_path), attribute)
+        
+        command = typer.main.get_command(sub_app)
+        command.name = cmd_name
+        if entry.help:
+            command.help = entry.help
+        self.add_command(command, cmd_name)
+        return command
+
+
+def lazy_group(subcommands: Dict[str, LazySubcommand]) -> Type[LazyTyperGroup]:
+    """
+    Create a group class for ``typer.Typer(cls=...)`` with lazy subcommands.
+    
+    Args:
+        subcommands: Subcommand name to its lazy registration
+    
+    Returns:
+        LazyTyperGroup subclass serving those subcommands
+    """
+    return type("LazyTyperGroup", (LazyTyperGroup,), {"lazy_subcommands": dict(subcommands)})
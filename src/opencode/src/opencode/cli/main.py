@@ -4,7 +4,6 @@ Main CLI entry point for OpenCode.
 This module defines the main CLI application and all subcommands.
 """
 
-import asyncio
 from pathlib import Path
 from typing import Annotated, Optional
 
@@ -12,12 +11,28 @@ import typer
 from rich.console import Console
 
 from opencode import __version__
+from opencode.cli.lazy import LazySubcommand, lazy_group
+
+# Subcommand groups, imported only when invoked
+SUBCOMMANDS = {
+    "rag": LazySubcommand("opencode.cli.commands.rag:app", "RAG management commands"),
+    "index": LazySubcommand("opencode.cli.commands.index:app", "Project index management"),
+    "llm": LazySubcommand("opencode.cli.commands.llmchecker:app", "LLM Checker commands"),
+    "local-llm": LazySubcommand(
+        "opencode.cli.commands.local_llm:llm_app",
+        "Local LLM model management (inspired by igllama)",
+    ),
+    "debug": LazySubcommand("opencode.cli.commands.debug_cmd:app", "Simplified troubleshooting commands"),
+    "github": LazySubcommand("opencode.cli.commands.github:app", "GitHub integration commands"),
+    "skills": LazySubcommand("opencode.cli.commands.skills:app", "Skills management with SkillPointer"),
+}
 
 app = typer.Typer(
     name="opencode",
     help="Open source AI coding agent",
     add_completion=False,
     rich_markup_mode="rich",
+    cls=lazy_group(SUBCOMMANDS),
 )
 
 console = Console()
@@ -78,6 +93,7 @@ def run(
     Sessions and logs will be saved to: {directory}/docs/opencode/
     Plans will be saved to: {directory}/plans/
     """
+    import asyncio
     from opencode.cli.commands.run import launch_tui
     
     asyncio.run(launch_tui(directory=directory, model=model, agent=agent, sandbox_root=sandbox_root))
@@ -95,6 +111,7 @@ def serve(
     This starts a headless API server that can be used with the web interface
     or other clients.
     """
+    import asyncio
     from opencode.cli.commands.serve import serve_command
     
     asyncio.run(serve_command(port=port, host=host, open_web=web))
@@ -113,6 +130,7 @@ def auth(
     Without arguments, shows current authentication status.
     With a provider name, initiates authentication flow.
     """
+    import asyncio
     from opencode.cli.commands.auth import auth_command
     
     asyncio.run(auth_command(provider=provider))
@@ -137,6 +155,7 @@ def config_cmd(
         opencode config model              # Show model config
         opencode config model default claude-3-5-sonnet  # Set config value
     """
+    import asyncio
     from opencode.cli.commands.config import config_command
     
     asyncio.run(config_command(key=key, value=value, list_all=list_all, global_config=global_config))
@@ -158,6 +177,7 @@ def models(
     
     Shows all models from configured providers with their capabilities.
     """
+    import asyncio
     from opencode.cli.commands.models import models_command
     
     asyncio.run(models_command(provider=provider, search=search))
@@ -187,6 +207,7 @@ def session(
         delete  - Delete a session
         export  - Export session to file
     """
+    import asyncio
     from opencode.cli.commands.session import session_command
     
     asyncio.run(session_command(action=action, session_id=session_id, output=output))
@@ -216,6 +237,7 @@ def mcp(
         remove  - Remove an MCP server
         start   - Start an MCP server
     """
+    import asyncio
     from opencode.cli.commands.mcp import mcp_command
     
     asyncio.run(mcp_command(action=action, name=name, command=command))
@@ -224,6 +246,7 @@ def mcp(
 @app.command()
 def upgrade() -> None:
     """Upgrade OpenCode to the latest version."""
+    import asyncio
     from opencode.cli.commands.upgrade import upgrade_command
     
     asyncio.run(upgrade_command())
@@ -232,21 +255,18 @@ def upgrade() -> None:
 @app.command()
 def uninstall() -> None:
     """Uninstall OpenCode."""
+    import asyncio
     from opencode.cli.commands.uninstall import uninstall_command
     
     asyncio.run(uninstall_command())
 
 
-# Register RAG commands as a sub-app
-from opencode.cli.commands.rag import app as rag_app
-app.add_typer(rag_app, name="rag", help="RAG management commands")
-
-
 @app.command()
 def import_sessions(
     file: Annotated[Path, typer.Argument(help="File to import from")],
 ) -> None:
     """Import sessions from a file."""
+    import asyncio
     from opencode.cli.commands.import_export import import_command
     
     asyncio.run(import_command(file=file))
@@ -264,35 +284,11 @@ def export_sessions(
     ] = None,
 ) -> None:
     """Export sessions to a file."""
+    import asyncio
     from opencode.cli.commands.import_export import export_command
     
     asyncio.run(export_command(output=output, session_ids=session_ids))
 
 
-# Add index subcommand group
-from opencode.cli.commands.index import app as index_app
-app.add_typer(index_app, name="index")
-
-# Add llmchecker subcommand group
-from opencode.cli.commands.llmchecker import app as llm_app
-app.add_typer(llm_app, name="llm")
-
-# Add local-llm subcommand group for local LLM management
-from opencode.cli.commands.local_llm import llm_app as local_llm_app
-app.add_typer(local_llm_app, name="local-llm")
-
-# Add debug subcommand group for simplified troubleshooting
-from opencode.cli.commands.debug_cmd import app as debug_app
-app.add_typer(debug_app, name="debug", help="Simplified troubleshooting commands")
-
-# Add github subcommand group for GitHub integration
-from opencode.cli.commands.github import app as github_app
-app.add_typer(github_app, name="github", help="GitHub integration commands")
-
-# Add skills subcommand group for SkillPointer management
-from opencode.cli.commands.skills import app as skills_app
-app.add_typer(skills_app, name="skills", help="Skills management with SkillPointer")
-
-
 if __name__ == "__main__":
     app()
@@ -5,12 +5,18 @@ Coordinates multi-agent task execution and manages the orchestration flow.
 """
 
 import asyncio
+import heapq
+import itertools
+import json
 import logging
 import uuid
+from collections import deque
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Callable
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Callable, Tuple
 
 from opencode.core.orchestration.agent import Agent, AgentTask, AgentDescription
 from opencode.core.orchestration.registry import AgentRegistry
@@ -28,6 +34,9 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"
 
 
+FINISHED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+
 @dataclass
 class CoordinatedTask:
     """A task being coordinated by the coordinator."""
@@ -42,6 +51,7 @@ class CoordinatedTask:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    priority: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -49,6 +59,7 @@ class CoordinatedTask:
             "task_id": self.task_id,
             "prompt": self.prompt,
             "status": self.status.value,
+            "priority": self.priority,
             "routing_result": self.routing_result.to_dict() if self.routing_result else None,
             "result": self.result,
             "error": self.error,
@@ -57,6 +68,29 @@ class CoordinatedTask:
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "metadata": self.metadata,
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CoordinatedTask":
+        """
+        Create from dictionary.
+        
+        The routing result and agent task are not restored.
+        """
+        def parse_time(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+        
+        return cls(
+            task_id=data["task_id"],
+            prompt=data["prompt"],
+            status=TaskStatus(data["status"]),
+            result=data.get("result"),
+            error=data.get("error"),
+            created_at=parse_time(data.get("created_at")) or datetime.utcnow(),
+            started_at=parse_time(data.get("started_at")),
+            completed_at=parse_time(data.get("completed_at")),
+            metadata=data.get("metadata", {}),
+            priority=data.get("priority", 0),
+        )
 
 
 @dataclass
@@ -67,6 +101,82 @@ class CoordinatorConfig:
     retry_failed_tasks: bool = True
     max_retries: int = 2
     enable_logging: bool = True
+    # Finished tasks kept in memory; older ones are evicted, and appended
+    # as JSON lines to spill_path when it is set
+    max_finished_tasks: int = 1000
+    spill_path: Optional[str] = None
+
+
+class TaskTable(MutableMapping):
+    """
+    Coordinated tasks by ID, indexed by status.
+    
+    Status changes must go through set_status() so the index stays
+    current. Finished tasks are also kept in the order they finished, so
+    the oldest can be evicted first.
+    """
+    
+    def __init__(self):
+        self._tasks: Dict[str, CoordinatedTask] = {}
+        self._by_status: Dict[TaskStatus, Dict[str, None]] = {status: {} for status in TaskStatus}
+        self._indexed: Dict[str, TaskStatus] = {}
+        self._finished: Dict[str, None] = {}
+    
+    def __getitem__(self, task_id: str) -> CoordinatedTask:
+        return self._tasks[task_id]
+    
+    def __setitem__(self, task_id: str, task: CoordinatedTask) -> None:
+        if task_id in self._tasks:
+            self._unindex(task_id)
+        self._tasks[task_id] = task
+        self._index(task_id, task.status)
+    
+    def __delitem__(self, task_id: str) -> None:
+        del self._tasks[task_id]
+        self._unindex(task_id)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tasks)
+    
+    def __len__(self) -> int:
+        return len(self._tasks)
+    
+    def _index(self, task_id: str, status: TaskStatus) -> None:
+        self._by_status[status][task_id] = None
+        self._indexed[task_id] = status
+        if status in FINISHED_STATUSES:
+            self._finished[task_id] = None
+    
+    def _unindex(self, task_id: str) -> None:
+        status = self._indexed.pop(task_id)
+        self._by_status[status].pop(task_id, None)
+        self._finished.pop(task_id, None)
+    
+    def set_status(self, task: CoordinatedTask, status: TaskStatus) -> None:
+        """Change a task's status and update the index."""
+        if task.task_id in self._tasks:
+            self._unindex(task.task_id)
+            task.status = status
+            self._index(task.task_id, status)
+        else:
+            task.status = status
+    
+    def with_status(self, *statuses: TaskStatus) -> List[CoordinatedTask]:
+        """Get tasks in any of the given statuses."""
+        return [self._tasks[tid] for status in statuses for tid in self._by_status[status]]
+    
+    def count(self, status: TaskStatus) -> int:
+        """Count tasks in a status."""
+        return len(self._by_status[status])
+    
+    @property
+    def finished_count(self) -> int:
+        """Number of finished tasks held."""
+        return len(self._finished)
+    
+    def oldest_finished(self) -> Optional[str]:
+        """ID of the task that finished first, if any."""
+        return next(iter(self._finished), None)
 
 
 class Coordinator:
@@ -76,6 +186,14 @@ class Coordinator:
     The coordinator manages the flow of tasks through the orchestration
     system, handling routing, execution, and result collection.
     
+    Scheduling is event-driven: submitting a task and finishing one both
+    trigger a dispatch pass, and waiters are woken by a per-task future
+    rather than by polling. Each routed task is queued by priority for its
+    agent, and an agent is never given more tasks than its
+    ``max_concurrent_tasks``. An agent with spare capacity and nothing of
+    its own queued takes work from a saturated agent when the router named
+    it as an alternative for that task.
+    
     Example:
         registry = AgentRegistry()
         registry.register(code_agent)
@@ -105,11 +223,23 @@ class Coordinator:
         self.config = config or CoordinatorConfig()
         self.router = OrchestrationRouter(registry)
         
-        self._tasks: Dict[str, CoordinatedTask] = {}
+        self._tasks = TaskTable()
         self._running_tasks: Dict[str, asyncio.Task] = {}
-        self._task_queue: asyncio.Queue = asyncio.Queue()
         self._result_callbacks: List[Callable] = []
         self._started = False
+        
+        # Submitted tasks awaiting routing, then per-agent priority queues of
+        # (-priority, sequence, task_id). A task is also entered in the steal
+        # queue of each alternative agent; entries for tasks that are no
+        # longer pending are skipped when they reach the top.
+        self._unrouted: Deque[str] = deque()
+        self._queues: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._steal_queues: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._sequence = itertools.count()
+        self._agent_load: Dict[str, int] = {}
+        
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._spilled: Dict[str, int] = {}
     
     async def start(self) -> None:
         """Start the coordinator."""
@@ -117,10 +247,7 @@ class Coordinator:
             return
         
         self._started = True
-        
-        # Start task processor
-        for _ in range(self.config.max_concurrent_tasks):
-            asyncio.create_task(self._process_tasks())
+        self._dispatch()
         
         logger.info("Coordinator started")
     
@@ -139,6 +266,7 @@ class Coordinator:
         self,
         prompt: str,
         metadata: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
     ) -> str:
         """
         Submit a new task.
@@ -146,6 +274,7 @@ class Coordinator:
         Args:
             prompt: Task prompt
             metadata: Optional metadata
+            priority: Higher priorities are dispatched first
             
         Returns:
             Task ID
@@ -156,11 +285,12 @@ class Coordinator:
             task_id=task_id,
             prompt=prompt,
             metadata=metadata or {},
+            priority=priority,
         )
         
         self._tasks[task_id] = task
-        
-        await self._task_queue.put(task_id)
+        self._unrouted.append(task_id)
+        self._dispatch()
         
         logger.info(f"Submitted task {task_id}: {prompt[:50]}...")
         
@@ -170,6 +300,7 @@ class Coordinator:
         self,
         prompt: str,
         metadata: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
     ) -> CoordinatedTask:
         """
         Submit a task and wait for completion.
@@ -177,11 +308,12 @@ class Coordinator:
         Args:
             prompt: Task prompt
             metadata: Optional metadata
+            priority: Higher priorities are dispatched first
             
         Returns:
             Completed task
         """
-        task_id = await self.submit(prompt, metadata)
+        task_id = await self.submit(prompt, metadata, priority)
         return await self.wait_for_result(task_id)
     
     async def wait_for_result(
@@ -200,82 +332,133 @@ class Coordinator:
             Completed task
             
         Raises:
+            ValueError: If the task is unknown
             asyncio.TimeoutError: If timeout exceeded
         """
         timeout = timeout or self.config.task_timeout_seconds
         
-        async def wait_for_completion():
-            while True:
-                task = self._tasks.get(task_id)
-                if not task:
-                    raise ValueError(f"Task not found: {task_id}")
-                
-                if task.status in (
-                    TaskStatus.COMPLETED,
-                    TaskStatus.FAILED,
-                    TaskStatus.CANCELLED,
-                ):
-                    return task
-                
-                await asyncio.sleep(0.1)
+        task = self.get_task(task_id)
+        if not task:
+            raise ValueError(f"Task not found: {task_id}")
+        if task.status in FINISHED_STATUSES:
+            return task
         
-        return await asyncio.wait_for(wait_for_completion(), timeout)
+        waiter = self._waiters.get(task_id)
+        if waiter is None:
+            waiter = self._waiters[task_id] = asyncio.get_running_loop().create_future()
+        # Shielded so one caller timing out does not cancel other waiters
+        return await asyncio.wait_for(asyncio.shield(waiter), timeout)
     
     def get_task(self, task_id: str) -> Optional[CoordinatedTask]:
-        """Get a task by ID."""
-        return self._tasks.get(task_id)
+        """Get a task by ID, including finished tasks spilled to disk."""
+        task = self._tasks.get(task_id)
+        if task is None and task_id in self._spilled:
+            task = self._load_spilled(task_id)
+        return task
     
     def get_all_tasks(self) -> List[CoordinatedTask]:
-        """Get all tasks."""
+        """Get all tasks held in memory."""
         return list(self._tasks.values())
     
     def get_pending_tasks(self) -> List[CoordinatedTask]:
         """Get pending tasks."""
-        return [t for t in self._tasks.values() if t.status == TaskStatus.PENDING]
+        return self._tasks.with_status(TaskStatus.PENDING)
     
     def get_running_tasks(self) -> List[CoordinatedTask]:
         """Get running tasks."""
-        return [t for t in self._tasks.values() if t.status == TaskStatus.RUNNING]
+        return self._tasks.with_status(TaskStatus.RUNNING)
     
     def add_result_callback(self, callback: Callable) -> None:
         """Add a callback for task results."""
         self._result_callbacks.append(callback)
     
-    async def _process_tasks(self) -> None:
-        """Process tasks from the queue."""
-        while self._started:
-            try:
-                task_id = await asyncio.wait_for(
-                    self._task_queue.get(),
-                    timeout=1.0,
-                )
-                
-                await self._execute_task(task_id)
-                
-            except asyncio.TimeoutError:
+    def _has_capacity(self, agent_id: str) -> bool:
+        """Whether an agent is below its concurrency limit."""
+        agent = self.registry.get(agent_id)
+        if agent is None:
+            return False
+        return self._agent_load.get(agent_id, 0) < max(agent.description.max_concurrent_tasks, 1)
+    
+    def _route_pending(self) -> None:
+        """Route newly submitted tasks into the per-agent queues."""
+        while self._unrouted:
+            task = self._tasks.get(self._unrouted.popleft())
+            if not task or task.status != TaskStatus.PENDING:
                 continue
+            try:
+                routing_result = self.router.route(task.prompt)
             except Exception as e:
-                logger.error(f"Error processing task: {e}")
+                task.error = str(e)
+                task.completed_at = datetime.utcnow()
+                self._tasks.set_status(task, TaskStatus.FAILED)
+                self._finish(task)
+                logger.error(f"Task {task.task_id} failed: {e}")
+                continue
+            
+            task.routing_result = routing_result
+            entry = (-task.priority, next(self._sequence), task.task_id)
+            heapq.heappush(self._queues.setdefault(routing_result.agent_id, []), entry)
+            for alternative in routing_result.alternative_agents:
+                heapq.heappush(self._steal_queues.setdefault(alternative, []), entry)
     
-    async def _execute_task(self, task_id: str) -> None:
-        """Execute a task."""
-        task = self._tasks.get(task_id)
-        if not task:
+    def _queue_head(self, queue: List[Tuple[int, int, str]]) -> Optional[Tuple[int, int, str]]:
+        """Drop stale entries and return the top of a queue."""
+        while queue:
+            task = self._tasks.get(queue[0][2])
+            if task and task.status == TaskStatus.PENDING and task.task_id not in self._running_tasks:
+                return queue[0]
+            heapq.heappop(queue)
+        return None
+    
+    def _next_task(self) -> Optional[Tuple[str, str]]:
+        """Pick the highest-priority (agent_id, task_id) that can start now."""
+        best: Optional[Tuple[Tuple[int, int, str], str]] = None
+        for agent_id in set(self._queues) | set(self._steal_queues):
+            if not self._has_capacity(agent_id):
+                continue
+            head = self._queue_head(self._queues.get(agent_id, []))
+            if head is None:
+                stolen = self._queue_head(self._steal_queues.get(agent_id, []))
+                if stolen is not None:
+                    owner = self._tasks[stolen[2]].routing_result.agent_id
+                    if not self._has_capacity(owner):
+                        head = stolen
+            if head is not None and (best is None or head < best[0]):
+                best = (head, agent_id)
+        if best is None:
+            return None
+        return best[1], best[0][2]
+    
+    def _dispatch(self) -> None:
+        """Start as many queued tasks as the concurrency limits allow."""
+        if not self._started:
             return
-        
-        try:
-            # Update status
-            task.status = TaskStatus.RUNNING
+        self._route_pending()
+        while len(self._running_tasks) < self.config.max_concurrent_tasks:
+            picked = self._next_task()
+            if picked is None:
+                break
+            agent_id, task_id = picked
+            task = self._tasks[task_id]
+            routing_result = task.routing_result
+            if agent_id != routing_result.agent_id:
+                routing_result.routing_reason += f"; taken over from busy agent {routing_result.agent_id}"
+                routing_result.agent_id = agent_id
+            self._tasks.set_status(task, TaskStatus.RUNNING)
             task.started_at = datetime.utcnow()
-            
-            # Route to agent
-            routing_result = self.router.route(task.prompt)
-            task.routing_result = routing_result
-            
+            self._agent_load[agent_id] = self._agent_load.get(agent_id, 0) + 1
+            running = asyncio.create_task(self._execute_task(task, agent_id))
+            running.add_done_callback(lambda done, task=task, agent_id=agent_id: self._task_done(task, agent_id, done))
+            self._running_tasks[task_id] = running
+    
+    async def _execute_task(self, task: CoordinatedTask, agent_id: str) -> None:
+        """Execute a task on its assigned agent."""
+        task_id = task.task_id
+        try:
             # Get agent
-            agent = self.registry.get(routing_result.agent_id)
+            agent = self.registry.get(agent_id)
             if not agent:
-                raise RuntimeError(f"Agent not found: {routing_result.agent_id}")
+                raise RuntimeError(f"Agent not found: {agent_id}")
             
             # Create agent task
             agent_task = AgentTask(
@@ -291,8 +474,8 @@ class Coordinator:
             # Update result
             task.result = agent_task.result
             task.error = agent_task.error
-            task.status = TaskStatus.COMPLETED if not agent_task.error else TaskStatus.FAILED
             task.completed_at = datetime.utcnow()
+            self._tasks.set_status(task, TaskStatus.COMPLETED if not agent_task.error else TaskStatus.FAILED)
             
             # Notify callbacks
             for callback in self._result_callbacks:
@@ -307,11 +490,57 @@ class Coordinator:
             logger.info(f"Task {task_id} completed with status: {task.status.value}")
             
         except Exception as e:
-            task.status = TaskStatus.FAILED
             task.error = str(e)
             task.completed_at = datetime.utcnow()
+            self._tasks.set_status(task, TaskStatus.FAILED)
             logger.error(f"Task {task_id} failed: {e}")
     
+    def _task_done(self, task: CoordinatedTask, agent_id: str, running: asyncio.Task) -> None:
+        """Release the agent slot of a finished run and start more work."""
+        self._agent_load[agent_id] -= 1
+        if self._running_tasks.get(task.task_id) is running:
+            del self._running_tasks[task.task_id]
+        if task.status == TaskStatus.RUNNING:
+            # Cancelled by stop(), possibly before it started
+            task.completed_at = datetime.utcnow()
+            self._tasks.set_status(task, TaskStatus.CANCELLED)
+        self._finish(task)
+        self._dispatch()
+    
+    def _finish(self, task: CoordinatedTask) -> None:
+        """Wake waiters for a finished task and enforce retention."""
+        waiter = self._waiters.pop(task.task_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(task)
+        while self._tasks.finished_count > self.config.max_finished_tasks:
+            self._evict(self._tasks.oldest_finished())
+    
+    def _evict(self, task_id: str) -> None:
+        """Drop a finished task from memory, spilling it if configured."""
+        task = self._tasks.pop(task_id)
+        if not self.config.spill_path:
+            return
+        try:
+            path = Path(self.config.spill_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            line = json.dumps(task.to_dict(), default=str) + "\n"
+            with open(path, "ab") as f:
+                self._spilled[task_id] = f.tell()
+                f.write(line.encode("utf-8"))
+        except OSError as e:
+            self._spilled.pop(task_id, None)
+            logger.warning(f"Failed to spill task {task_id}: {e}")
+    
+    def _load_spilled(self, task_id: str) -> Optional[CoordinatedTask]:
+        """Read a spilled task back from disk."""
+        try:
+            with open(self.config.spill_path, "rb") as f:
+                f.seek(self._spilled[task_id])
+                return CoordinatedTask.from_dict(json.loads(f.readline()))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to load spilled task {task_id}: {e}")
+            return None
+    
     async def cancel_task(self, task_id: str) -> bool:
         """
         Cancel a task.
@@ -329,28 +558,29 @@ class Coordinator:
         if task.status not in (TaskStatus.PENDING, TaskStatus.RUNNING):
             return False
         
-        task.status = TaskStatus.CANCELLED
         task.completed_at = datetime.utcnow()
+        self._tasks.set_status(task, TaskStatus.CANCELLED)
         
         # Cancel asyncio task if running
         if task_id in self._running_tasks:
             self._running_tasks[task_id].cancel()
             del self._running_tasks[task_id]
         
+        self._finish(task)
         return True
     
     def get_stats(self) -> Dict[str, Any]:
         """Get coordinator statistics."""
-        tasks = list(self._tasks.values())
-        
         return {
-            "total_tasks": len(tasks),
-            "pending": len([t for t in tasks if t.status == TaskStatus.PENDING]),
-            "running": len([t for t in tasks if t.status == TaskStatus.RUNNING]),
-            "completed": len([t for t in tasks if t.status == TaskStatus.COMPLETED]),
-            "failed": len([t for t in tasks if t.status == TaskStatus.FAILED]),
-            "cancelled": len([t for t in tasks if t.status == TaskStatus.CANCELLED]),
-            "queue_size": self._task_queue.qsize(),
+            "total_tasks": len(self._tasks),
+            "pending": self._tasks.count(TaskStatus.PENDING),
+            "running": self._tasks.count(TaskStatus.RUNNING),
+            "completed": self._tasks.count(TaskStatus.COMPLETED),
+            "failed": self._tasks.count(TaskStatus.FAILED),
+            "cancelled": self._tasks.count(TaskStatus.CANCELLED),
+            "queue_size": self._tasks.count(TaskStatus.PENDING),
+            "spilled": len(self._spilled),
+            "agent_load": {agent_id: load for agent_id, load in self._agent_load.items() if load},
         }
     
     def clear_completed_tasks(self) -> int:
@@ -360,10 +590,7 @@ class Coordinator:
         Returns:
             Number of tasks removed
         """
-        to_remove = [
-            tid for tid, task in self._tasks.items()
-            if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
-        ]
+        to_remove = [task.task_id for task in self._tasks.with_status(*FINISHED_STATUSES)]
         
         for tid in to_remove:
             del self._tasks[tid]
@@ -428,27 +428,29 @@ class Session:
             "usage": message.usage,
         }
     
+    @staticmethod
+    def _message_from_dict(m: dict[str, Any]) -> Message:
+        """Create a message from its dictionary form."""
+        return Message(
+            id=m["id"],
+            role=MessageRole(m["role"]),
+            content=[
+                ContentBlock(
+                    type=b["type"],
+                    text=b.get("text"),
+                    tool_call_id=b.get("tool_call_id"),
+                )
+                for b in m["content"]
+            ],
+            created_at=datetime.fromisoformat(m["created_at"]),
+            model=m.get("model"),
+            usage=m.get("usage"),
+        )
+    
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Session":
         """Create a session from a dictionary."""
-        messages = [
-            Message(
-                id=m["id"],
-                role=MessageRole(m["role"]),
-                content=[
-                    ContentBlock(
-                        type=b["type"],
-                        text=b.get("text"),
-                        tool_call_id=b.get("tool_call_id"),
-                    )
-                    for b in m["content"]
-                ],
-                created_at=datetime.fromisoformat(m["created_at"]),
-                model=m.get("model"),
-                usage=m.get("usage"),
-            )
-            for m in data.get("messages", [])
-        ]
+        messages = [cls._message_from_dict(m) for m in data.get("messages", [])]
         
         summary_data = data.get("summary")
         summary = SessionSummary(
@@ -512,24 +514,27 @@ class SessionManager:
         
         Searches for files matching the session ID (can be full UUID or short ID).
         """
+        data = self._load_data(session_id)
+        return Session.from_dict(data) if data is not None else None
+    
+    def _load_data(self, session_id: str) -> Optional[dict[str, Any]]:
+        """Read a session's raw dictionary from disk."""
         import json
         
         # Try exact match first (for backward compatibility)
         session_file = self.sessions_dir / f"{session_id}.json"
         if session_file.exists():
             with open(session_file) as f:
-                data = json.load(f)
-            return Session.from_dict(data)
+                return json.load(f)
         
         # Search for files containing the session ID (new format)
         for f in self.sessions_dir.glob("*.json"):
             if session_id in f.stem:
                 with open(f) as fp:
                     data = json.load(fp)
-                session = Session.from_dict(data)
                 # Check if this is the right session
-                if session.id == session_id or session.id.startswith(session_id):
-                    return session
+                if data["id"] == session_id or data["id"].startswith(session_id):
+                    return data
         
         return None
     
@@ -612,6 +617,32 @@ class SessionManager:
         session = await self.load(session_id)
         return session.messages if session else []
     
+    async def get_messages_page(
+        self,
+        session_id: str,
+        limit: int = 50,
+        before: Optional[int] = None,
+    ) -> tuple[list[Message], int]:
+        """Get a page of a session's messages, oldest first.
+        
+        Only the requested messages are converted to Message objects, so
+        opening a long session does not build its whole history.
+        
+        Args:
+            session_id: Session to read
+            limit: Maximum number of messages
+            before: Index to end the page at (default: the newest message)
+        
+        Returns:
+            Tuple of (messages, offset), where offset is the index of the
+            first returned message; pass it as ``before`` for the page before.
+        """
+        data = self._load_data(session_id)
+        raw_messages = data.get("messages", []) if data else []
+        end = len(raw_messages) if before is None else max(0, min(before, len(raw_messages)))
+        start = max(0, end - limit)
+        return [Session._message_from_dict(m) for m in raw_messages[start:end]], start
+    
     async def add_message(
         self,
         session_id: str,
@@ -10,6 +10,7 @@ from .models import (
     CalibrationPolicy,
     CalibrationObjective,
     CalibrationStatus,
+    CalibrationSchedule,
     PromptSuiteEntry,
 )
 
@@ -19,5 +20,6 @@ __all__ = [
     "CalibrationPolicy",
     "CalibrationObjective",
     "CalibrationStatus",
+    "CalibrationSchedule",
     "PromptSuiteEntry",
 ]
@@ -10,9 +10,10 @@ import uuid
 import time
 import re
 import asyncio
+from dataclasses import replace
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Awaitable
 
 import yaml
 
@@ -21,10 +22,12 @@ from .models import (
     CalibrationPolicy,
     CalibrationObjective,
     CalibrationStatus,
+    CalibrationSchedule,
     PromptSuiteEntry,
     CalibrationRun,
     ModelCalibrationResult,
     RoutingRule,
+    relative_ci_width,
 )
 from ..ollama import OllamaClient
 from ..hardware import HardwareDetector
@@ -107,19 +110,31 @@ class CalibrationManager:
         objective: CalibrationObjective = CalibrationObjective.BALANCED,
         dry_run: bool = False,
         progress_callback: Optional[Callable[[str, int, int], None]] = None,
+        schedule: Optional[CalibrationSchedule] = None,
     ) -> CalibrationResult:
         """Run calibration on models.
         
+        Models are calibrated one at a time so the server never swaps
+        between them mid-run. Each model is warmed up first so load time
+        stays out of the measurements, then its prompts run concurrently up
+        to the server's parallelism, each repeated as the schedule allows.
+        
         Args:
             models: List of model names to calibrate.
             prompt_suite: List of prompts to run.
             objective: Calibration objective.
             dry_run: If True, don't actually run prompts.
-            progress_callback: Callback for progress updates.
+            progress_callback: Callback for progress updates, called as each
+                prompt starts with (model, completed prompts, total prompts).
+            schedule: Warm-up, repetition and concurrency settings.
             
         Returns:
             CalibrationResult with benchmark data.
         """
+        schedule = schedule or CalibrationSchedule()
+        if dry_run:
+            schedule = replace(schedule, warmup_runs=0, min_samples=1, max_samples=1)
+        
         calibration_id = str(uuid.uuid4())[:8]
         result = CalibrationResult(
             id=calibration_id,
@@ -133,31 +148,38 @@ class CalibrationManager:
         total_prompts = len(models) * len(prompt_suite)
         completed = 0
         
+        def report(model: str) -> None:
+            if progress_callback:
+                progress_callback(model, completed, total_prompts)
+        
         for model in models:
             model_result = ModelCalibrationResult(model=model)
+            run_prompt = self._dry_run_prompt if dry_run else self._run_prompt
             
-            for entry in prompt_suite:
-                if progress_callback:
-                    progress_callback(model, completed, total_prompts)
-                
-                if dry_run:
-                    # Simulate a run
-                    run = CalibrationRun(
-                        model=model,
-                        prompt=entry.prompt,
-                        task=entry.task,
-                        response="[DRY RUN - Simulated response]",
-                        tokens_per_second=50.0,
-                        total_time_seconds=1.0,
-                        tokens_generated=50,
-                        quality_score=80.0,
-                    )
-                else:
-                    # Actually run the prompt
-                    run = await self._run_prompt(model, entry)
-                
-                model_result.runs.append(run)
-                completed += 1
+            if prompt_suite:
+                for _ in range(schedule.warmup_runs):
+                    warmup = await run_prompt(model, prompt_suite[0])
+                    model_result.warmup_seconds += warmup.total_time_seconds
+            
+            deadline = (
+                time.monotonic() + schedule.budget_seconds
+                if schedule.budget_seconds is not None else None
+            )
+            slots = asyncio.Semaphore(self._concurrency(schedule))
+            
+            async def calibrate_prompt(entry: PromptSuiteEntry) -> list[CalibrationRun]:
+                nonlocal completed
+                async with slots:
+                    report(model)
+                    runs = await self._sample_prompt(model, entry, schedule, deadline, run_prompt)
+                    completed += 1
+                    return runs
+            
+            samples = await asyncio.gather(
+                *(calibrate_prompt(entry) for entry in prompt_suite)
+            )
+            for runs in samples:
+                model_result.runs.extend(runs)
             
             model_result.calculate_aggregates()
             result.model_results.append(model_result)
@@ -168,6 +190,70 @@ class CalibrationManager:
         
         return result
     
+    def _concurrency(self, schedule: CalibrationSchedule) -> int:
+        """Number of prompts to run at once against one model.
+        
+        Defaults to the server's ``OLLAMA_NUM_PARALLEL`` setting, which
+        Ollama leaves at one request per model unless configured.
+        """
+        if schedule.concurrency:
+            return max(1, schedule.concurrency)
+        try:
+            return max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", "1")))
+        except ValueError:
+            return 1
+    
+    async def _sample_prompt(
+        self,
+        model: str,
+        entry: PromptSuiteEntry,
+        schedule: CalibrationSchedule,
+        deadline: Optional[float],
+        run_prompt: Callable[[str, PromptSuiteEntry], Awaitable[CalibrationRun]],
+    ) -> list[CalibrationRun]:
+        """Repeat a prompt until its latency estimate is tight enough.
+        
+        Args:
+            model: Model name.
+            entry: Prompt suite entry.
+            schedule: Repetition settings.
+            deadline: Monotonic time after which no new samples start.
+            run_prompt: Coroutine function producing one run.
+            
+        Returns:
+            All runs for the prompt; sampling stops at the first error.
+        """
+        runs: list[CalibrationRun] = []
+        while True:
+            run = await run_prompt(model, entry)
+            runs.append(run)
+            if run.error is not None or len(runs) >= schedule.max_samples:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            if len(runs) >= schedule.min_samples and relative_ci_width(
+                [r.total_time_seconds for r in runs]
+            ) <= schedule.target_relative_ci:
+                break
+        return runs
+    
+    async def _dry_run_prompt(
+        self,
+        model: str,
+        entry: PromptSuiteEntry,
+    ) -> CalibrationRun:
+        """Simulate a prompt run without contacting the server."""
+        return CalibrationRun(
+            model=model,
+            prompt=entry.prompt,
+            task=entry.task,
+            response="[DRY RUN - Simulated response]",
+            tokens_per_second=50.0,
+            total_time_seconds=1.0,
+            tokens_generated=50,
+            quality_score=80.0,
+        )
+    
     async def _run_prompt(
         self,
         model: str,
@@ -190,10 +276,13 @@ class CalibrationManager:
         
         try:
             # Run the prompt
-            response = await self.ollama.generate(
-                model=model,
-                prompt=entry.prompt,
-                options={"num_ctx": 4096},
+            response = await asyncio.wait_for(
+                self.ollama.generate(
+                    model=model,
+                    prompt=entry.prompt,
+                    options={"num_ctx": 4096},
+                ),
+                timeout=entry.timeout_seconds,
             )
             
             run.response = response.content
@@ -201,6 +290,7 @@ class CalibrationManager:
             run.total_time_seconds = response.total_time_seconds
             run.prompt_eval_time = response.prompt_eval_duration / 1e9
             run.eval_time = response.eval_duration / 1e9
+            run.load_time = response.load_duration / 1e9
             run.tokens_generated = response.eval_count
             
             # Check quality
@@ -302,28 +392,21 @@ class CalibrationManager:
             calibration_id=result.id,
         )
         
-        # Group results by task
+        # Group results by task, averaging repeated samples per model
         task_results: dict[str, list[ModelCalibrationResult]] = {}
         
         for model_result in result.model_results:
+            runs_by_task: dict[str, list[CalibrationRun]] = {}
             for run in model_result.runs:
-                task = run.task
-                if task not in task_results:
-                    task_results[task] = []
-                
-                # Create a temporary result for this task
+                runs_by_task.setdefault(run.task, []).append(run)
+            
+            for task, runs in runs_by_task.items():
                 task_model_result = ModelCalibrationResult(
                     model=model_result.model,
-                    avg_tokens_per_second=run.tokens_per_second,
-                    avg_quality_score=run.quality_score,
-                    success_rate=1.0 if run.error is None else 0.0,
-                )
-                task_model_result.overall_score = (
-                    run.tokens_per_second * 0.4 +
-                    run.quality_score * 0.4 +
-                    (100 if run.error is None else 0) * 0.2
+                    runs=runs,
                 )
-                task_results[task].append(task_model_result)
+                task_model_result.calculate_aggregates()
+                task_results.setdefault(task, []).append(task_model_result)
         
         # Create rules for each task
         for task, results in task_results.items():
@@ -472,6 +555,9 @@ class CalibrationManager:
                 avg_tokens_per_second=mr_data.get("avg_tokens_per_second", 0),
                 avg_quality_score=mr_data.get("avg_quality_score", 0),
                 avg_total_time=mr_data.get("avg_total_time", 0),
+                p50_latency=mr_data.get("p50_latency", 0),
+                p95_latency=mr_data.get("p95_latency", 0),
+                warmup_seconds=mr_data.get("warmup_seconds", 0),
                 success_rate=mr_data.get("success_rate", 0),
                 overall_score=mr_data.get("overall_score", 0),
             )
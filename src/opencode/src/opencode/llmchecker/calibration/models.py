@@ -2,12 +2,66 @@
 Data models for calibration system.
 """
 
+import math
+import statistics
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional, Any
 from datetime import datetime
 
 
+# Two-sided 95% Student t critical values by degrees of freedom. Untabulated
+# degrees of freedom use the next smaller entry, whose value is larger, so
+# the interval is never narrower than the true one
+_T_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571,
+    6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228,
+    11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
+    16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086,
+    21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060,
+    26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042,
+    40: 2.021, 60: 2.000, 120: 1.980,
+}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Compute a percentile with linear interpolation.
+    
+    Args:
+        values: Sample values.
+        pct: Percentile between 0 and 100.
+        
+    Returns:
+        The percentile, or 0.0 for an empty sample.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def relative_ci_width(values: list[float]) -> float:
+    """Half-width of the 95% confidence interval of the mean, relative to the mean.
+    
+    Args:
+        values: Sample values.
+        
+    Returns:
+        Relative half-width, or infinity when it cannot be estimated.
+    """
+    if len(values) < 2:
+        return math.inf
+    mean = statistics.fmean(values)
+    if mean <= 0:
+        return math.inf
+    df = len(values) - 1
+    t = _T_95[max(k for k in _T_95 if k <= df)]
+    return t * statistics.stdev(values) / math.sqrt(len(values)) / mean
+
+
 class CalibrationObjective(Enum):
     """Calibration objective types."""
     SPEED = "speed"
@@ -44,6 +98,23 @@ class PromptSuiteEntry:
         }
 
 
+@dataclass
+class CalibrationSchedule:
+    """How calibration samples are collected for each model.
+    
+    Each model gets warm-up requests that are not measured, then every
+    prompt is repeated until the 95% confidence interval of its latency is
+    within ``target_relative_ci`` of the mean, ``max_samples`` is reached
+    or the model's time budget runs out.
+    """
+    warmup_runs: int = 1
+    min_samples: int = 3
+    max_samples: int = 10
+    target_relative_ci: float = 0.1
+    budget_seconds: Optional[float] = None  # Per model, None for no limit
+    concurrency: Optional[int] = None  # None uses the server's parallelism
+
+
 @dataclass
 class CalibrationRun:
     """Result of a single calibration run."""
@@ -55,6 +126,7 @@ class CalibrationRun:
     total_time_seconds: float = 0.0
     prompt_eval_time: float = 0.0
     eval_time: float = 0.0
+    load_time: float = 0.0
     tokens_generated: int = 0
     quality_score: float = 0.0
     quality_passed: bool = True
@@ -83,6 +155,9 @@ class ModelCalibrationResult:
     avg_tokens_per_second: float = 0.0
     avg_quality_score: float = 0.0
     avg_total_time: float = 0.0
+    p50_latency: float = 0.0
+    p95_latency: float = 0.0
+    warmup_seconds: float = 0.0
     success_rate: float = 0.0
     overall_score: float = 0.0
     
@@ -100,9 +175,10 @@ class ModelCalibrationResult:
             self.avg_quality_score = sum(
                 r.quality_score for r in successful_runs
             ) / len(successful_runs)
-            self.avg_total_time = sum(
-                r.total_time_seconds for r in successful_runs
-            ) / len(successful_runs)
+            latencies = [r.total_time_seconds for r in successful_runs]
+            self.avg_total_time = sum(latencies) / len(latencies)
+            self.p50_latency = percentile(latencies, 50)
+            self.p95_latency = percentile(latencies, 95)
         
         self.success_rate = len(successful_runs) / len(self.runs)
         
@@ -121,6 +197,9 @@ class ModelCalibrationResult:
             "avg_tokens_per_second": round(self.avg_tokens_per_second, 2),
             "avg_quality_score": round(self.avg_quality_score, 2),
             "avg_total_time": round(self.avg_total_time, 3),
+            "p50_latency": round(self.p50_latency, 3),
+            "p95_latency": round(self.p95_latency, 3),
+            "warmup_seconds": round(self.warmup_seconds, 3),
             "success_rate": round(self.success_rate, 2),
             "overall_score": round(self.overall_score, 2),
         }
@@ -8,13 +8,13 @@ with MCP servers via stdio transport.
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 import shutil
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
+from opencode.mcp.framing import CONTENT_LENGTH, MAX_FRAME_SIZE, FramingError, encode_frame, read_frame
 from opencode.mcp.types import (
     JSONRPCNotification,
     JSONRPCRequest,
@@ -38,6 +38,8 @@ class MCPServerConfig:
     env: dict[str, str] = field(default_factory=dict)
     cwd: Optional[Path] = None
     timeout: int = 30  # seconds
+    framing: str = CONTENT_LENGTH  # or "newline" for newline-delimited JSON
+    batch: bool = False  # send JSON-RPC batch arrays (servers before 2025-06-18)
     
     @classmethod
     def from_dict(cls, name: str, data: dict) -> MCPServerConfig:
@@ -48,6 +50,8 @@ class MCPServerConfig:
             env=data.get("env", {}),
             cwd=Path(data["cwd"]) if data.get("cwd") else None,
             timeout=data.get("timeout", 30),
+            framing=data.get("framing", CONTENT_LENGTH),
+            batch=data.get("batch", False),
         )
 
 
@@ -69,6 +73,8 @@ class MCPServer:
     _pending_requests: dict[int, asyncio.Future] = field(default_factory=dict)
     _reader_task: Optional[asyncio.Task] = None
     _initialized: bool = False
+    _stale_lists: set[str] = field(default_factory=set)
+    _refresh_tasks: dict[str, asyncio.Task] = field(default_factory=dict)
     
     async def start(self) -> bool:
         """Start the MCP server process."""
@@ -93,6 +99,7 @@ class MCPServer:
                 stderr=asyncio.subprocess.PIPE,
                 env=env,
                 cwd=self.config.cwd,
+                limit=MAX_FRAME_SIZE,
             )
             
             # Start reader task
@@ -109,6 +116,10 @@ class MCPServer:
     
     async def stop(self) -> None:
         """Stop the MCP server process."""
+        for task in self._refresh_tasks.values():
+            task.cancel()
+        self._refresh_tasks.clear()
+        
         if self._reader_task:
             self._reader_task.cancel()
             try:
@@ -142,36 +153,112 @@ class MCPServer:
             # Send initialized notification
             await self._send_notification("notifications/initialized", {})
             
-            # Load capabilities
-            if self.server_info.capabilities.tools:
-                await self._load_tools()
-            if self.server_info.capabilities.resources:
-                await self._load_resources()
-            if self.server_info.capabilities.prompts:
-                await self._load_prompts()
+            # Load capabilities, all in one round trip
+            capabilities = self.server_info.capabilities
+            kinds = [
+                kind for kind, supported in (
+                    ("tools", capabilities.tools),
+                    ("resources", capabilities.resources),
+                    ("prompts", capabilities.prompts),
+                ) if supported
+            ]
+            responses = await self._send_batch([(f"{kind}/list", {}) for kind in kinds])
+            for kind, list_response in zip(kinds, responses):
+                self._apply_list(kind, list_response)
             
             self._initialized = True
     
-    async def _load_tools(self) -> None:
+    async def _load_tools(self) -> bool:
         """Load available tools from the server."""
-        response = await self._send_request("tools/list", {})
-        if response and "result" in response:
-            tools_data = response["result"].get("tools", [])
-            self.tools = [MCPTool.from_dict(t) for t in tools_data]
+        return self._apply_list("tools", await self._send_request("tools/list", {}))
     
-    async def _load_resources(self) -> None:
+    async def _load_resources(self) -> bool:
         """Load available resources from the server."""
-        response = await self._send_request("resources/list", {})
-        if response and "result" in response:
-            resources_data = response["result"].get("resources", [])
-            self.resources = [MCPResource.from_dict(r) for r in resources_data]
+        return self._apply_list("resources", await self._send_request("resources/list", {}))
     
-    async def _load_prompts(self) -> None:
+    async def _load_prompts(self) -> bool:
         """Load available prompts from the server."""
-        response = await self._send_request("prompts/list", {})
-        if response and "result" in response:
-            prompts_data = response["result"].get("prompts", [])
-            self.prompts = [MCPPrompt.from_dict(p) for p in prompts_data]
+        return self._apply_list("prompts", await self._send_request("prompts/list", {}))
+    
+    def _apply_list(self, kind: str, response: Optional[dict]) -> bool:
+        """Store a tools/resources/prompts list response; False if it failed."""
+        if not response or "result" not in response:
+            return False
+        items = response["result"].get(kind, [])
+        parser = {"tools": MCPTool, "resources": MCPResource, "prompts": MCPPrompt}[kind]
+        setattr(self, kind, [parser.from_dict(item) for item in items])
+        return True
+    
+    async def list_tools(self) -> list[MCPTool]:
+        """Get the server's tools, refetching only after a list_changed notification."""
+        await self._ensure_list("tools")
+        return self.tools
+    
+    async def list_resources(self) -> list[MCPResource]:
+        """Get the server's resources, refetching only after a list_changed notification."""
+        await self._ensure_list("resources")
+        return self.resources
+    
+    async def list_prompts(self) -> list[MCPPrompt]:
+        """Get the server's prompts, refetching only after a list_changed notification."""
+        await self._ensure_list("prompts")
+        return self.prompts
+    
+    async def _ensure_list(self, kind: str) -> None:
+        """Wait for a stale or refreshing list to be refetched."""
+        task = self._refresh_tasks.get(kind)
+        if (task is None or task.done()) and kind in self._stale_lists:
+            task = self._start_refresh(kind)
+        if task is not None and not task.done():
+            # Shielded so a cancelled caller does not abort the shared refresh
+            await asyncio.shield(task)
+    
+    def _invalidate_list(self, kind: str) -> None:
+        """Mark a cached list stale and refetch it in the background."""
+        self._stale_lists.add(kind)
+        task = self._refresh_tasks.get(kind)
+        # A refresh in flight is never cancelled: callers may be waiting on
+        # it, and it fetches again when it sees the list went stale meanwhile
+        if task is None or task.done():
+            # The reader task delivers the response, so it must not await this
+            self._start_refresh(kind)
+    
+    def _start_refresh(self, kind: str) -> asyncio.Task:
+        """Start the background refresh of a list."""
+        task = asyncio.ensure_future(self._refresh_list(kind))
+        self._refresh_tasks[kind] = task
+        return task
+    
+    async def _refresh_list(self, kind: str) -> None:
+        """Refetch a list until no list_changed arrived during the fetch."""
+        while kind in self._stale_lists:
+            self._stale_lists.discard(kind)
+            try:
+                loaded = await getattr(self, f"_load_{kind}")()
+            except BaseException:
+                self._stale_lists.add(kind)
+                raise
+            if not loaded:
+                # Try again on the next request rather than spinning
+                self._stale_lists.add(kind)
+                return
+    
+    def _next_request(self, method: str, params: Optional[dict]) -> tuple[dict, asyncio.Future]:
+        """Allocate an id and response future for a request."""
+        self._request_id += 1
+        request = JSONRPCRequest(
+            id=self._request_id,
+            method=method,
+            params=params,
+        )
+        future: asyncio.Future[Optional[dict]] = asyncio.get_running_loop().create_future()
+        self._pending_requests[self._request_id] = future
+        return request.to_dict(), future
+    
+    async def _write(self, message: Any) -> None:
+        """Write one framed message or batch."""
+        self.process.stdin.write(encode_frame(message, self.config.framing))
+        await self.process.stdin.drain()
     
     async def _send_request(
         self,
@@ -182,33 +269,21 @@ class MCPServer:
         if not self.process or not self.process.stdin:
             return None
         
-        self._request_id += 1
-        request_id = self._request_id
-        
-        request = JSONRPCRequest(
-            id=request_id,
-            method=method,
-            params=params,
-        )
-        
-        # Create future for response
-        loop = asyncio.get_event_loop()
-        future: asyncio.Future[Optional[dict]] = loop.create_future()
-        self._pending_requests[request_id] = future
-        
-        # Send request
-        content = json.dumps(request.to_dict())
-        message = f"Content-Length: {len(content)}\r\n\r\n{content}"
+        request, future = self._next_request(method, params)
+        request_id = request["id"]
         
         try:
-            self.process.stdin.write(message.encode())
-            await self.process.stdin.drain()
+            await self._write(request)
             
             # Wait for response with timeout
             return await asyncio.wait_for(future, timeout=self.config.timeout)
         
         except asyncio.TimeoutError:
             self._pending_requests.pop(request_id, None)
+            await self._send_notification("notifications/cancelled", {
+                "requestId": request_id,
+                "reason": "timeout",
+            })
             return None
         
         except Exception as e:
@@ -216,6 +291,48 @@ class MCPServer:
             print(f"MCP request error: {e}")
             return None
     
+    async def _send_batch(
+        self,
+        calls: list[tuple[str, Optional[dict]]],
+    ) -> list[Optional[dict]]:
+        """
+        Send several requests and wait for all responses.
+        
+        With ``config.batch`` the requests go out as one JSON-RPC batch
+        array; otherwise they are pipelined individually.
+        
+        Args:
+            calls: (method, params) pairs
+            
+        Returns:
+            Responses in call order, None for any that failed or timed out
+        """
+        if not calls:
+            return []
+        if not self.config.batch or len(calls) == 1:
+            return list(await asyncio.gather(
+                *(self._send_request(method, params) for method, params in calls)
+            ))
+        if not self.process or not self.process.stdin:
+            return [None] * len(calls)
+        
+        requests, futures = zip(*(self._next_request(method, params) for method, params in calls))
+        try:
+            await self._write(list(requests))
+            await asyncio.wait(futures, timeout=self.config.timeout)
+        except Exception as e:
+            print(f"MCP batch request error: {e}")
+        
+        responses = []
+        for request, future in zip(requests, futures):
+            if future.done() and not future.cancelled():
+                responses.append(future.result())
+            else:
+                self._pending_requests.pop(request["id"], None)
+                future.cancel()
+                responses.append(None)
+        return responses
+    
     async def _send_notification(
         self,
         method: str,
@@ -230,12 +347,8 @@ class MCPServer:
             params=params,
         )
         
-        content = json.dumps(notification.to_dict())
-        message = f"Content-Length: {len(content)}\r\n\r\n{content}"
-        
         try:
-            self.process.stdin.write(message.encode())
-            await self.process.stdin.drain()
+            await self._write(notification.to_dict())
         except Exception:
             pass
     
@@ -246,51 +359,59 @@ class MCPServer:
         
         try:
             while True:
-                # Read headers
-                headers = {}
-                while True:
-                    line = await self.process.stdout.readline()
-                    if not line:
-                        return
-                    if line == b"\r\n":
-                        break
-                    try:
-                        header = line.decode().strip()
-                        if ": " in header:
-                            key, value = header.split(": ", 1)
-                            headers[key] = value
-                    except Exception:
-                        continue
-                
-                # Read content
-                content_length = int(headers.get("Content-Length", 0))
-                if content_length <= 0:
-                    continue
-                
-                content = await self.process.stdout.read(content_length)
-                
                 try:
-                    data = json.loads(content)
-                    
-                    # Handle response
-                    if "id" in data:
-                        request_id = data["id"]
-                        if request_id in self._pending_requests:
-                            future = self._pending_requests.pop(request_id)
-                            if not future.done():
-                                future.set_result(data)
-                    
-                    # Handle notification
-                    elif "method" in data:
-                        await self._handle_notification(data)
-                
-                except json.JSONDecodeError:
+                    data = await read_frame(self.process.stdout)
+                except FramingError as e:
+                    print(f"MCP framing error: {e}")
                     continue
+                if data is None:
+                    break
+                
+                # A batch response is an array of responses
+                for message in data if isinstance(data, list) else [data]:
+                    if isinstance(message, dict):
+                        await self._dispatch_message(message)
         
         except asyncio.CancelledError:
             raise
         except Exception as e:
             print(f"MCP reader error: {e}")
+        finally:
+            # Fail outstanding requests now rather than at their timeout
+            for future in self._pending_requests.values():
+                if not future.done():
+                    future.set_result(None)
+            self._pending_requests.clear()
+    
+    async def _dispatch_message(self, data: dict) -> None:
+        """Route a response, server request or notification."""
+        if "method" in data and "id" in data:
+            asyncio.ensure_future(self._handle_server_request(data))
+        
+        # Handle response
+        elif "id" in data:
+            future = self._pending_requests.pop(data["id"], None)
+            if future and not future.done():
+                future.set_result(data)
+        
+        # Handle notification
+        elif "method" in data:
+            await self._handle_notification(data)
+    
+    async def _handle_server_request(self, data: dict) -> None:
+        """Answer a request initiated by the server."""
+        if data["method"] == "ping":
+            response = {"jsonrpc": "2.0", "id": data["id"], "result": {}}
+        else:
+            response = {
+                "jsonrpc": "2.0",
+                "id": data["id"],
+                "error": {"code": -32601, "message": f"Method not found: {data['method']}"},
+            }
+        try:
+            await self._write(response)
+        except Exception:
+            pass
     
     async def _handle_notification(self, data: dict) -> None:
         """Handle a notification from the server."""
@@ -306,15 +427,15 @@ class MCPServer:
         
         # Handle tool list changes
         elif method == "notifications/tools/list_changed":
-            await self._load_tools()
+            self._invalidate_list("tools")
         
         # Handle resource list changes
         elif method == "notifications/resources/list_changed":
-            await self._load_resources()
+            self._invalidate_list("resources")
         
         # Handle prompt list changes
         elif method == "notifications/prompts/list_changed":
-            await self._load_prompts()
+            self._invalidate_list("prompts")
     
     async def call_tool(
         self,
@@ -0,0 +1,93 @@
+"""
+JSON-RPC message framing for MCP stdio connections.
+
+Two framings are in use by MCP servers: LSP-style ``Content-Length``
+headers and newline-delimited JSON. Writers pick one explicitly; the
+reader accepts either, so a client can talk to both kinds of server.
+Payloads are handled as bytes end to end, so header lengths are exact
+for non-ASCII content.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Optional
+
+CONTENT_LENGTH = "content-length"
+NEWLINE = "newline"
+
+# Largest single frame accepted; also the stream buffer limit needed for
+# newline-delimited frames
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+
+class FramingError(Exception):
+    """Raised when a frame cannot be parsed."""
+
+
+def encode_frame(message: Any, framing: str = CONTENT_LENGTH) -> bytes:
+    """
+    Serialize a JSON-RPC message or batch into a single frame.
+
+    Args:
+        message: A message dict or a list of them (a batch)
+        framing: CONTENT_LENGTH or NEWLINE
+
+    Returns:
+        The framed bytes, ready for one write call
+    """
+    body = json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if framing == NEWLINE:
+        return body + b"\n"
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+async def read_frame(reader: asyncio.StreamReader, max_size: int = MAX_FRAME_SIZE) -> Optional[Any]:
+    """
+    Read and decode the next frame in either framing.
+
+    Args:
+        reader: Stream to read from
+        max_size: Largest Content-Length accepted
+
+    Returns:
+        The decoded message or batch, or None at end of stream
+
+    Raises:
+        FramingError: If the headers or JSON body are malformed
+    """
+    try:
+        line = await reader.readline()
+        while line and not line.strip():
+            line = await reader.readline()
+        if not line:
+            return None
+
+        stripped = line.lstrip()
+        if stripped[:1] in (b"{", b"["):
+            body = line
+        else:
+            content_length = None
+            while line.strip():
+                name, sep, value = line.partition(b":")
+                if sep and name.strip().lower() == b"content-length":
+                    try:
+                        content_length = int(value.strip())
+                    except ValueError:
+                        raise FramingError(f"Invalid Content-Length: {value.strip()!r}")
+                line = await reader.readline()
+                if not line:
+                    return None
+            if content_length is None:
+                raise FramingError("Missing Content-Length header")
+            if content_length > max_size:
+                raise FramingError(f"Frame of {content_length} bytes exceeds limit of {max_size}")
+            body = await reader.readexactly(content_length)
+    except asyncio.IncompleteReadError:
+        return None
+
+    try:
+        return json.loads(body)
+    except json.JSONDecodeError as e:
+        raise FramingError(f"Invalid JSON frame: {e}")
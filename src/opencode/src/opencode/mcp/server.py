@@ -7,13 +7,20 @@ to other MCP clients like Claude Desktop, Cursor, or other AI applications.
 
 import asyncio
 import json
+import logging
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Optional, Union
 
 from opencode.tool import get_registry
 from opencode.tool.base import Tool
 
+logger = logging.getLogger(__name__)
+
+# Largest single JSON-RPC frame accepted on any transport
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
 
 @dataclass
 class MCPServerConfig:
@@ -23,6 +30,7 @@ class MCPServerConfig:
     transport: str = "stdio"  # stdio, tcp, websocket
     host: str = "localhost"
     port: int = 3000
+    max_concurrent_requests: int = 16  # per connection
 
 
 class MCPServer:
@@ -68,41 +76,44 @@ class MCPServer:
     
     async def _run_stdio(self) -> None:
         """Run the MCP server using stdio transport."""
-        while self._running:
-            try:
-                # Read line from stdin
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, input
-                )
-                if not line:
-                    continue
-                
-                # Parse JSON-RPC request
-                try:
-                    request = json.loads(line)
-                except json.JSONDecodeError:
-                    await self._send_error(-32700, "Parse error")
-                    continue
-                
-                # Handle request
-                response = await self._handle_request(request)
-                
-                # Send response
-                print(json.dumps(response), flush=True)
+        receive, send = await self._open_stdio()
+        await self._serve_connection(receive, send)
+    
+    async def _open_stdio(self) -> tuple[Callable[[], Awaitable[Optional[bytes]]], Callable[[Any], Awaitable[None]]]:
+        """Wrap stdin/stdout in asyncio streams, falling back to blocking IO for regular files."""
+        loop = asyncio.get_running_loop()
+        
+        try:
+            reader = asyncio.StreamReader(limit=MAX_FRAME_SIZE)
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
             
-            except EOFError:
-                break
-            except Exception as e:
-                await self._send_error(-32603, f"Internal error: {e}")
+            async def receive() -> Optional[bytes]:
+                return await reader.readline() or None
+        except (ValueError, OSError):
+            # Pipe transports reject regular files, e.g. "opencode mcp < requests.jsonl"
+            async def receive() -> Optional[bytes]:
+                return await loop.run_in_executor(None, sys.stdin.buffer.readline) or None
+        
+        try:
+            transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+            writer = asyncio.StreamWriter(transport, protocol, None, loop)
+            
+            async def send(message: Any) -> None:
+                writer.write(json.dumps(message).encode() + b"\n")
+                await writer.drain()
+        except (ValueError, OSError):
+            async def send(message: Any) -> None:
+                print(json.dumps(message), flush=True)
+        
+        return receive, send
     
     async def _run_tcp(self) -> None:
         """Run the MCP server using TCP transport."""
-        import socket
-        
         server = await asyncio.start_server(
             self._handle_tcp_client,
             self.config.host,
             self.config.port,
+            limit=MAX_FRAME_SIZE,
         )
         
         async with server:
@@ -112,32 +123,165 @@ class MCPServer:
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ) -> None:
         """Handle a TCP client connection."""
-        addr = writer.get_extra_info('peername')
+        async def receive() -> Optional[bytes]:
+            return await reader.readline() or None
+        
+        async def send(message: Any) -> None:
+            writer.write(json.dumps(message).encode() + b"\n")
+            await writer.drain()
+        
+        try:
+            await self._serve_connection(receive, send)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def _run_websocket(self) -> None:
+        """Run the MCP server using WebSocket transport."""
+        try:
+            from websockets.asyncio.server import serve
+        except ImportError:
+            try:
+                # websockets < 13
+                from websockets import serve
+            except ImportError:
+                raise ImportError(
+                    "WebSocket transport requires the websockets package. "
+                    "Install it with: pip install websockets"
+                )
+        
+        async with serve(
+            self._handle_websocket_client,
+            self.config.host,
+            self.config.port,
+            max_size=MAX_FRAME_SIZE,
+        ):
+            await asyncio.get_running_loop().create_future()
+    
+    async def _handle_websocket_client(self, websocket: Any) -> None:
+        """Handle a WebSocket client connection. Each text message is one JSON-RPC frame."""
+        from websockets.exceptions import ConnectionClosed
+        
+        async def receive() -> Optional[str]:
+            try:
+                return await websocket.recv()
+            except ConnectionClosed:
+                return None
         
-        while self._running:
+        async def send(message: Any) -> None:
             try:
-                data = await reader.readline()
-                if not data:
+                await websocket.send(json.dumps(message))
+            except ConnectionClosed as e:
+                raise ConnectionError(str(e)) from e
+        
+        await self._serve_connection(receive, send)
+    
+    async def _serve_connection(
+        self,
+        receive: Callable[[], Awaitable[Optional[Union[str, bytes]]]],
+        send: Callable[[Any], Awaitable[None]],
+    ) -> None:
+        """
+        Read frames from a connection and dispatch them concurrently.
+        
+        Frames are read continuously and up to
+        ``config.max_concurrent_requests`` of them are handled at once;
+        the rest wait for a free slot. Responses are written as they
+        complete and carry the request id, so a slow tools/call does not
+        hold up other requests. ``notifications/cancelled`` cancels a
+        running or waiting request by id.
+        
+        Args:
+            receive: Returns the next frame, or None when the peer is gone
+            send: Writes one JSON-RPC message or batch
+        """
+        limit = asyncio.Semaphore(max(1, self.config.max_concurrent_requests))
+        in_flight: dict[Any, asyncio.Task] = {}
+        tasks: set[asyncio.Task] = set()
+        
+        def on_done(task: asyncio.Task, request_id: Any) -> None:
+            tasks.discard(task)
+            if request_id is not None and in_flight.get(request_id) is task:
+                del in_flight[request_id]
+        
+        finished = False
+        try:
+            while self._running:
+                frame = await receive()
+                if frame is None:
                     break
+                if not frame.strip():
+                    continue
                 
-                request = json.loads(data.decode())
-                response = await self._handle_request(request)
-                writer.write(json.dumps(response).encode() + b"\n")
-                await writer.drain()
-            
-            except Exception as e:
-                error_response = self._make_error_response(-32603, str(e))
-                writer.write(json.dumps(error_response).encode() + b"\n")
-                await writer.drain()
+                try:
+                    message = json.loads(frame)
+                except json.JSONDecodeError:
+                    await self._send_error(send, -32700, "Parse error")
+                    continue
+                
+                if isinstance(message, dict) and message.get("method") == "notifications/cancelled":
+                    task = in_flight.get((message.get("params") or {}).get("requestId"))
+                    if task:
+                        task.cancel()
+                    continue
+                
+                task = asyncio.create_task(self._dispatch(message, send, limit))
+                request_id = message.get("id") if isinstance(message, dict) else None
+                if request_id is not None:
+                    in_flight[request_id] = task
+                tasks.add(task)
+                task.add_done_callback(lambda t, request_id=request_id: on_done(t, request_id))
+            finished = True
+        finally:
+            # Let requests the peer already sent finish on a clean EOF
+            if not finished:
+                for task in tasks:
+                    task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _dispatch(
+        self,
+        message: Any,
+        send: Callable[[Any], Awaitable[None]],
+        limit: asyncio.Semaphore,
+    ) -> None:
+        """Handle one request, notification or batch and write any response."""
+        async with limit:
+            await self._dispatch_message(message, send)
+    
+    async def _dispatch_message(self, message: Any, send: Callable[[Any], Awaitable[None]]) -> None:
+        if isinstance(message, list):
+            if not message:
+                await self._send_error(send, -32600, "Invalid Request")
+                return
+            responses = await asyncio.gather(*(self._dispatch_one(item) for item in message))
+            responses = [response for response in responses if response is not None]
+            if responses:
+                await self._send_quietly(send, responses)
+            return
         
-        writer.close()
-        await writer.wait_closed()
+        response = await self._dispatch_one(message)
+        if response is not None:
+            await self._send_quietly(send, response)
     
-    async def _run_websocket(self) -> None:
-        """Run the MCP server using WebSocket transport."""
-        # WebSocket implementation would require a library like websockets
-        # For now, this is a placeholder
-        raise NotImplementedError("WebSocket transport not yet implemented")
+    async def _dispatch_one(self, message: Any) -> Optional[dict[str, Any]]:
+        """Handle a single message; notifications get no response."""
+        if not isinstance(message, dict) or "method" not in message:
+            return self._make_error_response(-32600, "Invalid Request")
+        response = await self._handle_request(message)
+        if "id" not in message:
+            return None
+        return response
+    
+    async def _send_quietly(self, send: Callable[[Any], Awaitable[None]], message: Any) -> None:
+        try:
+            await send(message)
+        except (ConnectionError, OSError) as e:
+            logger.debug(f"Dropping MCP response, peer disconnected: {e}")
     
     async def _handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
         """Handle a JSON-RPC request."""
@@ -236,10 +380,15 @@ class MCPServer:
             "id": request_id,
         }
     
-    async def _send_error(self, code: int, message: str) -> None:
-        """Send an error response to stdout."""
-        response = self._make_error_response(code, message)
-        print(json.dumps(response), flush=True)
+    async def _send_error(
+        self,
+        send: Callable[[Any], Awaitable[None]],
+        code: int,
+        message: str,
+        request_id: Any = None,
+    ) -> None:
+        """Send an error response on a connection."""
+        await self._send_quietly(send, self._make_error_response(code, message, request_id))
 
 
 async def run_mcp_server(
@@ -260,11 +260,16 @@ class MCPCapabilities:
     
     @classmethod
     def from_dict(cls, data: dict) -> MCPCapabilities:
+        # Servers advertise a capability by including its key, e.g. "tools": {}
+        def supported(name: str) -> bool:
+            value = data.get(name)
+            return isinstance(value, dict) and value.get("supported", True) is not False
+        
         return cls(
-            tools=data.get("tools", {}).get("supported", False),
-            resources=data.get("resources", {}).get("supported", False),
-            prompts=data.get("prompts", {}).get("supported", False),
-            logging=data.get("logging", {}).get("supported", False),
+            tools=supported("tools"),
+            resources=supported("resources"),
+            prompts=supported("prompts"),
+            logging=supported("logging"),
             experimental=data.get("experimental", {}),
         )
 
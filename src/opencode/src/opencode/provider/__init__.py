@@ -21,26 +21,6 @@ from opencode.provider.base import (
     ToolDefinition,
     Usage,
 )
-from opencode.provider.anthropic import AnthropicProvider
-from opencode.provider.google import GoogleProvider
-from opencode.provider.openai import OpenAIProvider
-
-# Extended providers
-from opencode.provider.azure import AzureOpenAIProvider
-from opencode.provider.bedrock import BedrockProvider
-from opencode.provider.cerebras import CerebrasProvider
-from opencode.provider.cohere import CohereProvider
-from opencode.provider.custom import CustomEndpointProvider
-from opencode.provider.deepinfra import DeepInfraProvider
-from opencode.provider.groq import GroqProvider
-from opencode.provider.lmstudio import LMStudioProvider
-from opencode.provider.mistral import MistralProvider
-from opencode.provider.ollama import OllamaProvider
-from opencode.provider.openrouter import OpenRouterProvider
-from opencode.provider.perplexity import PerplexityProvider
-from opencode.provider.together import TogetherProvider
-from opencode.provider.vercel import VercelGatewayProvider
-from opencode.provider.xai import XAIProvider
 
 __all__ = [
     # Base classes and types
@@ -79,3 +59,37 @@ __all__ = [
     "VercelGatewayProvider",
     "XAIProvider",
 ]
+
+# Provider implementations are imported on first access, since their SDKs
+# are slow to import
+_LAZY_ATTRIBUTES = {
+    "AnthropicProvider": ".anthropic:AnthropicProvider",
+    "GoogleProvider": ".google:GoogleProvider",
+    "OpenAIProvider": ".openai:OpenAIProvider",
+    # Extended providers
+    "AzureOpenAIProvider": ".azure:AzureOpenAIProvider",
+    "BedrockProvider": ".bedrock:BedrockProvider",
+    "CerebrasProvider": ".cerebras:CerebrasProvider",
+    "CohereProvider": ".cohere:CohereProvider",
+    "CustomEndpointProvider": ".custom:CustomEndpointProvider",
+    "DeepInfraProvider": ".deepinfra:DeepInfraProvider",
+    "GroqProvider": ".groq:GroqProvider",
+    "LMStudioProvider": ".lmstudio:LMStudioProvider",
+    "MistralProvider": ".mistral:MistralProvider",
+    "OllamaProvider": ".ollama:OllamaProvider",
+    "OpenRouterProvider": ".openrouter:OpenRouterProvider",
+    "PerplexityProvider": ".perplexity:PerplexityProvider",
+    "TogetherProvider": ".together:TogetherProvider",
+    "VercelGatewayProvider": ".vercel:VercelGatewayProvider",
+    "XAIProvider": ".xai:XAIProvider",
+}
+
+
+def __getattr__(name: str):
+    """Lazily import provider implementations on first access."""
+    if name in _LAZY_ATTRIBUTES:
+        module_path, attribute = _LAZY_ATTRIBUTES[name].split(":")
+        import importlib
+        module = importlib.import_module(module_path, package=__name__)
+        return getattr(module, attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
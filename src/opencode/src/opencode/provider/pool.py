@@ -0,0 +1,179 @@
+"""
+Process-wide pool of reusable provider instances.
+
+Building a provider creates a new httpx.AsyncClient, and resolving its
+credentials loads the full Config. Callers that run repeatedly, such as
+workflow nodes inside loops or ensemble branches, share instances from
+this pool instead.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ProviderKey = Tuple[str, Optional[str], Optional[str]]
+
+
+class ProviderPool:
+    """
+    Registry of lazily created, reused provider instances.
+
+    Instances are keyed by (provider, base_url, credentials), with the
+    credentials stored only as a SHA-256 fingerprint. When new credentials
+    replace an instance for the same provider and endpoint, as after a key
+    rotation, the old instance is evicted and closed. The loaded Config is
+    cached as well so repeated lookups do not re-read config files; it is
+    reloaded after ``config_ttl`` seconds or as soon as the global config
+    file changes, so long-running processes pick up rotated keys.
+
+    Example:
+        pool = get_provider_pool()
+        provider = pool.get_or_create(
+            "openai",
+            lambda: OpenAIProvider(api_key=key),
+            credentials=key,
+        )
+        ...
+        await pool.close_all()
+    """
+
+    CONFIG_TTL_SECONDS = 60.0
+
+    def __init__(self, config_ttl: float = CONFIG_TTL_SECONDS) -> None:
+        self._instances: Dict[ProviderKey, Any] = {}
+        # Evicted providers waiting for close_all() when no loop was running
+        self._retired: List[Any] = []
+        self._closing: Set[asyncio.Task] = set()
+        self._config: Optional[Any] = None
+        self._config_loaded_at = 0.0
+        self._config_mtime: Optional[float] = None
+        self.config_ttl = config_ttl
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    @staticmethod
+    def make_key(
+        provider_name: str,
+        base_url: Optional[str] = None,
+        credentials: Optional[str] = None,
+    ) -> ProviderKey:
+        """Build the pool key for a provider configuration."""
+        fingerprint = hashlib.sha256(credentials.encode()).hexdigest() if credentials else None
+        return (provider_name, base_url, fingerprint)
+
+    @staticmethod
+    def _config_file_mtime() -> Optional[float]:
+        """Modification time of the global config file, if it exists."""
+        try:
+            return (Path.home() / ".config" / "opencode" / "config.toml").stat().st_mtime
+        except OSError:
+            return None
+
+    def get_config(self) -> Any:
+        """Get the loaded Config, reloading it when stale or edited."""
+        mtime = self._config_file_mtime()
+        if (
+            self._config is None
+            or time.monotonic() - self._config_loaded_at > self.config_ttl
+            or mtime != self._config_mtime
+        ):
+            from opencode.core.config import Config
+
+            self._config = Config.load()
+            self._config_loaded_at = time.monotonic()
+            self._config_mtime = mtime
+        return self._config
+
+    def get_or_create(
+        self,
+        provider_name: str,
+        factory: Callable[[], Optional[Any]],
+        base_url: Optional[str] = None,
+        credentials: Optional[str] = None,
+    ) -> Optional[Any]:
+        """
+        Get a pooled provider, creating it with factory if needed.
+
+        Args:
+            provider_name: Provider identifier (e.g. "openai")
+            factory: Callable that builds the provider
+            base_url: Endpoint the provider talks to
+            credentials: API key or other secret the provider uses
+
+        Returns:
+            Provider instance, or None if factory returned None
+        """
+        key = self.make_key(provider_name, base_url, credentials)
+        replaced: List[Any] = []
+        with self._lock:
+            provider = self._instances.get(key)
+            if provider is None:
+                provider = factory()
+                if provider is not None:
+                    # Credentials for this provider and endpoint changed
+                    for stale in [k for k in self._instances if k[:2] == key[:2]]:
+                        replaced.append(self._instances.pop(stale))
+                    self._instances[key] = provider
+                    logger.debug(f"Created pooled provider: {provider_name}")
+        if replaced:
+            logger.debug(f"Evicted {len(replaced)} pooled provider(s) with old credentials: {provider_name}")
+            self._close_later(replaced)
+        return provider
+
+    def _close_later(self, providers: List[Any]) -> None:
+        """Close evicted providers in the background, or at close_all()."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            with self._lock:
+                self._retired.extend(providers)
+            return
+        for provider in providers:
+            task = loop.create_task(self._close_provider(provider))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_provider(provider: Any) -> None:
+        """Close one provider, logging failures."""
+        close = getattr(provider, "close", None)
+        if close is None:
+            return
+        try:
+            await close()
+        except Exception as e:
+            logger.warning(f"Error closing provider: {e}")
+
+    def clear(self) -> None:
+        """Forget pooled providers and the cached Config without closing them."""
+        with self._lock:
+            self._instances.clear()
+            self._retired.clear()
+            self._config = None
+
+    async def close_all(self) -> None:
+        """Close every pooled provider and empty the pool."""
+        with self._lock:
+            providers = list(self._instances.values()) + self._retired
+            self._instances.clear()
+            self._retired = []
+            self._config = None
+
+        for provider in providers:
+            await self._close_provider(provider)
+
+
+_provider_pool = ProviderPool()
+
+
+def get_provider_pool() -> ProviderPool:
+    """Get the process-wide provider pool."""
+    return _provider_pool
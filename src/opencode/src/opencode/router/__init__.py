@@ -8,12 +8,14 @@ and quality/speed preferences.
 Key Components:
 - RouterEngine: Core routing engine
 - ModelProfiler: Model performance profiling
+- ProfileStore: Persistent profiles and live performance statistics
 - VRAMMonitor: GPU memory monitoring
 - SemanticCache: Caching for routing decisions
 """
 
 from opencode.router.engine import RouterEngine, RoutingResult
 from opencode.router.profiler import ModelProfiler, ModelProfile
+from opencode.router.profile_store import ProfileStore
 from opencode.router.config import RouterConfig
 from opencode.router.skills import SkillClassifier
 
@@ -22,6 +24,7 @@ __all__ = [
     "RoutingResult",
     "ModelProfiler",
     "ModelProfile",
+    "ProfileStore",
     "RouterConfig",
     "SkillClassifier",
 ]
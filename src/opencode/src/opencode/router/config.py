@@ -16,6 +16,12 @@ class QualityPreference(str, Enum):
     QUALITY = "quality"  # Prefer higher quality models
 
 
+class RoutingObjective(str, Enum):
+    """What to minimize among similarly capable models."""
+    LATENCY = "latency"  # Fastest predicted completion
+    COST = "cost"  # Cheapest model that meets the SLOs
+
+
 class PromptCategory(str, Enum):
     """Categories for prompt classification."""
     CODING = "coding"
@@ -64,12 +70,54 @@ class RouterConfig(BaseModel):
     
     # VRAM management
     vram_monitoring: bool = Field(default=True, description="Enable VRAM monitoring")
+    telemetry_interval_seconds: float = Field(
+        default=2.0,
+        description="Seconds between background GPU/CPU/RAM samples"
+    )
     auto_unload: bool = Field(default=True, description="Auto-unload models when VRAM is low")
     vram_threshold_percent: float = Field(
         default=90.0,
         description="VRAM usage threshold for auto-unload"
     )
     
+    # Load-aware routing
+    load_aware_routing: bool = Field(
+        default=True,
+        description="Pick among similarly scored models by predicted latency or cost"
+    )
+    routing_objective: RoutingObjective = Field(
+        default=RoutingObjective.LATENCY,
+        description="What to minimize among similarly capable models"
+    )
+    score_tolerance: float = Field(
+        default=0.05,
+        description="Models within this score of the best count as similarly capable"
+    )
+    latency_slo_ms: Optional[float] = Field(
+        default=None,
+        description="Target completion time; models predicted to miss it are avoided"
+    )
+    ttft_slo_ms: Optional[float] = Field(
+        default=None,
+        description="Target time to first token"
+    )
+    model_parallelism: int = Field(
+        default=1,
+        description="Requests each model serves concurrently before queueing"
+    )
+    default_latency_ms: float = Field(
+        default=2000.0,
+        description="Assumed latency of models with no profile or observations"
+    )
+    model_load_ms: float = Field(
+        default=5000.0,
+        description="Estimated time to load a model that is not in memory"
+    )
+    vram_eviction_penalty_ms: float = Field(
+        default=30000.0,
+        description="Extra cost of loading a model that does not fit in free VRAM"
+    )
+    
     # Caching
     cache_enabled: bool = Field(default=True, description="Enable routing cache")
     cache_max_size: int = Field(default=100, description="Maximum cache entries")
@@ -79,6 +127,18 @@ class RouterConfig(BaseModel):
     profiling_enabled: bool = Field(default=True, description="Enable model profiling")
     profile_on_startup: bool = Field(default=False, description="Profile models on startup")
     profiling_timeout_seconds: int = Field(default=90, description="Profiling timeout")
+    persist_profiles: bool = Field(
+        default=True,
+        description="Keep profiles and live statistics on disk across restarts"
+    )
+    profile_store_path: Optional[str] = Field(
+        default=None,
+        description="Profile store file (default: ~/.cache/opencode/router/profiles.json)"
+    )
+    profile_half_life_seconds: float = Field(
+        default=3600.0,
+        description="Half-life of live latency and speed statistics"
+    )
     
     # Model preferences by category
     category_models: Dict[str, str] = Field(
@@ -127,6 +187,7 @@ class ModelConfig(BaseModel):
     # Resource requirements
     vram_required_gb: Optional[float] = Field(default=None, description="VRAM required in GB")
     context_length: int = Field(default=4096, description="Maximum context length")
+    cost_per_1k_tokens: float = Field(default=0.0, description="Cost per 1K tokens")
     
     # Performance scores (0-1)
     speed_score: float = Field(default=0.5, description="Speed score")
@@ -7,9 +7,11 @@ Core routing engine for intelligent LLM model selection.
 import asyncio
 import hashlib
 import logging
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import json
 
 from opencode.router.config import (
@@ -18,9 +20,13 @@ from opencode.router.config import (
     PromptCategory,
     Complexity,
     QualityPreference,
+    RoutingObjective,
 )
 from opencode.router.skills import SkillClassifier, ClassificationResult
-from opencode.router.profiler import ModelProfiler, ModelProfile
+from opencode.router.profiler import ModelProfiler, ModelProfile, speed_score
+from opencode.router.profile_store import ProfileStore
+from opencode.router.telemetry import get_sampler
+from opencode.router.vram_monitor import VRAMMonitor
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +47,8 @@ class RoutingResult:
     alternatives: List[Tuple[str, float]] = field(default_factory=list)
     cached: bool = False
     profile: Optional[ModelProfile] = None
+    predicted_latency_ms: Optional[float] = None
+    classification: Optional[ClassificationResult] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -53,9 +61,35 @@ class RoutingResult:
             "reasoning": self.reasoning,
             "alternatives": self.alternatives,
             "cached": self.cached,
+            "predicted_latency_ms": self.predicted_latency_ms,
         }
 
 
+@dataclass
+class LoadEstimate:
+    """Predicted performance of a model given its current load."""
+    model_id: str
+    in_flight: int
+    latency_ms: float
+    time_to_first_token_ms: Optional[float]
+    needs_load: bool
+    fits_in_vram: Optional[bool] = None
+
+
+@dataclass
+class RequestTracker:
+    """Timing of one in-flight request, filled in by the caller."""
+    model_id: str
+    started_at: float = field(default_factory=time.monotonic)
+    first_token_at: Optional[float] = None
+    tokens_generated: int = 0
+    
+    def first_token(self) -> None:
+        """Mark the arrival of the first streamed token."""
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+
+
 class SemanticCache:
     """
     Simple semantic cache for routing decisions.
@@ -120,6 +154,7 @@ class RouterEngine:
         self,
         config: Optional[RouterConfig] = None,
         provider: Optional[Any] = None,
+        vram_monitor: Optional[VRAMMonitor] = None,
     ):
         """
         Initialize the router engine.
@@ -127,11 +162,21 @@ class RouterEngine:
         Args:
             config: Router configuration
             provider: LLM provider instance for model listing
+            vram_monitor: Monitor used to judge whether a model fits in VRAM
         """
         self.config = config or RouterConfig()
         self.provider = provider
+        self.vram_monitor = vram_monitor
         self.classifier = SkillClassifier()
-        self.profiler = ModelProfiler(timeout_seconds=self.config.profiling_timeout_seconds)
+        self.store = ProfileStore(
+            path=self.config.profile_store_path,
+            half_life_seconds=self.config.profile_half_life_seconds,
+            persist=self.config.persist_profiles,
+        )
+        self.profiler = ModelProfiler(
+            timeout_seconds=self.config.profiling_timeout_seconds,
+            store=self.store,
+        )
         self.cache = SemanticCache(
             max_size=self.config.cache_max_size,
             ttl_seconds=self.config.cache_ttl_seconds,
@@ -139,6 +184,7 @@ class RouterEngine:
         
         self._models: Dict[str, ModelConfig] = {}
         self._profiles: Dict[str, ModelProfile] = {}
+        self._in_flight: Dict[str, int] = {}
         self._initialized = False
     
     async def initialize(self) -> None:
@@ -164,7 +210,7 @@ class RouterEngine:
                         supports_streaming=model_info.supports_streaming,
                         context_length=model_info.context_length,
                     )
-                    self._models[model_info.id] = model_config
+                    self.register_model(model_config)
                     logger.debug(f"Discovered model: {model_info.id}")
         except Exception as e:
             logger.error(f"Failed to discover models: {e}")
@@ -206,6 +252,11 @@ class RouterEngine:
             cached = self.cache.get(prompt)
             if cached:
                 logger.debug(f"Cache hit for prompt")
+                if cached.classification is not None and self._is_saturated(cached.model_id):
+                    # Keep the cached classification but pick a less busy model
+                    result = await self._select_model(prompt, cached.classification, context)
+                    result.cached = True
+                    return result
                 return cached
         
         # Classify the prompt
@@ -268,6 +319,11 @@ class RouterEngine:
                 )
             return self._default_routing(prompt)
         
+        # Among similarly capable models, account for load
+        estimate: Optional[LoadEstimate] = None
+        if self.config.load_aware_routing:
+            candidates, estimate = await self._rank_by_load(candidates)
+        
         # Get best model
         best_model_id, best_score, best_reasoning = candidates[0]
         
@@ -283,7 +339,157 @@ class RouterEngine:
             reasoning=best_reasoning,
             alternatives=alternatives,
             profile=self._profiles.get(best_model_id),
+            predicted_latency_ms=estimate.latency_ms if estimate else None,
+            classification=classification,
+        )
+    
+    async def _rank_by_load(
+        self,
+        candidates: List[Tuple[str, float, str]],
+    ) -> Tuple[List[Tuple[str, float, str]], LoadEstimate]:
+        """
+        Move the best model for the current load to the front.
+        
+        Models scoring within ``score_tolerance`` of the best are treated
+        as equally capable; among those that are predicted to meet the SLOs
+        the one with the lowest predicted latency (or cost) wins. If none
+        does, any model meeting the SLOs is considered before giving up and
+        taking the fastest similar model.
+        
+        Args:
+            candidates: (model_id, score, reasoning) sorted by score
+            
+        Returns:
+            Tuple of (reordered candidates, estimate for the chosen model)
+        """
+        free_vram_mb = await self._free_vram_mb(candidates)
+        estimates = {
+            model_id: self.predict_load(model_id, free_vram_mb)
+            for model_id, _, _ in candidates
+        }
+        
+        best_score = candidates[0][1]
+        similar = [c for c in candidates if c[1] >= best_score - self.config.score_tolerance]
+        pool = [c for c in similar if self._meets_slo(estimates[c[0]])]
+        note = ""
+        if not pool:
+            pool = [c for c in candidates if self._meets_slo(estimates[c[0]])]
+            note = "; no similar model meets the SLO" if pool else "; SLO cannot be met"
+        if not pool:
+            pool = similar
+        
+        def cost_key(candidate: Tuple[str, float, str]) -> Tuple[float, ...]:
+            model_id, score, _ = candidate
+            latency = estimates[model_id].latency_ms
+            if self.config.routing_objective == RoutingObjective.COST:
+                return (self._models[model_id].cost_per_1k_tokens, latency, -score)
+            return (latency, -score)
+        
+        chosen = min(pool, key=cost_key)
+        estimate = estimates[chosen[0]]
+        reasoning = (
+            f"{chosen[2]}; predicted {estimate.latency_ms:.0f} ms "
+            f"with {estimate.in_flight} in flight{note}"
         )
+        if estimate.needs_load:
+            reasoning += "; needs load" if estimate.fits_in_vram is not False else "; needs load, VRAM full"
+        
+        ranked = [(chosen[0], chosen[1], reasoning)]
+        ranked += [c for c in candidates if c[0] != chosen[0]]
+        return ranked, estimate
+    
+    def predict_load(self, model_id: str, free_vram_mb: Optional[int] = None) -> LoadEstimate:
+        """
+        Predict when a new request to a model would complete.
+        
+        Service time comes from live statistics, then the benchmark
+        profile, then ``default_latency_ms``. Requests beyond the model's
+        parallelism queue for a full service time per wave, and a model
+        that is not loaded pays ``model_load_ms`` plus the eviction penalty
+        when it does not fit in free VRAM.
+        
+        Args:
+            model_id: Model to predict for
+            free_vram_mb: Free VRAM, or None when unknown
+            
+        Returns:
+            LoadEstimate for the model
+        """
+        model = self._models.get(model_id)
+        stats = self.store.get_stats(model_id)
+        profile = self._profiles.get(model_id)
+        
+        if stats is not None and stats.latency_ms.weight > 0:
+            service_ms = stats.latency_ms.mean
+        elif profile is not None and profile.avg_latency_ms > 0:
+            service_ms = profile.avg_latency_ms
+        else:
+            service_ms = self.config.default_latency_ms
+        
+        if stats is not None and stats.time_to_first_token_ms.weight > 0:
+            ttft_ms: Optional[float] = stats.time_to_first_token_ms.mean
+        elif profile is not None and profile.time_to_first_token_ms > 0:
+            ttft_ms = profile.time_to_first_token_ms
+        else:
+            ttft_ms = None
+        
+        in_flight = self._in_flight.get(model_id, 0)
+        delay_ms = (in_flight // max(self.config.model_parallelism, 1)) * service_ms
+        
+        needs_load = model is not None and not model.is_loaded
+        fits_in_vram = None
+        if needs_load:
+            delay_ms += self.config.model_load_ms
+            if free_vram_mb is not None and model.vram_required_gb:
+                fits_in_vram = model.vram_required_gb * 1024 <= free_vram_mb
+                if not fits_in_vram:
+                    delay_ms += self.config.vram_eviction_penalty_ms
+        
+        return LoadEstimate(
+            model_id=model_id,
+            in_flight=in_flight,
+            latency_ms=delay_ms + service_ms,
+            time_to_first_token_ms=delay_ms + ttft_ms if ttft_ms is not None else None,
+            needs_load=needs_load,
+            fits_in_vram=fits_in_vram,
+        )
+    
+    def _meets_slo(self, estimate: LoadEstimate) -> bool:
+        """Check a prediction against the configured SLO targets."""
+        if self.config.latency_slo_ms is not None and estimate.latency_ms > self.config.latency_slo_ms:
+            return False
+        if (
+            self.config.ttft_slo_ms is not None
+            and estimate.time_to_first_token_ms is not None
+            and estimate.time_to_first_token_ms > self.config.ttft_slo_ms
+        ):
+            return False
+        return True
+    
+    def _is_saturated(self, model_id: str) -> bool:
+        """Check whether new requests to a model would queue."""
+        return self._in_flight.get(model_id, 0) >= max(self.config.model_parallelism, 1)
+    
+    async def _free_vram_mb(self, candidates: List[Tuple[str, float, str]]) -> Optional[int]:
+        """Get free VRAM when it matters for a candidate, otherwise None."""
+        if not self.config.vram_monitoring:
+            return None
+        if not any(
+            not self._models[m].is_loaded and self._models[m].vram_required_gb
+            for m, _, _ in candidates
+        ):
+            return None
+        
+        if self.vram_monitor is None:
+            self.vram_monitor = VRAMMonitor(
+                sampler=get_sampler(self.config.telemetry_interval_seconds)
+            )
+        try:
+            status = await self.vram_monitor.get_status()
+        except Exception as e:
+            logger.debug(f"VRAM status unavailable: {e}")
+            return None
+        return status.total_free_mb if status.gpus else None
     
     def _score_model(
         self,
@@ -302,6 +508,9 @@ class RouterEngine:
         """
         score = 0.0
         reasons = []
+        speed, observed_tps = self._speed_score(model)
+        if observed_tps is not None:
+            reasons.append(f"observed {observed_tps:.1f} tok/s")
         
         # Base score from category
         category_scores = {
@@ -324,10 +533,10 @@ class RouterEngine:
             score += model.quality_score * 0.3
             reasons.append("quality preference")
         elif self.config.quality_preference == QualityPreference.SPEED:
-            score += model.speed_score * 0.3
+            score += speed * 0.3
             reasons.append("speed preference")
         else:
-            score += (model.quality_score + model.speed_score) * 0.15
+            score += (model.quality_score + speed) * 0.15
             reasons.append("balanced preference")
         
         # Complexity adjustment
@@ -337,7 +546,7 @@ class RouterEngine:
             reasons.append("complex task -> quality boost")
         elif classification.complexity == Complexity.SIMPLE:
             # Prefer speed for simple tasks
-            score += model.speed_score * 0.2
+            score += speed * 0.2
             reasons.append("simple task -> speed boost")
         
         # Capability requirements
@@ -347,7 +556,7 @@ class RouterEngine:
                 reasons.append("supports tools")
         
         # Minimum thresholds
-        if model.speed_score < self.config.min_speed_score:
+        if speed < self.config.min_speed_score:
             score *= 0.5
             reasons.append("below min speed threshold")
         
@@ -358,6 +567,59 @@ class RouterEngine:
         reasoning = "; ".join(reasons)
         return score, reasoning
     
+    def _speed_score(self, model: ModelConfig) -> Tuple[float, Optional[float]]:
+        """
+        Get a model's speed score, preferring speed observed in real traffic.
+        
+        Args:
+            model: Model configuration
+            
+        Returns:
+            Tuple of (speed score, observed tokens/sec or None)
+        """
+        stats = self.store.get_stats(model.model_id)
+        if stats is None or stats.tokens_per_second.weight <= 0:
+            return model.speed_score, None
+        tps = stats.tokens_per_second.mean
+        return speed_score(tps), tps
+    
+    def record_completion(
+        self,
+        model_id: str,
+        latency_ms: float,
+        time_to_first_token_ms: Optional[float] = None,
+        tokens_generated: int = 0,
+    ) -> None:
+        """
+        Record the performance of a completed request.
+        
+        Observations are kept as exponentially-decayed statistics per model
+        and hardware, persisted across restarts, and used when scoring.
+        
+        Args:
+            model_id: Model that served the request
+            latency_ms: Total request latency
+            time_to_first_token_ms: Time until the first token, if streamed
+            tokens_generated: Number of output tokens
+        """
+        stats = self.store.record(
+            model_id,
+            latency_ms=latency_ms,
+            time_to_first_token_ms=time_to_first_token_ms,
+            tokens_generated=tokens_generated,
+        )
+        model = self._models.get(model_id)
+        if model is not None:
+            model.is_loaded = True
+        
+        profile = self._profiles.get(model_id)
+        if profile is not None:
+            profile.avg_latency_ms = stats.latency_ms.mean
+            if stats.time_to_first_token_ms.weight > 0:
+                profile.time_to_first_token_ms = stats.time_to_first_token_ms.mean
+            if stats.tokens_per_second.weight > 0:
+                profile.tokens_per_second = stats.tokens_per_second.mean
+    
     def _default_routing(self, prompt: str) -> RoutingResult:
         """Return default routing when no models are available."""
         return RoutingResult(
@@ -369,10 +631,78 @@ class RouterEngine:
             reasoning="Default routing (no models available)",
         )
     
-    async def profile_models(self) -> Dict[str, ModelProfile]:
+    def begin_request(self, model_id: str) -> None:
+        """Count a request that was sent to a model."""
+        self._in_flight[model_id] = self._in_flight.get(model_id, 0) + 1
+    
+    def end_request(
+        self,
+        model_id: str,
+        latency_ms: Optional[float] = None,
+        time_to_first_token_ms: Optional[float] = None,
+        tokens_generated: int = 0,
+    ) -> None:
+        """
+        Count a request as finished, recording its performance if given.
+        
+        Args:
+            model_id: Model that served the request
+            latency_ms: Total request latency (None if it failed)
+            time_to_first_token_ms: Time until the first token, if streamed
+            tokens_generated: Number of output tokens
+        """
+        remaining = self._in_flight.get(model_id, 0) - 1
+        if remaining > 0:
+            self._in_flight[model_id] = remaining
+        else:
+            self._in_flight.pop(model_id, None)
+        
+        if latency_ms is not None:
+            self.record_completion(model_id, latency_ms, time_to_first_token_ms, tokens_generated)
+    
+    @contextmanager
+    def track(self, model_id: str) -> Iterator[RequestTracker]:
+        """
+        Track a request to a model for load-aware routing.
+        
+        Successful requests are timed and recorded; call first_token() on
+        the tracker when streaming starts and set tokens_generated.
+        
+        Example:
+            with router.track(result.model_id) as request:
+                async for chunk in provider.complete(...):
+                    request.first_token()
+                    request.tokens_generated += 1
+        """
+        tracker = RequestTracker(model_id=model_id)
+        self.begin_request(model_id)
+        try:
+            yield tracker
+        except BaseException:
+            self.end_request(model_id)
+            raise
+        
+        now = time.monotonic()
+        self.end_request(
+            model_id,
+            latency_ms=(now - tracker.started_at) * 1000,
+            time_to_first_token_ms=(
+                (tracker.first_token_at - tracker.started_at) * 1000
+                if tracker.first_token_at is not None else None
+            ),
+            tokens_generated=tracker.tokens_generated,
+        )
+    
+    async def profile_models(self, force: bool = False) -> Dict[str, ModelProfile]:
         """
         Profile all available models.
         
+        Models with a stored profile for this hardware are not benchmarked
+        again unless ``force`` is set.
+        
+        Args:
+            force: Re-profile models that already have a stored profile
+            
         Returns:
             Dictionary of model profiles
         """
@@ -381,27 +711,35 @@ class RouterEngine:
             return {}
         
         for model_id in self._models:
+            if not force and model_id in self._profiles:
+                continue
             try:
                 profile = await self.profiler.quick_profile(self.provider, model_id)
-                self._profiles[model_id] = profile
-                
-                # Update model config with profile data
-                if model_id in self._models:
-                    self._models[model_id].speed_score = profile._calculate_speed_score()
-                    self._models[model_id].quality_score = profile.overall_quality
-                    self._models[model_id].coding_score = profile.coding_score
-                    self._models[model_id].reasoning_score = profile.reasoning_score
-                    self._models[model_id].creative_score = profile.creative_score
-                    self._models[model_id].math_score = profile.math_score
-                
+                self._apply_profile(model_id, profile)
             except Exception as e:
                 logger.error(f"Failed to profile model {model_id}: {e}")
         
         return self._profiles
     
+    def _apply_profile(self, model_id: str, profile: ModelProfile) -> None:
+        """Cache a profile and copy its scores into the model config."""
+        self._profiles[model_id] = profile
+        
+        if model_id in self._models:
+            self._models[model_id].speed_score = profile._calculate_speed_score()
+            self._models[model_id].quality_score = profile.overall_quality
+            self._models[model_id].coding_score = profile.coding_score
+            self._models[model_id].reasoning_score = profile.reasoning_score
+            self._models[model_id].creative_score = profile.creative_score
+            self._models[model_id].math_score = profile.math_score
+    
     def register_model(self, config: ModelConfig) -> None:
         """Manually register a model configuration."""
         self._models[config.model_id] = config
+        
+        stored = self.store.get_profile(config.model_id)
+        if stored is not None:
+            self._apply_profile(config.model_id, stored)
     
     def unregister_model(self, model_id: str) -> bool:
         """Unregister a model."""
@@ -428,6 +766,10 @@ class RouterEngine:
         return {
             "models_registered": len(self._models),
             "profiles_cached": len(self._profiles),
+            "models_observed": sum(
+                1 for model_id in self._models if self.store.get_stats(model_id)
+            ),
+            "in_flight": dict(self._in_flight),
             "cache_size": len(self.cache._cache),
             "config": {
                 "enabled": self.config.enabled,
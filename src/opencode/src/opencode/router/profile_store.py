@@ -0,0 +1,314 @@
+"""
+Profile Store
+
+Persists model profiles and live performance statistics across restarts.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from opencode.router.profiler import ModelProfile
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+
+
+def default_store_path() -> Path:
+    """Get the default on-disk location of the profile store."""
+    return Path.home() / ".cache" / "opencode" / "router" / "profiles.json"
+
+
+@functools.lru_cache(maxsize=1)
+def hardware_fingerprint() -> str:
+    """
+    Get a short hash identifying this machine's compute hardware.
+    
+    Covers the CPU, core count, installed RAM and NVIDIA GPU models, so
+    profiles measured on one machine are not reused on another.
+    """
+    parts = [platform.system(), platform.machine(), platform.processor(), str(os.cpu_count())]
+    
+    try:
+        import psutil
+        parts.append(str(round(psutil.virtual_memory().total / 2**30)))
+    except ImportError:
+        pass
+    
+    if shutil.which("nvidia-smi"):
+        try:
+            result = subprocess.run(
+                ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+            )
+            if result.returncode == 0:
+                parts.extend(sorted(result.stdout.split("\n")))
+        except (OSError, subprocess.SubprocessError):
+            pass
+    
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+@dataclass
+class DecayedStat:
+    """
+    Exponentially-decayed mean and variance of a metric.
+    
+    Older samples lose half their weight every half-life, so the mean
+    follows recent behaviour while ``weight`` tells how much recent
+    evidence there is.
+    """
+    mean: float = 0.0
+    variance: float = 0.0
+    weight: float = 0.0
+    updated_at: float = 0.0
+    
+    def update(self, value: float, now: float, half_life_seconds: float) -> None:
+        """Add a sample observed at ``now`` (epoch seconds)."""
+        weight = self.weight
+        if weight > 0 and half_life_seconds > 0:
+            weight *= 0.5 ** (max(now - self.updated_at, 0.0) / half_life_seconds)
+        
+        total = weight + 1.0
+        delta = value - self.mean
+        self.mean += delta / total
+        self.variance = (self.variance * weight + delta * (value - self.mean)) / total
+        self.weight = total
+        self.updated_at = now
+    
+    def to_dict(self) -> Dict[str, float]:
+        """Convert to dictionary."""
+        return {
+            "mean": self.mean,
+            "variance": self.variance,
+            "weight": self.weight,
+            "updated_at": self.updated_at,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DecayedStat":
+        """Create from dictionary."""
+        return cls(
+            mean=float(data.get("mean", 0.0)),
+            variance=float(data.get("variance", 0.0)),
+            weight=float(data.get("weight", 0.0)),
+            updated_at=float(data.get("updated_at", 0.0)),
+        )
+
+
+@dataclass
+class LiveStats:
+    """Performance observed from real completions of one model."""
+    latency_ms: DecayedStat = field(default_factory=DecayedStat)
+    time_to_first_token_ms: DecayedStat = field(default_factory=DecayedStat)
+    tokens_per_second: DecayedStat = field(default_factory=DecayedStat)
+    samples: int = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "latency_ms": self.latency_ms.to_dict(),
+            "time_to_first_token_ms": self.time_to_first_token_ms.to_dict(),
+            "tokens_per_second": self.tokens_per_second.to_dict(),
+            "samples": self.samples,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LiveStats":
+        """Create from dictionary."""
+        return cls(
+            latency_ms=DecayedStat.from_dict(data.get("latency_ms", {})),
+            time_to_first_token_ms=DecayedStat.from_dict(data.get("time_to_first_token_ms", {})),
+            tokens_per_second=DecayedStat.from_dict(data.get("tokens_per_second", {})),
+            samples=int(data.get("samples", 0)),
+        )
+
+
+class ProfileStore:
+    """
+    On-disk store of model profiles and live statistics.
+    
+    Entries are keyed by hardware fingerprint and model ID, so benchmark
+    profiles survive restarts and numbers measured on other hardware are
+    ignored. Live statistics are saved at most every ``save_interval``
+    seconds; call flush() to write pending updates.
+    
+    Example:
+        store = ProfileStore()
+        store.record("llama3.2", latency_ms=850, time_to_first_token_ms=120, tokens_generated=40)
+        stats = store.get_stats("llama3.2")
+    """
+    
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        fingerprint: Optional[str] = None,
+        half_life_seconds: float = 3600.0,
+        save_interval: float = 5.0,
+        persist: bool = True,
+    ):
+        """
+        Initialize the profile store.
+        
+        Args:
+            path: JSON file to persist to (default: default_store_path())
+            fingerprint: Hardware fingerprint (default: this machine's)
+            half_life_seconds: Half-life of live statistics
+            save_interval: Minimum seconds between automatic saves
+            persist: Read and write the file; False keeps everything in memory
+        """
+        self.path = Path(path) if path else default_store_path()
+        self.persist = persist
+        self._fingerprint = fingerprint
+        self.half_life_seconds = half_life_seconds
+        self.save_interval = save_interval
+        
+        self._data: Optional[Dict[str, Any]] = None
+        self._profiles: Dict[str, ModelProfile] = {}
+        self._stats: Dict[str, LiveStats] = {}
+        self._dirty = False
+        self._last_save = 0.0
+    
+    @property
+    def fingerprint(self) -> str:
+        """Hardware fingerprint entries are stored under."""
+        if self._fingerprint is None:
+            self._fingerprint = hardware_fingerprint()
+        return self._fingerprint
+    
+    def _load(self) -> Dict[str, Any]:
+        """Read the store file once, keeping entries for other hardware."""
+        if self._data is not None:
+            return self._data
+        
+        self._data = {"version": STORE_VERSION, "hardware": {}}
+        if not self.persist:
+            return self._data
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == STORE_VERSION:
+                self._data = data
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable profile store {self.path}: {e}")
+        
+        entries = self._data["hardware"].get(self.fingerprint, {})
+        for model_id, entry in entries.items():
+            try:
+                if "profile" in entry:
+                    self._profiles[model_id] = ModelProfile.from_dict(entry["profile"])
+                if "live" in entry:
+                    self._stats[model_id] = LiveStats.from_dict(entry["live"])
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Ignoring stored profile for {model_id}: {e}")
+        return self._data
+    
+    def get_profile(self, model_id: str) -> Optional[ModelProfile]:
+        """Get the stored benchmark profile for a model."""
+        self._load()
+        return self._profiles.get(model_id)
+    
+    def put_profile(self, profile: ModelProfile) -> None:
+        """Store a benchmark profile and save it."""
+        self._load()
+        self._profiles[profile.model_id] = profile
+        self._dirty = True
+        self.save()
+    
+    def get_stats(self, model_id: str) -> Optional[LiveStats]:
+        """Get live statistics for a model, if any completions were recorded."""
+        self._load()
+        return self._stats.get(model_id)
+    
+    def record(
+        self,
+        model_id: str,
+        latency_ms: float,
+        time_to_first_token_ms: Optional[float] = None,
+        tokens_generated: int = 0,
+        now: Optional[float] = None,
+    ) -> LiveStats:
+        """
+        Record one completed request.
+        
+        Args:
+            model_id: Model that served the request
+            latency_ms: Total request latency
+            time_to_first_token_ms: Time until the first token, if streamed
+            tokens_generated: Number of output tokens
+            now: Observation time in epoch seconds (default: current time)
+        
+        Returns:
+            The model's updated statistics
+        """
+        self._load()
+        now = time.time() if now is None else now
+        stats = self._stats.setdefault(model_id, LiveStats())
+        
+        stats.latency_ms.update(latency_ms, now, self.half_life_seconds)
+        if time_to_first_token_ms is not None:
+            stats.time_to_first_token_ms.update(time_to_first_token_ms, now, self.half_life_seconds)
+        if tokens_generated > 0 and latency_ms > 0:
+            generation_ms = latency_ms - (time_to_first_token_ms or 0.0)
+            if generation_ms > 0:
+                stats.tokens_per_second.update(
+                    tokens_generated / (generation_ms / 1000), now, self.half_life_seconds
+                )
+        stats.samples += 1
+        
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+        return stats
+    
+    def save(self) -> None:
+        """Write the store to disk atomically."""
+        if not self._dirty or not self.persist:
+            return
+        data = self._load()
+        
+        entries: Dict[str, Dict[str, Any]] = {}
+        for model_id, profile in self._profiles.items():
+            entries.setdefault(model_id, {})["profile"] = profile.to_dict()
+        for model_id, stats in self._stats.items():
+            entries.setdefault(model_id, {})["live"] = stats.to_dict()
+        data["hardware"][self.fingerprint] = entries
+        
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            payload = json.dumps(data, indent=2)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to save profile store {self.path}: {e}")
+            return
+        
+        self._dirty = False
+        self._last_save = time.monotonic()
+    
+    def flush(self) -> None:
+        """Save any pending updates."""
+        self.save()
+    
+    def clear(self) -> None:
+        """Forget all profiles and statistics for this hardware."""
+        self._load()
+        self._profiles.clear()
+        self._stats.clear()
+        self._dirty = True
+        self.save()
@@ -6,16 +6,30 @@ Profiles LLM models for performance and capability assessment.
 
 import asyncio
 import time
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 import logging
 
 from opencode.router.config import ModelConfig, PromptCategory
 
+if TYPE_CHECKING:
+    from opencode.router.profile_store import ProfileStore
+
 logger = logging.getLogger(__name__)
 
 
+def speed_score(tokens_per_second: float) -> float:
+    """
+    Map generation speed to a 0-1 speed score.
+    
+    50 tokens/sec or more scores 1.0; the score never drops below 0.1.
+    """
+    if tokens_per_second <= 0:
+        return 0.5
+    return max(min(tokens_per_second / 50.0, 1.0), 0.1)
+
+
 @dataclass
 class ModelProfile:
     """
@@ -75,13 +89,22 @@ class ModelProfile:
     
     def _calculate_speed_score(self) -> float:
         """Calculate speed score from performance metrics."""
-        if self.tokens_per_second <= 0:
-            return 0.5
-        
-        # Normalize tokens per second to 0-1 scale
-        # Assuming 50 tps is "fast" (score 1.0) and 5 tps is "slow" (score 0.1)
-        score = min(self.tokens_per_second / 50.0, 1.0)
-        return max(score, 0.1)
+        return speed_score(self.tokens_per_second)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        data = asdict(self)
+        data["profiled_at"] = self.profiled_at.isoformat() if self.profiled_at else None
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModelProfile":
+        """Create a profile from a dictionary, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        if values.get("profiled_at"):
+            values["profiled_at"] = datetime.fromisoformat(values["profiled_at"])
+        return cls(**values)
 
 
 @dataclass
@@ -134,14 +157,20 @@ class ModelProfiler:
         ],
     }
     
-    def __init__(self, timeout_seconds: int = 90):
+    def __init__(
+        self,
+        timeout_seconds: int = 90,
+        store: Optional["ProfileStore"] = None,
+    ):
         """
         Initialize the model profiler.
         
         Args:
             timeout_seconds: Timeout for benchmark runs
+            store: Store that persists profiles across restarts
         """
         self.timeout_seconds = timeout_seconds
+        self.store = store
         self._profiles: Dict[str, ModelProfile] = {}
     
     async def profile_model(
@@ -200,6 +229,8 @@ class ModelProfiler:
         
         # Cache the profile
         self._profiles[model_id] = profile
+        if self.store is not None:
+            self.store.put_profile(profile)
         
         return profile
     
@@ -332,8 +363,13 @@ class ModelProfiler:
         ) / 5
     
     def get_profile(self, model_id: str) -> Optional[ModelProfile]:
-        """Get a cached profile for a model."""
-        return self._profiles.get(model_id)
+        """Get a cached or stored profile for a model."""
+        profile = self._profiles.get(model_id)
+        if profile is None and self.store is not None:
+            profile = self.store.get_profile(model_id)
+            if profile is not None:
+                self._profiles[model_id] = profile
+        return profile
     
     def list_profiles(self) -> List[ModelProfile]:
         """List all cached profiles."""
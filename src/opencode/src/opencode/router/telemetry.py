@@ -0,0 +1,165 @@
+"""
+Telemetry Sampler
+
+Samples GPU, CPU and RAM usage on a background thread so readers never
+run vendor tools or block the event loop.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional
+
+from opencode.router.vram_monitor import VRAMMonitor, VRAMStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 2.0
+
+
+@dataclass
+class TelemetrySample:
+    """One snapshot of system resource usage."""
+    timestamp: float
+    vram: VRAMStatus
+    cpu_percent: Optional[float] = None
+    memory_percent: Optional[float] = None
+    memory_total_mb: Optional[int] = None
+    
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the sample was taken."""
+        return max(time.time() - self.timestamp, 0.0)
+
+
+class TelemetrySampler:
+    """
+    Background sampler of GPU, CPU and RAM usage.
+    
+    A daemon thread takes a sample every ``interval`` seconds and keeps
+    the most recent ``history`` samples in a ring buffer. latest() only
+    reads the end of that buffer, so routing decisions and UI refreshes
+    get a snapshot without forking processes.
+    
+    Example:
+        sampler = TelemetrySampler(interval=1.0).start()
+        sample = sampler.latest()
+        if sample:
+            print(f"CPU: {sample.cpu_percent}%")
+    """
+    
+    def __init__(
+        self,
+        monitor: Optional[VRAMMonitor] = None,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+        history: int = 60,
+    ):
+        """
+        Initialize the sampler.
+        
+        Args:
+            monitor: Monitor used to read VRAM (default: auto-detected on first sample)
+            interval: Seconds between samples
+            history: Number of samples kept
+        """
+        self.monitor = monitor
+        self.interval = interval
+        self._samples: Deque[TelemetrySample] = deque(maxlen=history)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def latest(self) -> Optional[TelemetrySample]:
+        """Get the most recent sample, or None before the first one."""
+        try:
+            return self._samples[-1]
+        except IndexError:
+            return None
+    
+    def history(self) -> List[TelemetrySample]:
+        """Get the buffered samples, oldest first."""
+        return list(self._samples)
+    
+    def sample_now(self) -> TelemetrySample:
+        """
+        Take a sample immediately and add it to the buffer.
+        
+        This blocks while the GPU tool runs; call it from the sampler
+        thread or a worker thread.
+        """
+        with self._lock:
+            if self.monitor is None:
+                self.monitor = VRAMMonitor()
+            vram = self.monitor.read_status()
+            sample = TelemetrySample(timestamp=time.time(), vram=vram)
+            
+            try:
+                import psutil
+                
+                # Non-blocking: CPU usage since the previous call
+                sample.cpu_percent = psutil.cpu_percent(interval=None)
+                memory = psutil.virtual_memory()
+                sample.memory_percent = memory.percent
+                sample.memory_total_mb = memory.total // (1024 * 1024)
+            except ImportError:
+                pass
+            except Exception as e:
+                logger.debug(f"Failed to read CPU/RAM usage: {e}")
+            
+            self._samples.append(sample)
+            return sample
+    
+    def start(self) -> "TelemetrySampler":
+        """Start the background thread if it is not running."""
+        if self.running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry-sampler", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _run(self) -> None:
+        """Sample until stopped."""
+        while not self._stop.is_set():
+            try:
+                self.sample_now()
+            except Exception as e:
+                logger.error(f"Telemetry sample failed: {e}")
+            self._stop.wait(self.interval)
+
+
+_sampler: Optional[TelemetrySampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler(interval: Optional[float] = None) -> TelemetrySampler:
+    """
+    Get the process-wide sampler, starting it on first use.
+    
+    Args:
+        interval: Seconds between samples; updates the running sampler
+    
+    Returns:
+        The shared TelemetrySampler
+    """
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = TelemetrySampler(interval=interval or DEFAULT_INTERVAL_SECONDS)
+        elif interval:
+            _sampler.interval = interval
+        return _sampler.start()
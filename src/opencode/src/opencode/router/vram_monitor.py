@@ -5,15 +5,19 @@ GPU memory monitoring for intelligent model management.
 """
 
 import asyncio
+import json
 import logging
 import platform
 import shutil
 import subprocess
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 from enum import Enum
 
+if TYPE_CHECKING:
+    from opencode.router.telemetry import TelemetrySampler
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,6 +74,95 @@ class VRAMStatus:
         return None
 
 
+NVIDIA_QUERY = [
+    "nvidia-smi",
+    "--query-gpu=index,name,memory.total,memory.used,memory.free,utilization.gpu,temperature.gpu",
+    "--format=csv,noheader,nounits",
+]
+AMD_QUERY = ["rocm-smi", "--showmeminfo", "vram", "--json"]
+INTEL_QUERY = ["xpu-smi", "dump", "-m", "-1", "-i", "0"]
+APPLE_MEMSIZE_QUERY = ["sysctl", "-n", "hw.memsize"]
+APPLE_VM_STAT_QUERY = ["vm_stat"]
+
+
+def parse_nvidia_smi(output: str) -> List[GPUInfo]:
+    """Parse ``nvidia-smi --query-gpu`` CSV output (see NVIDIA_QUERY)."""
+    gpus = []
+    for line in output.strip().split("\n"):
+        if not line.strip():
+            continue
+        
+        parts = [p.strip() for p in line.split(",")]
+        if len(parts) >= 6:
+            gpus.append(GPUInfo(
+                index=int(parts[0]),
+                vendor=GPUVendor.NVIDIA,
+                name=parts[1],
+                total_memory_mb=int(float(parts[2])),
+                used_memory_mb=int(float(parts[3])),
+                free_memory_mb=int(float(parts[4])),
+                utilization_percent=float(parts[5]),
+                temperature_c=float(parts[6]) if len(parts) > 6 else None,
+            ))
+    return gpus
+
+
+def parse_rocm_smi(output: str) -> List[GPUInfo]:
+    """Parse ``rocm-smi --showmeminfo vram --json`` output."""
+    gpus = []
+    for card_id, card_data in json.loads(output).items():
+        if isinstance(card_data, dict):
+            gpu = GPUInfo(
+                index=int(card_id.replace("card", "")),
+                vendor=GPUVendor.AMD,
+                name=card_data.get("Card series", "AMD GPU"),
+                total_memory_mb=int(card_data.get("VRAM Total Memory (B)", 0)) // (1024 * 1024),
+                used_memory_mb=int(card_data.get("VRAM Total Used Memory (B)", 0)) // (1024 * 1024),
+                free_memory_mb=0,
+                utilization_percent=0.0,
+            )
+            gpu.free_memory_mb = gpu.total_memory_mb - gpu.used_memory_mb
+            gpus.append(gpu)
+    return gpus
+
+
+def parse_xpu_smi(output: str) -> List[GPUInfo]:
+    """Parse ``xpu-smi dump`` output (memory fields are not reported yet)."""
+    return []
+
+
+def parse_apple_memory(memsize_output: str, vm_stat_output: str) -> List[GPUInfo]:
+    """Build the unified-memory GPU entry from ``sysctl hw.memsize`` and ``vm_stat``."""
+    total_memory_mb = int(memsize_output.strip()) // (1024 * 1024)
+    
+    page_size = 4096  # Default page size
+    used_pages = 0
+    for line in vm_stat_output.split("\n"):
+        if "page size of" in line:
+            page_size = int(line.split()[-2])
+        elif "Pages active" in line or "Pages wired" in line:
+            used_pages += int(line.split(":")[1].strip().rstrip("."))
+    
+    used_memory_mb = (used_pages * page_size) // (1024 * 1024)
+    return [GPUInfo(
+        index=0,
+        vendor=GPUVendor.APPLE,
+        name="Apple Silicon Unified Memory",
+        total_memory_mb=total_memory_mb,
+        used_memory_mb=used_memory_mb,
+        free_memory_mb=total_memory_mb - used_memory_mb,
+        utilization_percent=(used_memory_mb / total_memory_mb) * 100 if total_memory_mb > 0 else 0,
+    )]
+
+
+def run_command(args: List[str]) -> str:
+    """Run a monitoring command and return its stdout, raising on failure."""
+    result = subprocess.run(args, capture_output=True, text=True, timeout=10)
+    if result.returncode != 0:
+        raise RuntimeError(f"{args[0]} error: {result.stderr.strip()}")
+    return result.stdout
+
+
 class VRAMMonitor:
     """
     GPU memory monitor.
@@ -80,21 +173,40 @@ class VRAMMonitor:
     - Intel (via xpu-smi)
     - Apple Silicon (via system APIs)
     
+    With a TelemetrySampler attached, get_status() returns the latest
+    background sample instead of running a command per call.
+    
     Example:
-        monitor = VRAMMonitor()
+        monitor = VRAMMonitor(sampler=get_sampler())
         status = await monitor.get_status()
         print(f"VRAM usage: {status.overall_usage_percent:.1f}%")
     """
     
-    def __init__(self, auto_detect: bool = True):
+    # Commands each vendor's read_status() runs, and the parser for their output
+    BACKENDS: Dict[GPUVendor, Tuple[List[List[str]], Callable[..., List[GPUInfo]]]] = {
+        GPUVendor.NVIDIA: ([NVIDIA_QUERY], parse_nvidia_smi),
+        GPUVendor.AMD: ([AMD_QUERY], parse_rocm_smi),
+        GPUVendor.INTEL: ([INTEL_QUERY], parse_xpu_smi),
+        GPUVendor.APPLE: ([APPLE_MEMSIZE_QUERY, APPLE_VM_STAT_QUERY], parse_apple_memory),
+    }
+    
+    _sampler: Optional["TelemetrySampler"] = None
+    
+    def __init__(
+        self,
+        auto_detect: bool = True,
+        sampler: Optional["TelemetrySampler"] = None,
+    ):
         """
         Initialize the VRAM monitor.
         
         Args:
             auto_detect: Whether to auto-detect GPU vendor
+            sampler: Background sampler to serve get_status() from
         """
         self._vendor: Optional[GPUVendor] = None
         self._available = False
+        self._sampler = sampler
         
         if auto_detect:
             self._vendor = self._detect_vendor()
@@ -155,13 +267,45 @@ class VRAMMonitor:
         """Check if VRAM monitoring is available."""
         return self._available
     
+    def read_status(self, run: Callable[[List[str]], str] = run_command) -> VRAMStatus:
+        """
+        Query the GPUs synchronously.
+        
+        This blocks while the vendor tool runs, so it is meant for the
+        telemetry sampler thread rather than an event loop.
+        
+        Args:
+            run: Runs a command and returns its stdout; replaceable in tests
+            
+        Returns:
+            VRAMStatus with current memory information
+        """
+        backend = self.BACKENDS.get(self._vendor) if self._available else None
+        if backend is None:
+            return self._empty_status()
+        
+        commands, parse = backend
+        try:
+            return self._build_status(parse(*[run(command) for command in commands]))
+        except Exception as e:
+            logger.error(f"Failed to get {self.vendor.value} status: {e}")
+            return self._empty_status()
+    
     async def get_status(self) -> VRAMStatus:
         """
         Get current VRAM status.
         
+        Returns the sampler's latest snapshot when a sampler is attached
+        and has produced one, otherwise queries the GPUs.
+        
         Returns:
             VRAMStatus with current memory information
         """
+        if self._sampler is not None:
+            sample = self._sampler.latest()
+            if sample is not None:
+                return sample.vram
+        
         if not self._available:
             return VRAMStatus(
                 gpus=[],
@@ -192,9 +336,7 @@ class VRAMMonitor:
         """Get VRAM status for NVIDIA GPUs."""
         try:
             result = await asyncio.create_subprocess_exec(
-                "nvidia-smi",
-                "--query-gpu=index,name,memory.total,memory.used,memory.free,utilization.gpu,temperature.gpu",
-                "--format=csv,noheader,nounits",
+                *NVIDIA_QUERY,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
@@ -204,26 +346,7 @@ class VRAMMonitor:
                 logger.error(f"nvidia-smi error: {stderr.decode()}")
                 return self._empty_status()
             
-            gpus = []
-            for line in stdout.decode().strip().split("\n"):
-                if not line.strip():
-                    continue
-                
-                parts = [p.strip() for p in line.split(",")]
-                if len(parts) >= 6:
-                    gpu = GPUInfo(
-                        index=int(parts[0]),
-                        vendor=GPUVendor.NVIDIA,
-                        name=parts[1],
-                        total_memory_mb=int(float(parts[2])),
-                        used_memory_mb=int(float(parts[3])),
-                        free_memory_mb=int(float(parts[4])),
-                        utilization_percent=float(parts[5]),
-                        temperature_c=float(parts[6]) if len(parts) > 6 else None,
-                    )
-                    gpus.append(gpu)
-            
-            return self._build_status(gpus)
+            return self._build_status(parse_nvidia_smi(stdout.decode()))
             
         except Exception as e:
             logger.error(f"Failed to get NVIDIA status: {e}")
@@ -233,10 +356,7 @@ class VRAMMonitor:
         """Get VRAM status for AMD GPUs."""
         try:
             result = await asyncio.create_subprocess_exec(
-                "rocm-smi",
-                "--showmeminfo",
-                "vram",
-                "--json",
+                *AMD_QUERY,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
@@ -246,25 +366,7 @@ class VRAMMonitor:
                 logger.error(f"rocm-smi error: {stderr.decode()}")
                 return self._empty_status()
             
-            import json
-            data = json.loads(stdout.decode())
-            
-            gpus = []
-            for card_id, card_data in data.items():
-                if isinstance(card_data, dict):
-                    gpu = GPUInfo(
-                        index=int(card_id.replace("card", "")),
-                        vendor=GPUVendor.AMD,
-                        name=card_data.get("Card series", "AMD GPU"),
-                        total_memory_mb=int(card_data.get("VRAM Total Memory (B)", 0)) // (1024 * 1024),
-                        used_memory_mb=int(card_data.get("VRAM Total Used Memory (B)", 0)) // (1024 * 1024),
-                        free_memory_mb=0,
-                        utilization_percent=0.0,
-                    )
-                    gpu.free_memory_mb = gpu.total_memory_mb - gpu.used_memory_mb
-                    gpus.append(gpu)
-            
-            return self._build_status(gpus)
+            return self._build_status(parse_rocm_smi(stdout.decode()))
             
         except Exception as e:
             logger.error(f"Failed to get AMD status: {e}")
@@ -274,12 +376,7 @@ class VRAMMonitor:
         """Get VRAM status for Intel GPUs."""
         try:
             result = await asyncio.create_subprocess_exec(
-                "xpu-smi",
-                "dump",
-                "-m",
-                "-1",
-                "-i",
-                "0",
+                *INTEL_QUERY,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
@@ -289,16 +386,7 @@ class VRAMMonitor:
                 logger.error(f"xpu-smi error: {stderr.decode()}")
                 return self._empty_status()
             
-            # Parse xpu-smi output
-            gpus = []
-            lines = stdout.decode().strip().split("\n")
-            
-            for line in lines:
-                if "Memory" in line or "VRAM" in line:
-                    # Parse memory information
-                    pass
-            
-            return self._build_status(gpus)
+            return self._build_status(parse_xpu_smi(stdout.decode()))
             
         except Exception as e:
             logger.error(f"Failed to get Intel status: {e}")
@@ -309,47 +397,21 @@ class VRAMMonitor:
         try:
             # Get total memory
             result = await asyncio.create_subprocess_exec(
-                "sysctl",
-                "-n",
-                "hw.memsize",
+                *APPLE_MEMSIZE_QUERY,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
-            stdout, _ = await result.communicate()
-            total_memory_mb = int(stdout.decode().strip()) // (1024 * 1024)
+            memsize, _ = await result.communicate()
             
             # Get used memory via vm_stat
             result = await asyncio.create_subprocess_exec(
-                "vm_stat",
+                *APPLE_VM_STAT_QUERY,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
-            stdout, _ = await result.communicate()
-            
-            # Parse vm_stat output
-            page_size = 4096  # Default page size
-            used_pages = 0
-            
-            for line in stdout.decode().split("\n"):
-                if "page size of" in line:
-                    page_size = int(line.split()[-2])
-                elif "Pages active" in line or "Pages wired" in line:
-                    used_pages += int(line.split(":")[1].strip().rstrip("."))
-            
-            used_memory_mb = (used_pages * page_size) // (1024 * 1024)
-            free_memory_mb = total_memory_mb - used_memory_mb
-            
-            gpu = GPUInfo(
-                index=0,
-                vendor=GPUVendor.APPLE,
-                name="Apple Silicon Unified Memory",
-                total_memory_mb=total_memory_mb,
-                used_memory_mb=used_memory_mb,
-                free_memory_mb=free_memory_mb,
-                utilization_percent=(used_memory_mb / total_memory_mb) * 100 if total_memory_mb > 0 else 0,
-            )
+            vm_stat, _ = await result.communicate()
             
-            return self._build_status([gpu])
+            return self._build_status(parse_apple_memory(memsize.decode(), vm_stat.decode()))
             
         except Exception as e:
             logger.error(f"Failed to get Apple status: {e}")
@@ -7,6 +7,7 @@ Provides REST API and WebSocket endpoints for remote access.
 from __future__ import annotations
 
 import asyncio
+import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import AsyncGenerator, Optional
@@ -21,7 +22,11 @@ from opencode.core.config import Config
 from opencode.core.session import SessionManager
 from opencode.db.connection import Database, init_database, close_database, get_database
 from opencode.mcp.client import MCPClient
+from opencode.provider.pool import get_provider_pool
 from opencode.tool.base import ToolRegistry
+from opencode.tool.file_index import close_file_indexes
+from opencode.tool.lsp_client import close_lsp_clients
+from opencode.tool.trigram_index import close_trigram_indexes
 
 
 # Global state
@@ -87,6 +92,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Cleanup
     if _mcp_client:
         await _mcp_client.stop()
+    await get_provider_pool().close_all()
+    # The workflow REST, GraphQL and router routes create their engines on
+    # first use; close the ones whose modules were loaded
+    for module_name in (
+        "opencode.server.routes.workflow",
+        "opencode.server.graphql.schema",
+        "opencode.server.routes.router",
+    ):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            await module.close_engine()
+    await close_lsp_clients()
+    close_trigram_indexes()
+    close_file_indexes()
     await close_database()
 
 
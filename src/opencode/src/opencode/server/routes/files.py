@@ -4,6 +4,8 @@ Files API routes for OpenCode HTTP server.
 
 from __future__ import annotations
 
+import asyncio
+import re
 from pathlib import Path
 from typing import Optional
 
@@ -12,6 +14,9 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
 from opencode.server.app import get_config
+from opencode.tool.file_index import get_file_index
+from opencode.tool.grep_engine import GrepEngine
+from opencode.tool.trigram_index import get_trigram_index
 
 
 router = APIRouter()
@@ -52,6 +57,8 @@ class FileSearchRequest(BaseModel):
     pattern: str
     path: Optional[str] = None
     file_pattern: str = "*"
+    content: bool = False  # Treat pattern as a regex over file contents
+    use_index: bool = True  # Narrow content searches with the trigram index
 
 
 def _get_project_root() -> Path:
@@ -175,10 +182,17 @@ async def search_files(request: FileSearchRequest):
     if not search_path.exists():
         raise HTTPException(status_code=404, detail="Path not found")
     
-    results = []
-    for item in search_path.rglob(request.file_pattern):
-        if request.pattern.lower() in item.name.lower():
-            results.append(str(item.relative_to(project_root)))
+    if request.content:
+        return await _search_contents(request, project_root, search_path)
+    
+    # Answer from the shared workspace index instead of walking the tree
+    index = get_file_index(project_root)
+    base = search_path.relative_to(project_root.resolve()).as_posix() if request.path else ""
+    file_glob = request.file_pattern if request.file_pattern.startswith("**") else f"**/{request.file_pattern}"
+    matches = await asyncio.to_thread(index.glob, file_glob, base, True)
+    
+    pattern = request.pattern.lower()
+    results = [path for path in matches if pattern in path.rsplit("/", 1)[-1].lower()]
     
     return {
         "pattern": request.pattern,
@@ -187,6 +201,38 @@ async def search_files(request: FileSearchRequest):
     }
 
 
+async def _search_contents(request: FileSearchRequest, project_root: Path, search_path: Path) -> dict:
+    """Find files whose contents match a regex."""
+    try:
+        re.compile(request.pattern)
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid regex pattern: {e}")
+    
+    root = project_root.resolve()
+    base = search_path.relative_to(root).as_posix() if request.path else ""
+    
+    def run():
+        candidates = None
+        if request.use_index and search_path.is_dir():
+            candidates = get_trigram_index(root).candidates(request.pattern, base=base)
+        return GrepEngine().search(
+            search_path,
+            request.pattern,
+            file_pattern=request.file_pattern,
+            candidates=candidates,
+        )
+    
+    search = await asyncio.to_thread(run)
+    results = [str(f.path.relative_to(root)) for f in search.files]
+    
+    return {
+        "pattern": request.pattern,
+        "results": results,
+        "count": len(results),
+        "matches": search.match_count,
+    }
+
+
 @router.get("/download")
 async def download_file(path: str):
     """Download a file."""
@@ -11,6 +11,7 @@ from pydantic import BaseModel
 from opencode.router.engine import RouterEngine, RoutingResult
 from opencode.router.config import RouterConfig, QualityPreference
 from opencode.router.profiler import ModelProfile
+from opencode.router.telemetry import get_sampler
 from opencode.router.vram_monitor import VRAMMonitor, VRAMStatus
 
 router = APIRouter(prefix="/router", tags=["router"])
@@ -28,11 +29,19 @@ def get_engine() -> RouterEngine:
     return _engine
 
 
+async def close_engine() -> None:
+    """Save the router engine's pending live statistics and drop it."""
+    global _engine
+    if _engine is not None:
+        engine, _engine = _engine, None
+        engine.store.flush()
+
+
 def get_vram_monitor() -> VRAMMonitor:
     """Get or create the VRAM monitor."""
     global _vram_monitor
     if _vram_monitor is None:
-        _vram_monitor = VRAMMonitor()
+        _vram_monitor = VRAMMonitor(sampler=get_sampler())
     return _vram_monitor
 
 
@@ -41,6 +50,9 @@ class RouteRequest(BaseModel):
     """Request to route a prompt."""
     prompt: str
     context: Optional[Dict[str, Any]] = None
+    # Count the request as in flight on the chosen model. Only set this
+    # when the request will be reported to /completions, which ends it
+    track: bool = False
 
 
 class UpdateConfigRequest(BaseModel):
@@ -63,6 +75,14 @@ class RegisterModelRequest(BaseModel):
     context_length: int = 4096
 
 
+class RecordCompletionRequest(BaseModel):
+    """Performance of a completed request (latency_ms is None if it failed)."""
+    model_id: str
+    latency_ms: Optional[float] = None
+    time_to_first_token_ms: Optional[float] = None
+    tokens_generated: int = 0
+
+
 # Routes
 @router.get("/status")
 async def get_status() -> Dict[str, Any]:
@@ -76,6 +96,8 @@ async def route_prompt(request: RouteRequest) -> Dict[str, Any]:
     """Route a prompt to the best model."""
     engine = get_engine()
     result = await engine.route(request.prompt, request.context)
+    if request.track:
+        engine.begin_request(result.model_id)
     return result.to_dict()
 
 
@@ -155,10 +177,10 @@ async def get_model_profile(model_id: str) -> Dict[str, Any]:
 
 
 @router.post("/profile")
-async def profile_all_models() -> Dict[str, Any]:
-    """Profile all registered models."""
+async def profile_all_models(force: bool = False) -> Dict[str, Any]:
+    """Profile registered models that have no stored profile (all with force)."""
     engine = get_engine()
-    profiles = await engine.profile_models()
+    profiles = await engine.profile_models(force=force)
     
     return {
         "profiled": len(profiles),
@@ -166,6 +188,19 @@ async def profile_all_models() -> Dict[str, Any]:
     }
 
 
+@router.post("/completions")
+async def record_completion(request: RecordCompletionRequest) -> Dict[str, str]:
+    """Finish a routed request, recording its latency and speed."""
+    engine = get_engine()
+    engine.end_request(
+        request.model_id,
+        latency_ms=request.latency_ms,
+        time_to_first_token_ms=request.time_to_first_token_ms,
+        tokens_generated=request.tokens_generated,
+    )
+    return {"status": "recorded"}
+
+
 @router.get("/config")
 async def get_config() -> Dict[str, Any]:
     """Get current router configuration."""
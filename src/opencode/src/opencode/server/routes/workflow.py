@@ -28,6 +28,14 @@ def get_engine() -> WorkflowEngine:
     return _engine
 
 
+async def close_engine() -> None:
+    """Close the workflow engine, releasing its pooled HTTP connections."""
+    global _engine
+    if _engine is not None:
+        engine, _engine = _engine, None
+        await engine.close()
+
+
 # Request/Response Models
 class CreateWorkflowRequest(BaseModel):
     """Request to create a new workflow."""
@@ -12,6 +12,12 @@ from pathlib import Path
 import tempfile
 import os
 
+# The project root holds an older opencode package copy with its own
+# __init__.py; when only some test modules are selected, pytest's package
+# setup for that directory would import it as ``opencode``. Importing the
+# package under test first (``src`` is on pythonpath) pins the name to it.
+import opencode  # noqa: F401
+
 # Configure asyncio for pytest
 pytest_plugins = ('pytest_asyncio',)
 
@@ -473,6 +479,20 @@ def mock_mode():
     return MockMode
 
 
+# ============================================================================
+# Shared State Isolation
+# ============================================================================
+
+@pytest.fixture(autouse=True)
+def reset_provider_pool():
+    """Keep pooled providers and cached config from leaking between tests."""
+    from opencode.provider.pool import get_provider_pool
+    
+    get_provider_pool().clear()
+    yield
+    get_provider_pool().clear()
+
+
 # ============================================================================
 # Marker Registration
 # ============================================================================
@@ -0,0 +1,130 @@
+"""Tests for indexed hunk location and diff rendering in apply_patch."""
+
+import difflib
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from opencode.tool.apply_patch import (
+    AmbiguousMatchError,
+    LineIndex,
+    UpdateFileChunk,
+    apply_replacements,
+    compute_replacements,
+    derive_new_contents_from_chunks,
+    diff_from_replacements,
+    seek_sequence,
+)
+
+
+class TestLineIndex:
+    """Tests for LineIndex lookups."""
+
+    def test_matches_naive_scan(self):
+        """Test the first match agrees with a brute-force scan."""
+        rng = random.Random(5)
+        haystack = [rng.choice(["a", "b", "c", ""]) for _ in range(300)]
+        index = LineIndex(haystack)
+        for _ in range(200):
+            needle = [rng.choice(["a", "b", "c", ""]) for _ in range(rng.randint(1, 4))]
+            start = rng.randint(0, 300)
+            expected = next(
+                (i for i in range(start, len(haystack) - len(needle) + 1) if haystack[i:i + len(needle)] == needle),
+                -1,
+            )
+            assert index.seek(needle, start) == expected
+
+    def test_end_of_file_prefers_last_lines(self):
+        """Test end-of-file hunks match the final lines over earlier copies."""
+        haystack = ["}", "x", "}", "y", "}"]
+        assert seek_sequence(haystack, ["}"], 0, is_end_of_file=True) == 4
+        assert seek_sequence(haystack, ["}"], 0) == 0
+
+    def test_whitespace_fallbacks(self):
+        """Test trailing, surrounding and internal whitespace differences still match."""
+        haystack = ["def f():", "    return  a +  b   ", "x = 1"]
+        assert seek_sequence(haystack, ["    return  a +  b"]) == 1
+        assert seek_sequence(haystack, ["return  a +  b"]) == 1
+        assert seek_sequence(haystack, ["return a + b"]) == 1
+        assert seek_sequence(haystack, ["return a - b"]) == -1
+
+    def test_exact_match_beats_fuzzy(self):
+        """Test an exact match later in the file wins over an earlier loose one."""
+        haystack = ["  value = 1", "value = 1"]
+        assert seek_sequence(haystack, ["value = 1"]) == 1
+
+    def test_ambiguous_fuzzy_match_lists_candidates(self):
+        """Test several loose candidates raise with their line numbers."""
+        haystack = ["if x:", "    pass", "if y:", "\tpass", "end"]
+        with pytest.raises(AmbiguousMatchError) as exc_info:
+            seek_sequence(haystack, ["pass"])
+        assert exc_info.value.candidates == [1, 3]
+        assert "lines 2, 4" in str(exc_info.value)
+
+        with pytest.raises(ValueError):
+            compute_replacements(haystack, "test.py", [UpdateFileChunk(old_lines=["pass"], new_lines=["return"])])
+
+        chunk = UpdateFileChunk(old_lines=["pass"], new_lines=["return"], change_context="if y:")
+        assert compute_replacements(haystack, "test.py", [chunk]) == [(3, 1, ["return"])]
+
+
+class TestDiffFromReplacements:
+    """Tests for diff_from_replacements."""
+
+    @pytest.mark.parametrize("trailing_newline", [True, False])
+    def test_matches_difflib(self, trailing_newline):
+        """Test the rendered diff is identical to difflib's for the same edit."""
+        rng = random.Random(11)
+        for trial in range(300):
+            lines = [f"line {i}" for i in range(rng.randint(1, 40))]
+            replacements = []
+            position = 0
+            while position < len(lines) and rng.random() < 0.7:
+                start = rng.randint(position, min(len(lines) - 1, position + 8))
+                count = rng.randint(0, min(3, len(lines) - start))
+                replacements.append((start, count, [f"new {trial}.{k}" for k in range(rng.randint(0, 3))]))
+                position = start + count + 1
+            if rng.random() < 0.3:
+                replacements.append((len(lines), 0, ["appended"]))
+
+            original = "\n".join(lines) + ("\n" if trailing_newline else "")
+            new_content = "\n".join(apply_replacements(lines, replacements) + [""])
+            expected = "".join(difflib.unified_diff(
+                original.splitlines(keepends=True),
+                new_content.splitlines(keepends=True),
+                fromfile="f.py",
+                tofile="f.py",
+            ))
+            assert diff_from_replacements(lines, replacements, "f.py", trailing_newline) == expected
+
+    def test_no_changes(self):
+        """Test replacements that change nothing render no diff."""
+        assert diff_from_replacements(["a", "b"], [(0, 1, ["a"])], "f.py") == ""
+
+
+class TestLargePatch:
+    """Tests for patches against large files."""
+
+    def test_many_hunks_on_large_file(self):
+        """Test hundreds of hunks apply to a large generated file quickly."""
+        lines = [f"    value_{i} = compute({i}, {i % 13})" for i in range(100000)]
+        chunks = [
+            UpdateFileChunk(old_lines=lines[i:i + 3], new_lines=[lines[i], "    changed = True", lines[i + 2]])
+            for i in range(0, 100000, 500)
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = Path(tmpdir, "generated.py")
+            file_path.write_text("\n".join(lines) + "\n")
+
+            started = time.perf_counter()
+            diff, new_content = derive_new_contents_from_chunks(str(file_path), chunks)
+            elapsed = time.perf_counter() - started
+
+        new_lines = new_content.split("\n")
+        assert new_lines.count("    changed = True") == len(chunks)
+        assert new_lines[1] == "    changed = True"
+        assert diff.count("@@ -") == len(chunks)
+        assert elapsed < 2.0
@@ -7,8 +7,10 @@ Unit tests for the LLM checker calibration manager.
 import pytest
 from pathlib import Path
 from unittest.mock import AsyncMock, patch, MagicMock
+import asyncio
 import tempfile
 import json
+import statistics
 
 from opencode.llmchecker.calibration.manager import CalibrationManager
 from opencode.llmchecker.calibration.models import (
@@ -16,10 +18,13 @@ from opencode.llmchecker.calibration.models import (
     CalibrationPolicy,
     CalibrationObjective,
     CalibrationStatus,
+    CalibrationSchedule,
     PromptSuiteEntry,
     CalibrationRun,
     ModelCalibrationResult,
     RoutingRule,
+    percentile,
+    relative_ci_width,
 )
 
 
@@ -223,7 +228,7 @@ class TestRunCalibration(TestCalibrationManager):
         mock_response = MagicMock()
         mock_response.content = "Test response"
         mock_response.tokens_per_second = 50.0
-        mock_response.total_time = 1.0
+        mock_response.total_time_seconds = 1.0
         mock_response.prompt_eval_count = 10
         mock_response.eval_count = 20
         mock_ollama_client.generate.return_value = mock_response
@@ -239,7 +244,115 @@ class TestRunCalibration(TestCalibrationManager):
         )
         
         assert result.status == CalibrationStatus.COMPLETED
-        mock_ollama_client.generate.assert_called_once()
+        # One warm-up, then the minimum samples since latency is constant
+        assert mock_ollama_client.generate.call_count == 4
+        assert len(result.model_results[0].runs) == 3
+
+
+class TestCalibrationSchedule(TestCalibrationManager):
+    """Tests for warm-up, repetition and concurrency during calibration."""
+    
+    @staticmethod
+    def make_response(total_time: float, load_time: float = 0.0) -> MagicMock:
+        response = MagicMock()
+        response.content = "Test response"
+        response.tokens_per_second = 20.0 / total_time
+        response.total_time_seconds = total_time + load_time
+        response.prompt_eval_duration = 0
+        response.eval_duration = int(total_time * 1e9)
+        response.load_duration = int(load_time * 1e9)
+        response.eval_count = 20
+        return response
+    
+    @pytest.mark.asyncio
+    async def test_warmup_excluded_from_stats(self, manager, mock_ollama_client):
+        """Test the warm-up run's load time does not count as a sample."""
+        responses = [self.make_response(1.0, load_time=30.0)]
+        responses += [self.make_response(1.0) for _ in range(3)]
+        mock_ollama_client.generate.side_effect = responses
+        
+        result = await manager.run_calibration(
+            models=["model1"],
+            prompt_suite=[PromptSuiteEntry(prompt="Test", task="test")],
+        )
+        
+        model_result = result.model_results[0]
+        assert model_result.warmup_seconds == 31.0
+        assert model_result.p95_latency == 1.0
+        assert len(model_result.runs) == 3
+    
+    @pytest.mark.asyncio
+    async def test_repeats_until_confident(self, manager, mock_ollama_client):
+        """Test noisy prompts are repeated up to the sample limit."""
+        latencies = [1.0, 3.0, 1.0, 3.0, 1.0, 3.0]
+        mock_ollama_client.generate.side_effect = [
+            self.make_response(t) for t in latencies
+        ]
+        schedule = CalibrationSchedule(warmup_runs=0, max_samples=6)
+        
+        result = await manager.run_calibration(
+            models=["model1"],
+            prompt_suite=[PromptSuiteEntry(prompt="Test", task="test")],
+            schedule=schedule,
+        )
+        
+        model_result = result.model_results[0]
+        assert len(model_result.runs) == 6
+        assert model_result.p50_latency == 2.0
+        assert model_result.p95_latency == 3.0
+    
+    @pytest.mark.asyncio
+    async def test_budget_stops_sampling(self, manager, mock_ollama_client):
+        """Test an exhausted time budget stops repetition."""
+        mock_ollama_client.generate.side_effect = lambda **kwargs: self.make_response(
+            float(mock_ollama_client.generate.call_count)
+        )
+        schedule = CalibrationSchedule(warmup_runs=0, max_samples=10, budget_seconds=0)
+        
+        result = await manager.run_calibration(
+            models=["model1"],
+            prompt_suite=[PromptSuiteEntry(prompt="Test", task="test")],
+            schedule=schedule,
+        )
+        
+        assert len(result.model_results[0].runs) == 1
+    
+    @pytest.mark.asyncio
+    async def test_models_grouped_and_concurrency_bounded(self, manager, mock_ollama_client):
+        """Test models never interleave and prompts share the allowed slots."""
+        calls = []
+        active = 0
+        peak = 0
+        
+        async def generate(model, prompt, options=None):
+            nonlocal active, peak
+            calls.append(model)
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return self.make_response(1.0)
+        
+        mock_ollama_client.generate.side_effect = generate
+        prompt_suite = [PromptSuiteEntry(prompt=f"Test {i}", task="test") for i in range(4)]
+        schedule = CalibrationSchedule(warmup_runs=1, concurrency=2)
+        
+        result = await manager.run_calibration(
+            models=["model1", "model2"],
+            prompt_suite=prompt_suite,
+            schedule=schedule,
+        )
+        
+        assert calls == ["model1"] * 13 + ["model2"] * 13
+        assert peak == 2
+        assert all(len(mr.runs) == 12 for mr in result.model_results)
+    
+    def test_concurrency_defaults_to_server_setting(self, manager, monkeypatch):
+        """Test the server's parallelism is used when none is configured."""
+        monkeypatch.setenv("OLLAMA_NUM_PARALLEL", "4")
+        assert manager._concurrency(CalibrationSchedule()) == 4
+        monkeypatch.delenv("OLLAMA_NUM_PARALLEL")
+        assert manager._concurrency(CalibrationSchedule()) == 1
 
 
 class TestGeneratePolicy(TestCalibrationManager):
@@ -394,6 +507,24 @@ class TestModelCalibrationResult:
         
         assert result.avg_tokens_per_second == 55.0
         assert result.avg_quality_score == 85.0
+    
+    def test_percentile(self):
+        """Test percentiles interpolate between samples."""
+        assert percentile([], 50) == 0.0
+        assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+        assert percentile([1.0, 2.0], 95) == pytest.approx(1.95)
+    
+    def test_relative_ci_width_never_understates_t(self):
+        """Test untabulated degrees of freedom use a t value at least as large as the true one."""
+        def t_used(n):
+            values = [1.0, 3.0] * (n // 2) + [2.0] * (n % 2)
+            return relative_ci_width(values) * statistics.fmean(values) * n ** 0.5 / statistics.stdev(values)
+        
+        assert relative_ci_width([1.0]) == float("inf")
+        assert t_used(12) == pytest.approx(2.201)  # df = 11
+        assert t_used(36) == pytest.approx(2.042)  # df = 35 falls back to df = 30
+        assert t_used(500) == pytest.approx(1.980)
 
 
 class TestCalibrationResult:
@@ -0,0 +1,138 @@
+"""
+Startup benchmark and lazy loading tests for the CLI.
+
+Imports are measured in fresh interpreters, since the test process has
+already imported most of the package.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+import opencode
+from opencode.cli.main import SUBCOMMANDS, app
+
+# Budget for `import opencode.cli.main`, the work behind `opencode --version`.
+# Checked only by the opt-in benchmark, since timings depend on the machine
+IMPORT_BUDGET_MS = 100
+
+HEAVY_MODULES = [
+    "asyncio",
+    "fastapi",
+    "sqlalchemy",
+    "opencode.core.config",
+    "opencode.cli.commands.rag",
+    "opencode.provider.anthropic",
+]
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter that imports this opencode package."""
+    env = dict(os.environ, PYTHONPATH=str(Path(opencode.__file__).parent.parent))
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of a module reported by -X importtime."""
+    result = run_python(f"import {module}", "-X", "importtime")
+    for line in result.stderr.splitlines():
+        if line.rstrip().endswith(f"| {module}"):
+            return int(line.split("|")[1]) / 1000
+    raise AssertionError(f"{module} missing from importtime output:\n{result.stderr}")
+
+
+@pytest.mark.unit
+class TestCLIStartup:
+    """Tests for CLI startup cost."""
+    
+    def test_main_import_skips_heavy_modules(self):
+        """Test importing the CLI does not import subcommands or their dependencies."""
+        code = (
+            "import json, sys\n"
+            "import opencode.cli.main\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+        )
+        result = run_python(code)
+        
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout) == []
+    
+    @pytest.mark.benchmark
+    @pytest.mark.skipif(
+        not os.environ.get("OPENCODE_BENCHMARK"),
+        reason="wall-clock benchmark; set OPENCODE_BENCHMARK=1 to run",
+    )
+    def test_main_import_budget(self):
+        """Test the CLI imports within the startup budget (best of three runs)."""
+        elapsed = min(import_time_ms("opencode.cli.main") for _ in range(3))
+        
+        assert elapsed < IMPORT_BUDGET_MS, f"import took {elapsed:.0f} ms"
+    
+    def test_version(self):
+        """Test --version in a fresh interpreter."""
+        result = run_python("from opencode.cli.main import app; app(['--version'])")
+        
+        assert result.returncode == 0, result.stderr
+        assert opencode.__version__ in result.stdout
+
+
+@pytest.mark.unit
+class TestLazySubcommands:
+    """Tests for lazily loaded subcommand groups."""
+    
+    def test_help_lists_lazy_subcommands_without_importing(self):
+        """Test --help lists every subcommand group without importing one."""
+        code = (
+            "import sys\n"
+            "from opencode.cli.main import app\n"
+            "try:\n"
+            "    app(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('LOADED' if 'opencode.cli.commands.rag' in sys.modules else 'LAZY')"
+        )
+        result = run_python(code)
+        
+        assert result.returncode == 0, result.stderr
+        for name in SUBCOMMANDS:
+            assert name in result.stdout
+        assert result.stdout.strip().endswith("LAZY")
+    
+    def test_subcommand_resolved_on_invocation(self):
+        """Test invoking a lazy group runs its real commands."""
+        result = CliRunner().invoke(app, ["local-llm", "--help"])
+        
+        assert result.exit_code == 0
+        assert "list" in result.output
+    
+    def test_unknown_command(self):
+        """Test unknown commands still fail."""
+        result = CliRunner().invoke(app, ["no-such-command"])
+        
+        assert result.exit_code != 0
+    
+    def test_package_attributes_are_lazy(self):
+        """Test package __init__ attributes import on first access."""
+        code = (
+            "import sys\n"
+            "import opencode, opencode.provider, opencode.tool\n"
+            "assert 'opencode.core.config' not in sys.modules\n"
+            "assert 'opencode.provider.anthropic' not in sys.modules\n"
+            "assert opencode.Config.__name__ == 'Config'\n"
+            "assert opencode.provider.AnthropicProvider.__name__ == 'AnthropicProvider'\n"
+            "assert opencode.tool.BashTool.__name__ == 'BashTool'\n"
+        )
+        result = run_python(code)
+        
+        assert result.returncode == 0, result.stderr
@@ -0,0 +1,191 @@
+"""Tests for Coordinator scheduling, completion and retention."""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from opencode.core.orchestration.agent import Agent, AgentDescription
+from opencode.core.orchestration.coordinator import (
+    CoordinatedTask,
+    Coordinator,
+    CoordinatorConfig,
+    TaskStatus,
+    TaskTable,
+)
+from opencode.core.orchestration.registry import AgentRegistry
+
+
+def make_agent(agent_id: str, handler, priority: int = 0, max_concurrent: int = 1) -> Agent:
+    return Agent(
+        description=AgentDescription(
+            agent_id=agent_id,
+            name=agent_id,
+            description=f"{agent_id} agent",
+            priority=priority,
+            max_concurrent_tasks=max_concurrent,
+        ),
+        handler=handler,
+    )
+
+
+class TestTaskTable:
+    """Tests for the status-indexed task table."""
+
+    def test_status_index(self):
+        """Test inserts, status changes and deletes keep the index current."""
+        table = TaskTable()
+        table["a"] = CoordinatedTask(task_id="a", prompt="a")
+        table["b"] = CoordinatedTask(task_id="b", prompt="b", status=TaskStatus.RUNNING)
+        assert [t.task_id for t in table.with_status(TaskStatus.PENDING)] == ["a"]
+
+        table.set_status(table["a"], TaskStatus.COMPLETED)
+        table.set_status(table["b"], TaskStatus.FAILED)
+        assert table.count(TaskStatus.PENDING) == 0
+        assert table.finished_count == 2
+        assert table.oldest_finished() == "a"
+
+        del table["a"]
+        assert table.finished_count == 1
+        assert [t.task_id for t in table.with_status(TaskStatus.COMPLETED, TaskStatus.FAILED)] == ["b"]
+
+
+class TestCoordinatorScheduling:
+    """Tests for event-driven dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_wait_wakes_on_completion(self):
+        """Test waiters are woken as soon as a task finishes."""
+        release = asyncio.Event()
+
+        async def handler(task):
+            await release.wait()
+            return task.prompt.upper()
+
+        registry = AgentRegistry()
+        registry.register(make_agent("worker", handler))
+        coordinator = Coordinator(registry)
+        await coordinator.start()
+        try:
+            task_id = await coordinator.submit("hello")
+            waiters = [asyncio.create_task(coordinator.wait_for_result(task_id)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+
+            started = time.perf_counter()
+            release.set()
+            results = await asyncio.gather(*waiters)
+            assert time.perf_counter() - started < 0.05
+            assert {r.result for r in results} == {"HELLO"}
+        finally:
+            await coordinator.stop()
+
+    @pytest.mark.asyncio
+    async def test_priority_order_and_agent_limit(self):
+        """Test queued tasks start by priority without exceeding the agent's limit."""
+        order, active, peak = [], [0], [0]
+
+        async def handler(task):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            order.append(task.prompt)
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+
+        registry = AgentRegistry()
+        registry.register(make_agent("worker", handler, max_concurrent=2))
+        coordinator = Coordinator(registry)
+        ids = [
+            await coordinator.submit(name, priority=priority)
+            for name, priority in [("low", 0), ("high", 5), ("mid", 1), ("low2", 0)]
+        ]
+        await coordinator.start()
+        try:
+            for task_id in ids:
+                assert (await coordinator.wait_for_result(task_id, timeout=5)).status == TaskStatus.COMPLETED
+        finally:
+            await coordinator.stop()
+
+        assert order == ["high", "mid", "low", "low2"]
+        assert peak[0] == 2
+
+    @pytest.mark.asyncio
+    async def test_alternative_agent_takes_over(self):
+        """Test an idle alternative agent runs work queued for a busy one."""
+        ran_on = {}
+
+        def handler_for(agent_id):
+            async def handler(task):
+                ran_on[task.prompt] = agent_id
+                await asyncio.sleep(0.05)
+            return handler
+
+        registry = AgentRegistry()
+        registry.register(make_agent("primary", handler_for("primary"), priority=10))
+        registry.register(make_agent("helper", handler_for("helper")))
+        coordinator = Coordinator(registry)
+        ids = [await coordinator.submit(f"task {i}") for i in range(4)]
+        await coordinator.start()
+        try:
+            tasks = [await coordinator.wait_for_result(task_id, timeout=5) for task_id in ids]
+        finally:
+            await coordinator.stop()
+
+        assert set(ran_on.values()) == {"primary", "helper"}
+        stolen = [t for t in tasks if t.routing_result.agent_id == "helper"]
+        assert stolen and all("taken over" in t.routing_result.routing_reason for t in stolen)
+
+    @pytest.mark.asyncio
+    async def test_cancel_pending_task_is_skipped(self):
+        """Test a cancelled queued task is never started and wakes its waiter."""
+        started = []
+
+        async def handler(task):
+            started.append(task.prompt)
+
+        registry = AgentRegistry()
+        registry.register(make_agent("worker", handler))
+        coordinator = Coordinator(registry)
+        keep = await coordinator.submit("keep")
+        drop = await coordinator.submit("drop")
+        waiter = asyncio.create_task(coordinator.wait_for_result(drop, timeout=5))
+        await asyncio.sleep(0)
+        assert await coordinator.cancel_task(drop) is True
+        assert (await waiter).status == TaskStatus.CANCELLED
+
+        await coordinator.start()
+        try:
+            await coordinator.wait_for_result(keep, timeout=5)
+        finally:
+            await coordinator.stop()
+        assert started == ["keep"]
+
+
+class TestCoordinatorRetention:
+    """Tests for bounded retention of finished tasks."""
+
+    @pytest.mark.asyncio
+    async def test_finished_tasks_spill_to_disk(self):
+        """Test old finished tasks leave memory but stay retrievable."""
+        async def handler(task):
+            return f"result of {task.prompt}"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = AgentRegistry()
+            registry.register(make_agent("worker", handler))
+            config = CoordinatorConfig(max_finished_tasks=2, spill_path=str(Path(tmpdir, "tasks.jsonl")))
+            coordinator = Coordinator(registry, config)
+            await coordinator.start()
+            try:
+                ids = [(await coordinator.submit_and_wait(f"job {i}")).task_id for i in range(5)]
+            finally:
+                await coordinator.stop()
+
+            assert len(coordinator.get_all_tasks()) == 2
+            assert coordinator.get_stats()["spilled"] == 3
+            for i, task_id in enumerate(ids):
+                task = coordinator.get_task(task_id)
+                assert task.status == TaskStatus.COMPLETED
+                assert task.result == f"result of job {i}"
+            assert (await coordinator.wait_for_result(ids[0])).result == "result of job 0"
@@ -0,0 +1,211 @@
+"""
+Tests for the columnar CSV/Array engine and the pipeline operation.
+"""
+
+import numpy as np
+import pytest
+
+from opencode.workflow.tools.columnar import ColumnarTable, LazyFrame
+from opencode.workflow.tools.csv_array import CsvArrayTool
+
+
+CSV_DATA = (
+    "name,city,age,salary,active\n"
+    "Ann,NY,34,100.5,true\n"
+    "Bob,LA,28,80,false\n"
+    "Cid,NY,45,120,true\n"
+    "Dee,SF,30,95.5,true\n"
+    "Eve,LA,52,,false\n"
+)
+
+
+class TestColumnarTable:
+    """Tests for ColumnarTable construction."""
+
+    @pytest.mark.unit
+    def test_from_csv_infers_column_types(self):
+        """Test numeric and boolean columns become typed arrays."""
+        table = ColumnarTable.from_csv(CSV_DATA, CsvArrayTool()._parse_value)
+        assert len(table) == 5
+        assert table.columns["age"].dtype == np.int64
+        assert table.columns["salary"].dtype == np.float64
+        assert table.columns["active"].dtype == bool
+        assert table.columns["name"].dtype == object
+
+    @pytest.mark.unit
+    def test_from_csv_null_cells_are_invalid(self):
+        """Test empty cells in numeric columns read back as None."""
+        table = ColumnarTable.from_csv(CSV_DATA, CsvArrayTool()._parse_value)
+        records = table.to_records()
+        assert records[4]["salary"] is None
+        assert records[0]["salary"] == 100.5
+
+    @pytest.mark.unit
+    def test_from_csv_short_rows(self):
+        """Test rows shorter than the header leave cells missing."""
+        table = ColumnarTable.from_csv("a,b\n1,x\n2\n", CsvArrayTool()._parse_value)
+        assert table.to_records() == [{"a": 1, "b": "x"}, {"a": 2, "b": None}]
+
+    @pytest.mark.unit
+    def test_from_csv_empty(self):
+        """Test empty input yields an empty table."""
+        table = ColumnarTable.from_csv("", CsvArrayTool()._parse_value)
+        assert len(table) == 0
+        assert table.to_records() == []
+
+    @pytest.mark.unit
+    def test_from_records(self):
+        """Test building a table from an array of objects."""
+        table = ColumnarTable.from_records([{"a": 1, "b": "x"}, {"a": 2}])
+        assert table.columns["a"].dtype == np.int64
+        assert table.to_records() == [{"a": 1, "b": "x"}, {"a": 2, "b": None}]
+
+    @pytest.mark.unit
+    def test_from_records_rejects_non_objects(self):
+        """Test non-dict items are rejected."""
+        with pytest.raises(ValueError):
+            ColumnarTable.from_records([1, 2, 3])
+
+
+class TestLazyFrame:
+    """Tests for LazyFrame plans."""
+
+    def _frame(self) -> LazyFrame:
+        tool = CsvArrayTool()
+        return LazyFrame(ColumnarTable.from_csv(CSV_DATA, tool._parse_value), compare=tool._compare)
+
+    @pytest.mark.unit
+    def test_steps_are_deferred(self):
+        """Test building a plan does not mutate the source frame."""
+        frame = self._frame()
+        filtered = frame.filter("age", "gt", 40)
+        assert frame.steps == []
+        assert len(filtered.steps) == 1
+
+    @pytest.mark.unit
+    def test_fused_filters(self):
+        """Test consecutive filters combine into one result."""
+        result = self._frame().filter("age", "gte", 30).filter("active", "eq", True).collect()
+        assert [r["name"] for r in result] == ["Ann", "Cid", "Dee"]
+
+    @pytest.mark.unit
+    def test_string_filter_falls_back_to_scalar_compare(self):
+        """Test string operators on object columns."""
+        result = self._frame().filter("name", "startswith", "D").collect()
+        assert [r["name"] for r in result] == ["Dee"]
+
+    @pytest.mark.unit
+    def test_sort_descending_is_stable(self):
+        """Test descending sort keeps ties in original order."""
+        result = self._frame().sort("city", reverse=True).collect()
+        assert [r["name"] for r in result] == ["Dee", "Ann", "Cid", "Bob", "Eve"]
+
+    @pytest.mark.unit
+    def test_sort_puts_missing_last(self):
+        """Test rows without a value sort after the rest."""
+        result = self._frame().sort("salary").collect()
+        assert [r["name"] for r in result] == ["Bob", "Dee", "Ann", "Cid", "Eve"]
+
+    @pytest.mark.unit
+    def test_group_keeps_first_appearance_order(self):
+        """Test groups are ordered by first appearance."""
+        result = self._frame().group("city").collect()
+        assert list(result.keys()) == ["NY", "LA", "SF"]
+        assert [r["name"] for r in result["LA"]] == ["Bob", "Eve"]
+
+    @pytest.mark.unit
+    def test_grouped_aggregates(self):
+        """Test per-group sum, avg, count, min and max."""
+        frame = self._frame().group("city")
+        assert frame.aggregate("sum", "salary").collect() == {"NY": 220.5, "LA": 80.0, "SF": 95.5}
+        assert frame.aggregate("avg", "age").collect() == {"NY": 39.5, "LA": 40.0, "SF": 30.0}
+        assert frame.aggregate("count").collect() == {"NY": 2, "LA": 2, "SF": 1}
+        assert frame.aggregate("max", "age").collect() == {"NY": 45, "LA": 52, "SF": 30}
+        assert frame.aggregate("min", "name").collect() == {"NY": "Ann", "LA": "Bob", "SF": "Dee"}
+
+    @pytest.mark.unit
+    def test_aggregate_must_be_last(self):
+        """Test steps after an aggregation are rejected."""
+        with pytest.raises(ValueError):
+            self._frame().aggregate("sum", "age").sort("age").collect()
+
+    @pytest.mark.unit
+    def test_unknown_field(self):
+        """Test referencing a missing column raises."""
+        with pytest.raises(ValueError):
+            self._frame().filter("missing", "eq", 1).collect()
+
+
+class TestCsvArrayToolPipeline:
+    """Tests for the pipeline operation."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pipeline_parse_filter_group_sum(self):
+        """Test a full pipeline over CSV input."""
+        tool = CsvArrayTool()
+        result = await tool.execute({
+            "operation": "pipeline",
+            "data": CSV_DATA,
+            "options": {
+                "steps": [
+                    {"operation": "filter", "field": "age", "operator": "gte", "value": 30},
+                    {"operation": "group", "field": "city"},
+                    {"operation": "sum", "field": "salary"},
+                ],
+            },
+        })
+        assert result.success is True
+        assert result.data == {"NY": 220.5, "SF": 95.5, "LA": 0.0}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pipeline_matches_row_operations(self):
+        """Test the pipeline agrees with the row-based operations."""
+        tool = CsvArrayTool()
+        rows = tool._parse(CSV_DATA, {})
+        expected = tool._sum(tool._filter(rows, {"field": "active", "operator": "eq", "value": True}), {"field": "age"})
+
+        result = await tool.execute({
+            "operation": "pipeline",
+            "data": rows,
+            "options": {
+                "steps": [
+                    {"operation": "filter", "field": "active", "operator": "eq", "value": True},
+                    {"operation": "sum", "field": "age"},
+                ],
+            },
+        })
+        assert result.success is True
+        assert result.data == expected
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pipeline_sort_and_slice(self):
+        """Test sorting and slicing records."""
+        tool = CsvArrayTool()
+        result = await tool.execute({
+            "operation": "pipeline",
+            "data": CSV_DATA,
+            "options": {
+                "steps": [
+                    {"operation": "sort", "field": "age", "reverse": True},
+                    {"operation": "slice", "end": 2},
+                ],
+            },
+        })
+        assert result.success is True
+        assert [r["name"] for r in result.data] == ["Eve", "Cid"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pipeline_unsupported_step(self):
+        """Test unknown steps fail the operation."""
+        tool = CsvArrayTool()
+        result = await tool.execute({
+            "operation": "pipeline",
+            "data": CSV_DATA,
+            "options": {"steps": [{"operation": "explode"}]},
+        })
+        assert result.success is False
+        assert "explode" in result.error
@@ -263,7 +263,7 @@ class TestDataSourceNode:
             httpx.AsyncClient = MagicMock()
             
             async_cm = AsyncMock()
-            async_cm.get = AsyncMock(return_value=mock_response)
+            async_cm.request = AsyncMock(return_value=mock_response)
             async_cm.__aenter__ = AsyncMock(return_value=async_cm)
             async_cm.__aexit__ = AsyncMock(return_value=None)
             httpx.AsyncClient.return_value = async_cm
@@ -291,7 +291,7 @@ class TestDataSourceNode:
             httpx.AsyncClient = MagicMock()
             
             async_cm = AsyncMock()
-            async_cm.get = AsyncMock(return_value=mock_response)
+            async_cm.request = AsyncMock(return_value=mock_response)
             async_cm.__aenter__ = AsyncMock(return_value=async_cm)
             async_cm.__aexit__ = AsyncMock(return_value=None)
             httpx.AsyncClient.return_value = async_cm
@@ -327,7 +327,7 @@ class TestDataSourceNode:
             httpx.AsyncClient = MagicMock()
             
             async_cm = AsyncMock()
-            async_cm.get = AsyncMock(side_effect=Exception("Connection error"))
+            async_cm.request = AsyncMock(side_effect=Exception("Connection error"))
             async_cm.__aenter__ = AsyncMock(return_value=async_cm)
             async_cm.__aexit__ = AsyncMock(return_value=None)
             httpx.AsyncClient.return_value = async_cm
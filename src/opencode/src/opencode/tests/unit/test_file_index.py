@@ -0,0 +1,218 @@
+"""Tests for the shared workspace file index."""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from opencode.tool import file_index as file_index_module
+from opencode.tool.file_index import FileIndex, close_file_indexes, get_file_index, glob_to_regex
+from opencode.tui.widgets.completion import MentionCompletionProvider
+
+
+def make_tree(root: Path, files: list) -> None:
+    """Create empty files under root."""
+    for rel_path in files:
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll until condition() is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return condition()
+
+
+class TestGlobToRegex:
+    """Tests for glob translation."""
+
+    @pytest.mark.parametrize("pattern,path,expected", [
+        ("*.py", "a.py", True),
+        ("*.py", "pkg/a.py", False),
+        ("**/*.py", "a.py", True),
+        ("**/*.py", "pkg/sub/a.py", True),
+        ("pkg/**", "pkg/sub/a.py", True),
+        ("a?.txt", "ab.txt", True),
+        ("[!a]*.txt", "b.txt", True),
+        ("[!a]*.txt", "a.txt", False),
+    ])
+    def test_patterns(self, pattern, path, expected):
+        """Test glob semantics match pathlib's."""
+        assert bool(glob_to_regex(pattern).match(path)) is expected
+
+
+class TestFileIndex:
+    """Tests for FileIndex queries."""
+
+    def _index(self, root: Path) -> FileIndex:
+        make_tree(root, [
+            ".gitignore",
+            "README.md",
+            "src/app.py",
+            "src/widgets/completion.py",
+            "src/widgets/__init__.py",
+            "build/out.py",
+            "node_modules/pkg/index.js",
+        ])
+        (root / ".gitignore").write_text("build/\n")
+        return FileIndex(root, watch=False)
+
+    def test_ignore_rules_applied(self):
+        """Test ignored directories are not indexed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = self._index(Path(tmpdir))
+            assert index.files == [
+                ".gitignore",
+                "README.md",
+                "src/app.py",
+                "src/widgets/__init__.py",
+                "src/widgets/completion.py",
+            ]
+            assert index.dirs == ["src", "src/widgets"]
+
+    def test_glob_with_base(self):
+        """Test glob patterns relative to a base directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = self._index(Path(tmpdir))
+            assert index.glob("**/*.py") == ["src/app.py", "src/widgets/__init__.py", "src/widgets/completion.py"]
+            assert index.glob("*.py", base="src") == ["src/app.py"]
+            assert index.glob("*", base="src", include_dirs=True) == ["src/app.py", "src/widgets"]
+
+    def test_prefix(self):
+        """Test prefix queries."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = self._index(Path(tmpdir))
+            assert index.prefix("src/w") == ["src/widgets/__init__.py", "src/widgets/completion.py"]
+            assert index.prefix("src/w", include_dirs=True, limit=1) == ["src/widgets"]
+
+    def test_search_ranking(self):
+        """Test name prefix, substring and subsequence matches rank in order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = self._index(Path(tmpdir))
+            assert index.search("comp") == ["src/widgets/completion.py"]
+            assert index.search("app")[0] == "src/app.py"
+            assert index.search("swc") == ["src/widgets/completion.py"]
+            assert index.search("wid", include_files=False, include_dirs=True) == ["src/widgets"]
+
+    def test_stale_unwatched_index_is_rebuilt(self):
+        """Test an unwatched index rebuilds once stale."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            index = FileIndex(root, watch=False, stale_after=0.0)
+            assert index.files == []
+            make_tree(root, ["new.py"])
+            time.sleep(0.01)
+            assert index.files == ["new.py"]
+
+
+class TestFileIndexWatching:
+    """Tests for watchdog-driven updates."""
+
+    def test_events_update_index(self):
+        """Test created, moved and deleted paths are reflected."""
+        pytest.importorskip("watchdog")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir).resolve()
+            make_tree(root, ["a.py"])
+            index = FileIndex(root)
+            try:
+                assert index.files == ["a.py"]
+                if not index.is_watching:
+                    pytest.skip("filesystem watching unavailable")
+
+                changes = []
+                index.add_listener(lambda path, change: changes.append((path, change)))
+
+                make_tree(root, ["pkg/b.py"])
+                assert wait_for(lambda: "pkg/b.py" in index.files)
+
+                (root / "pkg").rename(root / "lib")
+                assert wait_for(lambda: index.files == ["a.py", "lib/b.py"])
+                assert index.dirs == ["lib"]
+
+                (root / "a.py").unlink()
+                assert wait_for(lambda: index.files == ["lib/b.py"])
+                assert ("a.py", "deleted") in changes
+            finally:
+                index.close()
+
+
+class TestFileIndexRegistry:
+    """Tests for the shared index registry."""
+
+    def test_shared_and_evicted(self, monkeypatch):
+        """Test indexes are shared per root and evicted least recently used."""
+        monkeypatch.setattr(file_index_module, "MAX_INDEXES", 2)
+        close_file_indexes()
+        with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b, \
+                tempfile.TemporaryDirectory() as c:
+            first = get_file_index(Path(a))
+            assert get_file_index(Path(a)) is first
+            get_file_index(Path(b))
+            get_file_index(Path(c))
+            assert get_file_index(Path(a)) is not first
+        close_file_indexes()
+
+
+class TestMentionCompletionIndex:
+    """Tests for @file completions backed by the index."""
+
+    def test_file_and_dir_mentions(self):
+        """Test @file and @dir completions come from the index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            make_tree(root, ["src/app.py", "node_modules/app.js"])
+            provider = MentionCompletionProvider(workspace_root=tmpdir)
+
+            # The first keystroke starts the build without waiting for it
+            assert provider.get_completions("@file:app", 9, {}) == []
+            assert provider.wait_for_index(timeout=10)
+
+            files = provider.get_completions("@file:app", 9, {})
+            assert [c.text for c in files] == ["@file:src/app.py"]
+
+            dirs = provider.get_completions("@dir:sr", 7, {})
+            assert [c.text for c in dirs] == ["@dir:src"]
+            assert dirs[0].description == "directory"
+            close_file_indexes()
+
+    def test_refresh_runs_off_the_calling_thread(self):
+        """Test refreshing re-walks in the background and serves the old matcher meanwhile."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            make_tree(root, ["src/app.py"])
+            provider = MentionCompletionProvider(workspace_root=tmpdir)
+            provider.refresh_file_cache(root)
+            assert provider.wait_for_index(timeout=10)
+
+            index = get_file_index(root)
+            release = threading.Event()
+            walked_on = []
+            original_refresh = index.refresh
+
+            def slow_refresh():
+                walked_on.append(threading.current_thread())
+                release.wait(10)
+                original_refresh()
+
+            make_tree(root, ["src/apple.py"])
+            with patch.object(index, "refresh", side_effect=slow_refresh):
+                thread = provider.refresh_file_cache(root)
+                stale = provider.get_completions("@file:app", 9, {})
+                release.set()
+                assert provider.wait_for_index(timeout=10)
+
+            assert walked_on == [thread]
+            assert thread is not threading.current_thread()
+            assert "@file:src/app.py" in [c.text for c in stale]
+            fresh = provider.get_completions("@file:apple", 11, {})
+            assert fresh[0].text == "@file:src/apple.py"
+            close_file_indexes()
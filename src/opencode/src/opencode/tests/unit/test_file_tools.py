@@ -413,6 +413,27 @@ class TestGlobTool:
             assert result.success is False
             assert result.error is not None
             assert "access denied" in result.error.lower() or "outside" in result.error.lower()
+    
+    @pytest.mark.asyncio
+    async def test_glob_outside_project_walks_without_index(self):
+        """Test a sandbox-allowed directory outside the project is not indexed or watched."""
+        with tempfile.TemporaryDirectory() as project, tempfile.TemporaryDirectory() as outside:
+            for i in range(5):
+                Path(outside, f"file{i}.py").write_text("")
+            Path(outside, "notes.txt").write_text("")
+            
+            tool = GlobTool(working_directory=Path(project))
+            with patch("opencode.tool.file_tools.is_sandbox_active", return_value=True), \
+                    patch("opencode.tool.file_tools.check_file_access", return_value=(True, None)), \
+                    patch("opencode.tool.file_tools.get_file_index") as mock_index:
+                result = await tool.execute(pattern="*.py", path=outside)
+            
+            mock_index.assert_not_called()
+            assert result.success is True
+            resolved = Path(outside).resolve()
+            assert result.output.splitlines() == [str(resolved / f"file{i}.py") for i in range(5)]
+            # The direct walk stops once it has enough results
+            assert len(GlobTool._walk_glob(resolved, "*.py", 3)) == 3
 
 
 class TestGrepTool:
@@ -372,6 +372,37 @@ class TestSearchFiles:
             data = response.json()
             assert len(data["results"]) >= 2
 
+    def test_search_files_content(self, mock_config, monkeypatch):
+        """Test searching file contents through the trigram index."""
+        from opencode.tool import trigram_index
+        
+        config, tmpdir = mock_config
+        (Path(tmpdir) / "a.py").write_text("def handler(): pass\n")
+        (Path(tmpdir) / "b.py").write_text("handler = None\n")
+        monkeypatch.setattr(trigram_index, "default_index_path", lambda root: Path(tmpdir) / ".git" / "t.db")
+        
+        with patch("opencode.server.routes.files.get_config", return_value=config):
+            app = FastAPI()
+            from opencode.server.routes.files import router
+            app.include_router(router, prefix="/files")
+            client = TestClient(app)
+            
+            response = client.post(
+                "/files/search",
+                json={"pattern": r"def handler\(", "content": True}
+            )
+            
+            assert response.status_code == 200
+            assert response.json()["results"] == ["a.py"]
+            
+            response = client.post(
+                "/files/search",
+                json={"pattern": "[invalid", "content": True}
+            )
+            assert response.status_code == 400
+        
+        trigram_index.close_trigram_indexes()
+
     def test_search_files_not_found(self, mock_config):
         """Test searching in non-existent path."""
         config, tmpdir = mock_config
@@ -0,0 +1,172 @@
+"""Tests for the async git executor."""
+
+import asyncio
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from opencode.tool.git_executor import (
+    GitExecutor,
+    GitTimeoutError,
+    parse_log,
+    parse_status_v2,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def init_repo(root: Path) -> None:
+    """Create a repository with a single commit."""
+    for args in (
+        ["init", "-q", "-b", "main"],
+        ["config", "user.email", "dev@example.com"],
+        ["config", "user.name", "Dev"],
+    ):
+        subprocess.run(["git", *args], cwd=root, check=True)
+    (root / "a.txt").write_text("one\n")
+    subprocess.run(["git", "add", "a.txt"], cwd=root, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", "initial"], cwd=root, check=True)
+
+
+class TestParsers:
+    """Tests for porcelain output parsing."""
+
+    def test_status_v2(self):
+        """Test branch headers, renames and untracked entries."""
+        output = "\0".join([
+            "# branch.oid abc123",
+            "# branch.head main",
+            "# branch.upstream origin/main",
+            "# branch.ab +2 -1",
+            "1 .M N... 100644 100644 100644 h1 h2 src/app.py",
+            "2 R. N... 100644 100644 100644 h1 h2 R100 new name.py",
+            "old.py",
+            "? notes.txt",
+            "",
+        ])
+        status = parse_status_v2(output)
+        assert (status.head, status.branch, status.upstream) == ("abc123", "main", "origin/main")
+        assert (status.ahead, status.behind) == (2, 1)
+        assert [(e.status, e.path, e.orig_path) for e in status.entries] == [
+            (" M", "src/app.py", None),
+            ("R ", "new name.py", "old.py"),
+            ("??", "notes.txt", None),
+        ]
+
+    def test_log(self):
+        """Test log records split on the record separator."""
+        output = "a1\x1fa\x1fDev\x1f100\x1ffix: thing\x1fHEAD -> main, tag: v1\x1e\nb2\x1fb\x1fDev\x1f90\x1finit\x1f\x1e\n"
+        entries = parse_log(output)
+        assert [e.subject for e in entries] == ["fix: thing", "init"]
+        assert entries[0].refs == ["HEAD -> main", "tag: v1"]
+        assert entries[1].refs == []
+
+
+class TestGitExecutor:
+    """Tests for GitExecutor against a real repository."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot(self):
+        """Test status, diff stat and log are collected together."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            init_repo(root)
+            (root / "a.txt").write_text("one\ntwo\n")
+            (root / "b.txt").write_text("new\n")
+
+            snapshot = await GitExecutor().snapshot(root)
+
+            assert snapshot.status.branch == "main"
+            assert [(e.status, e.path) for e in snapshot.status.entries] == [(" M", "a.txt"), ("??", "b.txt")]
+            assert snapshot.diff_stat == {"a.txt": (1, 0)}
+            assert [e.subject for e in snapshot.log] == ["initial"]
+
+    @pytest.mark.asyncio
+    async def test_cache_invalidated_by_index_and_writes(self):
+        """Test cached reads are dropped when the index or HEAD changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            init_repo(root)
+            executor = GitExecutor(cache_ttl=60.0)
+
+            first = await executor.run(root, ["status", "--porcelain"], cache=True)
+            (root / "b.txt").write_text("new\n")
+            # Unstaged edits are within the TTL's tolerated staleness
+            assert await executor.run(root, ["status", "--porcelain"], cache=True) is first
+
+            subprocess.run(["git", "add", "b.txt"], cwd=root, check=True)
+            staged = await executor.run(root, ["status", "--porcelain"], cache=True)
+            assert staged.stdout == "A  b.txt\n"
+
+            await executor.run(root, ["commit", "-q", "-m", "add b"])
+            log = await executor.run(root, ["log", "--format=%s"], cache=True)
+            assert log.stdout.splitlines() == ["add b", "initial"]
+
+    @pytest.mark.asyncio
+    async def test_streaming_lines(self):
+        """Test stdout lines are delivered to the callback."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            init_repo(root)
+            lines = []
+            result = await GitExecutor().run(root, ["log", "--format=%s"], on_line=lines.append, read_only=True)
+            assert result.returncode == 0
+            assert lines == ["initial"]
+
+    @pytest.mark.asyncio
+    async def test_writes_are_serialized(self):
+        """Test concurrent mutating commands on one repository do not race."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            init_repo(root)
+            executor = GitExecutor()
+            results = await asyncio.gather(*(
+                executor.run(root, ["branch", f"feature-{i}"]) for i in range(8)
+            ))
+            assert all(r.returncode == 0 for r in results)
+
+            branches = await executor.run(root, ["branch", "--format=%(refname:short)"], read_only=True)
+            assert len(branches.stdout.splitlines()) == 9
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process(self, monkeypatch):
+        """Test a command exceeding its timeout raises GitTimeoutError."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monkeypatch.setenv("GIT_EDITOR", "sleep 5; true")
+            root = Path(tmpdir)
+            init_repo(root)
+            with pytest.raises(GitTimeoutError):
+                await GitExecutor().run(root, ["commit", "--allow-empty"], timeout=0.2)
+
+    @pytest.mark.asyncio
+    async def test_git_tool_status_and_log(self, monkeypatch):
+        """Test GitTool status sees fresh edits and shares the cached log query."""
+        from opencode.tool import git_executor
+        from opencode.tool.git import GitTool
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            init_repo(root)
+            executor = GitExecutor(cache_ttl=60.0)
+            monkeypatch.setattr(git_executor, "_executor", executor)
+            monkeypatch.chdir(root)
+            tool = GitTool()
+
+            (root / "a.txt").write_text("one\ntwo\n")
+            first = await tool.execute(operation="status")
+            (root / "b.txt").write_text("new\n")
+            second = await tool.execute(operation="status")
+
+            assert "On branch main" in first.output
+            assert "[Modified] a.txt (+1 -0)" in first.output
+            assert "Latest commit:" in first.output and "initial" in first.output
+            assert "[Untracked] b.txt" in second.output
+
+            calls = []
+            monkeypatch.setattr(executor, "_exec", lambda *args, **kwargs: calls.append(args))
+            log = await tool.execute(operation="log")
+            assert "initial" in log.output
+            assert calls == []
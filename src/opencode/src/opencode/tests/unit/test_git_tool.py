@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, patch, AsyncMock
 from pathlib import Path
 
 from opencode.tool.git import GitTool
+from opencode.tool.git_executor import GitResult, GitSnapshot, GitStatus, LogEntry, StatusEntry
 from opencode.tool.base import PermissionLevel, ToolResult
 
 
@@ -44,12 +45,8 @@ class TestGitTool:
         """Test _run_git method."""
         tool = GitTool()
 
-        with patch("subprocess.run") as mock_run:
-            mock_result = MagicMock()
-            mock_result.returncode = 0
-            mock_result.stdout = "output"
-            mock_result.stderr = ""
-            mock_run.return_value = mock_result
+        with patch("opencode.tool.git.get_git_executor") as mock_get:
+            mock_get.return_value.run = AsyncMock(return_value=GitResult(0, "output", ""))
 
             returncode, stdout, stderr = await tool._run_git(Path.cwd(), ["status"])
 
@@ -59,26 +56,41 @@ class TestGitTool:
 
     @pytest.mark.asyncio
     async def test_git_status_success(self):
-        """Test _git_status with successful result."""
-        tool = GitTool()
-
-        with patch.object(tool, '_run_git', new_callable=AsyncMock) as mock_run:
-            # "M " means staged (M followed by space), "??" means untracked
-            mock_run.return_value = (0, "M  file1.py\n?? file2.py\n", "")
+        """Test _git_status renders the snapshot with line counts."""
+        tool = GitTool()
+        snapshot = GitSnapshot(
+            status=GitStatus(
+                head="abc1234def",
+                branch="main",
+                upstream="origin/main",
+                ahead=2,
+                entries=[StatusEntry("M ", "file1.py"), StatusEntry("??", "file2.py")],
+            ),
+            diff_stat={"file1.py": (3, 1)},
+            log=[LogEntry("abc1234def", "abc1234", "dev", 0, "Initial commit", ["HEAD -> main"])],
+        )
+
+        with patch("opencode.tool.git.get_git_executor") as mock_get:
+            mock_get.return_value.snapshot = AsyncMock(return_value=snapshot)
 
             result = await tool._git_status(Path.cwd())
 
+            mock_get.return_value.snapshot.assert_awaited_once_with(Path.cwd(), cache=False)
             assert result.success is True
-            assert "file1.py" in result.output
-            assert "file2.py" in result.output
+            assert "On branch main (tracking origin/main, ahead 2, behind 0)" in result.output
+            assert "[Staged] file1.py (+3 -1)" in result.output
+            assert "[Untracked] file2.py" in result.output
+            assert "Latest commit: abc1234 (HEAD -> main) Initial commit" in result.output
 
     @pytest.mark.asyncio
     async def test_git_status_clean(self):
         """Test _git_status with clean working tree."""
         tool = GitTool()
 
-        with patch.object(tool, '_run_git', new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = (0, "", "")
+        with patch("opencode.tool.git.get_git_executor") as mock_get:
+            mock_get.return_value.snapshot = AsyncMock(
+                return_value=GitSnapshot(status=GitStatus(branch="main"), diff_stat={}, log=[])
+            )
 
             result = await tool._git_status(Path.cwd())
 
@@ -90,8 +102,8 @@ class TestGitTool:
         """Test _git_status with error."""
         tool = GitTool()
 
-        with patch.object(tool, '_run_git', new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = (1, "", "Not a git repository")
+        with patch("opencode.tool.git.get_git_executor") as mock_get:
+            mock_get.return_value.snapshot = AsyncMock(side_effect=RuntimeError("Not a git repository"))
 
             result = await tool._git_status(Path.cwd())
 
@@ -154,23 +166,28 @@ class TestGitTool:
     async def test_git_log_success(self):
         """Test _git_log with successful result."""
         tool = GitTool()
+        entries = [
+            LogEntry("abc123ff", "abc123", "dev", 0, "Commit message", ["HEAD -> main"]),
+            LogEntry("def456ff", "def456", "dev", 0, "Another commit"),
+        ]
 
-        with patch.object(tool, '_run_git', new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = (0, "abc123 Commit message\ndef456 Another commit\n", "")
+        with patch("opencode.tool.git.get_git_executor") as mock_get:
+            mock_get.return_value.log = AsyncMock(return_value=entries)
 
             result = await tool._git_log(Path.cwd(), 10)
 
             assert result.success is True
             assert "Log" in result.output
-            assert "abc123" in result.output
+            assert "abc123 (HEAD -> main) Commit message" in result.output
+            assert "def456 Another commit" in result.output
 
     @pytest.mark.asyncio
     async def test_git_log_no_commits(self):
         """Test _git_log with no commits."""
         tool = GitTool()
 
-        with patch.object(tool, '_run_git', new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = (0, "", "")
+        with patch("opencode.tool.git.get_git_executor") as mock_get:
+            mock_get.return_value.log = AsyncMock(return_value=[])
 
             result = await tool._git_log(Path.cwd(), 10)
 
@@ -182,8 +199,8 @@ class TestGitTool:
         """Test _git_log with error."""
         tool = GitTool()
 
-        with patch.object(tool, '_run_git', new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = (1, "", "Error")
+        with patch("opencode.tool.git.get_git_executor") as mock_get:
+            mock_get.return_value.log = AsyncMock(side_effect=RuntimeError("Error"))
 
             result = await tool._git_log(Path.cwd(), 10)
 
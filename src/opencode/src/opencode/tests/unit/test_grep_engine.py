@@ -0,0 +1,258 @@
+"""Tests for the grep search engine."""
+
+import re
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from opencode.tool.file_tools import GrepTool
+from opencode.tool.grep_engine import (
+    GrepEngine,
+    IgnoreRules,
+    _compile,
+    is_binary_file,
+    search_file,
+    walk_files,
+)
+
+
+def make_tree(root: Path, files: dict) -> None:
+    """Create files (str or bytes content) under root."""
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content)
+
+
+class TestWalkFiles:
+    """Tests for walk_files and IgnoreRules."""
+
+    def test_prunes_default_and_gitignored_dirs(self):
+        """Test ignored directories and files are never yielded."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            make_tree(root, {
+                ".gitignore": "build/\n*.log\n!keep.log\n",
+                "src/main.py": "x",
+                "src/.gitignore": "generated.py\n",
+                "src/generated.py": "x",
+                "build/out.py": "x",
+                "node_modules/pkg/index.js": "x",
+                "debug.log": "x",
+                "keep.log": "x",
+            })
+
+            files = [p.relative_to(root).as_posix() for p in walk_files(root)]
+            assert files == [".gitignore", "keep.log", "src/.gitignore", "src/main.py"]
+
+    def test_gitignore_can_be_disabled(self):
+        """Test respect_gitignore=False keeps gitignored files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            make_tree(root, {".gitignore": "*.log\n", "a.log": "x"})
+
+            ignore = IgnoreRules(root, respect_gitignore=False)
+            assert not ignore.is_ignored("a.log")
+            assert ignore.is_ignored(".git", is_dir=True)
+
+    def test_file_pattern(self):
+        """Test file patterns match names or trailing path components."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            make_tree(root, {"a.py": "", "pkg/b.py": "", "pkg/c.txt": ""})
+
+            assert [p.name for p in walk_files(root, "*.py")] == ["a.py", "b.py"]
+            assert [p.name for p in walk_files(root, "pkg/*.py")] == ["b.py"]
+
+    def test_recursive_file_patterns(self):
+        """Test "**" patterns follow rglob semantics, including top-level files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            make_tree(root, {
+                "a.py": "",
+                "src/b.py": "",
+                "src/deep/c.py": "",
+                "lib/src/d.py": "",
+                "src/e.txt": "",
+            })
+
+            def names(pattern):
+                return sorted(p.relative_to(root).as_posix() for p in walk_files(root, pattern))
+
+            assert names("**/*.py") == ["a.py", "lib/src/d.py", "src/b.py", "src/deep/c.py"]
+            assert names("src/**/*.py") == ["lib/src/d.py", "src/b.py", "src/deep/c.py"]
+            assert names("src/*.py") == ["lib/src/d.py", "src/b.py"]
+
+
+class TestSearchFile:
+    """Tests for single-file search."""
+
+    def test_context_and_line_numbers(self):
+        """Test matches carry line numbers and context lines."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "f.txt")
+            path.write_text("one\ntwo\nthree target\nfour\nfive\n")
+
+            matches = search_file(path, "target", context=1)
+            assert len(matches) == 1
+            assert matches[0].line_number == 3
+            assert matches[0].before == ["two"]
+            assert matches[0].line == "three target"
+            assert matches[0].after == ["four"]
+
+    def test_anchors_apply_per_line(self):
+        """Test ^ and $ match at line boundaries in the whole-buffer scan."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "f.py")
+            path.write_text("x = 1\ndef foo():\n    def bar(): pass\n")
+
+            assert [m.line_number for m in search_file(path, r"^def")] == [2]
+            assert [m.line_number for m in search_file(path, r"pass$")] == [3]
+
+    def test_one_match_per_line(self):
+        """Test several hits on one line report the line once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "f.txt")
+            path.write_text("aaa\nbab\n")
+
+            assert [m.line_number for m in search_file(path, "a")] == [1, 2]
+
+    def test_binary_and_empty_files_are_skipped(self):
+        """Test files with NUL bytes and empty files yield no matches."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            binary = Path(tmpdir, "blob.bin")
+            binary.write_bytes(b"match\x00\x01\x02")
+            empty = Path(tmpdir, "empty.txt")
+            empty.write_text("")
+
+            assert is_binary_file(binary)
+            assert search_file(binary, "match") == []
+            assert search_file(empty, "match") == []
+
+    def test_unicode_escape_pattern(self):
+        """Test str-only escapes fall back to a decoded search."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "f.txt")
+            path.write_text("plain\ncafé\n", encoding="utf-8")
+
+            assert [m.line for m in search_file(path, r"caf\u00e9")] == ["café"]
+
+    def test_non_ascii_content_matches_like_str_regex(self):
+        """Test Unicode-aware patterns match non-ASCII text as re does on str."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "f.txt")
+            path.write_text("café\nÉCOLE\nnaïve\n", encoding="utf-8")
+
+            def lines(pattern, flags=0):
+                return [m.line for m in search_file(path, pattern, flags)]
+
+            assert lines(r"caf\w\b") == ["café"]
+            assert lines("école", re.IGNORECASE) == ["ÉCOLE"]
+            assert lines("na[ïx]ve") == ["naïve"]
+            assert lines(r"^\w+$") == ["café", "ÉCOLE", "naïve"]
+            assert lines("na.ve") == ["naïve"]
+            assert lines("caf[^x]$") == ["café"]
+            assert lines("CAF", re.IGNORECASE) == ["café"]
+
+    def test_ascii_literal_patterns_search_bytes(self):
+        """Test only patterns that match bytes like text use the bytes fast path."""
+        assert isinstance(_compile(r"^def \(", 0).pattern, bytes)
+        assert isinstance(_compile("a|b[xy]", 0).pattern, bytes)
+        for pattern, flags in ((r"\w+", 0), ("x", re.IGNORECASE), ("a.b", 0), ("[^a]", 0), ("(?i)x", 0), ("é", 0)):
+            assert isinstance(_compile(pattern, flags).pattern, str)
+
+
+class TestGrepEngine:
+    """Tests for GrepEngine."""
+
+    def _tree(self, root: Path) -> None:
+        make_tree(root, {f"dir{i // 10}/file{i:03d}.txt": f"line\nneedle {i}\n" for i in range(200)})
+
+    def test_results_follow_walk_order(self):
+        """Test parallel search returns files in walk order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._tree(root)
+
+            result = GrepEngine(max_workers=4).search(root, "needle")
+            paths = [f.path.relative_to(root).as_posix() for f in result.files]
+            assert paths == sorted(paths)
+            assert result.match_count == 200
+            assert result.files_searched == 200
+            assert not result.truncated
+
+    def test_stops_at_max_results(self):
+        """Test the search terminates early once enough matches are found."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._tree(root)
+
+            result = GrepEngine(max_workers=2).search(root, "needle", max_results=5)
+            assert result.match_count == 5
+            assert result.truncated
+            assert [f.path.name for f in result.files] == [f"file{i:03d}.txt" for i in range(5)]
+            assert result.files_searched < 200
+
+    def test_process_pool(self):
+        """Test the process pool backend finds the same matches."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._tree(root)
+
+            result = GrepEngine(max_workers=2, use_processes=True).search(root, r"needle 1\d\b")
+            assert result.match_count == 10
+
+
+class TestGrepToolEngine:
+    """Tests for GrepTool running on the engine."""
+
+    @pytest.mark.asyncio
+    async def test_output_and_metadata(self):
+        """Test output format, match count and gitignore handling."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            make_tree(root, {
+                ".gitignore": "ignored/\n",
+                "a.py": "first\nhit here\nlast\n",
+                "ignored/b.py": "hit here\n",
+            })
+
+            tool = GrepTool(working_directory=root)
+            result = await tool.execute(pattern="hit", context=1)
+
+            assert result.success is True
+            assert result.output.splitlines() == ["a.py:1:  first", "a.py:2:> hit here", "a.py:3:  last"]
+            assert result.metadata["matches"] == 1
+            assert result.metadata["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_max_results(self):
+        """Test max_results truncates the search."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            make_tree(root, {"a.txt": "hit\n" * 10})
+
+            tool = GrepTool(working_directory=root)
+            result = await tool.execute(pattern="hit", context=0, max_results=3)
+
+            assert result.metadata["matches"] == 3
+            assert result.metadata["truncated"] is True
+            assert "stopped after 3 matches" in result.output
+
+    @pytest.mark.asyncio
+    async def test_recursive_file_pattern(self):
+        """Test a "dir/**" file pattern finds files at every depth below dir."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            make_tree(root, {"top.py": "hit\n", "src/a.py": "hit\n", "src/pkg/b.py": "hit\n"})
+
+            tool = GrepTool(working_directory=root)
+            result = await tool.execute(pattern="hit", context=0, file_pattern="src/**/*.py")
+
+            assert result.metadata["matches"] == 2
+            assert "src/a.py" in result.output
+            assert "src/pkg/b.py" in result.output
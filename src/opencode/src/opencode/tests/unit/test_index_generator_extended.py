@@ -6,6 +6,8 @@ Tests for IndexGenerator class methods for 100% coverage.
 
 import json
 import os
+import shutil
+import subprocess
 import tempfile
 import time
 from pathlib import Path
@@ -295,9 +297,7 @@ class TestIndexGeneratorGitInfo:
     def test_get_git_info_success(self, mock_run):
         """Test successful git info retrieval."""
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout="main\n"),
-            MagicMock(returncode=0, stdout="abc123\n"),
-            MagicMock(returncode=0, stdout="2024-01-01 12:00:00\n"),
+            MagicMock(returncode=0, stdout="abc123\n2024-01-01 12:00:00\nHEAD -> main, origin/main\n"),
         ]
         
         generator = IndexGenerator()
@@ -312,8 +312,6 @@ class TestIndexGeneratorGitInfo:
         """Test git info retrieval failure."""
         mock_run.side_effect = [
             MagicMock(returncode=1, stdout=""),
-            MagicMock(returncode=1, stdout=""),
-            MagicMock(returncode=1, stdout=""),
         ]
         
         generator = IndexGenerator()
@@ -887,3 +885,87 @@ class TestIndexGeneratorGenerate:
             assert index.project_type == ProjectType.PYTHON
             assert index.directory_tree != ""
             assert len(index.file_counts) > 0
+
+
+def age_tree(root: Path, seconds: float = 60) -> None:
+    """Backdate every directory and file so cached listings are trusted."""
+    past = time.time() - seconds
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            os.utime(os.path.join(dirpath, name), (past, past))
+        os.utime(dirpath, (past, past))
+
+
+class TestIndexGeneratorIncremental:
+    """Tests for the single-pass scan and its persisted manifest."""
+
+    @pytest.mark.unit
+    def test_only_changed_directories_rescanned(self):
+        """Test a new generator reuses the manifest and relists changed dirs."""
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as cache_dir:
+            project_path = Path(tmpdir)
+            for name in ("a", "b", "c"):
+                (project_path / name).mkdir()
+                (project_path / name / "mod.py").write_text("x = 1")
+            age_tree(project_path)
+            config = IndexConfig(manifest_dir=Path(cache_dir))
+
+            assert IndexGenerator(config).scan(project_path).rescanned == 4
+            IndexGenerator(config).generate(project_path)
+
+            generator = IndexGenerator(config)
+            assert generator.scan(project_path).rescanned == 0
+
+            (project_path / "b" / "test_mod.py").write_text("def test(): pass")
+            scan = generator.scan(project_path)
+            assert scan.rescanned == 1
+            assert scan.directories["b"].files == ["mod.py", "test_mod.py"]
+
+    @pytest.mark.unit
+    def test_schema_cache_follows_file_edits(self):
+        """Test schema hits are re-read when a file changes in place."""
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as cache_dir:
+            project_path = Path(tmpdir)
+            (project_path / "pyproject.toml").write_text("")
+            models = project_path / "models.py"
+            models.write_text("class User: pass")
+            age_tree(project_path)
+            generator = IndexGenerator(IndexConfig(manifest_dir=Path(cache_dir)))
+
+            assert generator.generate(project_path).database_schemas == []
+
+            models.write_text("class User(BaseModel): pass")
+            assert generator.generate(project_path).database_schemas == ["models.py: BaseModel"]
+
+    @pytest.mark.unit
+    def test_glob_excludes(self):
+        """Test wildcard entries in exclude_dirs are honoured."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_path = Path(tmpdir)
+            (project_path / "pkg.egg-info").mkdir()
+            (project_path / "pkg.egg-info" / "PKG-INFO").write_text("")
+            (project_path / "src").mkdir()
+
+            generator = IndexGenerator(IndexConfig(persist_manifest=False))
+            scan = generator.scan(project_path)
+            assert sorted(scan.directories) == [".", "src"]
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    def test_git_info_cached_until_head_moves(self):
+        """Test git is only run again after a new commit."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_path = Path(tmpdir)
+            git = ["git", "-c", "user.email=dev@example.com", "-c", "user.name=Dev"]
+            subprocess.run(["git", "init", "-q", "-b", "main"], cwd=project_path, check=True)
+            subprocess.run([*git, "commit", "-q", "--allow-empty", "-m", "one"], cwd=project_path, check=True)
+
+            generator = IndexGenerator()
+            with patch("subprocess.run", wraps=subprocess.run) as run:
+                branch, first, _ = generator._get_git_info(project_path)
+                assert generator._get_git_info(project_path)[1] == first
+                assert run.call_count == 1
+
+            assert branch == "main"
+            subprocess.run([*git, "commit", "-q", "--allow-empty", "-m", "two"], cwd=project_path, check=True)
+            assert generator._get_git_info(project_path)[1] != first
@@ -290,7 +290,7 @@ class TestLlmProcessNodeGetProvider:
         node = LlmProcessNode("llm_1", {})
         with patch("opencode.core.config.Config.load") as mock_config:
             config_instance = MagicMock()
-            config_instance.get_provider_key.return_value = None
+            config_instance.get_api_key.return_value = None
             mock_config.return_value = config_instance
             
             provider = node._get_provider("openai")
@@ -302,7 +302,8 @@ class TestLlmProcessNodeGetProvider:
         node = LlmProcessNode("llm_1", {})
         with patch("opencode.core.config.Config.load") as mock_config:
             config_instance = MagicMock()
-            config_instance.get_provider_key.return_value = "test-key"
+            config_instance.get_api_key.return_value = "test-key"
+            config_instance.get_provider_config.return_value.base_url = None
             mock_config.return_value = config_instance
             
             mock_provider = MagicMock()
@@ -317,7 +318,7 @@ class TestLlmProcessNodeGetProvider:
         node = LlmProcessNode("llm_1", {})
         with patch("opencode.core.config.Config.load") as mock_config:
             config_instance = MagicMock()
-            config_instance.get_provider_key.return_value = None
+            config_instance.get_api_key.return_value = None
             mock_config.return_value = config_instance
             
             provider = node._get_provider("anthropic")
@@ -329,7 +330,8 @@ class TestLlmProcessNodeGetProvider:
         node = LlmProcessNode("llm_1", {})
         with patch("opencode.core.config.Config.load") as mock_config:
             config_instance = MagicMock()
-            config_instance.get_provider_key.return_value = "test-key"
+            config_instance.get_api_key.return_value = "test-key"
+            config_instance.get_provider_config.return_value.base_url = None
             mock_config.return_value = config_instance
             
             mock_provider = MagicMock()
@@ -344,7 +346,7 @@ class TestLlmProcessNodeGetProvider:
         node = LlmProcessNode("llm_1", {})
         with patch("opencode.core.config.Config.load") as mock_config:
             config_instance = MagicMock()
-            config_instance.get_provider_key.return_value = None
+            config_instance.get_api_key.return_value = None
             mock_config.return_value = config_instance
             
             provider = node._get_provider("google")
@@ -356,7 +358,8 @@ class TestLlmProcessNodeGetProvider:
         node = LlmProcessNode("llm_1", {})
         with patch("opencode.core.config.Config.load") as mock_config:
             config_instance = MagicMock()
-            config_instance.get_provider_key.return_value = "test-key"
+            config_instance.get_api_key.return_value = "test-key"
+            config_instance.get_provider_config.return_value.base_url = None
             mock_config.return_value = config_instance
             
             mock_provider = MagicMock()
@@ -371,7 +374,7 @@ class TestLlmProcessNodeGetProvider:
         node = LlmProcessNode("llm_1", {})
         with patch("opencode.core.config.Config.load") as mock_config:
             config_instance = MagicMock()
-            config_instance.get_provider_key.return_value = None
+            config_instance.get_api_key.return_value = None
             mock_config.return_value = config_instance
             
             provider = node._get_provider("groq")
@@ -383,7 +386,8 @@ class TestLlmProcessNodeGetProvider:
         node = LlmProcessNode("llm_1", {})
         with patch("opencode.core.config.Config.load") as mock_config:
             config_instance = MagicMock()
-            config_instance.get_provider_key.return_value = "test-key"
+            config_instance.get_api_key.return_value = "test-key"
+            config_instance.get_provider_config.return_value.base_url = None
             mock_config.return_value = config_instance
             
             mock_provider = MagicMock()
@@ -398,7 +402,7 @@ class TestLlmProcessNodeGetProvider:
         node = LlmProcessNode("llm_1", {})
         with patch("opencode.core.config.Config.load") as mock_config:
             config_instance = MagicMock()
-            config_instance.get_provider_key.return_value = None
+            config_instance.get_api_key.return_value = None
             mock_config.return_value = config_instance
             
             provider = node._get_provider("mistral")
@@ -410,7 +414,8 @@ class TestLlmProcessNodeGetProvider:
         node = LlmProcessNode("llm_1", {})
         with patch("opencode.core.config.Config.load") as mock_config:
             config_instance = MagicMock()
-            config_instance.get_provider_key.return_value = "test-key"
+            config_instance.get_api_key.return_value = "test-key"
+            config_instance.get_provider_config.return_value.base_url = None
             mock_config.return_value = config_instance
             
             mock_provider = MagicMock()
@@ -719,3 +724,127 @@ class TestLlmProcessNodeExecuteWithMockedProvider:
             # Verify the custom system prompt was used
             call_kwargs = mock_provider.complete_sync.call_args[1]
             assert call_kwargs["system"] == "Custom system prompt"
+
+
+class TestLlmProcessNodeMapMode:
+    """Tests for map mode over array inputs."""
+
+    @staticmethod
+    def _provider(reply, delay=0.0):
+        """Build a provider whose complete_sync replies via reply(prompt)."""
+        import asyncio
+        from opencode.provider.base import Usage
+
+        state = {"active": 0, "peak": 0, "calls": 0}
+
+        async def complete_sync(messages, model, **kwargs):
+            state["active"] += 1
+            state["calls"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(delay)
+            state["active"] -= 1
+            response = MagicMock()
+            response.content = reply(messages[-1].content)
+            response.usage = Usage(input_tokens=2, output_tokens=1)
+            return response
+
+        provider = MagicMock()
+        provider.complete_sync = complete_sync
+        return provider, state
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_map_mode_bounded_concurrency(self):
+        """Test items run concurrently up to the configured limit."""
+        node = LlmProcessNode("llm_1", {"mapMode": True, "concurrency": 3})
+        provider, state = self._provider(lambda prompt: prompt.upper(), delay=0.01)
+
+        with patch.object(node, "_get_provider", return_value=provider):
+            result = await node.execute({"input": ["a", "b", "c", "d", "e", "f"]}, MagicMock())
+
+        assert result.success is True
+        assert result.outputs["output"] == ["A", "B", "C", "D", "E", "F"]
+        assert result.outputs["tokens"] == {"prompt": 12, "completion": 6, "total": 18}
+        assert state["peak"] == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_map_mode_reports_progress(self):
+        """Test each finished item is reported through the event callback."""
+        node = LlmProcessNode("llm_1", {"mapMode": True})
+        provider, _ = self._provider(lambda prompt: prompt)
+        events = []
+        context = ExecutionContext(
+            workflow_id="wf", execution_id="ex", node_id="llm_1", event_callback=events.append
+        )
+
+        with patch.object(node, "_get_provider", return_value=provider):
+            await node.execute({"input": ["x", "y"]}, context)
+
+        reported = sorted(item["index"] for event in events for item in event["items"])
+        assert reported == [0, 1]
+        assert all(event["total"] == 2 for event in events)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_map_mode_packs_items(self):
+        """Test batchSize packs items into one request."""
+        import json
+
+        node = LlmProcessNode("llm_1", {"mapMode": True, "batchSize": 3})
+
+        def reply(prompt):
+            count = prompt.count("### Item")
+            return json.dumps([f"ok{i}" for i in range(count)]) if count else prompt
+
+        provider, state = self._provider(reply)
+        with patch.object(node, "_get_provider", return_value=provider):
+            result = await node.execute({"input": ["a", "b", "c", "d"]}, MagicMock())
+
+        assert state["calls"] == 2
+        assert result.outputs["output"] == ["ok0", "ok1", "ok2", "d"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_map_mode_unpackable_reply_falls_back(self):
+        """Test a malformed packed reply is retried item by item."""
+        node = LlmProcessNode("llm_1", {"mapMode": True, "batchSize": 2})
+        provider, state = self._provider(lambda prompt: "not json" if "### Item" in prompt else prompt)
+
+        with patch.object(node, "_get_provider", return_value=provider):
+            result = await node.execute({"input": ["a", "b"]}, MagicMock())
+
+        assert state["calls"] == 3
+        assert result.outputs["output"] == ["a", "b"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_map_mode_partial_failure(self):
+        """Test failed items are reported without failing the node."""
+        node = LlmProcessNode("llm_1", {"mapMode": True})
+
+        def reply(prompt):
+            if prompt == "bad":
+                raise RuntimeError("model error")
+            return prompt
+
+        provider, _ = self._provider(reply)
+        with patch.object(node, "_get_provider", return_value=provider):
+            result = await node.execute({"input": ["good", "bad"]}, MagicMock())
+
+        assert result.success is True
+        assert result.outputs["output"] == ["good", None]
+        assert result.outputs["errors"] == {"1": "model error"}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_map_mode_off_keeps_single_request(self):
+        """Test list inputs are sent as one prompt unless mapMode is set."""
+        node = LlmProcessNode("llm_1", {})
+        provider, state = self._provider(lambda prompt: "done")
+
+        with patch.object(node, "_get_provider", return_value=provider):
+            result = await node.execute({"input": ["a", "b"]}, MagicMock())
+
+        assert state["calls"] == 1
+        assert result.outputs["output"] == "done"
@@ -0,0 +1,197 @@
+"""Tests for the multiplexed LSP session layer."""
+
+import asyncio
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from opencode.tool.lsp import LSPTool
+from opencode.tool.lsp_client import LSPClient, LSPError, encode_message, read_message
+
+# A minimal language server. It answers "test/slow" only after the next
+# request, sends a server request and a log notification during
+# initialize, and reports the synced document text and version on hover.
+FAKE_SERVER = textwrap.dedent('''
+    import json, sys
+
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    documents, hovers, config_reply, deferred = {}, [0], [None], []
+
+    def send(message):
+        body = json.dumps(message).encode("utf-8")
+        stdout.write(b"Content-Length: %d\\r\\n\\r\\n" % len(body) + body)
+        stdout.flush()
+
+    def read():
+        length = None
+        while True:
+            line = stdin.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return json.loads(stdin.read(length))
+
+    while True:
+        message = read()
+        if message is None:
+            break
+        method, params = message.get("method"), message.get("params") or {}
+        if method is None:
+            config_reply[0] = message.get("result")
+            continue
+        if method == "initialize":
+            send({"jsonrpc": "2.0", "id": "s1", "method": "workspace/configuration",
+                  "params": {"items": [{"section": "a"}, {"section": "b"}]}})
+            send({"jsonrpc": "2.0", "method": "window/logMessage", "params": {"message": "hi"}})
+            result = {"capabilities": {"hoverProvider": True}}
+        elif method in ("textDocument/didOpen", "textDocument/didChange"):
+            doc = params["textDocument"]
+            text = doc["text"] if method.endswith("didOpen") else params["contentChanges"][0]["text"]
+            documents[doc["uri"]] = (doc["version"], text)
+            send({"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics",
+                  "params": {"uri": doc["uri"], "diagnostics": [{"message": "v%d" % doc["version"]}]}})
+            continue
+        elif method == "exit":
+            break
+        elif "id" not in message:
+            continue
+        elif method == "textDocument/hover":
+            hovers[0] += 1
+            version, text = documents[params["textDocument"]["uri"]]
+            result = {"contents": "v%d:%s" % (version, text.strip())}
+        elif method == "test/hoverCount":
+            result = hovers[0]
+        elif method == "test/configReply":
+            result = config_reply[0]
+        elif method == "test/slow":
+            deferred.append(message["id"])
+            continue
+        elif method == "test/fail":
+            send({"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32602, "message": "bad params"}})
+            continue
+        else:
+            result = None
+        send({"jsonrpc": "2.0", "id": message["id"], "result": result})
+        while deferred:
+            send({"jsonrpc": "2.0", "id": deferred.pop(), "result": "slow"})
+''')
+
+
+async def start_client(root: Path) -> LSPClient:
+    return await LSPClient.start([sys.executable, "-c", FAKE_SERVER], root, request_timeout=5.0, watch_files=False)
+
+
+class TestFraming:
+    """Tests for message framing."""
+
+    @pytest.mark.asyncio
+    async def test_content_length_counts_bytes(self):
+        """Test non-ASCII payloads round-trip with a byte length header."""
+        frame = encode_message({"text": "café ☕"})
+        header, body = frame.split(b"\r\n\r\n", 1)
+        assert int(header.split(b":")[1]) == len(body)
+
+        reader = asyncio.StreamReader()
+        reader.feed_data(frame + frame)
+        reader.feed_eof()
+        assert await read_message(reader) == {"text": "café ☕"}
+        assert await read_message(reader) == {"text": "café ☕"}
+        assert await read_message(reader) is None
+
+
+class TestLSPClient:
+    """Tests for LSPClient against a fake server."""
+
+    @pytest.mark.asyncio
+    async def test_handshake_and_server_messages(self):
+        """Test initialize, server requests and notifications are handled."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = await start_client(Path(tmpdir))
+            try:
+                assert client.capabilities == {"hoverProvider": True}
+                assert await client.request("test/configReply") == [None, None]
+            finally:
+                await client.close()
+            assert not client.is_alive
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_responses(self):
+        """Test responses are matched to concurrent requests by id."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = await start_client(Path(tmpdir))
+            try:
+                slow = asyncio.create_task(client.request("test/slow"))
+                await asyncio.sleep(0.05)
+                fast = await client.request("test/hoverCount")
+                assert fast == 0
+                assert await slow == "slow"
+
+                with pytest.raises(LSPError) as exc_info:
+                    await client.request("test/fail")
+                assert exc_info.value.code == -32602
+            finally:
+                await client.close()
+
+    @pytest.mark.asyncio
+    async def test_document_sync_and_cache(self):
+        """Test didOpen/didChange versions and cache invalidation on edits."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            path = root / "mod.py"
+            path.write_text("x = 'café'\n")
+            client = await start_client(root)
+            try:
+                params = {"textDocument": {"uri": path.resolve().as_uri()}, "position": {"line": 0, "character": 0}}
+                first = await client.request("textDocument/hover", params, sync=[path])
+                assert first == {"contents": "v1:x = 'café'"}
+                assert await client.request("textDocument/hover", params, sync=[path]) == first
+                assert await client.request("test/hoverCount") == 1
+
+                path.write_text("x = 'changed'\n")
+                second = await client.request("textDocument/hover", params, sync=[path])
+                assert second == {"contents": "v2:x = 'changed'"}
+                assert client.document_version(path) == 2
+                assert client.diagnostics[path.resolve().as_uri()] == [{"message": "v2"}]
+            finally:
+                await client.close()
+
+    @pytest.mark.asyncio
+    async def test_pending_requests_fail_when_server_exits(self):
+        """Test outstanding requests error out instead of hanging."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = await start_client(Path(tmpdir))
+            try:
+                slow = asyncio.create_task(client.request("test/slow"))
+                await asyncio.sleep(0.05)
+                client.process.kill()
+                with pytest.raises(LSPError):
+                    await slow
+            finally:
+                await client.close()
+
+
+class TestLSPToolSession:
+    """Tests for LSPTool running through an LSPClient."""
+
+    @pytest.mark.asyncio
+    async def test_hover_through_tool(self):
+        """Test the tool syncs the document and formats the result."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "mod.py").write_text("value = 1\n")
+            client = await start_client(root)
+            try:
+                tool = LSPTool(working_directory=root, lsp_clients={".py": client})
+                result = await tool.execute(method="hover", file_path="mod.py", line=0, character=0)
+                assert result.success is True
+                assert result.output == "v1:value = 1"
+            finally:
+                await client.close()
@@ -300,6 +300,7 @@ class TestMCPServerHandleNotification:
             "method": "notifications/tools/list_changed",
             "params": {},
         })
+        await server._refresh_tasks["tools"]
         
         server._load_tools.assert_called_once()
 
@@ -312,6 +313,7 @@ class TestMCPServerHandleNotification:
             "method": "notifications/resources/list_changed",
             "params": {},
         })
+        await server._refresh_tasks["resources"]
         
         server._load_resources.assert_called_once()
 
@@ -324,9 +326,35 @@ class TestMCPServerHandleNotification:
             "method": "notifications/prompts/list_changed",
             "params": {},
         })
+        await server._refresh_tasks["prompts"]
         
         server._load_prompts.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_list_changed_during_refresh_does_not_cancel_waiters(self, server):
+        """Test a second list_changed chains a refetch instead of cancelling the first."""
+        release = asyncio.Event()
+        calls = []
+        
+        async def load_tools():
+            calls.append(len(calls))
+            await release.wait()
+            server.tools = [MagicMock(name=f"load-{len(calls)}")]
+            return True
+        
+        server._load_tools = load_tools
+        server._invalidate_list("tools")
+        waiter = asyncio.create_task(server.list_tools())
+        await asyncio.sleep(0)
+        
+        server._invalidate_list("tools")
+        release.set()
+        tools = await asyncio.wait_for(waiter, timeout=5)
+        
+        assert calls == [0, 1]
+        assert tools is server.tools
+        assert "tools" not in server._stale_lists
+    
     @pytest.mark.asyncio
     async def test_handle_resources_updated(self, server):
         """Test handling resources updated notification."""
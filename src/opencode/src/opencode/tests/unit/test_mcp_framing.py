@@ -0,0 +1,186 @@
+"""Tests for MCP message framing and the client's use of it."""
+
+import asyncio
+import sys
+import textwrap
+
+import pytest
+
+from opencode.mcp.client import MCPServer, MCPServerConfig
+from opencode.mcp.framing import NEWLINE, FramingError, encode_frame, read_frame
+
+
+def feed(*chunks: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    return reader
+
+
+class TestFraming:
+    """Tests for encode_frame and read_frame."""
+
+    @pytest.mark.asyncio
+    async def test_content_length_is_in_bytes(self):
+        """Test non-ASCII bodies round-trip with exact byte lengths."""
+        message = {"text": "naïve – 漢字 " * 1000}
+        frame = encode_frame(message)
+        header, body = frame.split(b"\r\n\r\n", 1)
+        assert int(header.split(b":")[1]) == len(body)
+        assert await read_frame(feed(frame)) == message
+
+    @pytest.mark.asyncio
+    async def test_split_reads(self):
+        """Test a frame delivered in small chunks is reassembled."""
+        frame = encode_frame({"id": 1, "result": "x" * 10000})
+        reader = asyncio.StreamReader()
+
+        async def trickle():
+            for i in range(0, len(frame), 7):
+                reader.feed_data(frame[i:i + 7])
+                await asyncio.sleep(0)
+            reader.feed_eof()
+
+        feeder = asyncio.create_task(trickle())
+        assert (await read_frame(reader))["result"] == "x" * 10000
+        await feeder
+
+    @pytest.mark.asyncio
+    async def test_both_framings_and_batches(self):
+        """Test newline and header frames, including batch arrays, mix on one stream."""
+        reader = feed(
+            encode_frame([{"id": 1}, {"id": 2}]),
+            encode_frame({"id": 3}, NEWLINE),
+            b"\n",
+            encode_frame({"id": 4}),
+        )
+        assert await read_frame(reader) == [{"id": 1}, {"id": 2}]
+        assert await read_frame(reader) == {"id": 3}
+        assert await read_frame(reader) == {"id": 4}
+        assert await read_frame(reader) is None
+
+    @pytest.mark.asyncio
+    async def test_truncated_and_malformed(self):
+        """Test truncated frames end the stream and bad headers raise."""
+        assert await read_frame(feed(b"Content-Length: 50\r\n\r\n{}")) is None
+        with pytest.raises(FramingError):
+            await read_frame(feed(b"Content-Type: json\r\n\r\n{}"))
+
+
+# Serves tools/list, resources/read and batches over Content-Length framing.
+# "bump" changes the tool list and sends list_changed before replying.
+FAKE_SERVER = textwrap.dedent('''
+    import json, sys
+
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    tools = ["alpha"]
+    list_calls = [0]
+
+    def send(message):
+        body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+        stdout.write(b"Content-Length: %d\\r\\n\\r\\n" % len(body) + body)
+        stdout.flush()
+
+    def read():
+        length = None
+        while True:
+            line = stdin.readline()
+            if not line:
+                return None
+            if not line.strip():
+                break
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+        return json.loads(stdin.read(length))
+
+    def handle(message):
+        method = message.get("method")
+        if "id" not in message:
+            return None
+        if method == "initialize":
+            result = {"protocolVersion": "2024-11-05", "serverInfo": {"name": "fake", "version": "1"},
+                      "capabilities": {"tools": {"listChanged": True}, "resources": {}}}
+        elif method == "tools/list":
+            list_calls[0] += 1
+            result = {"tools": [{"name": name, "inputSchema": {}} for name in tools]}
+        elif method == "resources/list":
+            result = {"resources": [{"uri": "mem://big", "name": "big"}]}
+        elif method == "resources/read":
+            result = {"contents": [{"uri": "mem://big", "text": "Grüße ☃ " * 200000}]}
+        elif method == "tools/call" and message["params"]["name"] == "bump":
+            tools.append("beta")
+            send({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+            result = {"content": [{"type": "text", "text": "bumped"}]}
+        elif method == "tools/call" and message["params"]["name"] == "list_calls":
+            result = {"content": [{"type": "text", "text": str(list_calls[0])}]}
+        else:
+            result = {}
+        return {"jsonrpc": "2.0", "id": message["id"], "result": result}
+
+    while True:
+        message = read()
+        if message is None:
+            break
+        if isinstance(message, list):
+            replies = [r for r in map(handle, message) if r is not None]
+            if replies:
+                send(replies)
+        else:
+            reply = handle(message)
+            if reply is not None:
+                send(reply)
+''')
+
+
+class TestMCPServerFraming:
+    """Tests for MCPServer against a subprocess server."""
+
+    async def _start(self, batch: bool) -> MCPServer:
+        server = MCPServer(config=MCPServerConfig(
+            name="fake",
+            command=sys.executable,
+            args=["-c", FAKE_SERVER],
+            timeout=10,
+            batch=batch,
+        ))
+        assert await server.start() is True
+        return server
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("batch", [False, True])
+    async def test_initialize_loads_lists(self, batch):
+        """Test list loading works batched and pipelined."""
+        server = await self._start(batch)
+        try:
+            assert [tool.name for tool in server.tools] == ["alpha"]
+            assert [resource.uri for resource in server.resources] == ["mem://big"]
+        finally:
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_large_non_ascii_resource(self):
+        """Test a multi-megabyte non-ASCII resource is read intact."""
+        server = await self._start(batch=False)
+        try:
+            result = await server.read_resource("mem://big")
+            assert result["contents"][0]["text"] == "Grüße ☃ " * 200000
+        finally:
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_lists_cached_until_list_changed(self):
+        """Test cached lists are reused and refreshed after list_changed."""
+        server = await self._start(batch=False)
+        try:
+            assert [tool.name for tool in await server.list_tools()] == ["alpha"]
+            calls = await server.call_tool("list_calls", {})
+            assert calls.content[0]["text"] == "1"
+
+            await server.call_tool("bump", {})
+            assert [tool.name for tool in await server.list_tools()] == ["alpha", "beta"]
+            calls = await server.call_tool("list_calls", {})
+            assert calls.content[0]["text"] == "2"
+        finally:
+            await server.stop()
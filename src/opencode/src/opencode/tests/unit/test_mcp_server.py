@@ -1,5 +1,6 @@
 """Tests for MCP Server module."""
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 import json
@@ -191,27 +192,30 @@ class TestMCPServer:
         assert response["id"] is None
 
     @pytest.mark.asyncio
-    async def test_send_error(self, capsys):
-        """Test sending error to stdout."""
+    async def test_send_error(self):
+        """Test sending an error response on a connection."""
         server = MCPServer()
+        sent = []
         
-        await server._send_error(-32700, "Parse error")
+        async def send(message):
+            sent.append(message)
         
-        captured = capsys.readouterr()
-        output = json.loads(captured.out.strip())
+        await server._send_error(send, -32700, "Parse error")
         
+        output = sent[0]
         assert output["jsonrpc"] == "2.0"
         assert output["error"]["code"] == -32700
         assert output["error"]["message"] == "Parse error"
 
     @pytest.mark.asyncio
-    async def test_run_websocket_not_implemented(self):
-        """Test WebSocket transport raises NotImplementedError."""
+    async def test_run_websocket_requires_websockets(self):
+        """Test WebSocket transport reports a missing websockets package."""
         config = MCPServerConfig(transport="websocket")
         server = MCPServer(config)
         
-        with pytest.raises(NotImplementedError, match="WebSocket transport not yet implemented"):
-            await server._run_websocket()
+        with patch.dict("sys.modules", {"websockets": None, "websockets.asyncio.server": None}):
+            with pytest.raises(ImportError, match="websockets"):
+                await server._run_websocket()
 
 
 class TestMCPServerToolsCall:
@@ -261,6 +265,150 @@ class TestMCPServerToolsCall:
             assert result["isError"] is True
 
 
+def make_slow_registry(server):
+    """Make tools/call for "slow" block until released."""
+    release = asyncio.Event()
+
+    async def execute(name, params):
+        if name == "slow":
+            await release.wait()
+        result = MagicMock()
+        result.output = f"{name} done"
+        result.success = True
+        return result
+
+    server.tool_registry = MagicMock()
+    server.tool_registry.execute = execute
+    server.tool_registry.list_tools.return_value = []
+    return release
+
+
+class TestMCPServerTransports:
+    """Tests for concurrent request dispatch on server connections."""
+
+    def _call(self, request_id, name):
+        return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": {"name": name}}
+
+    @pytest.mark.asyncio
+    async def test_slow_call_does_not_block_list(self):
+        """Test responses are written as they complete."""
+        server = MCPServer()
+        server._running = True
+        release = make_slow_registry(server)
+        
+        frames = asyncio.Queue()
+        sent = []
+        
+        async def send(message):
+            sent.append(message)
+            if message.get("id") == 2:
+                release.set()
+        
+        for frame in (
+            self._call(1, "slow"),
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            None,
+        ):
+            frames.put_nowait(json.dumps(frame) if frame else None)
+        
+        await asyncio.wait_for(server._serve_connection(frames.get, send), timeout=5)
+        
+        assert [message["id"] for message in sent] == [2, 1]
+        assert sent[1]["result"]["content"][0]["text"] == "slow done"
+
+    @pytest.mark.asyncio
+    async def test_in_flight_limit_and_cancellation(self):
+        """Test requests wait for a slot and cancelled requests get no reply."""
+        server = MCPServer(MCPServerConfig(max_concurrent_requests=1))
+        server._running = True
+        make_slow_registry(server)
+        
+        frames = asyncio.Queue()
+        sent = []
+        
+        async def send(message):
+            sent.append(message)
+        
+        frames.put_nowait(json.dumps(self._call(1, "slow")))
+        frames.put_nowait(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/list"}))
+        serving = asyncio.create_task(server._serve_connection(frames.get, send))
+        await asyncio.sleep(0.05)
+        # The only slot is held by the slow call
+        assert sent == []
+        
+        frames.put_nowait(json.dumps({
+            "jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 1},
+        }))
+        frames.put_nowait(None)
+        await asyncio.wait_for(serving, timeout=5)
+        assert [message["id"] for message in sent] == [2]
+
+    @pytest.mark.asyncio
+    async def test_batch_and_parse_error(self):
+        """Test batches get one combined reply and bad frames a parse error."""
+        server = MCPServer()
+        server._running = True
+        make_slow_registry(server)
+        
+        frames = asyncio.Queue()
+        sent = []
+        
+        async def send(message):
+            sent.append(message)
+        
+        frames.put_nowait("not json")
+        frames.put_nowait(json.dumps([
+            self._call(1, "a"),
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            self._call(2, "b"),
+        ]))
+        frames.put_nowait(None)
+        await asyncio.wait_for(server._serve_connection(frames.get, send), timeout=5)
+        
+        assert sent[0]["error"]["code"] == -32700
+        assert [response["id"] for response in sent[1]] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_tcp_round_trip(self):
+        """Test pipelined requests over a TCP connection."""
+        server = MCPServer()
+        server._running = True
+        release = make_slow_registry(server)
+        
+        tcp = await asyncio.start_server(server._handle_tcp_client, "127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        async with tcp:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(json.dumps(self._call(1, "slow")).encode() + b"\n")
+            writer.write(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/list"}).encode() + b"\n")
+            await writer.drain()
+            
+            first = json.loads(await asyncio.wait_for(reader.readline(), timeout=5))
+            release.set()
+            second = json.loads(await asyncio.wait_for(reader.readline(), timeout=5))
+            assert (first["id"], second["id"]) == (2, 1)
+            writer.close()
+            await writer.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_websocket_round_trip(self):
+        """Test requests over the WebSocket transport."""
+        websockets_server = pytest.importorskip("websockets.asyncio.server")
+        websockets_client = pytest.importorskip("websockets.asyncio.client")
+        server = MCPServer()
+        server._running = True
+        make_slow_registry(server)
+        
+        async with websockets_server.serve(server._handle_websocket_client, "127.0.0.1", 0) as ws_server:
+            port = next(iter(ws_server.sockets)).getsockname()[1]
+            async with websockets_client.connect(f"ws://127.0.0.1:{port}") as ws:
+                await ws.send(json.dumps({"jsonrpc": "2.0", "id": 7, "method": "initialize", "params": {}}))
+                response = json.loads(await asyncio.wait_for(ws.recv(), timeout=5))
+                assert response["id"] == 7
+                assert response["result"]["serverInfo"]["name"] == "opencode"
+
+
 class TestRunMCPServer:
     """Tests for run_mcp_server function."""
 
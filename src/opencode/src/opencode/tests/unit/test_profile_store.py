@@ -0,0 +1,109 @@
+"""
+Tests for the router profile store.
+"""
+
+import json
+
+import pytest
+
+from opencode.router.profile_store import DecayedStat, ProfileStore
+from opencode.router.profiler import ModelProfile
+
+
+class TestDecayedStat:
+    """Tests for DecayedStat."""
+    
+    def test_constant_samples(self):
+        """Test repeated samples converge without variance."""
+        stat = DecayedStat()
+        for i in range(5):
+            stat.update(100.0, now=float(i), half_life_seconds=60.0)
+        
+        assert stat.mean == pytest.approx(100.0)
+        assert stat.variance == pytest.approx(0.0)
+    
+    def test_without_decay_matches_plain_mean(self):
+        """Test samples at the same instant weigh equally."""
+        stat = DecayedStat()
+        for value in (1.0, 2.0, 3.0, 4.0):
+            stat.update(value, now=0.0, half_life_seconds=60.0)
+        
+        assert stat.mean == pytest.approx(2.5)
+        assert stat.variance == pytest.approx(1.25)
+        assert stat.weight == pytest.approx(4.0)
+    
+    def test_old_samples_decay(self):
+        """Test a sample one half-life later counts twice as much as the old one."""
+        stat = DecayedStat()
+        stat.update(10.0, now=0.0, half_life_seconds=60.0)
+        stat.update(10.0, now=0.0, half_life_seconds=60.0)
+        stat.update(40.0, now=60.0, half_life_seconds=60.0)
+        
+        assert stat.weight == pytest.approx(2.0)
+        assert stat.mean == pytest.approx(25.0)
+
+
+class TestProfileStore:
+    """Tests for ProfileStore."""
+    
+    def test_record_and_reload(self, tmp_path):
+        """Test live statistics survive a restart on the same hardware."""
+        path = tmp_path / "profiles.json"
+        store = ProfileStore(path, fingerprint="hw-a")
+        store.record("model-a", latency_ms=1100, time_to_first_token_ms=100, tokens_generated=50, now=0)
+        store.record("model-a", latency_ms=1100, time_to_first_token_ms=100, tokens_generated=50, now=0)
+        store.flush()
+        
+        stats = ProfileStore(path, fingerprint="hw-a").get_stats("model-a")
+        assert stats.samples == 2
+        assert stats.latency_ms.mean == pytest.approx(1100)
+        assert stats.time_to_first_token_ms.mean == pytest.approx(100)
+        assert stats.tokens_per_second.mean == pytest.approx(50)
+    
+    def test_profiles_keyed_by_hardware(self, tmp_path):
+        """Test profiles from other hardware are kept but not used."""
+        path = tmp_path / "profiles.json"
+        ProfileStore(path, fingerprint="hw-a").put_profile(
+            ModelProfile(model_id="model-a", provider="ollama", tokens_per_second=30.0)
+        )
+        ProfileStore(path, fingerprint="hw-b").put_profile(
+            ModelProfile(model_id="model-a", provider="ollama", tokens_per_second=90.0)
+        )
+        
+        assert ProfileStore(path, fingerprint="hw-a").get_profile("model-a").tokens_per_second == 30.0
+        assert ProfileStore(path, fingerprint="hw-b").get_profile("model-a").tokens_per_second == 90.0
+        assert ProfileStore(path, fingerprint="hw-c").get_profile("model-a") is None
+        assert set(json.loads(path.read_text())["hardware"]) == {"hw-a", "hw-b"}
+    
+    def test_record_saves_are_throttled(self, tmp_path):
+        """Test live updates are written at most once per save interval."""
+        path = tmp_path / "profiles.json"
+        store = ProfileStore(path, fingerprint="hw-a", save_interval=3600)
+        store.record("model-a", latency_ms=500)
+        store.record("model-a", latency_ms=700)
+        
+        on_disk = json.loads(path.read_text())["hardware"]["hw-a"]["model-a"]["live"]
+        assert on_disk["samples"] == 1
+        store.flush()
+        on_disk = json.loads(path.read_text())["hardware"]["hw-a"]["model-a"]["live"]
+        assert on_disk["samples"] == 2
+    
+    def test_unreadable_file_ignored(self, tmp_path):
+        """Test a corrupt store starts empty instead of failing."""
+        path = tmp_path / "profiles.json"
+        path.write_text("{not json")
+        
+        store = ProfileStore(path, fingerprint="hw-a")
+        assert store.get_profile("model-a") is None
+        store.record("model-a", latency_ms=500)
+        assert json.loads(path.read_text())["version"] == 1
+    
+    def test_memory_only(self, tmp_path):
+        """Test a non-persistent store never touches the file."""
+        path = tmp_path / "profiles.json"
+        store = ProfileStore(path, fingerprint="hw-a", persist=False)
+        store.record("model-a", latency_ms=500)
+        store.flush()
+        
+        assert store.get_stats("model-a").samples == 1
+        assert not path.exists()
@@ -0,0 +1,199 @@
+"""
+Tests for the process-wide provider pool.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from opencode.provider.pool import ProviderPool, get_provider_pool
+from opencode.workflow.nodes.ensemble_aggregator import EnsembleAggregatorNode
+from opencode.workflow.nodes.llm_process import LlmProcessNode
+
+
+class TestProviderPool:
+    """Tests for ProviderPool."""
+
+    @pytest.mark.unit
+    def test_get_or_create_reuses_instance(self):
+        """Test the factory runs once per key."""
+        pool = ProviderPool()
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        first = pool.get_or_create("openai", factory, credentials="key")
+        second = pool.get_or_create("openai", factory, credentials="key")
+        assert first is second
+        factory.assert_called_once()
+        assert len(pool) == 1
+
+    @pytest.mark.unit
+    def test_keys_separate_credentials_and_base_url(self):
+        """Test different credentials or endpoints get different instances."""
+        pool = ProviderPool()
+        a = pool.get_or_create("openai", MagicMock, credentials="key-a")
+        b = pool.get_or_create("openai", MagicMock, credentials="key-b")
+        c = pool.get_or_create("openai", MagicMock, base_url="http://proxy", credentials="key-a")
+        assert len({id(a), id(b), id(c)}) == 3
+
+    @pytest.mark.unit
+    def test_key_does_not_store_raw_credentials(self):
+        """Test credentials are fingerprinted in the key."""
+        key = ProviderPool.make_key("openai", None, "sk-secret")
+        assert "sk-secret" not in key
+        assert key[2] is not None
+
+    @pytest.mark.unit
+    def test_none_from_factory_is_not_pooled(self):
+        """Test failed creation is retried next time."""
+        pool = ProviderPool()
+        assert pool.get_or_create("openai", lambda: None) is None
+        assert len(pool) == 0
+
+    @pytest.mark.unit
+    def test_config_is_loaded_once(self):
+        """Test the pool caches the loaded Config."""
+        pool = ProviderPool()
+        with patch("opencode.core.config.Config.load") as mock_load:
+            assert pool.get_config() is pool.get_config()
+            mock_load.assert_called_once()
+
+    @pytest.mark.unit
+    def test_config_reloads_after_ttl(self):
+        """Test a stale cached Config is reloaded."""
+        pool = ProviderPool(config_ttl=60.0)
+        with patch("opencode.core.config.Config.load") as mock_load, \
+                patch("opencode.provider.pool.time.monotonic", side_effect=[0.0, 30.0, 61.0, 61.0]):
+            pool.get_config()
+            pool.get_config()
+            pool.get_config()
+        assert mock_load.call_count == 2
+
+    @pytest.mark.unit
+    def test_config_reloads_when_file_changes(self):
+        """Test editing the config file invalidates the cached Config."""
+        pool = ProviderPool()
+        with patch("opencode.core.config.Config.load") as mock_load, \
+                patch.object(ProviderPool, "_config_file_mtime", side_effect=[1.0, 1.0, 2.0]):
+            pool.get_config()
+            pool.get_config()
+            pool.get_config()
+        assert mock_load.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rotated_credentials_evict_and_close_old_instance(self):
+        """Test new credentials for the same endpoint replace and close the old provider."""
+        pool = ProviderPool()
+        old = MagicMock()
+        old.close = AsyncMock()
+        other_endpoint = MagicMock()
+        pool.get_or_create("openai", lambda: old, credentials="key-a")
+        pool.get_or_create("openai", lambda: other_endpoint, base_url="http://proxy", credentials="key-a")
+
+        new = pool.get_or_create("openai", MagicMock, credentials="key-b")
+        await asyncio.sleep(0)
+
+        old.close.assert_awaited_once()
+        assert len(pool) == 2
+        assert pool.get_or_create("openai", MagicMock, credentials="key-b") is new
+        assert pool.get_or_create("openai", MagicMock, base_url="http://proxy", credentials="key-a") is other_endpoint
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_replaced_without_loop_closed_by_close_all(self):
+        """Test providers evicted outside an event loop are closed with the pool."""
+        pool = ProviderPool()
+        old = MagicMock()
+        old.close = AsyncMock()
+        pool.get_or_create("openai", lambda: old, credentials="key-a")
+        with patch("opencode.provider.pool.asyncio.get_running_loop", side_effect=RuntimeError):
+            pool.get_or_create("openai", MagicMock, credentials="key-b")
+        old.close.assert_not_awaited()
+
+        await pool.close_all()
+        old.close.assert_awaited_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_close_all(self):
+        """Test close_all closes providers and empties the pool."""
+        pool = ProviderPool()
+        provider = MagicMock()
+        provider.close = AsyncMock()
+        pool.get_or_create("ollama", lambda: provider)
+        await pool.close_all()
+        provider.close.assert_awaited_once()
+        assert len(pool) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_close_all_tolerates_errors(self):
+        """Test a failing close does not stop the others."""
+        pool = ProviderPool()
+        failing = MagicMock()
+        failing.close = AsyncMock(side_effect=RuntimeError("boom"))
+        healthy = MagicMock()
+        healthy.close = AsyncMock()
+        pool.get_or_create("a", lambda: failing)
+        pool.get_or_create("b", lambda: healthy)
+        await pool.close_all()
+        healthy.close.assert_awaited_once()
+
+
+class TestNodesUsePool:
+    """Tests that workflow nodes share pooled providers."""
+
+    @pytest.mark.unit
+    def test_llm_process_reuses_provider(self):
+        """Test repeated LlmProcessNode lookups build one provider."""
+        with patch("opencode.provider.ollama.OllamaProvider") as mock_class:
+            first = LlmProcessNode("a", {})._get_provider("ollama")
+            second = LlmProcessNode("b", {})._get_provider("ollama")
+        assert first is second
+        mock_class.assert_called_once()
+
+    @pytest.mark.unit
+    def test_llm_process_loads_config_once(self):
+        """Test keyed providers do not reload Config per execution."""
+        with patch("opencode.core.config.Config.load") as mock_load:
+            mock_load.return_value.get_api_key.return_value = "test-key"
+            mock_load.return_value.get_provider_config.return_value.base_url = None
+            with patch("opencode.provider.openai.OpenAIProvider") as mock_class:
+                node = LlmProcessNode("a", {})
+                for _ in range(3):
+                    node._get_provider("openai")
+        mock_load.assert_called_once()
+        mock_class.assert_called_once_with(api_key="test-key")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_llm_process_pools_keyed_providers(self, tmp_path):
+        """Test OpenAI and Anthropic providers are built from the config and pooled."""
+        from opencode.core.config import Config, ProviderConfig
+        from opencode.provider.anthropic import AnthropicProvider
+        from opencode.provider.openai import OpenAIProvider
+
+        config = Config(providers={
+            "openai": ProviderConfig(api_key="sk-openai", base_url="http://proxy/v1"),
+            "anthropic": ProviderConfig(api_key="sk-anthropic"),
+        }, data_dir=tmp_path, plans_dir=tmp_path)
+        with patch("opencode.core.config.Config.load", return_value=config):
+            openai = LlmProcessNode("a", {})._get_provider("openai")
+            anthropic = LlmProcessNode("b", {})._get_provider("anthropic")
+
+            assert isinstance(openai, OpenAIProvider)
+            assert openai.base_url == "http://proxy/v1"
+            assert isinstance(anthropic, AnthropicProvider)
+            assert LlmProcessNode("c", {})._get_provider("openai") is openai
+            assert EnsembleAggregatorNode("d", {})._get_provider("openai") is openai
+            assert len(get_provider_pool()) == 2
+        await get_provider_pool().close_all()
+
+    @pytest.mark.unit
+    def test_ensemble_shares_pool_with_llm_process(self):
+        """Test both node types resolve to the same pooled instance."""
+        with patch("opencode.provider.ollama.OllamaProvider"):
+            from_llm = LlmProcessNode("a", {})._get_provider("ollama")
+            from_ensemble = EnsembleAggregatorNode("b", {})._get_provider("ollama")
+        assert from_llm is from_ensemble
+        assert len(get_provider_pool()) == 1
@@ -14,8 +14,11 @@ from opencode.router.config import (
     PromptCategory,
     Complexity,
     QualityPreference,
+    RoutingObjective,
 )
 from opencode.router.skills import ClassificationResult
+from opencode.router.vram_monitor import VRAMStatus
+from opencode.router.profiler import BenchmarkResult
 
 
 class TestRoutingResult:
@@ -730,6 +733,207 @@ class TestRouterEngineProfileModels:
             assert "test-model" not in profiles
 
 
+class TestRouterEngineProfileStore:
+    """Tests for persisted profiles and live statistics in RouterEngine."""
+
+    def make_router(self, tmp_path, **kwargs) -> RouterEngine:
+        config = RouterConfig(profile_store_path=str(tmp_path / "profiles.json"), **kwargs)
+        provider = MagicMock()
+        provider.name = "test"
+        router = RouterEngine(config=config, provider=provider)
+        router.store._fingerprint = "test-hw"
+        return router
+
+    @pytest.mark.asyncio
+    async def test_stored_profiles_skip_reprofiling(self, tmp_path):
+        """Test a restarted router reuses profiles instead of benchmarking again."""
+        router = self.make_router(tmp_path)
+        router.register_model(ModelConfig(model_id="test-model", provider="test"))
+        
+        benchmark = BenchmarkResult(
+            prompt="p",
+            response="r" * 600,
+            latency_ms=1000.0,
+            tokens_generated=60,
+            tokens_per_second=60.0,
+            time_to_first_token_ms=100.0,
+            success=True,
+        )
+        with patch.object(router.profiler, '_run_benchmark', new_callable=AsyncMock) as mock_run:
+            mock_run.return_value = benchmark
+            await router.profile_models()
+        profile = router._profiles["test-model"]
+        
+        restarted = self.make_router(tmp_path)
+        restarted.register_model(ModelConfig(model_id="test-model", provider="test"))
+        assert restarted._profiles["test-model"].profiled_at == profile.profiled_at
+        assert restarted._models["test-model"].quality_score == pytest.approx(profile.overall_quality)
+        assert restarted._models["test-model"].speed_score == 1.0
+        
+        with patch.object(restarted.profiler, 'quick_profile', new_callable=AsyncMock) as mock_quick:
+            mock_quick.return_value = profile
+            await restarted.profile_models()
+            mock_quick.assert_not_called()
+            await restarted.profile_models(force=True)
+            mock_quick.assert_called_once()
+
+    def test_observed_speed_used_for_scoring(self, tmp_path):
+        """Test recorded completions replace the static speed score."""
+        router = self.make_router(tmp_path, quality_preference=QualityPreference.SPEED)
+        fast = ModelConfig(model_id="fast", provider="test", speed_score=0.9)
+        slow = ModelConfig(model_id="slow", provider="test", speed_score=0.2)
+        classification = ClassificationResult(
+            category=PromptCategory.GENERAL,
+            complexity=Complexity.MEDIUM,
+            confidence=0.8,
+            indicators=[],
+            suggested_skills=[],
+        )
+        assert router._score_model(fast, classification)[0] > router._score_model(slow, classification)[0]
+        
+        for _ in range(3):
+            router.record_completion("fast", latency_ms=10_000, time_to_first_token_ms=2_000, tokens_generated=40)
+            router.record_completion("slow", latency_ms=1_000, time_to_first_token_ms=200, tokens_generated=48)
+        
+        slow_score, reasoning = router._score_model(slow, classification)
+        assert slow_score > router._score_model(fast, classification)[0]
+        assert "observed 60.0 tok/s" in reasoning
+        
+        router.store.flush()
+        restarted = self.make_router(tmp_path, quality_preference=QualityPreference.SPEED)
+        assert restarted._score_model(slow, classification)[0] == pytest.approx(slow_score)
+
+
+class TestRouterEngineLoadAware:
+    """Tests for load-aware model selection."""
+
+    def make_router(self, tmp_path, vram_free_mb=None, **kwargs) -> RouterEngine:
+        config = RouterConfig(
+            profile_store_path=str(tmp_path / "profiles.json"),
+            persist_profiles=False,
+            cache_enabled=False,
+            **kwargs,
+        )
+        monitor = None
+        if vram_free_mb is not None:
+            monitor = MagicMock()
+            monitor.get_status = AsyncMock(return_value=VRAMStatus(
+                gpus=[MagicMock()],
+                total_memory_mb=24576,
+                total_used_mb=24576 - vram_free_mb,
+                total_free_mb=vram_free_mb,
+                timestamp=datetime.utcnow(),
+            ))
+        router = RouterEngine(config=config, vram_monitor=monitor)
+        router.store._fingerprint = "test-hw"
+        return router
+
+    def register(self, router, model_id, quality=0.8, latency_ms=1000.0, **kwargs):
+        router.register_model(ModelConfig(
+            model_id=model_id,
+            provider="test",
+            quality_score=quality,
+            is_loaded=True,
+            **kwargs,
+        ))
+        router.store.record(model_id, latency_ms=latency_ms)
+
+    @pytest.mark.asyncio
+    async def test_busy_model_loses_to_similar_idle_model(self, tmp_path):
+        """Test queued requests push routing to an equally capable model."""
+        router = self.make_router(tmp_path)
+        self.register(router, "local-a", quality=0.80)
+        self.register(router, "local-b", quality=0.78)
+        self.register(router, "weak", quality=0.30, latency_ms=100.0)
+        
+        assert (await router.route("hello")).model_id == "local-a"
+        
+        for _ in range(10):
+            router.begin_request("local-a")
+        result = await router.route("hello")
+        assert result.model_id == "local-b"
+        assert result.predicted_latency_ms == pytest.approx(1000.0)
+        assert result.alternatives[0][0] == "local-a"
+        assert router.predict_load("local-a").latency_ms == pytest.approx(11000.0)
+        
+        router.config.model_parallelism = 16
+        assert (await router.route("hello")).model_id == "local-a"
+
+    @pytest.mark.asyncio
+    async def test_slo_prefers_less_capable_model(self, tmp_path):
+        """Test a model predicted to miss the SLO is avoided."""
+        router = self.make_router(tmp_path, latency_slo_ms=2000)
+        self.register(router, "big", quality=0.9, latency_ms=5000.0)
+        self.register(router, "small", quality=0.5, latency_ms=800.0)
+        
+        result = await router.route("hello")
+        assert result.model_id == "small"
+        assert "no similar model meets the SLO" in result.reasoning
+        
+        router.config.latency_slo_ms = None
+        assert (await router.route("hello")).model_id == "big"
+
+    @pytest.mark.asyncio
+    async def test_cost_objective(self, tmp_path):
+        """Test the cheapest similar model wins under the cost objective."""
+        router = self.make_router(tmp_path, routing_objective=RoutingObjective.COST)
+        self.register(router, "premium", quality=0.80, latency_ms=500.0, cost_per_1k_tokens=0.01)
+        self.register(router, "budget", quality=0.79, latency_ms=1500.0, cost_per_1k_tokens=0.001)
+        
+        assert (await router.route("hello")).model_id == "budget"
+
+    @pytest.mark.asyncio
+    async def test_vram_headroom_decides_loading(self, tmp_path):
+        """Test a cold model is loaded only when it fits in free VRAM."""
+        for free_mb, expected in ((4096, "warm"), (16384, "cold")):
+            router = self.make_router(tmp_path, vram_free_mb=free_mb)
+            self.register(router, "warm", quality=0.8)
+            router.register_model(ModelConfig(
+                model_id="cold",
+                provider="test",
+                quality_score=0.8,
+                vram_required_gb=8,
+            ))
+            for _ in range(8):
+                router.begin_request("warm")
+            
+            result = await router.route("hello")
+            assert result.model_id == expected
+
+    @pytest.mark.asyncio
+    async def test_track_counts_and_records(self, tmp_path):
+        """Test tracked requests count as in flight and are recorded."""
+        router = self.make_router(tmp_path)
+        self.register(router, "model-a")
+        
+        with router.track("model-a") as request:
+            assert router.get_stats()["in_flight"] == {"model-a": 1}
+            request.first_token()
+            request.tokens_generated = 5
+        assert router.get_stats()["in_flight"] == {}
+        assert router.store.get_stats("model-a").samples == 2
+        
+        with pytest.raises(RuntimeError):
+            with router.track("model-a"):
+                raise RuntimeError("provider error")
+        assert router.get_stats()["in_flight"] == {}
+        assert router.store.get_stats("model-a").samples == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_route_rechecked_under_load(self, tmp_path):
+        """Test a cached decision is revised when its model is saturated."""
+        router = self.make_router(tmp_path)
+        router.config.cache_enabled = True
+        self.register(router, "local-a", quality=0.80)
+        self.register(router, "local-b", quality=0.78)
+        
+        assert (await router.route("hello")).model_id == "local-a"
+        router.begin_request("local-a")
+        result = await router.route("hello")
+        assert result.cached is True
+        assert result.model_id == "local-b"
+
+
 class TestModelConfig:
     """Tests for ModelConfig."""
 
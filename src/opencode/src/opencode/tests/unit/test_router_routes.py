@@ -197,6 +197,77 @@ class TestRoutePrompt:
         call_args = mock_engine.route.call_args
         assert call_args[0][0] == "Write a function"
         assert call_args[0][1] == {"language": "python"}
+    
+    @patch('opencode.server.routes.router.get_engine')
+    def test_route_prompt_counts_request_in_flight(self, mock_get_engine, client, mock_engine):
+        """Test a routed request is counted against the chosen model."""
+        mock_get_engine.return_value = mock_engine
+        mock_engine.route.return_value.model_id = "test-model"
+        
+        client.post("/router/route", json={"prompt": "Write a function", "track": True})
+        mock_engine.begin_request.assert_called_once_with("test-model")
+        
+        client.post("/router/route", json={"prompt": "Write a function"})
+        mock_engine.begin_request.assert_called_once()
+
+
+class TestRecordCompletion:
+    """Tests for record_completion endpoint."""
+    
+    @patch('opencode.server.routes.router.get_engine')
+    def test_record_completion_ends_request(self, mock_get_engine, client, mock_engine):
+        """Test a reported completion finishes the in-flight request."""
+        mock_get_engine.return_value = mock_engine
+        
+        response = client.post(
+            "/router/completions",
+            json={"model_id": "test-model", "latency_ms": 850, "tokens_generated": 40},
+        )
+        
+        assert response.status_code == 200
+        mock_engine.end_request.assert_called_once_with(
+            "test-model",
+            latency_ms=850,
+            time_to_first_token_ms=None,
+            tokens_generated=40,
+        )
+    
+    def test_route_and_complete_track_queue_depth(self, client):
+        """Test in-flight counts rise on /route and fall on /completions."""
+        from opencode.router.config import ModelConfig, RouterConfig
+        from opencode.router.engine import RouterEngine
+        
+        engine = RouterEngine(RouterConfig(persist_profiles=False))
+        engine._initialized = True
+        engine.register_model(ModelConfig(model_id="test-model", provider="ollama"))
+        
+        with patch('opencode.server.routes.router.get_engine', return_value=engine):
+            for _ in range(3):
+                client.post("/router/route", json={"prompt": "Write a function", "track": True})
+            assert engine.get_stats()["in_flight"] == {"test-model": 3}
+            
+            client.post("/router/completions", json={"model_id": "test-model", "latency_ms": 900})
+            client.post("/router/completions", json={"model_id": "test-model"})
+            assert engine.get_stats()["in_flight"] == {"test-model": 1}
+            assert engine.store.get_stats("test-model").latency_ms.weight > 0
+    
+    def test_untracked_routes_do_not_build_up_load(self, client):
+        """Test routes never reported to /completions leave no queue behind."""
+        from opencode.router.config import ModelConfig, RouterConfig
+        from opencode.router.engine import RouterEngine
+        
+        engine = RouterEngine(RouterConfig(persist_profiles=False))
+        engine._initialized = True
+        engine.register_model(ModelConfig(model_id="test-model", provider="ollama"))
+        
+        with patch('opencode.server.routes.router.get_engine', return_value=engine):
+            for _ in range(20):
+                response = client.post("/router/route", json={"prompt": "Write a function"})
+                assert response.json()["model_id"] == "test-model"
+        
+        assert engine.get_stats()["in_flight"] == {}
+        assert engine.predict_load("test-model").in_flight == 0
+        assert not engine._is_saturated("test-model")
 
 
 class TestListModels:
@@ -499,6 +570,24 @@ class TestGetEngine:
         engine2 = get_engine()
         
         assert engine1 is engine2
+    
+    @pytest.mark.asyncio
+    async def test_close_engine_flushes_store(self):
+        """Test close_engine saves pending statistics and drops the engine."""
+        import opencode.server.routes.router as router_module
+        from opencode.server.routes.router import close_engine
+        
+        engine = MagicMock()
+        router_module._engine = engine
+        
+        await close_engine()
+        
+        engine.store.flush.assert_called_once()
+        assert router_module._engine is None
+        
+        # Nothing to close the second time
+        await close_engine()
+        engine.store.flush.assert_called_once()
 
 
 class TestGetVRAMMonitor:
@@ -332,6 +332,58 @@ class TestLifespan:
             
             # After context exit, cleanup should have been called
             mock_mcp_client.stop.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_lifespan_closes_workflow_engine(self):
+        """Test that lifespan closes the workflow router's engine on shutdown."""
+        from opencode.server import app as server_app
+        from opencode.server.routes import workflow
+        
+        mock_config = MagicMock()
+        mock_config.data_dir = MagicMock()
+        mock_config.data_dir.__truediv__ = MagicMock(return_value=MagicMock())
+        mock_config.get_mcp_server_configs = MagicMock(return_value={})
+        
+        with patch('opencode.server.app.Config.load', return_value=mock_config), \
+             patch('opencode.server.app.init_database', new_callable=AsyncMock), \
+             patch('opencode.server.app.get_database', return_value=MagicMock()), \
+             patch('opencode.server.app.SessionManager'), \
+             patch('opencode.server.app.ToolRegistry'), \
+             patch('opencode.server.app.MCPClient', return_value=AsyncMock()), \
+             patch('opencode.server.app.close_database', new_callable=AsyncMock):
+            
+            async with server_app.lifespan(FastAPI()):
+                engine = workflow.get_engine()
+            
+            assert engine.http_pool._closed
+            assert workflow._engine is None
+    
+    @pytest.mark.asyncio
+    async def test_lifespan_flushes_router_profiles(self):
+        """Test that lifespan saves the router's live statistics on shutdown."""
+        from opencode.server import app as server_app
+        from opencode.server.routes import router as router_routes
+        
+        mock_config = MagicMock()
+        mock_config.data_dir = MagicMock()
+        mock_config.data_dir.__truediv__ = MagicMock(return_value=MagicMock())
+        mock_config.get_mcp_server_configs = MagicMock(return_value={})
+        engine = MagicMock()
+        
+        with patch('opencode.server.app.Config.load', return_value=mock_config), \
+             patch('opencode.server.app.init_database', new_callable=AsyncMock), \
+             patch('opencode.server.app.get_database', return_value=MagicMock()), \
+             patch('opencode.server.app.SessionManager'), \
+             patch('opencode.server.app.ToolRegistry'), \
+             patch('opencode.server.app.MCPClient', return_value=AsyncMock()), \
+             patch('opencode.server.app.close_database', new_callable=AsyncMock), \
+             patch.object(router_routes, '_engine', engine):
+            
+            async with server_app.lifespan(FastAPI()):
+                pass
+            
+            engine.store.flush.assert_called_once()
+            assert router_routes._engine is None
 
 
 class TestRunServer:
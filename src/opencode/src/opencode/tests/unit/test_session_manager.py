@@ -181,6 +181,31 @@ class TestSessionManager:
         
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_get_messages_page(self, session_manager, temp_dir):
+        """Test paging messages backwards from the newest."""
+        session = Session.create(project_id="test-project", directory=str(temp_dir))
+        for i in range(120):
+            session.add_message(Message.user(f"message {i}"))
+        await session_manager.save(session)
+        short_id = session.id[:8]
+        
+        newest, offset = await session_manager.get_messages_page(short_id, limit=50)
+        older, older_offset = await session_manager.get_messages_page(short_id, limit=50, before=offset)
+        oldest, oldest_offset = await session_manager.get_messages_page(short_id, limit=50, before=older_offset)
+        
+        assert offset == 70
+        assert [m.content[0].text for m in newest] == [f"message {i}" for i in range(70, 120)]
+        assert older_offset == 20
+        assert older[0].content[0].text == "message 20"
+        assert oldest_offset == 0
+        assert len(oldest) == 20
+
+    @pytest.mark.asyncio
+    async def test_get_messages_page_nonexistent_session(self, session_manager):
+        """Test paging a session that doesn't exist."""
+        assert await session_manager.get_messages_page("nonexistent-id") == ([], 0)
+
 
 class TestSession:
     """Tests for Session class."""
@@ -0,0 +1,89 @@
+"""
+Tests for the background telemetry sampler.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+from opencode.router import telemetry
+from opencode.router.telemetry import TelemetrySampler, get_sampler
+from opencode.router.vram_monitor import GPUVendor, VRAMMonitor
+
+
+def fake_monitor(output: str = "0, RTX 4090, 24564, 8192, 16372, 35, 61\n") -> VRAMMonitor:
+    """A monitor whose read_status() parses canned nvidia-smi output."""
+    monitor = VRAMMonitor(auto_detect=False)
+    monitor._vendor = GPUVendor.NVIDIA
+    monitor._available = True
+    monitor.calls = 0
+    read_status = monitor.read_status
+    
+    def read(run=None):
+        monitor.calls += 1
+        return read_status(run=lambda args: output)
+    
+    monitor.read_status = read
+    return monitor
+
+
+class TestTelemetrySampler:
+    """Tests for TelemetrySampler."""
+    
+    def test_latest_before_first_sample(self):
+        """Test latest() is None until a sample is taken."""
+        sampler = TelemetrySampler(monitor=fake_monitor())
+        
+        assert sampler.latest() is None
+        assert sampler.history() == []
+    
+    def test_ring_buffer_keeps_recent_samples(self):
+        """Test the buffer drops the oldest samples past its capacity."""
+        sampler = TelemetrySampler(monitor=fake_monitor(), history=3)
+        
+        samples = [sampler.sample_now() for _ in range(5)]
+        
+        assert sampler.history() == samples[2:]
+        assert sampler.latest() is samples[-1]
+        assert sampler.latest().vram.total_free_mb == 16372
+        assert sampler.latest().memory_total_mb > 0
+    
+    def test_background_thread_samples(self):
+        """Test the thread samples on its interval and stops cleanly."""
+        monitor = fake_monitor()
+        sampler = TelemetrySampler(monitor=monitor, interval=0.01).start()
+        try:
+            deadline = time.monotonic() + 5
+            while monitor.calls < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert monitor.calls >= 3
+            assert sampler.running
+        finally:
+            sampler.stop(timeout=5)
+        
+        assert not sampler.running
+        calls = monitor.calls
+        time.sleep(0.05)
+        assert monitor.calls == calls
+    
+    def test_reads_do_not_sample(self):
+        """Test latest() never queries the GPU."""
+        monitor = fake_monitor()
+        sampler = TelemetrySampler(monitor=monitor)
+        sampler.sample_now()
+        
+        for _ in range(100):
+            sampler.latest()
+        
+        assert monitor.calls == 1
+    
+    def test_get_sampler_shared(self, monkeypatch):
+        """Test get_sampler() returns one started sampler and updates its interval."""
+        created = MagicMock(spec=TelemetrySampler)
+        created.start.return_value = created
+        monkeypatch.setattr(telemetry, "_sampler", None)
+        monkeypatch.setattr(telemetry, "TelemetrySampler", MagicMock(return_value=created))
+        
+        assert get_sampler() is created
+        assert get_sampler(interval=0.5) is created
+        assert created.interval == 0.5
+        assert telemetry.TelemetrySampler.call_count == 1
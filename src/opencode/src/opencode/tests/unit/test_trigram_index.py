@@ -0,0 +1,203 @@
+"""Tests for the persistent trigram index."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from opencode.tool import trigram_index as trigram_module
+from opencode.tool.file_index import FileIndex, close_file_indexes
+from opencode.tool.file_tools import GrepTool
+from opencode.tool.trigram_index import (
+    TrigramIndex,
+    build_query,
+    close_trigram_indexes,
+    extract_trigrams,
+)
+
+
+def gram(text: str) -> int:
+    return int.from_bytes(text.encode(), "big")
+
+
+class TestBuildQuery:
+    """Tests for regex to trigram query translation."""
+
+    def test_literal(self):
+        """Test a plain literal requires all of its trigrams."""
+        query = build_query("hello")
+        assert query.op == "and"
+        assert query.trigrams == {gram("hel"), gram("ell"), gram("llo")}
+
+    def test_literals_are_lowercased(self):
+        """Test literals match the lowercased index."""
+        assert build_query("ABC").trigrams == {gram("abc")}
+
+    def test_wildcards_split_literals(self):
+        """Test non-literal items end a literal run."""
+        query = build_query(r"def \w+_handler\(")
+        assert gram("def") in query.trigrams
+        assert gram("han") in query.trigrams
+        assert gram("f h") not in query.trigrams
+
+    def test_alternation(self):
+        """Test alternations become OR queries."""
+        query = build_query("foo|bar")
+        assert query.subqueries[0].op == "or"
+        assert [sub.trigrams for sub in query.subqueries[0].subqueries] == [{gram("foo")}, {gram("bar")}]
+
+    def test_unindexable_patterns(self):
+        """Test patterns without a required literal match every file."""
+        assert build_query(r"\w+") is None
+        assert build_query("ab") is None
+        assert build_query("foo|x") is None
+        assert build_query("(?:abc)?") is None
+
+    def test_required_repeat(self):
+        """Test repeats with a minimum of one still require their literal."""
+        assert build_query("(?:abc)+").subqueries[0].trigrams == {gram("abc")}
+
+
+class TestExtractTrigrams:
+    """Tests for content trigram extraction."""
+
+    def test_unique_lowercased(self):
+        """Test trigrams are unique and case-folded."""
+        assert list(extract_trigrams(b"AbcAbc")) == sorted({gram("abc"), gram("bca"), gram("cab")})
+        assert len(extract_trigrams(b"ab")) == 0
+
+
+class TestTrigramIndex:
+    """Tests for TrigramIndex."""
+
+    def _index(self, root: Path) -> TrigramIndex:
+        return TrigramIndex(
+            root,
+            db_path=root / ".index" / "trigram.db",
+            file_index=FileIndex(root, watch=False, stale_after=0.0),
+            stale_after=0.0,
+        )
+
+    def _write(self, root: Path, files: dict) -> None:
+        for rel_path, content in files.items():
+            path = root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content)
+
+    def test_candidates(self):
+        """Test only files containing the query trigrams are candidates."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write(root, {
+                ".gitignore": ".index/\n",
+                "a.py": "def handler(): pass\n",
+                "b.py": "class Handler: pass\n",
+                "pkg/c.py": "print('nothing')\n",
+                "blob.bin": b"handler\x00\x00",
+            })
+            index = self._index(root)
+            try:
+                assert index.candidates("handler") == ["a.py", "b.py"]
+                assert index.candidates("HANDLER|nothing") == ["a.py", "b.py", "pkg/c.py"]
+                assert index.candidates("nothing", base="pkg") == ["c.py"]
+                assert index.candidates(r"\w+") is None
+            finally:
+                index.close()
+
+    def test_incremental_update(self):
+        """Test changed, unchanged and deleted files are reconciled."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write(root, {".gitignore": ".index/\n", "a.py": "alpha\n", "b.py": "beta\n"})
+            index = self._index(root)
+            try:
+                assert index.candidates("alpha") == ["a.py"]
+                assert len(index) == 3
+
+                self._write(root, {"a.py": "gamma\n"})
+                (root / "b.py").unlink()
+                assert index.candidates("alpha") == []
+                assert index.candidates("gamma") == ["a.py"]
+                assert len(index) == 2
+            finally:
+                index.close()
+
+    def test_touched_file_is_not_reindexed(self):
+        """Test an mtime change with the same content keeps its postings."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write(root, {".gitignore": ".index/\n", "a.py": "alpha\n"})
+            index = self._index(root)
+            try:
+                index.sync()
+                file_id = index.conn.execute("SELECT id FROM files WHERE path = 'a.py'").fetchone()[0]
+
+                stat = os.stat(root / "a.py")
+                os.utime(root / "a.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+                assert index.candidates("alpha") == ["a.py"]
+                assert index.conn.execute("SELECT id FROM files WHERE path = 'a.py'").fetchone()[0] == file_id
+            finally:
+                index.close()
+
+    def test_gitignore_change_resyncs_all_files(self):
+        """Test a rebuild after a .gitignore edit drops and adds indexed files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write(root, {
+                ".gitignore": ".index/\nbuild/\n",
+                "a.py": "needle\n",
+                "build/out.py": "needle\n",
+            })
+            # Neither index goes stale on its own, as when a watcher is running
+            file_index = FileIndex(root, watch=False, stale_after=3600.0)
+            index = TrigramIndex(root, db_path=root / ".index" / "trigram.db", file_index=file_index, stale_after=3600.0)
+            try:
+                assert index.candidates("needle") == ["a.py"]
+
+                # What the watcher does when it sees the .gitignore change
+                self._write(root, {".gitignore": ".index/\na.py\n"})
+                file_index._reload_ignore_rules()
+                assert index.candidates("needle") == ["build/out.py"]
+            finally:
+                index.close()
+
+    def test_index_persists(self):
+        """Test a reopened index reuses the stored postings."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write(root, {".gitignore": ".index/\n", "a.py": "alpha\n"})
+            self._index(root).sync()
+
+            reopened = self._index(root)
+            try:
+                count = reopened.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+                assert count > 0
+                assert reopened.candidates("alpha") == ["a.py"]
+            finally:
+                reopened.close()
+
+
+class TestGrepToolTrigramIndex:
+    """Tests for GrepTool with the trigram index enabled."""
+
+    @pytest.mark.asyncio
+    async def test_index_narrows_search(self, monkeypatch):
+        """Test indexed searches verify candidates with the real regex."""
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as cache:
+            monkeypatch.setattr(trigram_module, "default_index_path", lambda root: Path(cache) / "t.db")
+            root = Path(tmpdir)
+            (root / "a.py").write_text("def handler(): pass\n")
+            (root / "b.py").write_text("handler = None\n")
+
+            tool = GrepTool(working_directory=root, use_trigram_index=True)
+            result = await tool.execute(pattern=r"def handler", context=0)
+
+            assert result.success is True
+            assert result.output.splitlines() == ["a.py:1:> def handler(): pass"]
+            assert result.metadata["files_searched"] == 1
+            close_trigram_indexes()
+            close_file_indexes()
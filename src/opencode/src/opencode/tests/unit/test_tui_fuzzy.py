@@ -0,0 +1,177 @@
+"""Tests for fuzzy matching and its use in completion providers."""
+
+import random
+import string
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from opencode.tool.file_index import FileIndex
+from opencode.tui import fuzzy
+from opencode.tui.fuzzy import FuzzyMatcher, fuzzy_filter
+from opencode.tui.widgets.completion import (
+    CommandCompletionProvider,
+    CompletionItem,
+    CompletionManager,
+    CompletionProvider,
+    MentionCompletionProvider,
+)
+
+
+def reference_score(query: str, text: str):
+    """Straightforward per-character version of the matcher's scoring."""
+    lowered = text.lower()
+    end, position = -1, -1
+    for char in query:
+        position = lowered.find(char, position + 1)
+        if position < 0:
+            return None
+        end = position
+    positions = [end]
+    for char in reversed(query[:-1]):
+        positions.append(lowered.rfind(char, 0, positions[-1]))
+    positions.reverse()
+
+    def char_class(c):
+        if c in "/\\":
+            return "sep"
+        if c in " \t":
+            return "white"
+        if c in "_-.,:;|":
+            return "delim"
+        if "A" <= c <= "Z":
+            return "upper"
+        if "0" <= c <= "9":
+            return "digit"
+        return "lower"
+
+    def bonus(i):
+        current = char_class(text[i])
+        previous = "sep" if i == 0 else char_class(text[i - 1])
+        if current in ("lower", "upper", "digit"):
+            if previous == "sep":
+                return fuzzy.BONUS_SEPARATOR
+            if previous in ("white", "delim"):
+                return fuzzy.BONUS_BOUNDARY
+        if current == "upper" and previous == "lower":
+            return fuzzy.BONUS_CAMEL
+        if current == "digit" and previous in ("lower", "upper"):
+            return fuzzy.BONUS_CAMEL
+        return 0
+
+    score, run_bonus = 0, 0
+    for i, position in enumerate(positions):
+        char_bonus = bonus(position)
+        if i == 0:
+            run_bonus = char_bonus
+            score += fuzzy.SCORE_MATCH + char_bonus * fuzzy.BONUS_FIRST_CHAR_MULTIPLIER
+            continue
+        gap = position - positions[i - 1] - 1
+        if gap == 0:
+            if char_bonus >= fuzzy.BONUS_BOUNDARY:
+                run_bonus = char_bonus
+            char_bonus = max(char_bonus, run_bonus, fuzzy.BONUS_CONSECUTIVE)
+        else:
+            run_bonus = char_bonus
+            score += fuzzy.SCORE_GAP_START + fuzzy.SCORE_GAP_EXTENSION * (gap - 1)
+        score += fuzzy.SCORE_MATCH + char_bonus
+    return score
+
+
+class TestFuzzyMatcher:
+    """Tests for FuzzyMatcher."""
+
+    def test_matches_reference(self):
+        """Test matches and scores agree with the reference, across bucket widths."""
+        rng = random.Random(7)
+        alphabet = string.ascii_letters + string.digits + "/_.- "
+        candidates = [
+            "".join(rng.choice(alphabet) for _ in range(rng.choice([3, 20, 60, 70, 130, 300])))
+            for _ in range(400)
+        ]
+        matcher = FuzzyMatcher(candidates)
+        for query in ["a", "ab", "a/b", "x9", "qzq", "e_e", "zzzzzzzz"]:
+            expected = {
+                i: reference_score(query, text)
+                for i, text in enumerate(candidates)
+                if reference_score(query, text) is not None
+            }
+            got = {m.index: m.score for m in matcher.match(query)}
+            assert got == expected, query
+
+    def test_word_boundaries_rank_first(self):
+        """Test separator, delimiter and camelCase starts beat mid-word hits."""
+        candidates = ["xfooxbar", "foo/bar", "fooBar", "foo_bar"]
+        ranked = [m.text for m in fuzzy_filter("fb", candidates)]
+        assert ranked[-1] == "xfooxbar"
+        assert ranked[0] == "foo/bar"
+
+        assert fuzzy_filter("comp", ["unit/core/mcp", "tui/completion.py"])[0].text == "tui/completion.py"
+
+    def test_top_k_and_ties(self):
+        """Test limits keep the best matches, preferring shorter then earlier ones."""
+        candidates = ["src/b.py", "src/a.py", "a.py", "lib/a.py"]
+        assert [m.text for m in fuzzy_filter("a", candidates, limit=2)] == ["a.py", "src/a.py"]
+        assert [m.text for m in fuzzy_filter("", candidates, limit=2)] == ["src/b.py", "src/a.py"]
+
+    def test_incremental_narrowing(self):
+        """Test extending, editing and shortening the query give fresh results."""
+        rng = random.Random(3)
+        candidates = ["".join(rng.choice("abcde/") for _ in range(rng.randint(1, 90))) for _ in range(500)]
+        matcher = FuzzyMatcher(candidates)
+        for query in ["a", "ab", "abc", "ab", "abd", "b", "bad"]:
+            assert matcher.match(query, limit=15) == FuzzyMatcher(candidates).match(query, limit=15), query
+
+    def test_non_ascii(self):
+        """Test non-ASCII characters match case-insensitively."""
+        assert [m.text for m in fuzzy_filter("CAFÉ", ["café.md", "cafe.md"])] == ["café.md"]
+
+
+class TestFuzzyCompletion:
+    """Tests for fuzzy ranking in completion providers."""
+
+    def test_command_fuzzy_match(self):
+        """Test commands match by subsequence, best first."""
+        provider = CommandCompletionProvider(commands={
+            "help": {"description": "Show help"},
+            "history": {"description": "Show history"},
+            "checkpoint": {},
+        })
+        result = provider.get_completions("/hp", 3, {})
+        assert [item.text for item in result] == ["/help", "/checkpoint"]
+
+        provider.commands["hop"] = {}
+        assert provider.get_completions("/hp", 3, {})[0].text == "/hop"
+
+    def test_mention_ranks_indexed_files(self):
+        """Test file mentions are ranked over the whole index, not cut off early."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            for i in range(30):
+                (root / f"aaa_{i:02d}_config.txt").write_text("")
+            (root / "src").mkdir()
+            (root / "src" / "config.py").write_text("")
+
+            index = FileIndex(root, watch=False)
+            provider = MentionCompletionProvider()
+            with patch("opencode.tool.file_index.get_file_index", return_value=index):
+                provider.get_completions("@file:config", 12, {"workspace_root": str(root)})
+                assert provider.wait_for_index(timeout=10)
+                result = provider.get_completions("@file:config", 12, {"workspace_root": str(root)})
+            assert result[0].text == "@file:src/config.py"
+            assert len(result) == 20
+
+    def test_manager_merges_ranked_lists(self):
+        """Test provider results are merged in order and deduplicated."""
+
+        class Static(CompletionProvider):
+            def __init__(self, items):
+                self.items = items
+
+            def get_completions(self, text, cursor_position, context):
+                return self.items
+
+        manager = CompletionManager()
+        manager.add_provider(Static([CompletionItem("a", "a", score=5), CompletionItem("b", "b", score=1)]))
+        manager.add_provider(Static([CompletionItem("c", "c", score=3), CompletionItem("a", "a", score=0)]))
+        assert [item.text for item in manager.get_completions("", 0, {})] == ["a", "c", "b"]
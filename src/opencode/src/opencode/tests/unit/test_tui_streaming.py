@@ -0,0 +1,132 @@
+"""
+Tests for the TUI streaming render pipeline.
+"""
+
+import asyncio
+import math
+
+import pytest
+from textual.app import App, ComposeResult
+
+from opencode.tui.app import ChatContainer, StreamingMessageWidget
+from opencode.tui.streaming import StreamThrottle, split_settled
+
+
+@pytest.mark.unit
+class TestSplitSettled:
+    """Tests for split_settled."""
+    
+    def test_short_text_stays_in_tail(self):
+        """Test nothing settles below twice the block size."""
+        text = "line\n" * 7
+        assert split_settled(text, 4) == ("", text)
+    
+    def test_settles_whole_lines(self):
+        """Test the tail keeps the last block of lines, including a partial one."""
+        text = "".join(f"{i}\n" for i in range(10)) + "partial"
+        
+        settled, tail = split_settled(text, 4)
+        
+        assert settled + tail == text
+        assert settled.endswith("\n")
+        assert tail == "7\n8\n9\npartial"
+
+
+@pytest.mark.unit
+class TestStreamThrottle:
+    """Tests for StreamThrottle."""
+    
+    @pytest.mark.asyncio
+    async def test_coalesces_deltas_per_frame(self):
+        """Test a burst of deltas is delivered in order in few flushes."""
+        flushed = []
+        throttle = StreamThrottle(flushed.append, fps=20)
+        
+        for i in range(1000):
+            throttle.feed(f"{i} ")
+        await asyncio.sleep(0.01)
+        throttle.feed("end")
+        assert throttle.pending
+        throttle.close()
+        
+        assert "".join(flushed) == "".join(f"{i} " for i in range(1000)) + "end"
+        assert len(flushed) == 2
+        assert not throttle.pending
+    
+    @pytest.mark.asyncio
+    async def test_flush_waits_for_frame(self):
+        """Test a flush is deferred until the frame interval has passed."""
+        now = [0.0]
+        flushed = []
+        throttle = StreamThrottle(flushed.append, fps=10, clock=lambda: now[0])
+        
+        throttle.feed("a")
+        await asyncio.sleep(0.001)
+        assert flushed == ["a"]
+        
+        now[0] = 0.05
+        throttle.feed("b")
+        await asyncio.sleep(0.01)
+        assert flushed == ["a"]
+        
+        await asyncio.sleep(0.1)
+        assert flushed == ["a", "b"]
+    
+    def test_flushes_immediately_without_loop(self):
+        """Test feeding outside an event loop delivers text directly."""
+        flushed = []
+        throttle = StreamThrottle(flushed.append)
+        
+        throttle.feed("x")
+        throttle.feed("")
+        
+        assert flushed == ["x"]
+
+
+class ChatApp(App):
+    """Minimal app hosting a chat container."""
+    
+    def compose(self) -> ComposeResult:
+        yield ChatContainer(id="chat")
+
+
+@pytest.mark.unit
+class TestStreamingMessageWidget:
+    """Tests for StreamingMessageWidget."""
+    
+    @pytest.mark.asyncio
+    async def test_long_stream_freezes_blocks(self):
+        """Test long output settles into blocks and keeps a bounded tail."""
+        app = ChatApp()
+        async with app.run_test() as pilot:
+            chat = app.query_one("#chat", ChatContainer)
+            widget = chat.add_streaming_message("assistant", placeholder="Thinking...")
+            await pilot.pause()
+            assert widget.message_content == "Thinking..."
+            
+            lines = [f"line {i} [not markup]\n" for i in range(500)]
+            for line in lines:
+                widget.append_text(line)
+            await pilot.pause()
+            
+            assert widget.message_content == "".join(lines)
+            assert widget._tail_text.count("\n") < 2 * StreamingMessageWidget.TAIL_LINES
+            blocks = list(widget.query(".block"))
+            assert 1 <= len(blocks) <= math.log2(500 / StreamingMessageWidget.TAIL_LINES) + 1
+            assert "".join(str(block.render()) for block in blocks) + widget._tail_text == "".join(lines)
+    
+    @pytest.mark.asyncio
+    async def test_replace_content(self):
+        """Test setting message_content replaces streamed text and blocks."""
+        app = ChatApp()
+        async with app.run_test() as pilot:
+            widget = app.query_one("#chat", ChatContainer).add_streaming_message()
+            await pilot.pause()
+            widget.append_text("x\n" * 200)
+            await pilot.pause()
+            
+            widget.message_content = "[Cancelled]"
+            await pilot.pause()
+            
+            assert widget.message_content == "[Cancelled]"
+            assert not widget.query(".block")
@@ -0,0 +1,184 @@
+"""
+Tests for the virtualized TUI chat transcript.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from textual.app import App, ComposeResult
+
+from opencode.tui.app import ChatContainer, MessageWidget
+from opencode.tui.transcript import (
+    CHROME_ROWS,
+    TranscriptEntry,
+    estimate_height,
+    prefix_heights,
+    visible_range,
+)
+
+
+@pytest.mark.unit
+class TestTranscriptLayout:
+    """Tests for transcript height bookkeeping."""
+    
+    def test_estimate_height_wraps_lines(self):
+        """Test long lines are estimated as wrapped at the container width."""
+        assert estimate_height("short", 40) == 1 + CHROME_ROWS
+        assert estimate_height("x" * 100 + "\n\nend", 56) == 2 + 1 + 1 + CHROME_ROWS
+    
+    def test_measured_height_overrides_estimate(self):
+        """Test measured heights are used per width and dropped on new text."""
+        entry = TranscriptEntry(role="user", text="hello")
+        entry.heights[80] = 3
+        
+        assert entry.height(80) == 3
+        assert entry.height(40) == estimate_height("hello", 40)
+        
+        entry.set_text("hello again")
+        assert entry.heights == {}
+    
+    def test_visible_range(self):
+        """Test the range covers the viewport plus overscan."""
+        offsets = prefix_heights([TranscriptEntry(role="user", text="x") for _ in range(100)], 80)
+        row = offsets[1]
+        
+        assert visible_range(offsets, 10 * row, 2 * row, 0) == (10, 12)
+        assert visible_range(offsets, 10 * row, 2 * row, row) == (9, 13)
+        assert visible_range(offsets, offsets[-1], 2 * row, 0) == (99, 100)
+        assert visible_range([0], 0, 10, 5) == (0, 0)
+
+
+def make_messages(count: int) -> list:
+    """Session-like messages with varying lengths."""
+    return [
+        SimpleNamespace(role="user" if i % 2 else "assistant", content=f"message {i}\n" + "word " * (i % 40))
+        for i in range(count)
+    ]
+
+
+class ChatApp(App):
+    """Minimal app hosting a chat container."""
+    
+    def compose(self) -> ComposeResult:
+        yield ChatContainer(id="chat")
+
+
+@pytest.mark.unit
+class TestVirtualizedChat:
+    """Tests for ChatContainer virtualization."""
+    
+    @pytest.mark.asyncio
+    async def test_history_materializes_visible_window(self):
+        """Test a long history only mounts widgets near the viewport."""
+        messages = make_messages(2000)
+        app = ChatApp()
+        async with app.run_test(size=(100, 40)) as pilot:
+            chat = app.query_one("#chat", ChatContainer)
+            chat.load_history(messages)
+            for _ in range(20):
+                await pilot.pause()
+                if chat._window[1] == len(messages) and chat.scroll_y == chat.max_scroll_y > 0:
+                    break
+            
+            widgets = list(chat.query(MessageWidget))
+            assert len(chat.entries) == 2000
+            assert 0 < len(widgets) < 50
+            assert widgets[-1].message_content == messages[-1].content
+            assert chat.scroll_y == chat.max_scroll_y
+            
+            middle = chat.max_scroll_y // 2
+            chat.scroll_to(y=middle, animate=False)
+            for _ in range(20):
+                await pilot.pause()
+                if chat.scroll_y == middle and not chat._update_pending:
+                    break
+            
+            lo, hi = chat._window
+            assert 0 < lo < hi < 2000
+            assert len(chat.query(MessageWidget)) == hi - lo
+    
+    @pytest.mark.asyncio
+    async def test_window_follows_end_before_scroll_lands(self):
+        """Test an update that runs before scroll_end() applies keeps the newest entries."""
+        messages = make_messages(500)
+        app = ChatApp()
+        async with app.run_test(size=(100, 40)) as pilot:
+            chat = app.query_one("#chat", ChatContainer)
+            chat.load_history(messages)
+            assert chat.scroll_y == 0
+            chat._update_window()
+            
+            assert chat._window[1] == len(messages)
+            
+            await pilot.pause()
+            chat.scroll_to(y=0, animate=False)
+            for _ in range(20):
+                await pilot.pause()
+                if chat.scroll_y == 0 and not chat._update_pending:
+                    break
+            assert chat._window[0] == 0
+    
+    @pytest.mark.asyncio
+    async def test_pages_in_older_messages(self):
+        """Test scrolling to the top loads older pages from the loader."""
+        messages = make_messages(300)
+        requested = []
+        
+        async def loader(before):
+            requested.append(before)
+            start = max(0, before - ChatContainer.PAGE_SIZE)
+            return messages[start:before], start
+        
+        app = ChatApp()
+        async with app.run_test(size=(100, 40)) as pilot:
+            chat = app.query_one("#chat", ChatContainer)
+            chat.load_history(messages[-50:], 250, loader=loader)
+            await pilot.pause()
+            
+            for _ in range(20):
+                if chat.first_offset == 0:
+                    break
+                chat.scroll_to(y=0, animate=False)
+                await pilot.pause()
+                await asyncio.sleep(0.01)
+            
+            assert requested == [250, 200, 150, 100, 50]
+            assert [entry.text for entry in chat.entries] == [m.content for m in messages]
+            assert len(chat.query(MessageWidget)) < 50
+    
+    @pytest.mark.asyncio
+    async def test_finished_stream_joins_transcript(self):
+        """Test a streamed message becomes an entry when it ends."""
+        app = ChatApp()
+        async with app.run_test() as pilot:
+            chat = app.query_one("#chat", ChatContainer)
+            chat.add_message("user", "hi")
+            widget = chat.add_streaming_message()
+            widget.append_text("Error: boom")
+            widget.add_class("error")
+            await pilot.pause()
+            
+            chat.end_streaming(widget)
+            await pilot.pause()
+            
+            assert [entry.text for entry in chat.entries] == ["hi", "Error: boom"]
+            assert chat.entries[-1].classes == {"error"}
+            last = list(chat.query(MessageWidget))[-1]
+            assert last.message_content == "Error: boom"
+            assert last.has_class("error")
+    
+    @pytest.mark.asyncio
+    async def test_clear_messages(self):
+        """Test clearing removes entries and widgets."""
+        app = ChatApp()
+        async with app.run_test() as pilot:
+            chat = app.query_one("#chat", ChatContainer)
+            chat.load_history(make_messages(100))
+            await pilot.pause()
+            
+            chat.clear_messages()
+            await pilot.pause()
+            
+            assert chat.entries == []
+            assert not chat.query(MessageWidget)
@@ -14,6 +14,9 @@ from opencode.router.vram_monitor import (
     GPUInfo,
     VRAMStatus,
     VRAMMonitor,
+    parse_apple_memory,
+    parse_nvidia_smi,
+    parse_rocm_smi,
 )
 
 
@@ -688,3 +691,81 @@ class TestVRAMMonitor:
         
         assert status.gpus == []
         assert status.total_memory_mb == 0
+
+
+class TestBackendParsers:
+    """Tests for vendor output parsers and synchronous reads."""
+
+    NVIDIA_OUTPUT = "0, RTX 4090, 24564, 8192, 16372, 35, 61\n1, RTX 3060, 12288, 0, 12288, 0\n"
+
+    def test_parse_nvidia_smi(self):
+        """Test parsing nvidia-smi CSV output, with and without temperature."""
+        gpus = parse_nvidia_smi(self.NVIDIA_OUTPUT)
+        
+        assert [gpu.name for gpu in gpus] == ["RTX 4090", "RTX 3060"]
+        assert gpus[0].free_memory_mb == 16372
+        assert gpus[0].temperature_c == 61.0
+        assert gpus[1].temperature_c is None
+
+    def test_parse_rocm_smi(self):
+        """Test parsing rocm-smi JSON output."""
+        output = '{"card0": {"VRAM Total Memory (B)": "17179869184", "VRAM Total Used Memory (B)": "4294967296"}}'
+        
+        gpus = parse_rocm_smi(output)
+        
+        assert gpus[0].total_memory_mb == 16384
+        assert gpus[0].free_memory_mb == 12288
+
+    def test_parse_apple_memory(self):
+        """Test parsing sysctl and vm_stat output."""
+        vm_stat = (
+            "Mach Virtual Memory Statistics: (page size of 16384 bytes)\n"
+            "Pages active: 262144.\n"
+            "Pages wired down: 65536.\n"
+        )
+        
+        gpus = parse_apple_memory("17179869184\n", vm_stat)
+        
+        assert gpus[0].used_memory_mb == 5120
+        assert gpus[0].free_memory_mb == 11264
+
+    def test_read_status_with_fake_runner(self):
+        """Test read_status runs the vendor command through the given runner."""
+        monitor = VRAMMonitor(auto_detect=False)
+        monitor._vendor = GPUVendor.NVIDIA
+        monitor._available = True
+        commands = []
+        
+        def run(args):
+            commands.append(args[0])
+            return self.NVIDIA_OUTPUT
+        
+        status = monitor.read_status(run=run)
+        
+        assert commands == ["nvidia-smi"]
+        assert status.total_memory_mb == 24564 + 12288
+
+    def test_read_status_command_failure(self):
+        """Test read_status returns an empty status when the command fails."""
+        monitor = VRAMMonitor(auto_detect=False)
+        monitor._vendor = GPUVendor.NVIDIA
+        monitor._available = True
+        
+        def run(args):
+            raise RuntimeError("nvidia-smi error: driver not loaded")
+        
+        assert monitor.read_status(run=run).gpus == []
+
+    @pytest.mark.asyncio
+    async def test_get_status_uses_sampler(self):
+        """Test get_status serves the sampler's snapshot without running commands."""
+        snapshot = VRAMMonitor(auto_detect=False)._build_status(parse_nvidia_smi(self.NVIDIA_OUTPUT))
+        sampler = MagicMock()
+        sampler.latest.return_value.vram = snapshot
+        monitor = VRAMMonitor(auto_detect=False, sampler=sampler)
+        
+        with patch("asyncio.create_subprocess_exec") as mock_exec:
+            status = await monitor.get_status()
+        
+        assert status is snapshot
+        mock_exec.assert_not_called()
@@ -0,0 +1,202 @@
+"""
+Tests for the workflow HTTP client pool.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import MagicMock
+
+from opencode.workflow.engine import WorkflowEngine
+from opencode.workflow.http_pool import HttpClientPool, pool_for
+from opencode.workflow.node import ExecutionContext
+from opencode.workflow.nodes.http import HttpNode
+
+
+def make_pool(handler, **kwargs) -> HttpClientPool:
+    """Create a pool backed by a mock transport."""
+    return HttpClientPool(transport=httpx.MockTransport(handler), **kwargs)
+
+
+class TestHttpClientPool:
+    """Tests for HttpClientPool."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused(self):
+        """Test the same client serves every request."""
+        pool = make_pool(lambda request: httpx.Response(200, text="ok"))
+        client = pool.client
+        await pool.request("GET", "https://example.com/a")
+        await pool.request("POST", "https://example.com/b", json={"x": 1})
+        assert pool.client is client
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_are_coalesced(self):
+        """Test identical in-flight GETs share one request."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"n": 1})
+
+        pool = make_pool(handler)
+        responses = await asyncio.gather(*[pool.request("GET", "https://example.com/data") for _ in range(20)])
+        assert len(calls) == 1
+        assert all(r.json() == {"n": 1} for r in responses)
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_different_headers_are_not_coalesced(self):
+        """Test requests with different headers are sent separately."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.headers.get("authorization"))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200)
+
+        pool = make_pool(handler)
+        await asyncio.gather(
+            pool.request("GET", "https://example.com/me", headers={"Authorization": "a"}),
+            pool.request("GET", "https://example.com/me", headers={"Authorization": "b"}),
+        )
+        assert sorted(calls) == ["a", "b"]
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_different_redirect_settings_are_not_coalesced(self):
+        """Test requests differing in follow_redirects are sent and cached separately."""
+        def handler(request):
+            if request.url.path == "/old":
+                return httpx.Response(302, headers={"location": "https://example.com/new"})
+            return httpx.Response(200, text="new", headers={"etag": '"v1"'})
+
+        pool = make_pool(handler)
+        followed, raw = await asyncio.gather(
+            pool.request("GET", "https://example.com/old", follow_redirects=True),
+            pool.request("GET", "https://example.com/old", follow_redirects=False),
+        )
+        assert followed.status_code == 200
+        assert raw.status_code == 302
+        again = await pool.request("GET", "https://example.com/old", follow_redirects=False)
+        assert again.status_code == 302
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_etag_revalidation(self):
+        """Test a 304 reply returns the cached response."""
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"v": 1}, headers={"ETag": '"v1"'})
+
+        pool = make_pool(handler)
+        first = await pool.request("GET", "https://example.com/item")
+        second = await pool.request("GET", "https://example.com/item")
+        assert seen == [None, '"v1"']
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_no_store_is_not_cached(self):
+        """Test responses marked no-store are not revalidated."""
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("if-modified-since"))
+            return httpx.Response(
+                200,
+                headers={"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT", "Cache-Control": "no-store"},
+            )
+
+        pool = make_pool(handler)
+        await pool.request("GET", "https://example.com/live")
+        await pool.request("GET", "https://example.com/live")
+        assert seen == [None, None]
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        """Test concurrent requests to one host are bounded."""
+        active = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200)
+
+        pool = make_pool(handler, per_host_limit=2)
+        await asyncio.gather(*[pool.request("POST", "https://example.com/x") for _ in range(8)])
+        assert peak == 2
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_closed_pool_rejects_requests(self):
+        """Test a closed pool cannot be used."""
+        pool = make_pool(lambda request: httpx.Response(200))
+        await pool.aclose()
+        with pytest.raises(RuntimeError):
+            await pool.request("GET", "https://example.com")
+
+
+class TestPoolFor:
+    """Tests for pool_for."""
+
+    @pytest.mark.asyncio
+    async def test_uses_context_pool(self):
+        """Test the engine pool is taken from the context."""
+        pool = HttpClientPool()
+        context = ExecutionContext(workflow_id="wf", execution_id="ex", node_id="n", http_pool=pool)
+        async with pool_for(context) as selected:
+            assert selected is pool
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_temporary_pool_without_engine(self):
+        """Test a temporary pool is created and closed otherwise."""
+        async with pool_for(MagicMock()) as selected:
+            assert isinstance(selected, HttpClientPool)
+        with pytest.raises(RuntimeError):
+            selected.client
+
+
+class TestHttpNodeWithPool:
+    """Tests for HttpNode using the engine pool."""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_reuses_cached_response(self):
+        """Test many executions hit the server once plus revalidations."""
+        hits = []
+
+        def handler(request):
+            hits.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match"):
+                return httpx.Response(304)
+            return httpx.Response(200, json={"ok": True}, headers={"ETag": '"abc"'})
+
+        engine = WorkflowEngine()
+        engine.http_pool = make_pool(handler)
+        context = ExecutionContext(
+            workflow_id="wf", execution_id="ex", node_id="http-1", http_pool=engine.http_pool
+        )
+        node = HttpNode("http-1", {"url": "https://api.example.com/items"})
+
+        for _ in range(5):
+            result = await node.execute({}, context)
+            assert result.success is True
+            assert result.outputs["response"] == {"ok": True}
+
+        assert hits[0] is None
+        assert all(h == '"abc"' for h in hits[1:])
+        await engine.close()
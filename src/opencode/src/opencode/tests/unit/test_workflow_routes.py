@@ -590,3 +590,20 @@ class TestGPURoutes:
         response = client.get("/workflows/gpu/can-run-parallel?models=invalid")
         # The route handles invalid format gracefully
         assert response.status_code == 200
+
+
+@pytest.mark.unit
+class TestEngineLifecycle:
+    """Tests for the shared workflow engine."""
+
+    @pytest.mark.asyncio
+    async def test_close_engine(self):
+        """Test closing the engine closes its HTTP pool and resets it."""
+        from opencode.server.routes import workflow
+
+        engine = workflow.get_engine()
+        await workflow.close_engine()
+
+        assert engine.http_pool._closed
+        assert workflow.get_engine() is not engine
+        await workflow.close_engine()
@@ -16,25 +16,6 @@ from opencode.tool.base import (
     register_tool,
 )
 
-# Core tools
-from opencode.tool.bash import BashTool
-from opencode.tool.file_tools import EditTool, GlobTool, GrepTool, ReadTool, WriteTool
-from opencode.tool.lsp import LSPTool
-
-# Extended tools
-from opencode.tool.apply_patch import ApplyPatchTool
-from opencode.tool.batch import BatchTool
-from opencode.tool.codesearch import CodeSearchTool
-from opencode.tool.git import GitTool
-from opencode.tool.multiedit import MultiEditTool
-from opencode.tool.plan import PlanTool
-from opencode.tool.question import QuestionTool
-from opencode.tool.skill import SkillTool
-from opencode.tool.task import TaskTool
-from opencode.tool.todo import TodoReadTool, TodoWriteTool
-from opencode.tool.webfetch import WebFetchTool
-from opencode.tool.websearch import WebSearchTool
-
 __all__ = [
     # Base classes
     "PermissionLevel",
@@ -68,3 +49,39 @@ __all__ = [
     "WebFetchTool",
     "WebSearchTool",
 ]
+
+# Tool implementations are imported on first access
+_LAZY_ATTRIBUTES = {
+    # Core tools
+    "BashTool": ".bash:BashTool",
+    "EditTool": ".file_tools:EditTool",
+    "GlobTool": ".file_tools:GlobTool",
+    "GrepTool": ".file_tools:GrepTool",
+    "ReadTool": ".file_tools:ReadTool",
+    "WriteTool": ".file_tools:WriteTool",
+    "LSPTool": ".lsp:LSPTool",
+    # Extended tools
+    "ApplyPatchTool": ".apply_patch:ApplyPatchTool",
+    "BatchTool": ".batch:BatchTool",
+    "CodeSearchTool": ".codesearch:CodeSearchTool",
+    "GitTool": ".git:GitTool",
+    "MultiEditTool": ".multiedit:MultiEditTool",
+    "PlanTool": ".plan:PlanTool",
+    "QuestionTool": ".question:QuestionTool",
+    "SkillTool": ".skill:SkillTool",
+    "TaskTool": ".task:TaskTool",
+    "TodoReadTool": ".todo:TodoReadTool",
+    "TodoWriteTool": ".todo:TodoWriteTool",
+    "WebFetchTool": ".webfetch:WebFetchTool",
+    "WebSearchTool": ".websearch:WebSearchTool",
+}
+
+
+def __getattr__(name: str):
+    """Lazily import tool implementations on first access."""
+    if name in _LAZY_ATTRIBUTES:
+        module_path, attribute = _LAZY_ATTRIBUTES[name].split(":")
+        import importlib
+        module = importlib.import_module(module_path, package=__name__)
+        return getattr(module, attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,6 +9,7 @@ This tool implements a custom patch format that supports:
 """
 
 import os
+from collections import Counter
 from pathlib import Path
 from typing import Any, Optional
 from dataclasses import dataclass, field
@@ -216,32 +217,132 @@ def parse_patch(patch_text: str) -> list[Hunk]:
     return hunks
 
 
-def seek_sequence(haystack: list[str], needle: list[str], start_idx: int = 0, is_end_of_file: bool = False) -> int:
-    """Find the starting index of a sequence in a list."""
-    if not needle:
-        return start_idx
-    
-    for i in range(start_idx, len(haystack) - len(needle) + 1):
-        match = True
-        for j, n in enumerate(needle):
-            if i + j >= len(haystack) or haystack[i + j] != n:
-                match = False
+# Line normalizations tried in order when locating hunk lines. The first
+# level is exact; the rest tolerate trailing, surrounding and internal
+# whitespace differences between the patch and the file.
+MATCH_LEVELS: tuple[str, ...] = ("exact", "rstrip", "strip", "whitespace")
+
+_NORMALIZERS = {
+    "exact": None,
+    "rstrip": str.rstrip,
+    "strip": str.strip,
+    "whitespace": lambda line: " ".join(line.split()),
+}
+
+
+class AmbiguousMatchError(ValueError):
+    """Raised when a whitespace-tolerant match has more than one candidate."""
+
+    def __init__(self, message: str, candidates: list[int]):
+        super().__init__(message)
+        self.candidates = candidates
+
+
+class LineIndex:
+    """
+    Line occurrence counts for a file, for locating hunks without a naive scan.
+
+    Each normalization level keeps the (normalized) lines and a count of
+    how often each one occurs. To find a sequence, the needle line with the
+    fewest occurrences is used as the anchor: candidates are found by
+    scanning for that line alone (``list.index`` runs in C) and only those
+    candidates are compared in full. A needle containing a line that is not
+    in the file is rejected without scanning at all. Levels other than
+    exact are built on first use.
+    """
+
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+        self._levels: dict[str, tuple[list[str], Counter]] = {}
+
+    def _level(self, level: str) -> tuple[list[str], Counter]:
+        cached = self._levels.get(level)
+        if cached is None:
+            normalize = _NORMALIZERS[level]
+            keys = self.lines if normalize is None else [normalize(line) for line in self.lines]
+            cached = self._levels[level] = (keys, Counter(keys))
+        return cached
+
+    def candidates(self, needle: list[str], start_idx: int = 0, level: str = "exact", limit: Optional[int] = None) -> list[int]:
+        """
+        Find the start positions of a line sequence, in ascending order.
+
+        Args:
+            needle: Lines to find
+            start_idx: Smallest start position to consider
+            level: Normalization level from MATCH_LEVELS
+            limit: Stop after this many matches
+
+        Returns:
+            Matching start positions at or after start_idx
+        """
+        if not needle:
+            return [start_idx]
+        keys, counts = self._level(level)
+        normalize = _NORMALIZERS[level]
+        wanted = needle if normalize is None else [normalize(line) for line in needle]
+
+        anchor = min(range(len(wanted)), key=lambda offset: counts[wanted[offset]])
+        if not counts[wanted[anchor]]:
+            return []
+        anchor_key = wanted[anchor]
+        last_start = len(keys) - len(wanted)
+        matches: list[int] = []
+        position = max(start_idx, 0) + anchor
+        while True:
+            try:
+                position = keys.index(anchor_key, position)
+            except ValueError:
                 break
-        if match:
-            return i
-    
-    # If end of file, try searching from the end
-    if is_end_of_file and len(needle) <= len(haystack):
-        for i in range(len(haystack) - len(needle), max(start_idx - 1, -1), -1):
-            match = True
-            for j, n in enumerate(needle):
-                if i + j >= len(haystack) or haystack[i + j] != n:
-                    match = False
+            start = position - anchor
+            if start > last_start:
+                break
+            if keys[start:start + len(wanted)] == wanted:
+                matches.append(start)
+                if limit is not None and len(matches) >= limit:
                     break
-            if match:
-                return i
-    
-    return -1
+            position += 1
+        return matches
+
+    def seek(self, needle: list[str], start_idx: int = 0, is_end_of_file: bool = False, file_path: str = "file") -> int:
+        """
+        Locate a sequence, falling back to whitespace-tolerant matching.
+
+        An exact match is always preferred, taking the first one at or after
+        start_idx (or the one ending at the last line for end-of-file
+        hunks). Looser levels are only accepted when they are unambiguous.
+
+        Returns:
+            The start position, or -1 if the lines are not found
+
+        Raises:
+            AmbiguousMatchError: If the best level that matches has several
+                candidates and none is preferred
+        """
+        if not needle:
+            return start_idx
+        tail = len(self.lines) - len(needle)
+        for level in MATCH_LEVELS:
+            if is_end_of_file and tail >= start_idx and self.candidates(needle, tail, level, limit=1) == [tail]:
+                return tail
+            found = self.candidates(needle, start_idx, level, limit=None if level != "exact" else 1)
+            if not found:
+                continue
+            if level == "exact" or len(found) == 1:
+                return found[0]
+            lines = ", ".join(str(position + 1) for position in found[:10])
+            more = f" and {len(found) - 10} more" if len(found) > 10 else ""
+            raise AmbiguousMatchError(
+                f"Ambiguous match in {file_path}: lines differing only in whitespace "
+                f"found at lines {lines}{more}; add context to the hunk:\n" + "\n".join(needle),
+                found,
+            )
+        return -1
+
+
+def seek_sequence(haystack: list[str], needle: list[str], start_idx: int = 0, is_end_of_file: bool = False) -> int:
+    """Find the starting index of a sequence in a list."""
+    return LineIndex(haystack).seek(needle, start_idx, is_end_of_file)
 
 
 def compute_replacements(
@@ -250,13 +351,14 @@ def compute_replacements(
     chunks: list[UpdateFileChunk],
 ) -> list[tuple[int, int, list[str]]]:
     """Compute line replacements for update chunks."""
+    index = LineIndex(original_lines)
     replacements: list[tuple[int, int, list[str]]] = []
     line_index = 0
     
     for chunk in chunks:
         # Handle context-based seeking
         if chunk.change_context:
-            context_idx = seek_sequence(original_lines, [chunk.change_context], line_index)
+            context_idx = index.seek([chunk.change_context], line_index, file_path=file_path)
             if context_idx == -1:
                 raise ValueError(f"Failed to find context '{chunk.change_context}' in {file_path}")
             line_index = context_idx + 1
@@ -268,16 +370,16 @@ def compute_replacements(
             continue
         
         # Try to match old lines in the file
-        pattern = chunk.old_lines.copy()
-        new_slice = chunk.new_lines.copy()
-        found = seek_sequence(original_lines, pattern, line_index, chunk.is_end_of_file)
+        pattern = chunk.old_lines
+        new_slice = chunk.new_lines
+        found = index.seek(pattern, line_index, chunk.is_end_of_file, file_path)
         
         # Retry without trailing empty line if not found
         if found == -1 and pattern and pattern[-1] == "":
             pattern = pattern[:-1]
             if new_slice and new_slice[-1] == "":
                 new_slice = new_slice[:-1]
-            found = seek_sequence(original_lines, pattern, line_index, chunk.is_end_of_file)
+            found = index.seek(pattern, line_index, chunk.is_end_of_file, file_path)
         
         if found != -1:
             replacements.append((found, len(pattern), new_slice))
@@ -337,8 +439,10 @@ def derive_new_contents_from_chunks(file_path: str, chunks: list[UpdateFileChunk
     
     new_content = "\n".join(new_lines)
     
-    # Generate unified diff
-    unified_diff = generate_unified_diff(original_content, new_content, file_path)
+    # Generate unified diff from the known changes rather than re-diffing
+    unified_diff = diff_from_replacements(
+        original_lines, replacements, file_path, original_content.endswith("\n")
+    )
     
     return unified_diff, new_content
 
@@ -360,6 +464,107 @@ def generate_unified_diff(old_content: str, new_content: str, file_path: str) ->
     return "".join(diff)
 
 
+def diff_from_replacements(
+    original_lines: list[str],
+    replacements: list[tuple[int, int, list[str]]],
+    file_path: str,
+    original_ends_with_newline: bool = True,
+    context: int = 3,
+) -> str:
+    """
+    Render a unified diff directly from computed replacements.
+
+    The changed regions are already known, so this avoids running a
+    sequence matcher over the whole file. The output has the same shape as
+    generate_unified_diff() for the same edit; each replacement is trimmed
+    of lines it leaves unchanged. The new content is assumed to end with a
+    newline, as derive_new_contents_from_chunks() ensures.
+
+    Args:
+        original_lines: Original file lines, without line endings
+        replacements: Sorted (start, remove_count, new_lines) tuples
+        file_path: Path shown in the diff header
+        original_ends_with_newline: Whether the original file ended with a newline
+        context: Number of unchanged lines around each change
+
+    Returns:
+        The unified diff, or an empty string if nothing changed
+    """
+    total = len(original_lines)
+
+    def old_line(i: int) -> str:
+        if i == total - 1 and not original_ends_with_newline:
+            return original_lines[i]
+        return original_lines[i] + "\n"
+
+    # Changed regions as (old_start, old_end, new_lines), with the last line
+    # forced into a change when the original lacks a trailing newline
+    regions: list[tuple[int, int, list[str]]] = [
+        (start, start + count, [line + "\n" for line in new_lines])
+        for start, count, new_lines in replacements
+    ]
+    if total and not original_ends_with_newline:
+        appended: list[str] = []
+        while regions and regions[-1][0] == total:
+            appended[:0] = regions.pop()[2]
+        if regions and regions[-1][1] == total:
+            start, end, new_lines = regions.pop()
+            regions.append((start, end, new_lines + appended))
+        else:
+            regions.append((total - 1, total, [original_lines[-1] + "\n"] + appended))
+
+    # Merge touching regions, then trim unchanged leading and trailing lines
+    merged: list[tuple[int, int, list[str]]] = []
+    for region in regions:
+        if merged and region[0] == merged[-1][1]:
+            start, _, new_lines = merged.pop()
+            region = (start, region[1], new_lines + region[2])
+        merged.append(region)
+    changes: list[tuple[int, int, int, list[str]]] = []
+    shift = 0
+    for old_start, old_end, new_lines in merged:
+        new_start = old_start + shift
+        shift += len(new_lines) - (old_end - old_start)
+        head, tail = 0, len(new_lines)
+        while old_start < old_end and head < tail and old_line(old_start) == new_lines[head]:
+            old_start, head, new_start = old_start + 1, head + 1, new_start + 1
+        while old_start < old_end and head < tail and old_line(old_end - 1) == new_lines[tail - 1]:
+            old_end, tail = old_end - 1, tail - 1
+        if old_start < old_end or head < tail:
+            changes.append((old_start, old_end, new_start, new_lines[head:tail]))
+    if not changes:
+        return ""
+
+    # Group changes whose context windows touch, as difflib does
+    groups: list[list[tuple[int, int, int, list[str]]]] = [[changes[0]]]
+    for change in changes[1:]:
+        if change[0] - groups[-1][-1][1] <= 2 * context:
+            groups[-1].append(change)
+        else:
+            groups.append([change])
+
+    def format_range(start: int, length: int) -> str:
+        if length == 1:
+            return str(start + 1)
+        return f"{start + 1 if length else start},{length}"
+
+    out = [f"--- {file_path}\n", f"+++ {file_path}\n"]
+    for group in groups:
+        old_first = max(group[0][0] - context, 0)
+        old_last = min(group[-1][1] + context, total)
+        new_first = group[0][2] - (group[0][0] - old_first)
+        new_length = (old_last - old_first) + sum(len(lines) - (end - start) for start, end, _, lines in group)
+        out.append(f"@@ -{format_range(old_first, old_last - old_first)} +{format_range(new_first, new_length)} @@\n")
+        position = old_first
+        for start, end, _, lines in group:
+            out.extend(" " + old_line(i) for i in range(position, start))
+            out.extend("-" + old_line(i) for i in range(start, end))
+            out.extend("+" + line for line in lines)
+            position = end
+        out.extend(" " + old_line(i) for i in range(position, old_last))
+    return "".join(out)
+
+
 def trim_diff(diff: str) -> str:
     """Trim diff header lines for cleaner output."""
     lines = diff.split("\n")
@@ -7,6 +7,7 @@ Reads index files first, then falls back to live search when needed.
 
 from __future__ import annotations
 
+import asyncio
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -393,9 +394,9 @@ class ExploreTool(Tool):
         """Fall back to live search when index is unavailable."""
         logger.info(f"Falling back to live search for: {query}")
         
-        # Generate index on the fly
+        # Generate index on the fly, off the event loop
         try:
-            index = self.generator.generate(self.project_path)
+            index = await asyncio.to_thread(self.generator.generate, self.project_path)
             self._index_content = self.generator.format_index(index)
             self._index_valid = True
             
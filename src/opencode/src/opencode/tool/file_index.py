@@ -0,0 +1,493 @@
+"""
+Shared workspace file index.
+
+Walking a large workspace on every glob, file search, or @file completion
+is slow. A FileIndex walks the tree once (applying ignore rules), keeps
+sorted arrays of file and directory paths in memory, and stays current
+through watchdog filesystem events. When watchdog is unavailable the
+index is rebuilt after it goes stale instead.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from opencode.tool.grep_engine import IgnoreRules, glob_to_regex, walk_tree
+
+logger = logging.getLogger(__name__)
+
+# Sorts after any character that can appear in a path
+_PATH_MAX = "\U0010ffff"
+
+# Maximum number of workspaces indexed at once
+MAX_INDEXES = 8
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Get the part of a glob before its first wildcard."""
+    match = re.search(r"[*?\[]", pattern)
+    return pattern[:match.start()] if match else pattern
+
+
+def _is_gitignore(rel_path: str) -> bool:
+    return rel_path.rsplit("/", 1)[-1] == ".gitignore"
+
+
+def _subsequence(query: str, text: str) -> bool:
+    """Check whether all characters of query appear in text, in order."""
+    position = 0
+    for char in query:
+        position = text.find(char, position) + 1
+        if position == 0:
+            return False
+    return True
+
+
+class FileIndex:
+    """
+    In-memory index of the files and directories in a workspace.
+
+    Paths are stored relative to the root with "/" separators, in sorted
+    arrays, so glob and prefix queries only scan the matching key range.
+    The generation counter increases on every change, letting callers
+    cache derived data. The builds counter increases only on full
+    rebuilds, such as after a .gitignore edit, which listeners are not
+    told about path by path.
+
+    Example:
+        index = get_file_index(Path("."))
+        index.glob("**/*.py", base="src")
+        index.search("compl", limit=20)
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        respect_gitignore: bool = True,
+        watch: bool = True,
+        stale_after: float = 5.0,
+    ):
+        """
+        Initialize the index. The tree is walked on first use.
+
+        Args:
+            root: Workspace root directory
+            respect_gitignore: Skip paths matched by .gitignore rules
+            watch: Keep the index current with watchdog events
+            stale_after: Seconds after which an unwatched index is rebuilt
+        """
+        self.root = Path(root)
+        self.respect_gitignore = respect_gitignore
+        self.watch = watch
+        self.stale_after = stale_after
+        self.generation = 0
+        self.builds = 0
+
+        self._files: list[str] = []
+        self._dirs: list[str] = []
+        self._built_at: Optional[float] = None
+        self._ignore = IgnoreRules(self.root, respect_gitignore=respect_gitignore)
+        self._observer: Optional[Any] = None
+        self._listeners: list[Callable[[str, str], None]] = []
+        self._lock = threading.RLock()
+
+    @property
+    def is_watching(self) -> bool:
+        """Whether filesystem events are keeping the index current."""
+        return self._observer is not None
+
+    @property
+    def files(self) -> list[str]:
+        """All indexed file paths, sorted."""
+        self._ensure_built()
+        with self._lock:
+            return list(self._files)
+
+    @property
+    def dirs(self) -> list[str]:
+        """All indexed directory paths, sorted."""
+        self._ensure_built()
+        with self._lock:
+            return list(self._dirs)
+
+    @property
+    def needs_build(self) -> bool:
+        """Whether the next query would walk the tree (first use, or stale and unwatched)."""
+        if self._built_at is None:
+            return True
+        return self._observer is None and time.monotonic() - self._built_at > self.stale_after
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return len(self._files)
+
+    def add_listener(self, callback: Callable[[str, str], None]) -> None:
+        """
+        Register a callback for file changes seen by the watcher.
+
+        Args:
+            callback: Called with (relative path, change), where change is
+                "created", "modified" or "deleted"
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, str], None]) -> None:
+        """Unregister a callback added with add_listener."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # Building
+
+    def _ensure_built(self) -> None:
+        """Build the index on first use, or rebuild it once stale."""
+        with self._lock:
+            if self._built_at is None:
+                if self.watch and self._observer is None:
+                    # Start watching first so changes made during the walk are not lost
+                    self._start_watching()
+                self._build()
+            elif self._observer is None and time.monotonic() - self._built_at > self.stale_after:
+                self._build()
+
+    def refresh(self) -> None:
+        """Rebuild the index from disk."""
+        with self._lock:
+            self._ignore = IgnoreRules(self.root, respect_gitignore=self.respect_gitignore)
+            self._build()
+
+    def _build(self) -> None:
+        """Walk the tree and replace the indexed paths."""
+        started = time.monotonic()
+        files, dirs = [], []
+        for _, rel_path, is_dir in walk_tree(self.root, self._ignore):
+            (dirs if is_dir else files).append(rel_path)
+        files.sort()
+        dirs.sort()
+
+        self._files, self._dirs = files, dirs
+        self._built_at = time.monotonic()
+        self.generation += 1
+        self.builds += 1
+        logger.debug(f"Indexed {len(files)} files under {self.root} in {self._built_at - started:.2f}s")
+
+    # Watching
+
+    def _start_watching(self) -> bool:
+        """Start a watchdog observer for the root, if available."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.debug("watchdog not installed; file index will be rebuilt when stale")
+            return False
+
+        index = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                index._on_created(event.src_path, event.is_directory)
+
+            def on_deleted(self, event):
+                index._on_deleted(event.src_path, event.is_directory)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    index._on_modified(event.src_path)
+
+            def on_moved(self, event):
+                index._on_deleted(event.src_path, event.is_directory)
+                index._on_created(event.dest_path, event.is_directory)
+
+        try:
+            observer = Observer()
+            observer.schedule(_Handler(), str(self.root), recursive=True)
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            # e.g. inotify watch or instance limits
+            logger.warning(f"Could not watch {self.root}: {e}")
+            return False
+
+        self._observer = observer
+        return True
+
+    def close(self) -> None:
+        """Stop watching the filesystem."""
+        with self._lock:
+            observer, self._observer = self._observer, None
+        if observer is not None:
+            try:
+                observer.stop()
+                observer.join(timeout=1.0)
+            except Exception as e:
+                logger.debug(f"Error stopping file watcher: {e}")
+
+    def _relative(self, path: Any) -> Optional[str]:
+        """Convert an event path to a root-relative path, or None if outside."""
+        if isinstance(path, bytes):
+            path = path.decode("utf-8", errors="surrogateescape")
+        try:
+            rel_path = Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        return None if rel_path == "." else rel_path
+
+    def _is_excluded(self, rel_path: str, is_dir: bool) -> bool:
+        """Check a path and all of its parent directories against ignore rules."""
+        parts = rel_path.split("/")
+        for depth in range(1, len(parts)):
+            if self._ignore.is_ignored("/".join(parts[:depth]), is_dir=True):
+                return True
+        return self._ignore.is_ignored(rel_path, is_dir=is_dir)
+
+    def _notify(self, rel_path: str, change: str) -> None:
+        for callback in self._listeners:
+            try:
+                callback(rel_path, change)
+            except Exception as e:
+                logger.debug(f"File index listener failed: {e}")
+
+    def _on_created(self, path: Any, is_dir: bool) -> None:
+        rel_path = self._relative(path)
+        if rel_path is None:
+            return
+        if _is_gitignore(rel_path):
+            self._reload_ignore_rules()
+            return
+
+        with self._lock:
+            if self._built_at is None or self._is_excluded(rel_path, is_dir):
+                return
+            if is_dir:
+                self._insert(self._dirs, rel_path)
+                # Directories moved into the tree arrive with their contents
+                for _, child, child_is_dir in walk_tree(self.root, self._ignore, start=rel_path):
+                    self._insert(self._dirs if child_is_dir else self._files, child)
+            else:
+                self._insert(self._files, rel_path)
+            self.generation += 1
+        if not is_dir:
+            self._notify(rel_path, "created")
+
+    def _on_deleted(self, path: Any, is_dir: bool) -> None:
+        rel_path = self._relative(path)
+        if rel_path is None:
+            return
+        if _is_gitignore(rel_path):
+            self._reload_ignore_rules()
+            return
+
+        removed = []
+        with self._lock:
+            if self._built_at is None:
+                return
+            # Deleting a directory also drops everything below it
+            if self._remove(self._files, rel_path):
+                removed.append(rel_path)
+            self._remove(self._dirs, rel_path)
+            removed.extend(self._remove_subtree(self._files, rel_path))
+            self._remove_subtree(self._dirs, rel_path)
+            self.generation += 1
+        for removed_path in removed:
+            self._notify(removed_path, "deleted")
+
+    def _on_modified(self, path: Any) -> None:
+        rel_path = self._relative(path)
+        if rel_path is None:
+            return
+        if _is_gitignore(rel_path):
+            self._reload_ignore_rules()
+            return
+        with self._lock:
+            known = self._contains(self._files, rel_path)
+        if known:
+            self._notify(rel_path, "modified")
+
+    def _reload_ignore_rules(self) -> None:
+        """Rebuild after a .gitignore changes, since any path may be affected."""
+        with self._lock:
+            if self._built_at is not None:
+                self.refresh()
+
+    # Sorted array helpers
+
+    @staticmethod
+    def _contains(items: list[str], value: str) -> bool:
+        position = bisect.bisect_left(items, value)
+        return position < len(items) and items[position] == value
+
+    @staticmethod
+    def _insert(items: list[str], value: str) -> None:
+        position = bisect.bisect_left(items, value)
+        if position == len(items) or items[position] != value:
+            items.insert(position, value)
+
+    @staticmethod
+    def _remove(items: list[str], value: str) -> bool:
+        position = bisect.bisect_left(items, value)
+        if position < len(items) and items[position] == value:
+            del items[position]
+            return True
+        return False
+
+    @staticmethod
+    def _remove_subtree(items: list[str], rel_dir: str) -> list[str]:
+        prefix = rel_dir + "/"
+        start = bisect.bisect_left(items, prefix)
+        end = bisect.bisect_left(items, prefix + _PATH_MAX)
+        removed = items[start:end]
+        del items[start:end]
+        return removed
+
+    @staticmethod
+    def _prefix_range(items: list[str], prefix: str) -> list[str]:
+        start = bisect.bisect_left(items, prefix)
+        end = bisect.bisect_left(items, prefix + _PATH_MAX)
+        return items[start:end]
+
+    # Queries
+
+    def is_dir(self, rel_path: str) -> bool:
+        """Check whether a path is an indexed directory."""
+        self._ensure_built()
+        with self._lock:
+            return self._contains(self._dirs, rel_path)
+
+    def glob(self, pattern: str, base: str = "", include_dirs: bool = False) -> list[str]:
+        """
+        Find paths matching a glob.
+
+        Args:
+            pattern: Glob relative to base (e.g. "**/*.py")
+            base: Directory to search in, relative to the root
+            include_dirs: Also return matching directories
+
+        Returns:
+            Matching paths relative to the root, sorted
+        """
+        self._ensure_built()
+        base = base.strip("/")
+        base = "" if base == "." else base
+        scope = f"{base}/" if base else ""
+        regex = glob_to_regex(pattern)
+        # Only scan the key range that can share the glob's literal prefix
+        prefix = scope + _literal_prefix(pattern)
+
+        with self._lock:
+            candidates = self._prefix_range(self._files, prefix)
+            if include_dirs:
+                candidates = sorted(candidates + self._prefix_range(self._dirs, prefix))
+
+        offset = len(scope)
+        return [path for path in candidates if regex.match(path, offset)]
+
+    def prefix(self, prefix: str, include_dirs: bool = False, limit: Optional[int] = None) -> list[str]:
+        """
+        Find paths starting with a prefix.
+
+        Args:
+            prefix: Path prefix relative to the root
+            include_dirs: Also return directories
+            limit: Maximum number of results
+
+        Returns:
+            Matching paths, sorted
+        """
+        self._ensure_built()
+        with self._lock:
+            results = self._prefix_range(self._files, prefix)
+            if include_dirs:
+                results = sorted(results + self._prefix_range(self._dirs, prefix))
+        return results[:limit] if limit is not None else results
+
+    def search(
+        self,
+        query: str,
+        include_files: bool = True,
+        include_dirs: bool = False,
+        limit: Optional[int] = None,
+    ) -> list[str]:
+        """
+        Find paths loosely matching a query, case-insensitively.
+
+        Paths whose name starts with the query rank first, then paths that
+        contain it, then paths containing its characters in order.
+
+        Args:
+            query: Text typed by the user
+            include_files: Return files
+            include_dirs: Return directories
+            limit: Maximum number of results
+
+        Returns:
+            Matching paths, best first
+        """
+        self._ensure_built()
+        with self._lock:
+            candidates = (self._files if include_files else []) + (self._dirs if include_dirs else [])
+
+        query = query.lower()
+        if not query:
+            return sorted(candidates)[:limit] if limit is not None else sorted(candidates)
+
+        name_hits, path_hits, loose_hits = [], [], []
+        for path in candidates:
+            lowered = path.lower()
+            if query in lowered:
+                name = lowered.rsplit("/", 1)[-1]
+                (name_hits if name.startswith(query) else path_hits).append(path)
+            elif _subsequence(query, lowered):
+                loose_hits.append(path)
+
+        ranked = sorted(name_hits, key=len) + sorted(path_hits, key=len) + sorted(loose_hits, key=len)
+        return ranked[:limit] if limit is not None else ranked
+
+
+_indexes: "OrderedDict[Path, FileIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_file_index(root: Path) -> FileIndex:
+    """
+    Get the shared index for a workspace root.
+
+    Up to MAX_INDEXES workspaces are kept; the least recently used index
+    is closed when another is opened.
+
+    Args:
+        root: Workspace root directory
+
+    Returns:
+        FileIndex for the root
+    """
+    key = Path(root).resolve()
+    evicted = []
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = FileIndex(key)
+            _indexes[key] = index
+            while len(_indexes) > MAX_INDEXES:
+                evicted.append(_indexes.popitem(last=False)[1])
+        else:
+            _indexes.move_to_end(key)
+
+    for old in evicted:
+        old.close()
+    return index
+
+
+def close_file_indexes() -> None:
+    """Stop watching and forget every shared index."""
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+        _indexes.clear()
+    for index in indexes:
+        index.close()
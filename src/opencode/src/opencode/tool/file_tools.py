@@ -10,6 +10,7 @@ to allowed directories and requires permission for external access.
 
 from __future__ import annotations
 
+import asyncio
 import difflib
 import os
 import re
@@ -22,6 +23,8 @@ from opencode.tool.base import (
     Tool,
     ToolResult,
 )
+from opencode.tool.file_index import get_file_index
+from opencode.tool.grep_engine import GrepEngine
 from opencode.core.sandbox import (
     AccessType,
     check_file_access,
@@ -482,28 +485,27 @@ class GlobTool(Tool):
             return ToolResult.err(f"Invalid path: {e}")
         
         try:
-            # Use pathlib glob
-            matches = list(search_path.glob(pattern))
-            
-            # Convert to relative paths
-            relative_paths = []
-            for match in matches:
-                if match.is_file():
-                    try:
-                        rel_path = match.relative_to(self.working_directory)
-                        relative_paths.append(str(rel_path))
-                    except ValueError:
-                        pass
-            
-            # Sort and limit results
-            relative_paths.sort()
             max_results = 1000
-            truncated = len(relative_paths) > max_results
-            relative_paths = relative_paths[:max_results]
+            root = self.working_directory.resolve()
+            try:
+                base = resolved_search.relative_to(root).as_posix()
+            except ValueError:
+                # Sandboxed searches may reach outside the project; walk those
+                # directly rather than indexing and watching an arbitrary tree
+                matches = await asyncio.to_thread(self._walk_glob, resolved_search, pattern, max_results + 1)
+                total = f"{len(matches) - 1}+"
+            else:
+                # Answer from the shared workspace index instead of walking the tree
+                matches = await asyncio.to_thread(get_file_index(root).glob, pattern, base)
+                total = str(len(matches))
+            
+            # Limit results (results are already sorted)
+            truncated = len(matches) > max_results
+            relative_paths = matches[:max_results]
             
             output = "\n".join(relative_paths)
             if truncated:
-                output += f"\n... (truncated, {len(relative_paths)} of {len(matches)} results shown)"
+                output += f"\n... (truncated, {len(relative_paths)} of {total} results shown)"
             
             return ToolResult.ok(
                 output=output or "No files found",
@@ -516,6 +518,17 @@ class GlobTool(Tool):
         
         except Exception as e:
             return ToolResult.err(f"Failed to search: {e}")
+    
+    @staticmethod
+    def _walk_glob(directory: Path, pattern: str, limit: int) -> list[str]:
+        """Glob a directory outside the project, stopping after ``limit`` files."""
+        matches = []
+        for match in directory.glob(pattern):
+            if match.is_file():
+                matches.append(str(match))
+                if len(matches) >= limit:
+                    break
+        return sorted(matches)
 
 
 @dataclass
@@ -527,10 +540,18 @@ class GrepTool(Tool):
     - Regex pattern matching
     - Context lines
     - File type filtering
+    - Gitignore respect and binary file skipping
+    - Parallel search off the event loop
+    - Optional persistent trigram index to narrow the files searched
     """
     
     working_directory: Path = Path(".")
     max_output_size: int = 100000
+    max_results: int = 1000
+    max_workers: Optional[int] = None
+    use_processes: bool = False
+    respect_gitignore: bool = True
+    use_trigram_index: bool = False
     
     @property
     def name(self) -> str:
@@ -542,7 +563,8 @@ class GrepTool(Tool):
 
 - Uses regular expressions
 - Shows matching lines with context
-- Can filter by file pattern"""
+- Can filter by file pattern
+- Respects .gitignore and skips binary files"""
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -567,6 +589,11 @@ class GrepTool(Tool):
                     "description": "Number of context lines to show",
                     "default": 2,
                 },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of matching lines to return",
+                    "default": 1000,
+                },
             },
             "required": ["pattern"],
         }
@@ -581,6 +608,7 @@ class GrepTool(Tool):
         path: Optional[str] = None,
         file_pattern: str = "*",
         context: int = 2,
+        max_results: Optional[int] = None,
         **kwargs: Any,
     ) -> ToolResult:
         """Search for patterns in files."""
@@ -603,49 +631,51 @@ class GrepTool(Tool):
             return ToolResult.err(f"Invalid path: {e}")
         
         try:
-            regex = re.compile(pattern)
+            re.compile(pattern)
         except re.error as e:
             return ToolResult.err(f"Invalid regex pattern: {e}")
         
-        results = []
+        engine = GrepEngine(
+            max_workers=self.max_workers,
+            use_processes=self.use_processes,
+            respect_gitignore=self.respect_gitignore,
+        )
         
         try:
-            # Get files to search
-            if search_path.is_file():
-                files = [search_path]
-            else:
-                files = list(search_path.rglob(file_pattern))
+            candidates = None
+            if self.use_trigram_index and self.respect_gitignore and search_path.is_dir():
+                candidates = await asyncio.to_thread(self._index_candidates, pattern, resolved_search)
             
-            for file_path in files:
-                if not file_path.is_file():
-                    continue
-                
-                # Skip binary files and common non-text files
-                if any(part in str(file_path) for part in [".git", "__pycache__", "node_modules", ".venv"]):
-                    continue
-                
+            # The engine blocks on file I/O, so keep it off the event loop
+            search = await asyncio.to_thread(
+                engine.search,
+                search_path,
+                pattern,
+                file_pattern=file_pattern,
+                context=max(0, context),
+                max_results=max_results or self.max_results,
+                candidates=candidates,
+            )
+            
+            results = []
+            for file_matches in search.files:
                 try:
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        lines = f.readlines()
-                    
-                    for i, line in enumerate(lines):
-                        if regex.search(line):
-                            # Get context
-                            start = max(0, i - context)
-                            end = min(len(lines), i + context + 1)
-                            
-                            rel_path = file_path.relative_to(self.working_directory)
-                            
-                            for j in range(start, end):
-                                prefix = ">" if j == i else " "
-                                results.append(f"{rel_path}:{j+1}:{prefix} {lines[j].rstrip()}")
-                            
-                            results.append("")  # Empty line between matches
+                    rel_path = file_matches.path.relative_to(self.working_directory)
+                except ValueError:
+                    rel_path = file_matches.path
                 
-                except Exception:
-                    continue
+                for match in file_matches.matches:
+                    first = match.line_number - len(match.before)
+                    for offset, line in enumerate(match.before):
+                        results.append(f"{rel_path}:{first + offset}:  {line}")
+                    results.append(f"{rel_path}:{match.line_number}:> {match.line}")
+                    for offset, line in enumerate(match.after, start=1):
+                        results.append(f"{rel_path}:{match.line_number + offset}:  {line}")
+                    results.append("")  # Empty line between matches
             
             output = "\n".join(results)
+            if search.truncated:
+                output += f"\n... (stopped after {search.match_count} matches)"
             
             if len(output) > self.max_output_size:
                 output = output[:self.max_output_size] + "\n... (output truncated)"
@@ -654,12 +684,26 @@ class GrepTool(Tool):
                 output=output or "No matches found",
                 metadata={
                     "pattern": pattern,
-                    "matches": len([r for r in results if r.startswith(">")]),
+                    "matches": search.match_count,
+                    "files_searched": search.files_searched,
+                    "truncated": search.truncated,
                 },
             )
         
         except Exception as e:
             return ToolResult.err(f"Search failed: {e}")
+    
+    def _index_candidates(self, pattern: str, resolved_search: Path) -> Optional[list[str]]:
+        """Get candidate files under the search path from the trigram index."""
+        from opencode.tool.trigram_index import get_trigram_index
+        
+        root = self.working_directory.resolve()
+        try:
+            base = resolved_search.relative_to(root).as_posix()
+        except ValueError:
+            root, base = resolved_search, ""
+        
+        return get_trigram_index(root).candidates(pattern, base=base)
 
 
 # Factory functions
@@ -679,5 +723,5 @@ def create_glob_tool(working_directory: Path = Path(".")) -> GlobTool:
     return GlobTool(working_directory=working_directory)
 
 
-def create_grep_tool(working_directory: Path = Path(".")) -> GrepTool:
-    return GrepTool(working_directory=working_directory)
+def create_grep_tool(working_directory: Path = Path("."), use_trigram_index: bool = False) -> GrepTool:
+    return GrepTool(working_directory=working_directory, use_trigram_index=use_trigram_index)
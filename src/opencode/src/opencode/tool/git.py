@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Any, Optional
 
 from opencode.tool.base import PermissionLevel, Tool, ToolResult
+from opencode.tool.git_executor import GitSnapshot, GitTimeoutError, LogEntry, get_git_executor
 
 
 class GitTool(Tool):
@@ -76,8 +77,6 @@ All operations are read-only by default unless explicitly allowed."""
     
     async def execute(self, **params: Any) -> ToolResult:
         """Execute a git operation."""
-        import subprocess
-        
         operation = params.get("operation", "")
         path = params.get("path", ".")
         branch = params.get("branch")
@@ -127,54 +126,90 @@ All operations are read-only by default unless explicitly allowed."""
         
         except FileNotFoundError:
             return ToolResult.err("Git is not installed or not found in PATH")
+        except GitTimeoutError as e:
+            return ToolResult.err(str(e))
         except Exception as e:
             return ToolResult.err(f"Git operation failed: {e}")
     
-    async def _run_git(self, workdir: Path, args: list[str]) -> tuple[int, str, str]:
-        """Run a git command and return the result."""
-        import subprocess
-        
-        result = subprocess.run(
-            ["git"] + args,
-            cwd=workdir,
-            capture_output=True,
-            text=True,
-        )
-        return result.returncode, result.stdout, result.stderr
+    async def _run_git(
+        self,
+        workdir: Path,
+        args: list[str],
+        read_only: bool = False,
+        cache: bool = False,
+    ) -> tuple[int, str, str]:
+        """
+        Run a git command and return the result.
+        
+        Args:
+            workdir: Working directory for the command
+            args: Arguments after ``git``
+            read_only: The command does not modify the repository
+            cache: A recent cached result may be returned
+            
+        Returns:
+            Tuple of (returncode, stdout, stderr)
+        """
+        result = await get_git_executor().run(workdir, args, read_only=read_only, cache=cache)
+        return result.as_tuple()
     
     async def _git_status(self, workdir: Path) -> ToolResult:
-        """Show git status."""
-        returncode, stdout, stderr = await self._run_git(workdir, ["status", "--porcelain=v1"])
-        
-        if returncode != 0:
-            return ToolResult.err(f"Git status failed: {stderr}")
-        
-        if not stdout.strip():
-            return ToolResult.ok("Working tree clean - no changes")
-        
-        lines = stdout.strip().split("\n")
-        output = f"Git Status ({len(lines)} changes):\n"
+        """Show branch, working tree status with line counts, and the latest commit."""
+        try:
+            # Fresh status and diff, since the agent may have just edited files
+            snapshot = await get_git_executor().snapshot(workdir, cache=False)
+        except RuntimeError as e:
+            return ToolResult.err(f"Git status failed: {e}")
+        
+        output = self._format_branch(snapshot) + "\n"
+        entries = snapshot.status.entries
+        if not entries:
+            output += "Working tree clean - no changes\n"
+        else:
+            output += f"Git Status ({len(entries)} changes):\n"
+        
+        status_map = {
+            " M": "Modified",
+            "M ": "Staged",
+            "MM": "Staged + Modified",
+            " A": "Added",
+            "A ": "Staged (new)",
+            " D": "Deleted",
+            "D ": "Staged (deleted)",
+            "R ": "Renamed",
+            "??": "Untracked",
+            "!!": "Ignored",
+        }
+        for entry in entries:
+            status_text = status_map.get(entry.status, entry.status)
+            filepath = f"{entry.orig_path} -> {entry.path}" if entry.orig_path else entry.path
+            stat = snapshot.diff_stat.get(entry.path)
+            counts = f" (+{stat[0]} -{stat[1]})" if stat else ""
+            output += f"  [{status_text}] {filepath}{counts}\n"
         
-        for line in lines:
-            status = line[:2]
-            filepath = line[3:]
-            
-            status_map = {
-                " M": "Modified",
-                "M ": "Staged",
-                "MM": "Staged + Modified",
-                " A": "Added",
-                "A ": "Staged (new)",
-                " D": "Deleted",
-                "D ": "Staged (deleted)",
-                "??": "Untracked",
-                "!!": "Ignored",
-            }
-            status_text = status_map.get(status, status)
-            output += f"  [{status_text}] {filepath}\n"
+        if snapshot.log:
+            output += f"Latest commit: {self._format_commit(snapshot.log[0])}\n"
         
         return ToolResult.ok(output)
     
+    @staticmethod
+    def _format_branch(snapshot: GitSnapshot) -> str:
+        """Describe the current branch and how it relates to its upstream."""
+        status = snapshot.status
+        if status.branch is None:
+            line = f"HEAD detached at {(status.head or '')[:7]}"
+        else:
+            line = f"On branch {status.branch}"
+        if status.upstream:
+            line += f" (tracking {status.upstream}, ahead {status.ahead}, behind {status.behind})"
+        return line
+    
+    @staticmethod
+    def _format_commit(entry: LogEntry) -> str:
+        """Format a commit like ``git log --oneline --decorate``."""
+        refs = f" ({', '.join(entry.refs)})" if entry.refs else ""
+        return f"{entry.short_oid}{refs} {entry.subject}"
+    
     async def _git_diff(self, workdir: Path, path: str) -> ToolResult:
         """Show git diff."""
         args = ["diff"]
@@ -182,7 +217,7 @@ All operations are read-only by default unless explicitly allowed."""
             args.append("--")
             args.append(path)
         
-        returncode, stdout, stderr = await self._run_git(workdir, args)
+        returncode, stdout, stderr = await self._run_git(workdir, args, read_only=True)
         
         if returncode != 0:
             return ToolResult.err(f"Git diff failed: {stderr}")
@@ -198,17 +233,17 @@ All operations are read-only by default unless explicitly allowed."""
     
     async def _git_log(self, workdir: Path, limit: int) -> ToolResult:
         """Show git log."""
-        args = ["log", f"-{limit}", "--oneline", "--decorate"]
-        
-        returncode, stdout, stderr = await self._run_git(workdir, args)
-        
-        if returncode != 0:
-            return ToolResult.err(f"Git log failed: {stderr}")
+        try:
+            # Same cached query as the status snapshot's recent commits
+            entries = await get_git_executor().log(workdir, limit)
+        except RuntimeError as e:
+            return ToolResult.err(f"Git log failed: {e}")
         
-        if not stdout.strip():
+        if not entries:
             return ToolResult.ok("No commits found")
         
-        return ToolResult.ok(f"Git Log (last {limit} commits):\n{stdout}")
+        lines = "\n".join(self._format_commit(entry) for entry in entries)
+        return ToolResult.ok(f"Git Log (last {limit} commits):\n{lines}\n")
     
     async def _git_branch(self, workdir: Path, branch: Optional[str]) -> ToolResult:
         """List branches or create a new branch."""
@@ -220,7 +255,7 @@ All operations are read-only by default unless explicitly allowed."""
             return ToolResult.ok(f"Created and switched to branch: {branch}")
         
         # List branches
-        returncode, stdout, stderr = await self._run_git(workdir, ["branch", "-a"])
+        returncode, stdout, stderr = await self._run_git(workdir, ["branch", "-a"], cache=True)
         if returncode != 0:
             return ToolResult.err(f"Git branch failed: {stderr}")
         
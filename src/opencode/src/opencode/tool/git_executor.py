@@ -0,0 +1,532 @@
+"""
+Async git executor.
+
+Runs git through asyncio subprocesses so long operations such as
+``git push`` never block the event loop. Commands that may modify a
+repository are serialized with a per-repository lock, read-only queries
+are cached for a short time keyed on HEAD and the index mtime, and
+:meth:`GitExecutor.snapshot` answers the usual status/branch/log panel
+requests with a handful of concurrent invocations.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import time
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60.0
+NETWORK_TIMEOUT = 300.0
+CACHE_TTL = 2.0
+MAX_CACHE_ENTRIES = 256
+STREAM_LIMIT = 16 * 1024 * 1024
+
+NETWORK_COMMANDS = frozenset({"clone", "fetch", "pull", "push", "ls-remote"})
+
+
+class GitTimeoutError(Exception):
+    """Raised when a git command exceeds its timeout."""
+
+
+@dataclass
+class GitResult:
+    """Result of a git invocation."""
+
+    returncode: int
+    stdout: str
+    stderr: str
+
+    def as_tuple(self) -> tuple[int, str, str]:
+        return self.returncode, self.stdout, self.stderr
+
+
+@dataclass
+class StatusEntry:
+    """A changed path from ``git status --porcelain=v2``."""
+
+    status: str  # two-letter porcelain v1 style code, e.g. " M" or "??"
+    path: str
+    orig_path: Optional[str] = None
+
+
+@dataclass
+class LogEntry:
+    """A commit from ``git log``."""
+
+    oid: str
+    short_oid: str
+    author: str
+    timestamp: int
+    subject: str
+    refs: list[str] = field(default_factory=list)
+
+
+@dataclass
+class GitStatus:
+    """Branch and working tree state from a single status invocation."""
+
+    head: Optional[str] = None
+    branch: Optional[str] = None
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    entries: list[StatusEntry] = field(default_factory=list)
+
+    @property
+    def is_clean(self) -> bool:
+        return not self.entries
+
+
+@dataclass
+class GitSnapshot:
+    """Combined status, diff stat and log for a repository."""
+
+    status: GitStatus
+    diff_stat: dict[str, tuple[int, int]]
+    log: list[LogEntry]
+
+
+def find_git_dir(workdir: Path) -> Optional[Path]:
+    """
+    Locate the git directory for a working directory.
+
+    Follows ``.git`` files used by worktrees and submodules.
+
+    Args:
+        workdir: Directory inside the repository
+
+    Returns:
+        Path to the git directory, or None outside a repository
+    """
+    for directory in (workdir, *workdir.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:"):].strip())
+                return git_dir if git_dir.is_absolute() else (directory / git_dir).resolve()
+            return None
+    return None
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def repository_state(git_dir: Path) -> tuple:
+    """
+    Cheap fingerprint of HEAD and the index, read without running git.
+
+    Args:
+        git_dir: The repository's git directory
+
+    Returns:
+        A tuple that changes whenever HEAD moves or the index is written
+    """
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        head = ""
+
+    common_dir = git_dir
+    commondir_file = git_dir / "commondir"
+    if commondir_file.is_file():
+        try:
+            common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+        except OSError:
+            pass
+
+    ref_mtime = 0
+    if head.startswith("ref:"):
+        ref = head[len("ref:"):].strip()
+        ref_mtime = _mtime_ns(common_dir / ref) or _mtime_ns(git_dir / ref)
+
+    return (
+        head,
+        ref_mtime,
+        _mtime_ns(common_dir / "packed-refs"),
+        _mtime_ns(git_dir / "index"),
+    )
+
+
+def parse_status_v2(output: str) -> GitStatus:
+    """
+    Parse ``git status --porcelain=v2 --branch -z`` output.
+
+    Args:
+        output: Raw NUL separated status output
+
+    Returns:
+        Parsed GitStatus
+    """
+    status = GitStatus()
+    records = output.split("\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+
+        if record.startswith("# "):
+            key, _, value = record[2:].partition(" ")
+            if key == "branch.oid":
+                status.head = None if value == "(initial)" else value
+            elif key == "branch.head":
+                status.branch = None if value == "(detached)" else value
+            elif key == "branch.upstream":
+                status.upstream = value
+            elif key == "branch.ab":
+                ahead, _, behind = value.partition(" ")
+                status.ahead = int(ahead.lstrip("+") or 0)
+                status.behind = int(behind.lstrip("-") or 0)
+            continue
+
+        kind = record[0]
+        if kind in "?!":
+            status.entries.append(StatusEntry(kind * 2, record[2:]))
+        elif kind == "1":
+            parts = record.split(" ", 8)
+            status.entries.append(StatusEntry(parts[1].replace(".", " "), parts[8]))
+        elif kind == "2":
+            parts = record.split(" ", 9)
+            orig_path = records[i] if i < len(records) else None
+            i += 1
+            status.entries.append(StatusEntry(parts[1].replace(".", " "), parts[9], orig_path))
+        elif kind == "u":
+            parts = record.split(" ", 10)
+            status.entries.append(StatusEntry(parts[1], parts[10]))
+
+    return status
+
+
+LOG_FORMAT = "%H%x1f%h%x1f%an%x1f%at%x1f%s%x1f%D%x1e"
+
+
+def parse_log(output: str) -> list[LogEntry]:
+    """Parse ``git log`` output produced with :data:`LOG_FORMAT`."""
+    entries = []
+    for record in output.split("\x1e"):
+        record = record.strip("\n")
+        if not record:
+            continue
+        oid, short_oid, author, timestamp, subject, refs = record.split("\x1f", 5)
+        entries.append(LogEntry(
+            oid=oid,
+            short_oid=short_oid,
+            author=author,
+            timestamp=int(timestamp or 0),
+            subject=subject,
+            refs=[ref.strip() for ref in refs.split(",") if ref.strip()],
+        ))
+    return entries
+
+
+def parse_numstat(output: str) -> dict[str, tuple[int, int]]:
+    """Parse ``git diff --numstat`` output into {path: (added, deleted)}."""
+    stats = {}
+    for line in output.splitlines():
+        parts = line.split("\t", 2)
+        if len(parts) != 3:
+            continue
+        added, deleted, path = parts
+        # Binary files report "-" for both counts
+        stats[path] = (int(added) if added.isdigit() else 0, int(deleted) if deleted.isdigit() else 0)
+    return stats
+
+
+class GitExecutor:
+    """
+    Runs git commands without blocking the event loop.
+
+    Read-only commands run concurrently without the repository lock and
+    skip git's optional index refresh lock; with ``cache=True`` their
+    results are also reused for ``cache_ttl`` seconds as long as HEAD and
+    the index are unchanged. Unstaged edits do not touch either, so only
+    cache queries where that short staleness is acceptable. All other
+    commands are assumed to modify the repository, hold the
+    per-repository lock and invalidate its cached results.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        network_timeout: float = NETWORK_TIMEOUT,
+        cache_ttl: float = CACHE_TTL,
+    ):
+        self.timeout = timeout
+        self.network_timeout = network_timeout
+        self.cache_ttl = cache_ttl
+        self._cache: dict[tuple, tuple[tuple, float, GitResult]] = {}
+        # asyncio locks belong to one event loop, so keep a set per loop
+        self._locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _repo_key(self, workdir: Path) -> tuple[Path, Optional[Path]]:
+        git_dir = find_git_dir(workdir)
+        return (git_dir.resolve() if git_dir else workdir.resolve()), git_dir
+
+    def _lock(self, repo: Path) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        locks = self._locks.setdefault(loop, {})
+        if repo not in locks:
+            locks[repo] = asyncio.Lock()
+        return locks[repo]
+
+    def invalidate(self, workdir: Optional[Path] = None) -> None:
+        """
+        Drop cached results.
+
+        Args:
+            workdir: Only drop results for this repository (default: all)
+        """
+        if workdir is None:
+            self._cache.clear()
+            return
+        repo, _ = self._repo_key(Path(workdir))
+        for key in [key for key in self._cache if key[0] == repo]:
+            del self._cache[key]
+
+    async def run(
+        self,
+        workdir: Path,
+        args: list[str],
+        timeout: Optional[float] = None,
+        on_line: Optional[Callable[[str], None]] = None,
+        read_only: bool = False,
+        cache: bool = False,
+    ) -> GitResult:
+        """
+        Run a git command.
+
+        Args:
+            workdir: Working directory for the command
+            args: Arguments after ``git``
+            timeout: Seconds before the process is killed (default depends
+                on whether the command talks to a remote)
+            on_line: Called with each stdout line as it is produced
+            read_only: The command does not modify the repository
+            cache: Reuse a recent result (implies read_only)
+
+        Returns:
+            GitResult with the exit code and decoded output
+
+        Raises:
+            GitTimeoutError: If the command does not finish in time
+            FileNotFoundError: If git is not installed
+        """
+        workdir = Path(workdir)
+        if timeout is None:
+            timeout = self.network_timeout if args and args[0] in NETWORK_COMMANDS else self.timeout
+
+        repo, git_dir = self._repo_key(workdir)
+
+        if not (read_only or cache):
+            async with self._lock(repo):
+                try:
+                    return await self._exec(workdir, args, timeout, on_line, read_only=False)
+                finally:
+                    self.invalidate(workdir)
+
+        if not cache or git_dir is None or self.cache_ttl <= 0:
+            return await self._exec(workdir, args, timeout, on_line, read_only=True)
+
+        key = (repo, str(workdir.resolve()), tuple(args))
+        state = repository_state(git_dir)
+        cached = self._cache.get(key)
+        if cached and cached[0] == state and cached[1] > time.monotonic():
+            if on_line:
+                for line in cached[2].stdout.splitlines():
+                    on_line(line)
+            return cached[2]
+
+        result = await self._exec(workdir, args, timeout, on_line, read_only=True)
+        if result.returncode == 0:
+            if len(self._cache) >= MAX_CACHE_ENTRIES:
+                now = time.monotonic()
+                for stale in [k for k, v in self._cache.items() if v[1] <= now]:
+                    del self._cache[stale]
+                if len(self._cache) >= MAX_CACHE_ENTRIES:
+                    self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = (state, time.monotonic() + self.cache_ttl, result)
+        return result
+
+    async def _exec(
+        self,
+        workdir: Path,
+        args: list[str],
+        timeout: float,
+        on_line: Optional[Callable[[str], None]],
+        read_only: bool,
+    ) -> GitResult:
+        env = os.environ.copy()
+        # Never wait on an interactive credential prompt
+        env["GIT_TERMINAL_PROMPT"] = "0"
+        if read_only:
+            # Keep status from taking index.lock and racing writers
+            env["GIT_OPTIONAL_LOCKS"] = "0"
+
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            *args,
+            cwd=workdir,
+            env=env,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT,
+            # Own process group so hooks and editors die with git on timeout
+            start_new_session=os.name != "nt",
+        )
+
+        try:
+            stdout, stderr = await asyncio.wait_for(self._communicate(process, on_line), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._kill(process)
+            await process.wait()
+            raise GitTimeoutError(f"git {' '.join(args[:1])} timed out after {timeout:g} seconds")
+        except asyncio.CancelledError:
+            self._kill(process)
+            raise
+
+        return GitResult(
+            returncode=process.returncode,
+            stdout=stdout.decode("utf-8", errors="replace"),
+            stderr=stderr.decode("utf-8", errors="replace"),
+        )
+
+    @staticmethod
+    def _kill(process: asyncio.subprocess.Process) -> None:
+        try:
+            if os.name != "nt":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    async def _communicate(
+        self,
+        process: asyncio.subprocess.Process,
+        on_line: Optional[Callable[[str], None]],
+    ) -> tuple[bytes, bytes]:
+        if on_line is None:
+            return await process.communicate()
+
+        async def read_stdout() -> bytes:
+            chunks = []
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                chunks.append(line)
+                on_line(line.decode("utf-8", errors="replace").rstrip("\r\n"))
+            return b"".join(chunks)
+
+        stdout, stderr = await asyncio.gather(read_stdout(), process.stderr.read())
+        await process.wait()
+        return stdout, stderr
+
+    async def status(self, workdir: Path, cache: bool = True) -> GitStatus:
+        """
+        Get branch, upstream and working tree state in one invocation.
+
+        Args:
+            workdir: Directory inside the repository
+            cache: Reuse a recent result (unstaged edits may be missed
+                within the TTL)
+
+        Returns:
+            Parsed GitStatus
+
+        Raises:
+            RuntimeError: If git status fails
+        """
+        result = await self.run(
+            workdir, ["status", "--porcelain=v2", "--branch", "-z"], read_only=True, cache=cache
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or "git status failed")
+        return parse_status_v2(result.stdout)
+
+    async def log(self, workdir: Path, limit: int = 10) -> list[LogEntry]:
+        """
+        Get recent commits.
+
+        The log only changes when HEAD moves, which invalidates the cache,
+        so it is always cached and shared with snapshot().
+
+        Args:
+            workdir: Directory inside the repository
+            limit: Number of commits to return
+
+        Returns:
+            Parsed log entries, newest first
+
+        Raises:
+            RuntimeError: If git log fails (e.g. there are no commits yet)
+        """
+        result = await self.run(workdir, ["log", f"-{limit}", f"--format={LOG_FORMAT}"], cache=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or "git log failed")
+        return parse_log(result.stdout)
+
+    async def snapshot(self, workdir: Path, log_limit: int = 10, cache: bool = True) -> GitSnapshot:
+        """
+        Collect status, diff stat and recent log concurrently.
+
+        Each part is cached, so repeated UI refreshes within the TTL do
+        not spawn any processes.
+
+        Args:
+            workdir: Directory inside the repository
+            log_limit: Number of commits to include
+            cache: Reuse recent status and diff results; pass False when
+                unstaged edits must be seen
+
+        Returns:
+            GitSnapshot for the repository
+
+        Raises:
+            RuntimeError: If git status fails
+        """
+        status, diff, log = await asyncio.gather(
+            self.status(workdir, cache=cache),
+            self.run(workdir, ["diff", "HEAD", "--numstat"], read_only=True, cache=cache),
+            self.log(workdir, log_limit),
+            return_exceptions=True,
+        )
+        if isinstance(status, BaseException):
+            raise status
+        # Diff and log both fail on a repository without commits
+        return GitSnapshot(
+            status=status,
+            diff_stat=parse_numstat(diff.stdout) if isinstance(diff, GitResult) and diff.returncode == 0 else {},
+            log=log if isinstance(log, list) else [],
+        )
+
+
+_executor: Optional[GitExecutor] = None
+
+
+def get_git_executor() -> GitExecutor:
+    """Get the shared git executor."""
+    global _executor
+    if _executor is None:
+        _executor = GitExecutor()
+    return _executor
@@ -0,0 +1,558 @@
+"""
+Search engine behind the grep tool.
+
+Walks the workspace lazily while pruning ignored directories, skips
+binary files, and scans each file as a single memory-mapped buffer
+across a worker pool so large trees can be searched without blocking
+the event loop.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import mmap
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+# Directories that are never searched, even without a .gitignore
+DEFAULT_IGNORED_DIRS = frozenset({".git", "__pycache__", "node_modules", ".venv"})
+
+# Bytes read from the start of a file to decide whether it is binary
+BINARY_SNIFF_SIZE = 8192
+
+# Files handed to a worker per task
+BATCH_SIZE = 64
+
+
+class IgnoreRules:
+    """
+    Gitignore-style ignore rules for a directory tree.
+
+    Nested .gitignore files are loaded as the walk enters each directory,
+    and deeper files take precedence, as in git.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        respect_gitignore: bool = True,
+        ignored_dirs: frozenset[str] = DEFAULT_IGNORED_DIRS,
+    ):
+        """
+        Initialize ignore rules.
+
+        Args:
+            root: Root directory the rules apply to
+            respect_gitignore: Whether to read .gitignore files
+            ignored_dirs: Directory names that are always skipped
+        """
+        self.root = root
+        self.respect_gitignore = respect_gitignore
+        self.ignored_dirs = ignored_dirs
+        self._specs: dict[str, Optional[object]] = {}
+
+    def _spec_for(self, rel_dir: str) -> Optional[object]:
+        """Load the .gitignore spec for a directory (relative to root)."""
+        if rel_dir not in self._specs:
+            spec = None
+            gitignore = self.root / rel_dir / ".gitignore"
+            if gitignore.is_file():
+                try:
+                    import pathspec
+
+                    lines = gitignore.read_text(encoding="utf-8", errors="ignore").splitlines()
+                    spec = pathspec.GitIgnoreSpec.from_lines(lines)
+                except Exception:
+                    spec = None
+            self._specs[rel_dir] = spec
+        return self._specs[rel_dir]
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """
+        Check whether a path is ignored.
+
+        Args:
+            rel_path: Path relative to root, using "/" separators
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if the path should be skipped
+        """
+        parts = rel_path.split("/")
+        if is_dir and parts[-1] in self.ignored_dirs:
+            return True
+        if not self.respect_gitignore:
+            return False
+
+        # Deepest .gitignore first; the first one with an opinion wins
+        for depth in range(len(parts) - 1, -1, -1):
+            spec = self._spec_for("/".join(parts[:depth]))
+            if spec is None:
+                continue
+            candidate = "/".join(parts[depth:]) + ("/" if is_dir else "")
+            result = spec.check_file(candidate)
+            if result.include is not None:
+                return result.include
+        return False
+
+
+@lru_cache(maxsize=128)
+def glob_to_regex(pattern: str) -> re.Pattern:
+    """
+    Translate a pathlib-style glob into a regex over "/"-separated paths.
+
+    "*" and "?" stay within one path component, "**/" matches zero or
+    more directories, and a trailing "**" matches everything below.
+    """
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:[^/]+/)*")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+def _matches_file_pattern(rel_path: str, name: str, file_pattern: str) -> bool:
+    """
+    Match a file against a glob with Path.rglob semantics.
+
+    Patterns without "/" match the file name; others match the path
+    relative to the search root, starting at any directory, with "**"
+    spanning directories.
+    """
+    if file_pattern in ("*", "**", "**/*"):
+        return True
+    if "/" in file_pattern:
+        if not file_pattern.startswith("**/"):
+            file_pattern = "**/" + file_pattern
+        return glob_to_regex(file_pattern).match(rel_path) is not None
+    return fnmatch.fnmatchcase(name, file_pattern)
+
+
+def walk_tree(
+    root: Path,
+    ignore: Optional[IgnoreRules] = None,
+    stop: Optional[threading.Event] = None,
+    start: str = "",
+) -> Iterator[tuple[os.DirEntry, str, bool]]:
+    """
+    Lazily walk a tree, pruning ignored directories.
+
+    Symlinked directories are not followed.
+
+    Args:
+        root: Root directory (ignore rules are relative to it)
+        ignore: Ignore rules; defaults to IgnoreRules(root)
+        stop: Event that ends the walk early when set
+        start: Subdirectory of root to walk, relative to root
+
+    Yields:
+        (entry, path relative to root, is_dir) for every kept entry,
+        directory by directory in name order
+    """
+    ignore = ignore or IgnoreRules(root)
+    pending = [start]
+
+    while pending:
+        rel_dir = pending.pop()
+        try:
+            with os.scandir(root / rel_dir if rel_dir else root) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if stop is not None and stop.is_set():
+                return
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not ignore.is_ignored(rel_path, is_dir=True):
+                        subdirs.append(rel_path)
+                        yield entry, rel_path, True
+                elif entry.is_file() and not ignore.is_ignored(rel_path):
+                    yield entry, rel_path, False
+            except OSError:
+                continue
+
+        # Reversed so directories are visited in sorted order
+        pending.extend(reversed(subdirs))
+
+
+def walk_files(
+    root: Path,
+    file_pattern: str = "*",
+    ignore: Optional[IgnoreRules] = None,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[Path]:
+    """
+    Lazily yield files under root, pruning ignored directories.
+
+    Args:
+        root: Directory to walk
+        file_pattern: Glob the file name (or trailing path) must match
+        ignore: Ignore rules; defaults to IgnoreRules(root)
+        stop: Event that ends the walk early when set
+
+    Yields:
+        Matching file paths, in directory order
+    """
+    for entry, rel_path, is_dir in walk_tree(root, ignore, stop):
+        if not is_dir and _matches_file_pattern(rel_path, entry.name, file_pattern):
+            yield Path(entry.path)
+
+
+def is_binary_file(path: Path) -> bool:
+    """Check whether a file looks binary by sniffing its header for NUL bytes."""
+    try:
+        with open(path, "rb") as f:
+            return b"\x00" in f.read(BINARY_SNIFF_SIZE)
+    except OSError:
+        return True
+
+
+@dataclass
+class LineMatch:
+    """A matching line with its surrounding context."""
+    line_number: int
+    before: list[str] = field(default_factory=list)
+    line: str = ""
+    after: list[str] = field(default_factory=list)
+
+
+@dataclass
+class FileMatches:
+    """All matches found in one file."""
+    path: Path
+    matches: list[LineMatch] = field(default_factory=list)
+
+
+@dataclass
+class SearchResult:
+    """Result of a search across a tree."""
+    files: list[FileMatches] = field(default_factory=list)
+    files_searched: int = 0
+    match_count: int = 0
+    truncated: bool = False
+
+
+# Escapes whose meaning differs between bytes and str patterns: character
+# classes and word boundaries are ASCII-only on bytes, and numeric escapes
+# name a byte rather than a code point
+_UNICODE_SENSITIVE_ESCAPES = frozenset("wWbBsSdDxX0123456789")
+
+# Inline flags that change how a pattern treats text
+_INLINE_FLAGS = frozenset("aiLu")
+
+
+def _byte_search_safe(pattern: str, flags: int) -> bool:
+    """
+    Whether a pattern matches UTF-8 bytes exactly as it matches decoded text.
+
+    Only pure-ASCII patterns without case folding, ``.``, negated sets or
+    Unicode-sensitive escapes qualify; ``.`` and ``[^...]`` would consume a
+    single byte of a multi-byte character.
+    """
+    if flags & re.IGNORECASE or not pattern.isascii():
+        return False
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            if pattern[index + 1:index + 2] in _UNICODE_SENSITIVE_ESCAPES:
+                return False
+            index += 2
+            continue
+        if char == ".":
+            return False
+        if char == "[" and pattern[index + 1:index + 2] == "^":
+            return False
+        if char == "(" and pattern[index + 1:index + 2] == "?":
+            group = pattern[index + 2:].split(")", 1)[0].split(":", 1)[0]
+            if _INLINE_FLAGS & set(group):
+                return False
+        index += 1
+    return True
+
+
+@lru_cache(maxsize=64)
+def _compile(pattern: str, flags: int) -> re.Pattern:
+    """
+    Compile a pattern for whole-buffer search.
+
+    Patterns that match bytes the same way as text are compiled as bytes
+    so the memory-mapped file is searched without decoding. Anything else
+    (non-ASCII text, case folding, classes such as ``\\w``) is compiled
+    as a str pattern; callers then decode the buffer before searching.
+    """
+    if _byte_search_safe(pattern, flags):
+        try:
+            return re.compile(pattern.encode("utf-8"), flags | re.MULTILINE)
+        except re.error:
+            pass
+    return re.compile(pattern, flags | re.MULTILINE)
+
+
+def _decode_line(buffer, start: int, end: int) -> str:
+    """Decode one line of a buffer, dropping the line terminator."""
+    line = buffer[start:end]
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="ignore")
+    return line.rstrip()
+
+
+def search_file(
+    path: Path,
+    pattern: str,
+    flags: int = 0,
+    context: int = 0,
+    max_matches: Optional[int] = None,
+) -> list[LineMatch]:
+    """
+    Search one file as a single buffer.
+
+    The whole file is memory-mapped and searched with one regex pass;
+    only files with a hit are split into lines.
+
+    Args:
+        path: File to search
+        pattern: Regular expression
+        flags: re flags
+        context: Lines of context before and after each match
+        max_matches: Stop after this many matching lines
+
+    Returns:
+        Matching lines in file order
+    """
+    regex = _compile(pattern, flags)
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if b"\x00" in mapped[:BINARY_SNIFF_SIZE]:
+                    return []
+                buffer = mapped if isinstance(regex.pattern, bytes) else mapped[:].decode("utf-8", errors="ignore")
+                if regex.search(buffer) is None:
+                    return []
+                return _collect_matches(buffer, regex, context, max_matches)
+    except (OSError, ValueError):
+        return []
+
+
+def _collect_matches(buffer, regex: re.Pattern, context: int, max_matches: Optional[int]) -> list[LineMatch]:
+    """Turn whole-buffer regex hits into per-line matches with context."""
+    newline = b"\n" if isinstance(regex.pattern, bytes) else "\n"
+    size = len(buffer)
+
+    # Start offset of every line, built only for files that matched
+    line_starts = [0]
+    position = buffer.find(newline)
+    while position != -1:
+        line_starts.append(position + 1)
+        position = buffer.find(newline, position + 1)
+    if line_starts[-1] == size and size > 0:
+        line_starts.pop()
+
+    def line_text(index: int) -> str:
+        end = line_starts[index + 1] if index + 1 < len(line_starts) else size
+        return _decode_line(buffer, line_starts[index], end)
+
+    matches: list[LineMatch] = []
+    last_line = -1
+    line_index = 0
+    for hit in regex.finditer(buffer):
+        while line_index + 1 < len(line_starts) and line_starts[line_index + 1] <= hit.start():
+            line_index += 1
+        if line_index == last_line:
+            continue
+        last_line = line_index
+
+        first = max(0, line_index - context)
+        last = min(len(line_starts) - 1, line_index + context)
+        matches.append(LineMatch(
+            line_number=line_index + 1,
+            before=[line_text(i) for i in range(first, line_index)],
+            line=line_text(line_index),
+            after=[line_text(i) for i in range(line_index + 1, last + 1)],
+        ))
+        if max_matches is not None and len(matches) >= max_matches:
+            break
+    return matches
+
+
+def _search_batch(
+    paths: list[Path],
+    pattern: str,
+    flags: int,
+    context: int,
+    max_matches: int,
+    stop: Optional[threading.Event] = None,
+) -> tuple[list[FileMatches], int]:
+    """Search a batch of files in a worker. Returns (matches, files searched)."""
+    found: list[FileMatches] = []
+    searched = 0
+    remaining = max_matches
+    for path in paths:
+        if remaining <= 0 or (stop is not None and stop.is_set()):
+            break
+        searched += 1
+        matches = search_file(path, pattern, flags, context, remaining)
+        if matches:
+            found.append(FileMatches(path=path, matches=matches))
+            remaining -= len(matches)
+    return found, searched
+
+
+class GrepEngine:
+    """
+    Parallel, ignore-aware file content search.
+
+    Files are produced lazily by walk_files and searched in batches on a
+    thread pool (or a process pool for CPU-bound regexes on large trees).
+    Results are consumed in walk order, so output is deterministic, and
+    the walk stops as soon as max_results matching lines are found.
+
+    Example:
+        engine = GrepEngine()
+        result = engine.search(Path("."), r"def \\w+", file_pattern="*.py")
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+        respect_gitignore: bool = True,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            max_workers: Worker count (default: CPU count, capped at 16)
+            use_processes: Use a process pool instead of threads
+            respect_gitignore: Skip files matched by .gitignore rules
+        """
+        self.max_workers = max_workers or min(16, os.cpu_count() or 4)
+        self.use_processes = use_processes
+        self.respect_gitignore = respect_gitignore
+
+    def _make_executor(self) -> Executor:
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="grep")
+
+    def search(
+        self,
+        path: Path,
+        pattern: str,
+        file_pattern: str = "*",
+        context: int = 0,
+        max_results: int = 1000,
+        flags: int = 0,
+        candidates: Optional[Iterable[str]] = None,
+    ) -> SearchResult:
+        """
+        Search a file or directory tree.
+
+        Args:
+            path: File or directory to search
+            pattern: Regular expression
+            file_pattern: Glob that file names must match
+            context: Lines of context around each match
+            max_results: Stop after this many matching lines
+            flags: re flags
+            candidates: Paths relative to path to search instead of walking
+                the tree (e.g. from a trigram index)
+
+        Returns:
+            SearchResult with per-file matches in walk order
+        """
+        result = SearchResult()
+        if path.is_file():
+            matches = search_file(path, pattern, flags, context, max_results)
+            result.files_searched = 1
+            if matches:
+                result.files.append(FileMatches(path=path, matches=matches))
+                result.match_count = len(matches)
+            return result
+
+        stop = threading.Event()
+        ignore = IgnoreRules(path, respect_gitignore=self.respect_gitignore)
+        if candidates is None:
+            files = walk_files(path, file_pattern, ignore, stop)
+        else:
+            files = (
+                path / rel_path
+                for rel_path in candidates
+                if _matches_file_pattern(rel_path, rel_path.rsplit("/", 1)[-1], file_pattern)
+            )
+        window = self.max_workers * 2
+        pending: deque[Future] = deque()
+        # Threads share the stop event; processes rely on the per-batch cap
+        worker_stop = None if self.use_processes else stop
+
+        def submit_next(executor: Executor) -> bool:
+            batch = [p for _, p in zip(range(BATCH_SIZE), files)]
+            if not batch:
+                return False
+            pending.append(executor.submit(
+                _search_batch, batch, pattern, flags, context, max_results, worker_stop,
+            ))
+            return True
+
+        executor = self._make_executor()
+        try:
+            while len(pending) < window and submit_next(executor):
+                pass
+
+            while pending:
+                found, searched = pending.popleft().result()
+                result.files_searched += searched
+                for file_matches in found:
+                    remaining = max_results - result.match_count
+                    if remaining <= 0:
+                        break
+                    file_matches.matches = file_matches.matches[:remaining]
+                    result.files.append(file_matches)
+                    result.match_count += len(file_matches.matches)
+
+                if result.match_count >= max_results:
+                    result.truncated = True
+                    stop.set()
+                    break
+                submit_next(executor)
+        finally:
+            stop.set()
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return result
@@ -11,8 +11,8 @@ This tool provides code intelligence features through LSP:
 
 from __future__ import annotations
 
-import asyncio
 import json
+import logging
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
@@ -23,6 +23,9 @@ from opencode.tool.base import (
     Tool,
     ToolResult,
 )
+from opencode.tool.lsp_client import LSPClient, LSPError, get_lsp_client
+
+logger = logging.getLogger(__name__)
 
 
 class LSPMethod(str, Enum):
@@ -232,13 +235,14 @@ class LSPTool(Tool):
         """Get or create an LSP client for the given file type."""
         suffix = Path(file_path).suffix
         
-        # Check if we already have a client
-        if suffix in self.lsp_clients:
-            return self.lsp_clients[suffix]
+        # Check if we already have a live client
+        client = self.lsp_clients.get(suffix)
+        if client is not None and client.is_alive:
+            return client
         
         # Map file extensions to LSP server commands
         server_commands = {
-            ".py": ["pylsp", "pyright-langserver", "ruff server"],
+            ".py": ["pylsp"],
             ".ts": ["typescript-language-server", "--stdio"],
             ".js": ["typescript-language-server", "--stdio"],
             ".tsx": ["typescript-language-server", "--stdio"],
@@ -255,133 +259,19 @@ class LSPTool(Tool):
         if not command:
             return None
         
-        # Create LSP client (simplified - real implementation would use proper LSP library)
         client = await self._create_lsp_client(command)
         if client:
             self.lsp_clients[suffix] = client
         
         return client
     
-    async def _create_lsp_client(self, command: list[str]) -> Optional[Any]:
-        """Create an LSP client process."""
+    async def _create_lsp_client(self, command: list[str]) -> Optional[LSPClient]:
+        """Get a running LSP session for a server command."""
         try:
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=self.working_directory,
-            )
-            
-            # Initialize LSP connection
-            init_params = {
-                "processId": process.pid,
-                "rootUri": self.working_directory.as_uri(),
-                "capabilities": {
-                    "textDocument": {
-                        "definition": {"linkSupport": True},
-                        "references": {},
-                        "hover": {"contentFormat": ["markdown", "plaintext"]},
-                        "documentSymbol": {
-                            "symbolKind": {"valueSet": list(range(1, 27))},
-                        },
-                    },
-                    "workspace": {
-                        "symbol": {
-                            "symbolKind": {"valueSet": list(range(1, 27))},
-                        },
-                    },
-                },
-            }
-            
-            # Send initialize request
-            await self._send_lsp_message(
-                process, "initialize", init_params
-            )
-            
-            # Send initialized notification
-            await self._send_lsp_notification(process, "initialized", {})
-            
-            return process
-        
-        except Exception:
-            return None
-    
-    async def _send_lsp_message(
-        self,
-        process: Any,
-        method: str,
-        params: dict,
-        request_id: int = 1,
-    ) -> Optional[dict]:
-        """Send an LSP request and wait for response."""
-        if not process.stdin or not process.stdout:
-            return None
-        
-        message = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method,
-            "params": params,
-        }
-        
-        content = json.dumps(message)
-        header = f"Content-Length: {len(content)}\r\n\r\n"
-        
-        process.stdin.write(header.encode())
-        process.stdin.write(content.encode())
-        await process.stdin.drain()
-        
-        # Read response (simplified)
-        response = await self._read_lsp_response(process)
-        return response
-    
-    async def _send_lsp_notification(
-        self,
-        process: Any,
-        method: str,
-        params: dict,
-    ) -> None:
-        """Send an LSP notification (no response expected)."""
-        if not process.stdin:
-            return
-        
-        message = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params,
-        }
-        
-        content = json.dumps(message)
-        header = f"Content-Length: {len(content)}\r\n\r\n"
-        
-        process.stdin.write(header.encode())
-        process.stdin.write(content.encode())
-        await process.stdin.drain()
-    
-    async def _read_lsp_response(self, process: Any) -> Optional[dict]:
-        """Read an LSP response from the process."""
-        if not process.stdout:
+            return await get_lsp_client(command, self.working_directory)
+        except Exception as e:
+            logger.debug(f"Failed to start language server {command[0]}: {e}")
             return None
-        
-        # Read headers
-        headers = {}
-        while True:
-            line = await process.stdout.readline()
-            if not line or line == b"\r\n":
-                break
-            if line:
-                parts = line.decode().strip().split(": ", 1)
-                if len(parts) == 2:
-                    headers[parts[0]] = parts[1]
-        
-        # Read content
-        content_length = int(headers.get("Content-Length", 0))
-        if content_length > 0:
-            content = await process.stdout.read(content_length)
-            return json.loads(content)
-        
-        return None
     
     async def _send_request(
         self,
@@ -397,10 +287,12 @@ class LSPTool(Tool):
     ) -> Any:
         """Send an LSP request."""
         params = {}
+        sync = []
         
         if file_path:
-            path = self.working_directory / file_path
+            path = (self.working_directory / file_path).resolve()
             params["textDocument"] = {"uri": path.as_uri()}
+            sync.append(path)
         
         if line is not None and character is not None:
             params["position"] = {"line": line, "character": character}
@@ -431,7 +323,11 @@ class LSPTool(Tool):
                     "insertSpaces": True,
                 }
         
-        return await self._send_lsp_message(client, method.value, params)
+        try:
+            result = await client.request(method.value, params, sync=sync)
+        except LSPError as e:
+            return {"error": e.to_dict()}
+        return {"result": result}
     
     def _format_result(self, result: Any, method: str) -> str:
         """Format LSP result for display."""
@@ -439,7 +335,10 @@ class LSPTool(Tool):
             return f"No {method} found"
         
         if "result" not in result:
-            return f"LSP error: {result.get('error', 'Unknown error')}"
+            error = result.get("error", "Unknown error")
+            if isinstance(error, dict):
+                error = error.get("message", error)
+            return f"LSP error: {error}"
         
         lsp_result = result["result"]
         
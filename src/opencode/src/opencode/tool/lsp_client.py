@@ -0,0 +1,599 @@
+"""
+JSON-RPC session layer for language servers.
+
+An :class:`LSPClient` owns one long-lived language server process. A
+reader task demultiplexes everything the server writes: responses are
+matched to pending requests by id, server-initiated requests are
+answered, and notifications such as diagnostics are recorded. Documents
+are opened and re-synced with ``textDocument/didOpen``/``didChange``
+before requests that reference them, and navigation results are cached
+until a file in the workspace changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUEST_TIMEOUT = 30.0
+INITIALIZE_TIMEOUT = 60.0
+SHUTDOWN_TIMEOUT = 2.0
+MAX_CACHE_ENTRIES = 1024
+
+# Requests whose results only change when workspace files change
+CACHEABLE_METHODS = frozenset({
+    "textDocument/hover",
+    "textDocument/definition",
+    "textDocument/documentSymbol",
+    "workspace/symbol",
+})
+
+LANGUAGE_IDS = {
+    ".py": "python",
+    ".ts": "typescript",
+    ".tsx": "typescriptreact",
+    ".js": "javascript",
+    ".jsx": "javascriptreact",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "java",
+    ".c": "c",
+    ".h": "c",
+    ".cpp": "cpp",
+}
+
+# JSON-RPC error codes
+METHOD_NOT_FOUND = -32601
+REQUEST_CANCELLED = -32800
+
+
+class LSPError(Exception):
+    """Error response from a language server, or a failed session."""
+
+    def __init__(self, message: str, code: Optional[int] = None, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+    def to_dict(self) -> dict:
+        error = {"code": self.code, "message": str(self)}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+@dataclass
+class OpenDocument:
+    """A document the server has been told about."""
+    uri: str
+    version: int
+    mtime_ns: int
+    size: int
+
+
+def encode_message(message: dict) -> bytes:
+    """Frame a JSON-RPC message with a byte-accurate Content-Length header."""
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[dict]:
+    """
+    Read one framed JSON-RPC message.
+
+    Args:
+        reader: Stream positioned at the start of a header block
+
+    Returns:
+        The decoded message, or None at end of stream
+    """
+    content_length = None
+    while True:
+        line = await reader.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if content_length is None:
+                continue
+            break
+        name, _, value = line.decode("ascii", errors="replace").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value.strip())
+
+    body = await reader.readexactly(content_length)
+    return json.loads(body)
+
+
+class LSPClient:
+    """
+    A multiplexed connection to one language server.
+
+    Requests may be issued concurrently from any number of tasks; each
+    gets its own id and future, so interleaved responses and
+    notifications never get mixed up.
+
+    Example:
+        client = await LSPClient.start(["pylsp"], Path("."))
+        hover = await client.request("textDocument/hover", params, sync=[path])
+        await client.close()
+    """
+
+    def __init__(
+        self,
+        process: asyncio.subprocess.Process,
+        root: Path,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ):
+        """
+        Wrap a started server process. Use :meth:`start` to also initialize it.
+
+        Args:
+            process: Server process with piped stdin and stdout
+            root: Workspace root
+            request_timeout: Default seconds to wait for a response
+        """
+        self.process = process
+        self.root = Path(root).resolve()
+        self.request_timeout = request_timeout
+        self.capabilities: dict[str, Any] = {}
+        self.diagnostics: dict[str, list[dict]] = {}
+
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._documents: dict[str, OpenDocument] = {}
+        self._sync_lock = asyncio.Lock()
+        self._cache: dict[str, Any] = {}
+        self._cache_generation = 0
+        self._notification_handlers: dict[str, Callable[[Any], None]] = {}
+        self._request_handlers: dict[str, Callable[[Any], Any]] = {
+            "workspace/configuration": lambda params: [None] * len((params or {}).get("items", [])),
+            "workspace/workspaceFolders": lambda params: [{"uri": self.root.as_uri(), "name": self.root.name}],
+            "client/registerCapability": lambda params: None,
+            "client/unregisterCapability": lambda params: None,
+            "window/workDoneProgress/create": lambda params: None,
+            "window/showMessageRequest": lambda params: None,
+        }
+        self._loop = asyncio.get_running_loop()
+        self._file_index: Optional[Any] = None
+        self._closed = False
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    @classmethod
+    async def start(
+        cls,
+        command: list[str],
+        root: Path,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        watch_files: bool = True,
+    ) -> LSPClient:
+        """
+        Launch and initialize a language server.
+
+        Args:
+            command: Server command line
+            root: Workspace root
+            request_timeout: Default seconds to wait for a response
+            watch_files: Invalidate caches from the shared file index watcher
+
+        Returns:
+            An initialized client
+
+        Raises:
+            FileNotFoundError: If the server executable is missing
+            LSPError: If initialization fails
+        """
+        root = Path(root).resolve()
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=root,
+        )
+        client = cls(process, root, request_timeout=request_timeout)
+        try:
+            await client.initialize()
+        except BaseException:
+            await client.close()
+            raise
+        if watch_files:
+            client.watch_workspace()
+        return client
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the server is still running and the session is usable."""
+        return not self._closed and self.process.returncode is None and not self._reader_task.done()
+
+    async def initialize(self) -> dict:
+        """Run the initialize handshake and return the server capabilities."""
+        result = await self.request(
+            "initialize",
+            {
+                "processId": os.getpid(),
+                "rootUri": self.root.as_uri(),
+                "workspaceFolders": [{"uri": self.root.as_uri(), "name": self.root.name}],
+                "capabilities": {
+                    "textDocument": {
+                        "synchronization": {"didSave": False, "dynamicRegistration": False},
+                        "definition": {"linkSupport": True},
+                        "references": {},
+                        "hover": {"contentFormat": ["markdown", "plaintext"]},
+                        "documentSymbol": {
+                            "symbolKind": {"valueSet": list(range(1, 27))},
+                            "hierarchicalDocumentSymbolSupport": True,
+                        },
+                        "publishDiagnostics": {},
+                    },
+                    "workspace": {
+                        "symbol": {
+                            "symbolKind": {"valueSet": list(range(1, 27))},
+                        },
+                        "workspaceFolders": True,
+                        "configuration": True,
+                        "didChangeWatchedFiles": {"dynamicRegistration": False},
+                    },
+                },
+            },
+            timeout=INITIALIZE_TIMEOUT,
+        )
+        self.capabilities = (result or {}).get("capabilities", {})
+        await self.notify("initialized", {})
+        return self.capabilities
+
+    def on_notification(self, method: str, handler: Callable[[Any], None]) -> None:
+        """Register a handler for a server notification."""
+        self._notification_handlers[method] = handler
+
+    def on_request(self, method: str, handler: Callable[[Any], Any]) -> None:
+        """Register a handler answering a server-initiated request."""
+        self._request_handlers[method] = handler
+
+    # Transport
+
+    async def _send(self, message: dict) -> None:
+        if self._closed or self.process.stdin is None:
+            raise LSPError("Language server session is closed")
+        # A single write per frame keeps concurrent senders from interleaving
+        self.process.stdin.write(encode_message(message))
+        await self.process.stdin.drain()
+
+    async def notify(self, method: str, params: Any = None) -> None:
+        """Send a notification."""
+        await self._send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    async def request(
+        self,
+        method: str,
+        params: Any = None,
+        timeout: Optional[float] = None,
+        sync: Optional[list[Path]] = None,
+        cache: Optional[bool] = None,
+    ) -> Any:
+        """
+        Send a request and wait for its result.
+
+        Args:
+            method: LSP method name
+            params: Request parameters
+            timeout: Seconds to wait (default: request_timeout)
+            sync: Documents to open or re-sync before sending
+            cache: Serve from and store in the result cache (default: True
+                for navigation methods in CACHEABLE_METHODS)
+
+        Returns:
+            The ``result`` member of the response
+
+        Raises:
+            LSPError: On an error response, timeout or closed session
+        """
+        for path in sync or []:
+            await self.sync_document(path)
+
+        if cache is None:
+            cache = method in CACHEABLE_METHODS
+        key = None
+        if cache:
+            key = method + json.dumps(params, sort_keys=True, separators=(",", ":"))
+            if key in self._cache:
+                return self._cache[key]
+            generation = self._cache_generation
+
+        request_id = next(self._ids)
+        future = self._loop.create_future()
+        self._pending[request_id] = future
+        try:
+            await self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            result = await asyncio.wait_for(future, timeout or self.request_timeout)
+        except asyncio.TimeoutError:
+            await self._cancel(request_id)
+            raise LSPError(f"{method} timed out", code=REQUEST_CANCELLED)
+        except asyncio.CancelledError:
+            asyncio.ensure_future(self._cancel(request_id))
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+        # Skip storing if files changed while the request was in flight
+        if key is not None and generation == self._cache_generation:
+            if len(self._cache) >= MAX_CACHE_ENTRIES:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = result
+        return result
+
+    async def _cancel(self, request_id: int) -> None:
+        if self.is_alive:
+            try:
+                await self.notify("$/cancelRequest", {"id": request_id})
+            except (LSPError, ConnectionError):
+                pass
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                message = await read_message(self.process.stdout)
+                if message is None:
+                    break
+                self._dispatch(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Language server stream failed: {e}")
+        finally:
+            self._fail_pending(LSPError("Language server exited"))
+
+    def _dispatch(self, message: dict) -> None:
+        method = message.get("method")
+        if method is None:
+            future = self._pending.get(message.get("id"))
+            if future is None or future.done():
+                return
+            if "error" in message:
+                error = message["error"] or {}
+                future.set_exception(LSPError(
+                    error.get("message", "Unknown error"), error.get("code"), error.get("data"),
+                ))
+            else:
+                future.set_result(message.get("result"))
+        elif "id" in message:
+            asyncio.create_task(self._answer(message["id"], method, message.get("params")))
+        else:
+            self._handle_notification(method, message.get("params"))
+
+    def _handle_notification(self, method: str, params: Any) -> None:
+        if method == "textDocument/publishDiagnostics" and params:
+            self.diagnostics[params.get("uri", "")] = params.get("diagnostics", [])
+        handler = self._notification_handlers.get(method)
+        if handler:
+            try:
+                handler(params)
+            except Exception as e:
+                logger.debug(f"LSP notification handler for {method} failed: {e}")
+
+    async def _answer(self, request_id: Any, method: str, params: Any) -> None:
+        handler = self._request_handlers.get(method)
+        if handler is None:
+            response = {"jsonrpc": "2.0", "id": request_id,
+                        "error": {"code": METHOD_NOT_FOUND, "message": f"Unsupported method: {method}"}}
+        else:
+            try:
+                result = handler(params)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+            except Exception as e:
+                response = {"jsonrpc": "2.0", "id": request_id,
+                            "error": {"code": -32603, "message": str(e)}}
+        try:
+            await self._send(response)
+        except (LSPError, ConnectionError):
+            pass
+
+    def _fail_pending(self, error: LSPError) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    # Document synchronization
+
+    def _uri(self, path: Path) -> str:
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.root / path
+        return path.resolve().as_uri()
+
+    async def sync_document(self, path: Path) -> Optional[OpenDocument]:
+        """
+        Make sure the server has the current contents of a document.
+
+        Opens the document on first use and sends a full-text didChange
+        with a bumped version whenever its size or mtime changed.
+
+        Args:
+            path: Absolute or root-relative file path
+
+        Returns:
+            The tracked document, or None if the file cannot be read
+        """
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.root / path
+        uri = self._uri(path)
+
+        async with self._sync_lock:
+            try:
+                stat = path.stat()
+            except OSError:
+                if self._documents.pop(uri, None):
+                    await self.notify("textDocument/didClose", {"textDocument": {"uri": uri}})
+                    self.invalidate()
+                return None
+
+            document = self._documents.get(uri)
+            if document and (document.mtime_ns, document.size) == (stat.st_mtime_ns, stat.st_size):
+                return document
+
+            try:
+                text = path.read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                return None
+
+            if document is None:
+                document = OpenDocument(uri, 1, stat.st_mtime_ns, stat.st_size)
+                await self.notify("textDocument/didOpen", {
+                    "textDocument": {
+                        "uri": uri,
+                        "languageId": LANGUAGE_IDS.get(path.suffix, "plaintext"),
+                        "version": document.version,
+                        "text": text,
+                    },
+                })
+            else:
+                document.version += 1
+                document.mtime_ns, document.size = stat.st_mtime_ns, stat.st_size
+                await self.notify("textDocument/didChange", {
+                    "textDocument": {"uri": uri, "version": document.version},
+                    "contentChanges": [{"text": text}],
+                })
+                self.invalidate()
+            self._documents[uri] = document
+            return document
+
+    def document_version(self, path: Path) -> Optional[int]:
+        """Version last sent for a document, or None if it is not open."""
+        document = self._documents.get(self._uri(path))
+        return document.version if document else None
+
+    # Caching
+
+    def invalidate(self) -> None:
+        """Drop all cached results, e.g. after a file changed."""
+        self._cache.clear()
+        self._cache_generation += 1
+
+    def watch_workspace(self) -> None:
+        """Invalidate caches and notify the server on file system changes."""
+        from opencode.tool.file_index import get_file_index
+
+        try:
+            index = get_file_index(self.root)
+            index.add_listener(self._on_file_event)
+            # Listeners only fire once the index is built and watching
+            len(index)
+            self._file_index = index
+        except Exception as e:
+            logger.debug(f"LSP file watching unavailable: {e}")
+
+    def _on_file_event(self, rel_path: str, change: str) -> None:
+        # Called from the watchdog thread
+        if self._closed or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._file_changed, rel_path, change)
+
+    def _file_changed(self, rel_path: str, change: str) -> None:
+        self.invalidate()
+        if not self.is_alive:
+            return
+        change_type = {"created": 1, "modified": 2, "deleted": 3}.get(change, 2)
+        asyncio.ensure_future(self._notify_quietly("workspace/didChangeWatchedFiles", {
+            "changes": [{"uri": (self.root / rel_path).as_uri(), "type": change_type}],
+        }))
+
+    async def _notify_quietly(self, method: str, params: Any) -> None:
+        try:
+            await self.notify(method, params)
+        except (LSPError, ConnectionError):
+            pass
+
+    # Shutdown
+
+    async def close(self) -> None:
+        """Shut the server down, killing it if it does not exit promptly."""
+        if self._closed:
+            return
+        if self._file_index is not None:
+            self._file_index.remove_listener(self._on_file_event)
+            self._file_index = None
+
+        if self.is_alive:
+            try:
+                await asyncio.wait_for(self.request("shutdown", cache=False), SHUTDOWN_TIMEOUT)
+                await self.notify("exit")
+            except (LSPError, ConnectionError, asyncio.TimeoutError):
+                pass
+        self._closed = True
+
+        try:
+            await asyncio.wait_for(self.process.wait(), SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+            await self.process.wait()
+
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except asyncio.CancelledError:
+            pass
+        self._fail_pending(LSPError("Language server session closed"))
+
+
+_clients: dict[tuple[Path, tuple[str, ...]], LSPClient] = {}
+# asyncio locks belong to one event loop, so keep a set per loop
+_start_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+async def get_lsp_client(command: list[str], root: Path) -> LSPClient:
+    """
+    Get the shared client for a server command and workspace root.
+
+    Servers are started once and reused across tools and sessions;
+    a server that exited, or was started on another event loop, is
+    replaced.
+
+    Args:
+        command: Server command line
+        root: Workspace root
+
+    Returns:
+        An initialized, running client
+    """
+    key = (Path(root).resolve(), tuple(command))
+    loop = asyncio.get_running_loop()
+
+    locks = _start_locks.setdefault(loop, {})
+    if key not in locks:
+        locks[key] = asyncio.Lock()
+    lock = locks[key]
+
+    async with lock:
+        client = _clients.get(key)
+        if client is not None and client._loop is loop and client.is_alive:
+            return client
+        if client is not None and client._loop is loop:
+            await client.close()
+        client = await LSPClient.start(list(command), key[0])
+        _clients[key] = client
+        return client
+
+
+async def close_lsp_clients() -> None:
+    """Shut down all shared language servers running on this event loop."""
+    loop = asyncio.get_running_loop()
+    for key, client in list(_clients.items()):
+        if client._loop is loop:
+            await client.close()
+        del _clients[key]
@@ -0,0 +1,471 @@
+"""
+Persistent trigram index for content search.
+
+Every indexed file is split into the set of (lowercased) byte trigrams it
+contains, stored as posting lists in an on-disk SQLite database. A regex
+query is turned into a boolean combination of trigrams that any matching
+file must contain; only the candidate files that satisfy it are then
+searched with the real regex.
+
+The index is updated incrementally: files are re-read only when their
+mtime or size changed, and re-indexed only when their content hash did.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from opencode.tool.file_index import FileIndex, get_file_index
+from opencode.tool.grep_engine import BINARY_SNIFF_SIZE
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_parse  # type: ignore[no-redef]
+
+logger = logging.getLogger(__name__)
+
+# Files larger than this are not indexed and are always treated as candidates
+MAX_INDEXED_FILE_SIZE = 4 * 1024 * 1024
+
+# Trigrams used per literal; more adds little selectivity but costs query time
+MAX_TRIGRAMS_PER_LITERAL = 8
+
+# Files indexed per transaction
+COMMIT_BATCH = 200
+
+STATUS_INDEXED = "indexed"
+STATUS_LARGE = "large"
+STATUS_BINARY = "binary"
+
+_REPEATS = {"MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"}
+
+
+def default_index_path(root: Path) -> Path:
+    """Get the on-disk location of the index for a workspace root."""
+    digest = hashlib.sha256(str(Path(root).resolve()).encode()).hexdigest()[:16]
+    return Path.home() / ".cache" / "opencode" / "trigram" / f"{digest}.db"
+
+
+def extract_trigrams(data: bytes) -> np.ndarray:
+    """
+    Get the sorted, unique trigrams of a buffer.
+
+    Trigrams are taken over lowercased bytes and packed into 24-bit ints.
+    """
+    if len(data) < 3:
+        return np.empty(0, dtype=np.uint32)
+    values = np.frombuffer(data.lower(), dtype=np.uint8).astype(np.uint32)
+    return np.unique((values[:-2] << 16) | (values[1:-1] << 8) | values[2:])
+
+
+@dataclass
+class TrigramQuery:
+    """
+    Boolean trigram query.
+
+    An "and" query requires every trigram and subquery; an "or" query
+    requires any subquery. None is used for "matches every file".
+    """
+    op: str = "and"
+    trigrams: set[int] = field(default_factory=set)
+    subqueries: list["TrigramQuery"] = field(default_factory=list)
+
+
+def _literal_trigrams(literal: bytes) -> set[int]:
+    """Pack the trigrams of a literal, keeping at most MAX_TRIGRAMS_PER_LITERAL."""
+    grams = [int.from_bytes(literal[i:i + 3], "big") for i in range(len(literal) - 2)]
+    if len(grams) > MAX_TRIGRAMS_PER_LITERAL:
+        step = len(grams) / MAX_TRIGRAMS_PER_LITERAL
+        grams = [grams[int(i * step)] for i in range(MAX_TRIGRAMS_PER_LITERAL)] + [grams[-1]]
+    return set(grams)
+
+
+def _analyze(items, ignorecase: bool) -> Optional[TrigramQuery]:
+    """Build the trigram query a parsed regex sequence implies."""
+    query = TrigramQuery()
+    run = bytearray()
+
+    def flush() -> None:
+        if len(run) >= 3:
+            query.trigrams |= _literal_trigrams(bytes(run))
+        run.clear()
+
+    def add(sub: Optional[TrigramQuery]) -> None:
+        if sub is not None:
+            query.subqueries.append(sub)
+
+    for op, av in items:
+        name = str(op)
+        if name == "LITERAL":
+            char = chr(av)
+            if ignorecase and not char.isascii():
+                # Non-ASCII case folding does not map onto lowercased bytes
+                flush()
+                continue
+            run.extend(char.encode("utf-8").lower())
+        elif name == "AT":
+            # Zero-width assertions keep neighbouring literals adjacent
+            continue
+        elif name == "SUBPATTERN":
+            flush()
+            add(_analyze(av[-1], ignorecase))
+        elif name in _REPEATS:
+            flush()
+            low, _, sub = av
+            if low >= 1:
+                add(_analyze(sub, ignorecase))
+        elif name == "BRANCH":
+            flush()
+            branches = [_analyze(branch, ignorecase) for branch in av[1]]
+            if all(branch is not None for branch in branches):
+                add(TrigramQuery(op="or", subqueries=branches))
+        else:
+            flush()
+    flush()
+
+    if not query.trigrams and not query.subqueries:
+        return None
+    return query
+
+
+def build_query(pattern: str, flags: int = 0) -> Optional[TrigramQuery]:
+    """
+    Derive the trigram query for a regex.
+
+    Args:
+        pattern: Regular expression
+        flags: re flags
+
+    Returns:
+        TrigramQuery, or None if the regex cannot be narrowed by trigrams
+    """
+    compiled = re.compile(pattern, flags)
+    ignorecase = bool(compiled.flags & re.IGNORECASE)
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+    return _analyze(parsed, ignorecase)
+
+
+def _query_sql(query: TrigramQuery) -> tuple[str, list[int]]:
+    """Translate a query into a compound SELECT of file IDs."""
+    parts, params = [], []
+    for trigram in sorted(query.trigrams):
+        parts.append("SELECT file_id FROM postings WHERE trigram = ?")
+        params.append(trigram)
+    for sub in query.subqueries:
+        sql, sub_params = _query_sql(sub)
+        parts.append(f"SELECT file_id FROM ({sql})")
+        params.extend(sub_params)
+    joiner = " INTERSECT " if query.op == "and" else " UNION "
+    return joiner.join(parts), params
+
+
+class TrigramIndex:
+    """
+    On-disk trigram index of a workspace.
+
+    The file list comes from the shared FileIndex, so ignore rules match
+    the other search tools, and its watcher events mark files for
+    incremental re-indexing.
+
+    Example:
+        index = get_trigram_index(Path("."))
+        candidates = index.candidates(r"def \\w+_handler")
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        db_path: Optional[Path] = None,
+        file_index: Optional[FileIndex] = None,
+        stale_after: float = 5.0,
+    ):
+        """
+        Initialize the index and open (or create) its database.
+
+        Args:
+            root: Workspace root directory
+            db_path: Database location (default: under ~/.cache/opencode)
+            file_index: File list source (default: the shared index for root)
+            stale_after: Seconds after which an unwatched index is rescanned
+        """
+        self.root = Path(root).resolve()
+        self.db_path = Path(db_path) if db_path else default_index_path(self.root)
+        self.file_index = file_index or get_file_index(self.root)
+        self.stale_after = stale_after
+
+        self._synced_at: Optional[float] = None
+        self._synced_builds = 0
+        self._dirty: set[str] = set()
+        self._lock = threading.RLock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._init_schema()
+        self.file_index.add_listener(self._on_file_change)
+
+    def _init_schema(self) -> None:
+        """Create tables on first use."""
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                hash TEXT,
+                status TEXT NOT NULL,
+                trigrams BLOB
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                trigram INTEGER NOT NULL,
+                file_id INTEGER NOT NULL,
+                PRIMARY KEY (trigram, file_id)
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    # Updating
+
+    def _on_file_change(self, rel_path: str, change: str) -> None:
+        with self._lock:
+            self._dirty.add(rel_path)
+
+    def sync(self, full: bool = False) -> None:
+        """
+        Bring the index up to date.
+
+        The first sync (and any sync of an unwatched, stale index, or after
+        the file index was rebuilt) compares every file's mtime and size
+        against the database; later syncs only revisit files the watcher
+        reported as changed.
+
+        Args:
+            full: Force a full comparison
+        """
+        with self._lock:
+            stale = (
+                self._synced_at is None
+                or (not self.file_index.is_watching and time.monotonic() - self._synced_at > self.stale_after)
+                # A rebuild (e.g. after a .gitignore edit) can add or drop any path
+                or self.file_index.builds != self._synced_builds
+            )
+            if full or stale:
+                self._dirty.clear()
+                self._sync_all()
+            elif self._dirty:
+                paths, self._dirty = self._dirty, set()
+                self._sync_paths(paths)
+            self._synced_at = time.monotonic()
+            self._synced_builds = self.file_index.builds
+
+    def _sync_all(self) -> None:
+        """Reconcile the database with every file in the workspace."""
+        started = time.monotonic()
+        known = {
+            row["path"]: (row["id"], row["mtime_ns"], row["size"], row["hash"])
+            for row in self.conn.execute("SELECT id, path, mtime_ns, size, hash FROM files")
+        }
+        current = self.file_index.files
+
+        pending = 0
+        for rel_path in current:
+            previous = known.pop(rel_path, None)
+            if self._index_file(rel_path, previous):
+                pending += 1
+                if pending >= COMMIT_BATCH:
+                    self.conn.commit()
+                    pending = 0
+
+        for file_id, *_ in known.values():
+            self._remove_file(file_id)
+        self.conn.commit()
+        logger.debug(f"Trigram index synced {len(current)} files in {time.monotonic() - started:.2f}s")
+
+    def _sync_paths(self, paths: Iterable[str]) -> None:
+        """Re-check specific files."""
+        for rel_path in paths:
+            row = self.conn.execute(
+                "SELECT id, mtime_ns, size, hash FROM files WHERE path = ?", (rel_path,)
+            ).fetchone()
+            previous = tuple(row) if row else None
+            if not (self.root / rel_path).is_file():
+                if previous:
+                    self._remove_file(previous[0])
+                continue
+            self._index_file(rel_path, previous)
+        self.conn.commit()
+
+    def _index_file(self, rel_path: str, previous: Optional[tuple]) -> bool:
+        """
+        Index one file if it changed.
+
+        Args:
+            rel_path: Path relative to the root
+            previous: (id, mtime_ns, size, hash) from the database, if known
+
+        Returns:
+            True if the database was modified
+        """
+        try:
+            stat = os.stat(self.root / rel_path)
+        except OSError:
+            if previous:
+                self._remove_file(previous[0])
+                return True
+            return False
+
+        if previous and previous[1] == stat.st_mtime_ns and previous[2] == stat.st_size:
+            return False
+
+        status, digest, grams = STATUS_LARGE, None, None
+        if stat.st_size <= MAX_INDEXED_FILE_SIZE:
+            try:
+                data = (self.root / rel_path).read_bytes()
+            except OSError:
+                return False
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            if previous and previous[3] == digest:
+                # Touched but unchanged: only refresh the stat fields
+                self.conn.execute(
+                    "UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                    (stat.st_mtime_ns, stat.st_size, previous[0]),
+                )
+                return True
+            if b"\x00" in data[:BINARY_SNIFF_SIZE]:
+                status = STATUS_BINARY
+            else:
+                status, grams = STATUS_INDEXED, extract_trigrams(data)
+
+        if previous:
+            self._remove_file(previous[0])
+
+        cursor = self.conn.execute(
+            "INSERT INTO files (path, mtime_ns, size, hash, status, trigrams) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                rel_path,
+                stat.st_mtime_ns,
+                stat.st_size,
+                digest,
+                status,
+                zlib.compress(grams.tobytes()) if grams is not None else None,
+            ),
+        )
+        if grams is not None and len(grams):
+            file_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO postings (trigram, file_id) VALUES (?, ?)",
+                ((int(gram), file_id) for gram in grams),
+            )
+        return True
+
+    def _remove_file(self, file_id: int) -> None:
+        """Delete a file and its postings."""
+        row = self.conn.execute("SELECT trigrams FROM files WHERE id = ?", (file_id,)).fetchone()
+        if row and row["trigrams"]:
+            grams = np.frombuffer(zlib.decompress(row["trigrams"]), dtype=np.uint32)
+            self.conn.executemany(
+                "DELETE FROM postings WHERE trigram = ? AND file_id = ?",
+                ((int(gram), file_id) for gram in grams),
+            )
+        self.conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    # Querying
+
+    def candidates(self, pattern: str, flags: int = 0, base: str = "") -> Optional[list[str]]:
+        """
+        Get the files that may match a regex.
+
+        Syncs the index first. Files too large to index are always included;
+        binary files never are.
+
+        Args:
+            pattern: Regular expression
+            flags: re flags
+            base: Only return files under this directory (relative to root)
+
+        Returns:
+            Sorted candidate paths relative to base, or None if the regex
+            has no usable trigrams and every file must be searched
+        """
+        query = build_query(pattern, flags)
+        if query is None:
+            return None
+
+        self.sync()
+        sql, params = _query_sql(query)
+        base = base.strip("/")
+        base = "" if base == "." else base
+
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT path FROM files WHERE id IN ({sql}) OR status = ? ORDER BY path",
+                (*params, STATUS_LARGE),
+            ).fetchall()
+
+        paths = [row["path"] for row in rows]
+        if base:
+            prefix = base + "/"
+            paths = [path[len(prefix):] for path in paths if path.startswith(prefix)]
+        return paths
+
+
+_indexes: dict[Path, TrigramIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_trigram_index(root: Path) -> TrigramIndex:
+    """
+    Get the shared trigram index for a workspace root.
+
+    Args:
+        root: Workspace root directory
+
+    Returns:
+        TrigramIndex for the root
+    """
+    key = Path(root).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = TrigramIndex(key)
+            _indexes[key] = index
+        return index
+
+
+def close_trigram_indexes() -> None:
+    """Close every shared trigram index."""
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+        _indexes.clear()
+    for index in indexes:
+        index.close()
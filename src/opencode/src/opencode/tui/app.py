@@ -11,11 +11,12 @@ import asyncio
 import logging
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal, Vertical
+from textual.markup import escape
 from textual.reactive import reactive
 from textual.widgets import Footer, Header, Static
 
@@ -24,6 +25,8 @@ from opencode.core.session import SessionManager
 from opencode.mcp.client import MCPClient
 from opencode.provider.base import Provider
 from opencode.tool.base import ToolRegistry
+from opencode.tui.streaming import StreamThrottle, split_settled
+from opencode.tui.transcript import TranscriptEntry, prefix_heights, visible_range
 
 # Set up logging for TUI debugging
 logger = logging.getLogger(__name__)
@@ -136,11 +139,13 @@ class MessageWidget(Static):
         id: Optional[str] = None,
     ) -> None:
         super().__init__(name=name, id=id)
-        self.role = role
+        # Accept MessageRole enums from the session store as well as strings
+        self.role = getattr(role, "value", role)
         # Handle ContentBlock list or string
         self.message_content = self._extract_text(content)
     
-    def _extract_text(self, content: str | list) -> str:
+    @staticmethod
+    def _extract_text(content: str | list) -> str:
         """Extract text from string or ContentBlock list."""
         if isinstance(content, str):
             return content
@@ -169,11 +174,127 @@ class MessageWidget(Static):
             "system": "⚙️ System",
         }.get(self.role, self.role)
         
-        return f"[bold]{role_label}[/bold]\n\n{self.message_content}"
+        return f"[bold]{role_label}[/bold]\n\n{escape(self.message_content)}"
+
+
+class StreamingMessageWidget(Vertical):
+    """Widget for a message whose text is still streaming in.
+    
+    Text arrives through append_text(), normally from a StreamThrottle.
+    Once the live tail reaches twice TAIL_LINES lines, all but the last
+    TAIL_LINES are moved into a fixed block widget, so each update only
+    re-lays out the tail instead of the whole message. Blocks are merged
+    like a binary counter, so a long answer is held in a logarithmic
+    number of widgets.
+    """
+    
+    DEFAULT_CSS = """
+    StreamingMessageWidget {
+        height: auto;
+        margin: 0 1;
+        padding: 1;
+        background: $surface;
+        border: solid $primary;
+        border-left: thick $primary;
+    }
+    
+    StreamingMessageWidget.error {
+        border-left: thick $error;
+    }
+    
+    StreamingMessageWidget .role-label {
+        text-style: bold;
+        margin-bottom: 1;
+    }
+    """
+    
+    TAIL_LINES = 40
+    
+    def __init__(
+        self,
+        role: str = "assistant",
+        placeholder: str = "",
+        *,
+        name: Optional[str] = None,
+        id: Optional[str] = None,
+    ) -> None:
+        super().__init__(name=name, id=id)
+        self.role = role
+        self.add_class(role)
+        self._blocks: list[str] = []
+        self._block_widgets: list[Static] = []
+        self._tail_text = placeholder
+        self._placeholder = bool(placeholder)
+        self._tail = Static(placeholder, markup=False, classes="tail")
+    
+    def compose(self) -> ComposeResult:
+        role_label = {
+            "user": "👤 You",
+            "assistant": "🤖 Assistant",
+            "system": "⚙️ System",
+        }.get(self.role, self.role)
+        yield Static(role_label, markup=False, classes="role-label")
+        yield self._tail
+    
+    @property
+    def message_content(self) -> str:
+        """The full text shown so far."""
+        return "".join(self._blocks) + self._tail_text
+    
+    @message_content.setter
+    def message_content(self, content: str) -> None:
+        """Replace all text, e.g. with an error or cancellation notice."""
+        for block in self._block_widgets:
+            block.remove()
+        self._blocks.clear()
+        self._block_widgets.clear()
+        self._placeholder = False
+        self._set_tail(content)
+    
+    def append_text(self, text: str) -> None:
+        """Append streamed text, replacing the placeholder on first call."""
+        if self._placeholder:
+            self._placeholder = False
+            self._tail_text = ""
+        self._set_tail(self._tail_text + text)
+    
+    def _set_tail(self, text: str) -> None:
+        """Update the tail, freezing settled lines into a block."""
+        settled, tail = split_settled(text, self.TAIL_LINES)
+        if settled and self._tail.is_mounted:
+            self._freeze(settled)
+            text = tail
+        self._tail_text = text
+        self._tail.update(text)
+    
+    def _freeze(self, text: str) -> None:
+        """Append settled text as a block, merging it into blocks no larger."""
+        if not self._blocks or len(self._blocks[-1]) > len(text):
+            block = Static(text, markup=False, classes="block")
+            self.mount(block, before=self._tail)
+        else:
+            block = self._block_widgets.pop()
+            text = self._blocks.pop() + text
+            while self._blocks and len(self._blocks[-1]) <= len(text):
+                text = self._blocks.pop() + text
+                self._block_widgets.pop().remove()
+            block.update(text)
+        self._blocks.append(text)
+        self._block_widgets.append(block)
 
 
 class ChatContainer(Container):
-    """Container for chat messages."""
+    """Virtualized container for chat messages.
+    
+    Messages are kept as TranscriptEntry records, and widgets exist only
+    for the entries in view plus OVERSCAN rows either side. Two spacers
+    stand in for the rest, sized from each entry's height cached per
+    width (estimated until the entry is first shown). When the view nears
+    the top, older messages are paged in through ``loader``.
+    
+    Messages still streaming in are mounted after the transcript until
+    end_streaming() turns them into entries.
+    """
     
     DEFAULT_CSS = """
     ChatContainer {
@@ -181,19 +302,261 @@ class ChatContainer(Container):
         overflow-y: auto;
         padding: 1;
     }
+    
+    ChatContainer > .spacer {
+        height: 0;
+    }
     """
     
+    OVERSCAN = 40
+    PAGE_SIZE = 50
+    
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.entries: list[TranscriptEntry] = []
+        # Fetches the page of messages before a store index: (messages, offset)
+        self.loader: Optional[Callable[[int], Awaitable[tuple[list, int]]]] = None
+        # Store index of entries[0]; older messages remain to be paged in while > 0
+        self.first_offset = 0
+        self._window = (0, 0)
+        self._offsets: Optional[list[int]] = None
+        self._offsets_width = 0
+        self._live: list[StreamingMessageWidget] = []
+        self._update_pending = False
+        self._loading = False
+        # Keep the window on the newest entries until the user scrolls up;
+        # scroll_end() only lands after a refresh, so scroll_y lags behind
+        self._following = False
+        self._top = Static("", classes="spacer")
+        self._bottom = Static("", classes="spacer")
+    
+    def compose(self) -> ComposeResult:
+        yield self._top
+        yield self._bottom
+    
+    def on_mount(self) -> None:
+        # Show messages added before the container was mounted
+        self.call_after_refresh(self._follow)
+    
+    @property
+    def _width(self) -> int:
+        return self.scrollable_content_region.width or self.size.width
+    
+    def _get_offsets(self) -> list[int]:
+        """Entry offsets at the current width, rebuilt when invalidated."""
+        width = self._width
+        if self._offsets is None or self._offsets_width != width:
+            self._offsets = prefix_heights(self.entries, width)
+            self._offsets_width = width
+        return self._offsets
+    
     def add_message(self, role: str, content: str | list) -> MessageWidget:
-        """Add a message to the chat."""
+        """Add a message to the end of the chat and scroll to it."""
         message = MessageWidget(role=role, content=content)
+        # The widget is mounted once the window reaches the new entry, which
+        # _follow() does straight away when the container is mounted
+        self.entries.append(TranscriptEntry(role=message.role, text=message.message_content, widget=message))
+        self._offsets = None
+        self._follow()
+        return message
+    
+    def add_streaming_message(self, role: str = "assistant", placeholder: str = "") -> StreamingMessageWidget:
+        """Add a message whose text will be streamed in."""
+        message = StreamingMessageWidget(role=role, placeholder=placeholder)
+        self._live.append(message)
         self.mount(message)
         self.scroll_end(animate=False)
         return message
     
+    def end_streaming(self, message: StreamingMessageWidget) -> None:
+        """Move a finished streaming message into the transcript."""
+        if message not in self._live:
+            return
+        self._live.remove(message)
+        entry = TranscriptEntry(
+            role=message.role,
+            text=message.message_content,
+            classes=set(message.classes) - {message.role},
+        )
+        self.entries.append(entry)
+        self._offsets = None
+        message.remove()
+        self._follow()
+    
+    def load_history(
+        self,
+        messages: list,
+        offset: int = 0,
+        loader: Optional[Callable[[int], Awaitable[tuple[list, int]]]] = None,
+    ) -> None:
+        """
+        Show the newest page of a session's messages.
+        
+        Args:
+            messages: Messages with ``role`` and ``content``, oldest first
+            offset: Store index of the first message
+            loader: Fetches the page before a store index, for paging in
+                older messages
+        """
+        self.clear_messages()
+        self.entries = [self._entry_for(msg) for msg in messages]
+        self.first_offset = offset
+        self.loader = loader
+        self._follow()
+    
     def clear_messages(self) -> None:
         """Clear all messages."""
-        for child in list(self.children):
-            child.remove()
+        for entry in self.entries:
+            if entry.widget is not None:
+                entry.widget.remove()
+        for message in self._live:
+            message.remove()
+        self.entries = []
+        self._live = []
+        self._window = (0, 0)
+        self._offsets = None
+        self._following = False
+        self.first_offset = 0
+        self.loader = None
+        if self._top.is_mounted:
+            self._top.styles.height = 0
+            self._bottom.styles.height = 0
+    
+    @staticmethod
+    def _entry_for(message) -> TranscriptEntry:
+        """Create an entry from a session message."""
+        role = getattr(message.role, "value", message.role)
+        return TranscriptEntry(role=role, text=MessageWidget._extract_text(message.content))
+    
+    def _follow(self) -> None:
+        """Lay out the window at the end of the transcript and scroll there."""
+        if not self._top.is_mounted:
+            return
+        offsets = self._get_offsets()
+        viewport = self.scrollable_content_region.height or self.size.height
+        self._reconcile(*visible_range(offsets, offsets[-1] - viewport, viewport, self.OVERSCAN))
+        self._following = True
+        self.call_after_refresh(self._stick_to_end)
+        self._schedule_update()
+    
+    def _stick_to_end(self) -> None:
+        """Scroll to the end once laid out, unless the user scrolled away meanwhile."""
+        if self._following:
+            self.scroll_end(animate=False, immediate=True)
+    
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if new_value < old_value:
+            self._following = False
+        self._schedule_update()
+    
+    def on_resize(self) -> None:
+        self._schedule_update()
+    
+    def _schedule_update(self) -> None:
+        """Update the window once the pending layout has been applied."""
+        if not self._update_pending:
+            self._update_pending = True
+            self.call_after_refresh(self._update_window)
+    
+    def _update_window(self) -> None:
+        """Materialize the entries around the scroll position."""
+        self._update_pending = False
+        if not self._top.is_mounted:
+            return
+        self._measure()
+        viewport = self.scrollable_content_region.height or self.size.height
+        offsets = self._get_offsets()
+        top = offsets[-1] - viewport if self._following else self.scroll_y
+        self._reconcile(*visible_range(offsets, top, viewport, self.OVERSCAN))
+        if self._following:
+            # Measured heights may have moved the end
+            self.call_after_refresh(self._stick_to_end)
+        
+        if self.first_offset > 0 and self.loader is not None and not self._loading:
+            if top < self.OVERSCAN:
+                self._loading = True
+                self.run_worker(self._load_older(), group="transcript", exclusive=True)
+    
+    def _measure(self) -> None:
+        """Cache the laid-out heights of materialized entries."""
+        width = self._width
+        lo, hi = self._window
+        for entry in self.entries[lo:hi]:
+            widget = entry.widget
+            if widget is not None and widget.is_mounted and widget.size.height:
+                height = widget.outer_size.height
+                if entry.heights.get(width) != height:
+                    entry.heights[width] = height
+                    self._offsets = None
+    
+    def _reconcile(self, lo: int, hi: int) -> None:
+        """Mount widgets for entries[lo:hi], release the rest and size the spacers."""
+        old_lo, old_hi = self._window
+        if old_lo >= old_hi:
+            old_lo = old_hi = hi
+        keep_lo, keep_hi = max(lo, old_lo), min(hi, old_hi)
+        if keep_lo >= keep_hi:
+            keep_lo = keep_hi = hi
+        
+        for index in range(old_lo, old_hi):
+            if not keep_lo <= index < keep_hi:
+                self._release(self.entries[index])
+        
+        head = [self._materialize(entry) for entry in self.entries[lo:keep_lo]]
+        tail = [self._materialize(entry) for entry in self.entries[keep_hi:hi]]
+        if head:
+            self.mount(*head, after=self._top)
+        if tail:
+            self.mount(*tail, before=self._bottom)
+        self._window = (lo, hi)
+        
+        offsets = self._get_offsets()
+        self._top.styles.height = offsets[lo]
+        self._bottom.styles.height = offsets[-1] - offsets[hi]
+    
+    def _materialize(self, entry: TranscriptEntry) -> MessageWidget:
+        """Create the widget for an entry."""
+        if entry.widget is None:
+            entry.widget = MessageWidget(role=entry.role, content=entry.text)
+            if entry.classes:
+                entry.widget.add_class(*entry.classes)
+        return entry.widget
+    
+    def _release(self, entry: TranscriptEntry) -> None:
+        """Remove an entry's widget, keeping its text, classes and height."""
+        widget = entry.widget
+        if widget is None:
+            return
+        entry.set_text(widget.message_content)
+        entry.classes = set(widget.classes) - {entry.role}
+        if widget.is_mounted and widget.size.height:
+            entry.heights[self._width] = widget.outer_size.height
+        entry.widget = None
+        widget.remove()
+    
+    async def _load_older(self) -> None:
+        """Prepend the page of messages before the first entry."""
+        try:
+            messages, offset = await self.loader(self.first_offset)
+        except Exception as e:
+            logger.warning(f"Failed to load older messages: {e}")
+            self._loading = False
+            return
+        
+        older = [self._entry_for(msg) for msg in messages]
+        lo, hi = self._window
+        self.entries[0:0] = older
+        self.first_offset = offset if older else 0
+        self._window = (lo + len(older), hi + len(older))
+        self._offsets = None
+        
+        # Keep the same messages in view while the spacer above grows
+        added = self._get_offsets()[len(older)]
+        self._top.styles.height = self._get_offsets()[self._window[0]]
+        self.scroll_to(y=self.scroll_y + added, animate=False, immediate=True)
+        self._loading = False
+        self._schedule_update()
 
 
 class InputContainer(Container):
@@ -410,6 +773,9 @@ class OpenCodeApp(App):
     }
     """
     
+    # Maximum re-renders per second of a streaming response
+    STREAM_FPS = 30.0
+    
     BINDINGS = [
         Binding("ctrl+n", "new_session", "New Session"),
         Binding("ctrl+s", "save_session", "Save Session"),
@@ -530,34 +896,41 @@ class OpenCodeApp(App):
             gpu_info=gpu_status,
         )
     
+    async def _get_telemetry(self):
+        """Get the latest background telemetry sample.
+        
+        Only the very first call waits for a sample, taken on a worker
+        thread so the event loop is not blocked.
+        """
+        from opencode.router.telemetry import get_sampler
+        
+        sampler = get_sampler()
+        sample = sampler.latest()
+        if sample is None:
+            sample = await asyncio.to_thread(sampler.sample_now)
+        return sample
+    
     async def _get_computer_status(self) -> str:
         """Get computer/system status."""
         try:
-            import platform
-            import psutil
+            sample = await self._get_telemetry()
+            if sample.cpu_percent is None or not sample.memory_total_mb:
+                import platform
+                return f"OK | {platform.system()} {platform.machine()}"
             
-            # Get CPU and memory info
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-            memory_gb = memory.total / (1024**3)
-            
-            return f"OK | CPU: {cpu_percent:.0f}% | RAM: {memory_percent:.0f}% of {memory_gb:.1f}GB"
-        except ImportError:
-            import platform
-            return f"OK | {platform.system()} {platform.machine()}"
+            memory_gb = sample.memory_total_mb / 1024
+            return f"OK | CPU: {sample.cpu_percent:.0f}% | RAM: {sample.memory_percent:.0f}% of {memory_gb:.1f}GB"
         except Exception as e:
             return f"Error: {e}"
     
     async def _get_network_status(self) -> str:
         """Get network connectivity status."""
-        import socket
-        
         try:
             # Try to connect to a common DNS server
-            socket.create_connection(("8.8.8.8", 53), timeout=2)
+            _, writer = await asyncio.wait_for(asyncio.open_connection("8.8.8.8", 53), timeout=2)
+            writer.close()
             return "Connected"
-        except OSError:
+        except (OSError, asyncio.TimeoutError):
             return "Disconnected"
     
     async def _get_ollama_status(self) -> tuple[str, int, list]:
@@ -589,51 +962,23 @@ class OpenCodeApp(App):
             return f"Error: {e}", 0, []
     
     async def _get_gpu_status(self) -> list:
-        """Get GPU status using nvidia-smi.
+        """Get GPU status from the background telemetry sampler.
         
         Returns:
             List of GPU info strings
         """
         try:
-            import shutil
-            import subprocess
-            
-            # Check if nvidia-smi is available
-            if not shutil.which("nvidia-smi"):
-                return []
-            
-            # Run nvidia-smi to get GPU info
-            result = subprocess.run(
-                ["nvidia-smi", "--query-gpu=index,name,memory.total,memory.used,memory.free,utilization.gpu",
-                 "--format=csv,noheader,nounits"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode != 0:
-                return []
+            sample = await self._get_telemetry()
             
             gpu_list = []
-            for line in result.stdout.strip().split('\n'):
-                if not line.strip():
-                    continue
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) >= 6:
-                    index = parts[0]
-                    name = parts[1]
-                    total_mb = int(parts[2])
-                    used_mb = int(parts[3])
-                    free_mb = int(parts[4])
-                    util = int(parts[5])
-                    
-                    total_gb = total_mb / 1024
-                    used_gb = used_mb / 1024
-                    free_gb = free_mb / 1024
-                    
-                    gpu_list.append(f"[{index}] {name}")
-                    gpu_list.append(f"    {used_gb:.1f}GB / {total_gb:.1f}GB ({util}%)")
-                    gpu_list.append(f"    Free: {free_gb:.1f}GB")
+            for gpu in sample.vram.gpus:
+                total_gb = gpu.total_memory_mb / 1024
+                used_gb = gpu.used_memory_mb / 1024
+                free_gb = gpu.free_memory_mb / 1024
+                
+                gpu_list.append(f"[{gpu.index}] {gpu.name}")
+                gpu_list.append(f"    {used_gb:.1f}GB / {total_gb:.1f}GB ({gpu.utilization_percent:.0f}%)")
+                gpu_list.append(f"    Free: {free_gb:.1f}GB")
             
             return gpu_list
         except Exception:
@@ -698,13 +1043,20 @@ class OpenCodeApp(App):
             self.current_session_id = session.id
     
     async def _load_session_messages(self, session_id: str) -> None:
-        """Load messages from a session into the chat."""
+        """Load the newest messages of a session into the chat.
+        
+        Older messages are paged in from the session store as the chat is
+        scrolled up.
+        """
         chat = self.query_one("#chat", ChatContainer)
-        chat.clear_messages()
         
-        messages = await self.session_manager.get_messages(session_id)
-        for msg in messages:
-            chat.add_message(msg.role, msg.content)
+        async def load_page(before: Optional[int]) -> tuple[list, int]:
+            return await self.session_manager.get_messages_page(
+                session_id, limit=chat.PAGE_SIZE, before=before
+            )
+        
+        messages, offset = await load_page(None)
+        chat.load_history(messages, offset, loader=load_page)
     
     async def on_input_submitted(self, _event) -> None:
         """Handle input submission (deprecated - kept for compatibility)."""
@@ -784,8 +1136,9 @@ class OpenCodeApp(App):
         self.is_processing = True
         chat = self.query_one("#chat", ChatContainer)
         
-        # Create placeholder for response
-        response_widget = chat.add_message("assistant", "Thinking...")
+        # Create placeholder for response; streamed text replaces it
+        response_widget = chat.add_streaming_message("assistant", placeholder="Thinking...")
+        stream = StreamThrottle(response_widget.append_text, fps=self.STREAM_FPS)
         
         # Create a cancellation scope for this processing
         self._cancelled = False
@@ -830,7 +1183,9 @@ class OpenCodeApp(App):
                 
                 # Stream response using the provider's complete() method
                 # Note: complete() is an async generator, so we don't await it
-                full_response = ""
+                # Deltas are collected in a list and rendered at most once per frame
+                response_parts: list[str] = []
+                response_length = 0
                 chunk_count = 0
                 
                 # Get the async iterator from the provider
@@ -846,19 +1201,25 @@ class OpenCodeApp(App):
                     # Check for cancellation during streaming
                     if self._cancelled:
                         logger.info("Processing cancelled during streaming")
-                        response_widget.message_content = full_response + "\n\n[Cancelled]"
+                        stream.feed("\n\n[Cancelled]")
+                        stream.close()
                         return
                     
                     chunk_count += 1
                     if chunk.delta:
-                        full_response += chunk.delta
-                        # Update the reactive property - this triggers watch_message_content
-                        response_widget.message_content = full_response
+                        response_parts.append(chunk.delta)
+                        response_length += len(chunk.delta)
+                        stream.feed(chunk.delta)
                         # Log every 10 chunks for debugging
                         if chunk_count % 10 == 0:
-                            logger.debug(f"Received {chunk_count} chunks, {len(full_response)} chars")
+                            logger.debug(f"Received {chunk_count} chunks, {response_length} chars")
                 
-                logger.info(f"Streaming complete: {chunk_count} chunks, response length: {len(full_response)}")
+                stream.close()
+                full_response = "".join(response_parts)
+                logger.info(
+                    f"Streaming complete: {chunk_count} chunks, {stream.flush_count} renders, "
+                    f"response length: {len(full_response)}"
+                )
                 
                 # Check for cancellation before saving
                 if self._cancelled:
@@ -876,11 +1237,13 @@ class OpenCodeApp(App):
             
             except asyncio.CancelledError:
                 logger.info("Processing task was cancelled")
+                stream.close()
                 response_widget.message_content = "[Cancelled]"
                 raise
             
             except Exception as e:
                 logger.exception(f"Error processing message: {e}")
+                stream.close()
                 response_widget.message_content = f"Error: {e}"
                 response_widget.add_class("error")
         
@@ -894,6 +1257,7 @@ class OpenCodeApp(App):
         finally:
             self._streaming_task = None
             self.is_processing = False
+            chat.end_streaming(response_widget)
     
     def action_new_session(self) -> None:
         """Create a new session."""
@@ -0,0 +1,417 @@
+"""
+Fuzzy Matching
+
+fzf-style fuzzy matching for completion lists.
+
+A query matches a candidate when all of its characters appear in order,
+case-insensitively. Matches are scored like fzf: every matched character
+earns points, characters at the start of a word (after a path separator,
+a delimiter, or a camelCase hump) earn a bonus, consecutive runs are
+rewarded and gaps are penalized.
+
+Candidates are encoded once into padded byte matrices, grouped by
+length, with a bitmask of the characters each one contains. A keystroke
+is then a mask test followed by a handful of vectorized passes over the
+remaining rows instead of a Python loop per candidate. When the query
+extends the previous one, only the previous survivors are rescanned.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+
+# Bonus for matching the first character of a path component
+BONUS_SEPARATOR = 9
+# Bonus for matching after whitespace or a delimiter such as "_" or "."
+BONUS_BOUNDARY = 8
+# Bonus for matching an uppercase letter after a lowercase one, or a
+# digit after a letter
+BONUS_CAMEL = 7
+# Minimum bonus for each character continuing a consecutive run
+BONUS_CONSECUTIVE = -(SCORE_GAP_START + SCORE_GAP_EXTENSION)
+# The first query character's bonus counts this many times
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+
+# Candidates are grouped into matrices no wider than these lengths
+BUCKET_WIDTHS = (16, 32, 48, 64, 96, 128, 192, 256, 512, 1024)
+
+# Non-ASCII characters are folded into the upper half of the byte range,
+# so distinct non-ASCII characters may occasionally compare equal
+_ASCII = 128
+
+_CLASS_WHITE, _CLASS_SEPARATOR, _CLASS_DELIMITER, _CLASS_LOWER, _CLASS_UPPER, _CLASS_DIGIT = range(6)
+
+
+@dataclass
+class FuzzyMatch:
+    """A scored match."""
+    index: int  # Position in the candidate list
+    text: str
+    score: int
+
+
+class _Bucket:
+    """Candidates of similar length, encoded as matrices."""
+
+    def __init__(self, indices: np.ndarray, texts: List[str], width: int):
+        self.indices = indices
+        self.lengths = np.array([len(t) for t in texts], dtype=np.int32)
+        self.width = width
+        self.chars = _encode([t.lower() for t in texts], width)
+        self.masks = _char_masks(self.chars)
+        # Flattened, so per-row lookups are a single take()
+        self.bonus = _bonus_matrix(_code_points(texts, width)).ravel()
+        self._bitsets: Dict[int, np.ndarray] = {}
+
+    def bitset(self, code: int) -> np.ndarray:
+        """Get the (rows, words) bitsets of where a character occurs, cached."""
+        bits = self._bitsets.get(code)
+        if bits is None:
+            bits = self._bitsets[code] = _pack(self.chars == code)
+        return bits
+
+
+def _code_points(texts: List[str], width: int) -> np.ndarray:
+    """Get a zero padded (len(texts), width) code point matrix."""
+    return np.array(texts, dtype=f"<U{width}").view(np.uint32).reshape(len(texts), width)
+
+
+def _fold(codes: np.ndarray) -> np.ndarray:
+    return np.where(codes < _ASCII, codes, _ASCII + codes % (256 - _ASCII)).astype(np.uint8)
+
+
+def _encode(texts: List[str], width: int) -> np.ndarray:
+    """Encode strings into a zero padded (len(texts), width) byte matrix."""
+    return _fold(_code_points(texts, width))
+
+
+def _char_masks(chars: np.ndarray) -> np.ndarray:
+    """Get a 64-bit mask per row with a bit set for each character present."""
+    bits = np.left_shift(np.uint64(1), (chars % 63 + 1).astype(np.uint64))
+    bits[chars == 0] = 0
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def _char_classes(codes: np.ndarray) -> np.ndarray:
+    classes = np.full(codes.shape, _CLASS_LOWER, dtype=np.int8)
+    classes[(codes >= ord("A")) & (codes <= ord("Z"))] = _CLASS_UPPER
+    classes[(codes >= ord("0")) & (codes <= ord("9"))] = _CLASS_DIGIT
+    classes[np.isin(codes, [ord(c) for c in "_-.,:;|"])] = _CLASS_DELIMITER
+    classes[np.isin(codes, [ord("/"), ord("\\")])] = _CLASS_SEPARATOR
+    classes[np.isin(codes, [0, ord(" "), ord("\t")])] = _CLASS_WHITE
+    return classes
+
+
+def _bonus_matrix(codes: np.ndarray) -> np.ndarray:
+    """Compute the bonus earned by matching each character."""
+    current = _char_classes(codes)
+    previous = np.empty_like(current)
+    previous[:, 0] = _CLASS_SEPARATOR
+    previous[:, 1:] = current[:, :-1]
+
+    word = current >= _CLASS_LOWER
+    bonus = np.zeros(codes.shape, dtype=np.int16)
+    bonus[word & (previous == _CLASS_SEPARATOR)] = BONUS_SEPARATOR
+    bonus[word & ((previous == _CLASS_WHITE) | (previous == _CLASS_DELIMITER))] = BONUS_BOUNDARY
+    bonus[(current == _CLASS_UPPER) & (previous == _CLASS_LOWER)] = BONUS_CAMEL
+    bonus[(current == _CLASS_DIGIT) & ((previous == _CLASS_LOWER) | (previous == _CLASS_UPPER))] = BONUS_CAMEL
+    return bonus
+
+
+def _pack(hits: np.ndarray) -> np.ndarray:
+    """Pack a boolean matrix into rows of little-endian uint64 bitsets."""
+    packed = np.packbits(hits, axis=1, bitorder="little")
+    words = -(-packed.shape[1] // 8)
+    if packed.shape[1] != words * 8:
+        padded = np.zeros((len(packed), words * 8), dtype=np.uint8)
+        padded[:, :packed.shape[1]] = packed
+        packed = padded
+    return packed.view(np.uint64)
+
+
+_ONE = np.uint64(1)
+_ALL = ~np.uint64(0)
+
+# Multiplying an isolated bit by this de Bruijn constant leaves a unique
+# pattern in the top six bits, which maps back to the bit index
+_DE_BRUIJN = np.uint64(0x03F79D71B4CB0A89)
+_DE_BRUIJN_INDEX = np.zeros(64, dtype=np.int64)
+for _bit in range(64):
+    _DE_BRUIJN_INDEX[((1 << _bit) * 0x03F79D71B4CB0A89 % 2**64) >> 58] = _bit
+
+
+def _lowest_bit(value: np.ndarray) -> np.ndarray:
+    """Index of the lowest set bit of each nonzero value."""
+    lowest = value & (~value + _ONE)
+    return _DE_BRUIJN_INDEX[(lowest * _DE_BRUIJN) >> np.uint64(58)]
+
+
+def _highest_bit(value: np.ndarray) -> np.ndarray:
+    """Index of the highest set bit of each nonzero value."""
+    # Rounding to float may carry into the next power of two; undo that
+    bit = np.minimum(np.frexp(value.astype(np.float64))[1] - 1, 63)
+    return bit - ((_ONE << bit.astype(np.uint64)) > value)
+
+
+def _shift(amount: np.ndarray) -> np.ndarray:
+    # numpy defines shifts of 64 or more as producing zero
+    return np.maximum(amount, 0).astype(np.uint64)
+
+
+def _first_after(bits: np.ndarray, position: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the first set bit after a position in each row.
+
+    Args:
+        bits: (rows, words) uint64 bitsets
+        position: Bits at or before this index are ignored (None for none)
+
+    Returns:
+        (found, index) for each row
+    """
+    if bits.shape[1] == 1:
+        value = bits[:, 0]
+        if position is not None:
+            value = value & (_ALL << _shift(position + 1))
+        return value != 0, _lowest_bit(value)
+
+    found = np.zeros(len(bits), dtype=bool)
+    index = np.zeros(len(bits), dtype=np.int64)
+    for word in range(bits.shape[1]):
+        value = bits[:, word]
+        if position is not None:
+            value = value & (_ALL << _shift(position + 1 - 64 * word))
+        hit = (value != 0) & ~found
+        index[hit] = 64 * word + _lowest_bit(value[hit])
+        found |= hit
+    return found, index
+
+
+def _last_before(bits: np.ndarray, position: np.ndarray) -> np.ndarray:
+    """
+    Find the last set bit before a position in each row.
+
+    Args:
+        bits: (rows, words) uint64 bitsets
+        position: Bits at or after this index are ignored
+
+    Returns:
+        Index for each row; only meaningful where such a bit exists
+    """
+    if bits.shape[1] == 1:
+        return _highest_bit(bits[:, 0] & ~(_ALL << _shift(position)))
+
+    found = np.zeros(len(bits), dtype=bool)
+    index = np.zeros(len(bits), dtype=np.int64)
+    for word in reversed(range(bits.shape[1])):
+        value = bits[:, word] & ~(_ALL << _shift(position - 64 * word))
+        hit = (value != 0) & ~found
+        index[hit] = 64 * word + _highest_bit(value[hit])
+        found |= hit
+    return index
+
+
+def _forward(bucket: _Bucket, rows: Optional[np.ndarray], query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the leftmost match of the query in each row.
+
+    Rows are dropped as soon as a character fails to match, so later
+    characters only touch live rows.
+
+    Args:
+        bucket: Bucket to search
+        rows: Rows to consider, or None for all of them
+        query: Encoded query
+
+    Returns:
+        (rows, end): the matching rows and the position of the last query
+        character in each one's leftmost match
+    """
+    position = None
+    for code in query:
+        bits = bucket.bitset(int(code))
+        found, position = _first_after(bits if rows is None else bits.take(rows, axis=0), position)
+        if not found.all():
+            rows = np.flatnonzero(found) if rows is None else rows.compress(found)
+            position = position.compress(found)
+            if len(rows) == 0:
+                break
+    if rows is None:
+        rows = np.arange(len(bucket.chars))
+    return rows, position
+
+
+def _backward(bucket: _Bucket, rows: np.ndarray, query: np.ndarray, end: np.ndarray) -> List[np.ndarray]:
+    """
+    Match the query right to left from a known end position.
+
+    This yields the shortest match window ending at ``end``.
+
+    Returns:
+        Positions of each query character, in query order
+    """
+    positions = [end]
+    for code in query[-2::-1]:
+        positions.append(_last_before(bucket.bitset(int(code)).take(rows, axis=0), positions[-1]))
+    positions.reverse()
+    return positions
+
+
+def _score(bucket: _Bucket, rows: np.ndarray, positions: List[np.ndarray]) -> np.ndarray:
+    """
+    Score matches at the given positions.
+
+    As in fzf, each character of a consecutive run earns at least the
+    bonus of the character that started the run.
+    """
+    offsets = rows * bucket.width
+    score = np.zeros(len(rows), dtype=np.int64)
+    previous: Optional[np.ndarray] = None
+    run_bonus: Optional[np.ndarray] = None
+    for position in positions:
+        char_bonus = bucket.bonus.take(offsets + position).astype(np.int64)
+        if previous is None:
+            run_bonus = char_bonus
+            score += SCORE_MATCH + char_bonus * BONUS_FIRST_CHAR_MULTIPLIER
+        else:
+            gap = position - previous - 1
+            consecutive = gap == 0
+            run_bonus = np.where(consecutive & (char_bonus < BONUS_BOUNDARY), run_bonus, char_bonus)
+            run_best = np.maximum(np.maximum(char_bonus, run_bonus), BONUS_CONSECUTIVE)
+            char_bonus = np.where(consecutive, run_best, char_bonus)
+            score += SCORE_MATCH + char_bonus
+            score += np.where(consecutive, 0, SCORE_GAP_START + SCORE_GAP_EXTENSION * (gap - 1))
+        previous = position
+    return score
+
+
+class FuzzyMatcher:
+    """
+    Fuzzy matcher over a fixed list of candidates.
+
+    Build one per candidate list and keep it while the list is unchanged;
+    successive queries that extend each other (as when typing) only
+    rescan the candidates that matched the previous query.
+
+    Example:
+        matcher = FuzzyMatcher(["src/app.py", "tests/test_app.py"])
+        for match in matcher.match("tap", limit=10):
+            print(match.score, match.text)
+    """
+
+    def __init__(self, candidates: Sequence[str]):
+        self.candidates = list(candidates)
+        self._buckets: List[_Bucket] = []
+        self._last_query: Optional[str] = None
+        self._survivors: List[Optional[np.ndarray]] = []
+
+        if not self.candidates:
+            return
+
+        lengths = np.array([len(c) for c in self.candidates], dtype=np.int64)
+        order = np.argsort(lengths, kind="stable")
+        sorted_lengths = lengths[order]
+        start = 0
+        while start < len(order):
+            longest = int(sorted_lengths[start])
+            width = next((w for w in BUCKET_WIDTHS if w >= longest), max(longest, 1))
+            end = int(np.searchsorted(sorted_lengths, width, side="right"))
+            indices = order[start:end]
+            self._buckets.append(_Bucket(indices, [self.candidates[i] for i in indices], max(width, 1)))
+            start = end
+        self._survivors = [None] * len(self._buckets)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def match(self, query: str, limit: Optional[int] = None) -> List[FuzzyMatch]:
+        """
+        Find the best matches for a query.
+
+        Args:
+            query: Text typed by the user; an empty query matches everything
+            limit: Maximum number of matches to return
+
+        Returns:
+            Matches, best first; ties go to shorter candidates, then to
+            earlier ones
+        """
+        if not query:
+            chosen = self.candidates if limit is None else self.candidates[:limit]
+            return [FuzzyMatch(index=i, text=text, score=0) for i, text in enumerate(chosen)]
+
+        lowered = query.lower()
+        narrowing = self._last_query is not None and lowered.startswith(self._last_query)
+        codes = _fold(np.array([ord(c) for c in lowered], dtype=np.uint32))
+        query_mask = _char_masks(codes[None, :])[0]
+
+        best: List[Tuple[int, int, int, int]] = []
+        survivors: List[Optional[np.ndarray]] = []
+        for bucket, previous in zip(self._buckets, self._survivors):
+            rows = previous if narrowing else None
+            if rows is not None and len(rows) == 0:
+                survivors.append(rows)
+                continue
+            if len(codes) > bucket.chars.shape[1]:
+                survivors.append(np.empty(0, dtype=np.int64))
+                continue
+
+            # Rows lacking any query character cannot match
+            masks = bucket.masks if rows is None else bucket.masks[rows]
+            keep = (masks & query_mask) == query_mask
+            if rows is not None:
+                rows = rows[keep]
+            elif not keep.all():
+                rows = np.flatnonzero(keep)
+
+            rows, end = _forward(bucket, rows, codes)
+            survivors.append(rows)
+            if len(rows) == 0:
+                continue
+
+            positions = _backward(bucket, rows, codes, end)
+            scores = _score(bucket, rows, positions)
+
+            if limit is not None and len(rows) > limit:
+                # Rank by score, then shorter, then earlier, in one key
+                lengths = np.minimum(bucket.lengths[rows], 0xFFFFF).astype(np.int64)
+                key = (scores << 40) - (lengths << 20) - np.minimum(bucket.indices[rows], 0xFFFFF)
+                top = np.argpartition(-key, limit - 1)[:limit]
+            else:
+                top = np.arange(len(rows))
+            for j in top:
+                row = int(rows[j])
+                best.append((int(scores[j]), -int(bucket.lengths[row]), -int(bucket.indices[row]), row))
+
+        self._last_query = lowered
+        self._survivors = survivors
+
+        # Merge the per-bucket winners
+        ranked = heapq.nlargest(limit, best) if limit is not None else sorted(best, reverse=True)
+        return [
+            FuzzyMatch(index=-index, text=self.candidates[-index], score=score)
+            for score, _, index, _ in ranked
+        ]
+
+
+def fuzzy_filter(query: str, candidates: Sequence[str], limit: Optional[int] = None) -> List[FuzzyMatch]:
+    """
+    One-off fuzzy match over a small list.
+
+    Args:
+        query: Text typed by the user
+        candidates: Strings to match
+        limit: Maximum number of matches to return
+
+    Returns:
+        Matches, best first
+    """
+    return FuzzyMatcher(candidates).match(query, limit)
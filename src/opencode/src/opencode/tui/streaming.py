@@ -0,0 +1,121 @@
+"""
+Streaming Render Pipeline
+
+Coalesces streamed response deltas into frame-rate limited UI updates.
+
+Providers can emit hundreds of small deltas per second. Re-rendering a
+message for each one makes long answers quadratic: the whole text is
+rebuilt and re-laid out per chunk. StreamThrottle buffers deltas in a
+list and hands them to the widget at most once per frame, and
+split_settled() lets the widget freeze finished lines so only the tail
+of the message is laid out again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable, List, Optional, Tuple
+
+DEFAULT_FPS = 30.0
+
+
+def split_settled(text: str, block_lines: int) -> Tuple[str, str]:
+    """
+    Split text into a settled head and a live tail.
+
+    Nothing settles until the text spans ``2 * block_lines`` lines; then
+    the head takes everything but the last ``block_lines`` lines, so
+    settled blocks always hold at least ``block_lines`` lines and the tail
+    never grows past twice that.
+
+    Args:
+        text: Text rendered so far
+        block_lines: Lines kept in the tail after settling
+
+    Returns:
+        Tuple of (settled, tail)
+    """
+    if text.count("\n") < 2 * block_lines:
+        return "", text
+
+    cut = len(text)
+    for _ in range(block_lines):
+        cut = text.rfind("\n", 0, cut)
+    return text[:cut + 1], text[cut + 1:]
+
+
+class StreamThrottle:
+    """
+    Buffers streamed text and flushes it at a bounded frame rate.
+
+    feed() only appends to a list; the callback receives the text
+    accumulated since the previous flush, at most once per frame.
+
+    Example:
+        throttle = StreamThrottle(widget.append_text, fps=30)
+        async for chunk in stream:
+            throttle.feed(chunk.delta)
+        throttle.close()
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[str], None],
+        fps: float = DEFAULT_FPS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the throttle.
+
+        Args:
+            flush: Called with the pending text once per frame
+            fps: Maximum flushes per second
+            clock: Monotonic clock in seconds
+        """
+        self._flush = flush
+        self.frame_interval = 1.0 / fps if fps > 0 else 0.0
+        self._clock = clock
+        self._pending: List[str] = []
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._last_flush = float("-inf")
+        self.flush_count = 0
+
+    @property
+    def pending(self) -> bool:
+        """Whether text is waiting for the next frame."""
+        return bool(self._pending)
+
+    def feed(self, delta: str) -> None:
+        """Buffer a delta and schedule a flush for the next frame."""
+        if not delta:
+            return
+        self._pending.append(delta)
+        if self._handle is not None:
+            return
+
+        delay = self._last_flush + self.frame_interval - self._clock()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._handle = loop.call_later(max(delay, 0.0), self.flush)
+
+    def flush(self) -> None:
+        """Deliver pending text now."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._pending:
+            return
+
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._last_flush = self._clock()
+        self.flush_count += 1
+        self._flush(text)
+
+    def close(self) -> None:
+        """Flush remaining text and stop scheduling."""
+        self.flush()
@@ -0,0 +1,98 @@
+"""
+Transcript Virtualization
+
+Bookkeeping for a chat transcript that only keeps widgets for the
+messages in view.
+
+Each message is a TranscriptEntry holding its text and the heights it
+was laid out at, per container width. Messages that have never been
+shown at a width get an estimate from their line lengths. Prefix sums of
+the heights map a scroll offset to the range of entries to materialize.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+# Rows and columns a message widget adds around its text: border and
+# padding on each side, plus the role label and the blank line below it
+CHROME_ROWS = 6
+CHROME_COLUMNS = 6
+
+
+def estimate_height(text: str, width: int) -> int:
+    """
+    Estimate the rendered height of a message at a container width.
+
+    Args:
+        text: Message text
+        width: Container width in cells
+
+    Returns:
+        Estimated height in rows
+    """
+    columns = max(width - CHROME_COLUMNS, 1)
+    rows = 0
+    for line in text.split("\n"):
+        rows += max(-(-len(line) // columns), 1)
+    return rows + CHROME_ROWS
+
+
+@dataclass
+class TranscriptEntry:
+    """A message in the transcript, whether or not it has a widget."""
+    role: str
+    text: str
+    classes: Set[str] = field(default_factory=set)
+    # Measured heights by container width; the layout cache
+    heights: Dict[int, int] = field(default_factory=dict)
+    widget: Optional[Any] = None
+    _estimate: Tuple[int, int] = (-1, 0)
+
+    def height(self, width: int) -> int:
+        """Height at a width: measured if known, otherwise estimated."""
+        measured = self.heights.get(width)
+        if measured is not None:
+            return measured
+        if self._estimate[0] != width:
+            self._estimate = (width, estimate_height(self.text, width))
+        return self._estimate[1]
+
+    def set_text(self, text: str) -> None:
+        """Replace the text, dropping layouts measured for the old text."""
+        if text != self.text:
+            self.text = text
+            self.heights.clear()
+            self._estimate = (-1, 0)
+
+
+def prefix_heights(entries: Sequence[TranscriptEntry], width: int) -> List[int]:
+    """Offsets of each entry's top edge, followed by the total height."""
+    offsets = [0]
+    for entry in entries:
+        offsets.append(offsets[-1] + entry.height(width))
+    return offsets
+
+
+def visible_range(offsets: Sequence[int], top: float, height: int, overscan: int) -> Tuple[int, int]:
+    """
+    Find the entries overlapping a viewport, plus overscan rows either side.
+
+    Args:
+        offsets: Result of prefix_heights()
+        top: Scroll offset of the viewport
+        height: Viewport height in rows
+        overscan: Extra rows to include above and below
+
+    Returns:
+        Half-open range (start, end) of entry indexes
+    """
+    count = len(offsets) - 1
+    if count <= 0:
+        return 0, 0
+    start = bisect.bisect_right(offsets, top - overscan) - 1
+    end = bisect.bisect_left(offsets, top + height + overscan)
+    start = min(max(start, 0), count - 1)
+    return start, min(max(end, start + 1), count)
@@ -7,13 +7,17 @@ Provides auto-completion for paths, commands, and mentions in the TUI.
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
+import heapq
 import logging
 import re
+import threading
 
 from textual.widget import Widget
 from textual.message import Message
 from textual.reactive import reactive
 
+from opencode.tui.fuzzy import FuzzyMatcher, fuzzy_filter
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,11 +30,14 @@ class CompletionItem:
     category: str = "general"
     priority: int = 0
     insert_text: Optional[str] = None  # Text to insert (if different from display)
+    score: int = 0  # Fuzzy match score
     
     def __lt__(self, other: "CompletionItem") -> bool:
-        # Higher priority first, then alphabetically
+        # Higher priority first, then better match, then alphabetically
         if self.priority != other.priority:
             return self.priority > other.priority
+        if self.score != other.score:
+            return self.score > other.score
         return self.display.lower() < other.display.lower()
 
 
@@ -131,16 +138,18 @@ class PathCompletionProvider(CompletionProvider):
         completions = []
         try:
             if search_dir.exists() and search_dir.is_dir():
-                for item in search_dir.iterdir():
-                    if item.name.startswith(prefix):
-                        is_dir = item.is_dir()
-                        completions.append(CompletionItem(
-                            text=str(item.relative_to(workspace)) if not str(item).startswith("/") else str(item),
-                            display=item.name + ("/" if is_dir else ""),
-                            description="directory" if is_dir else "file",
-                            category="path",
-                            priority=10 if is_dir else 5,
-                        ))
+                items = list(search_dir.iterdir())
+                for match in fuzzy_filter(prefix, [item.name for item in items]):
+                    item = items[match.index]
+                    is_dir = item.is_dir()
+                    completions.append(CompletionItem(
+                        text=str(item.relative_to(workspace)) if not str(item).startswith("/") else str(item),
+                        display=item.name + ("/" if is_dir else ""),
+                        description="directory" if is_dir else "file",
+                        category="path",
+                        priority=10 if is_dir else 5,
+                        score=match.score,
+                    ))
         except PermissionError:
             pass
         
@@ -178,10 +187,18 @@ class CommandCompletionProvider(CompletionProvider):
     
     def __init__(self, commands: Optional[Dict[str, Any]] = None):
         self.commands = commands or {}
+        self._matcher: Optional[FuzzyMatcher] = None
     
     def get_trigger_chars(self) -> List[str]:
         return ["/"]
     
+    def _get_matcher(self) -> FuzzyMatcher:
+        """Get a matcher over the command names, rebuilt when they change."""
+        names = list(self.commands)
+        if self._matcher is None or self._matcher.candidates != names:
+            self._matcher = FuzzyMatcher(names)
+        return self._matcher
+    
     def get_completions(
         self,
         text: str,
@@ -204,15 +221,16 @@ class CommandCompletionProvider(CompletionProvider):
         prefix = match.group(1)
         
         completions = []
-        for cmd, info in self.commands.items():
-            if cmd.startswith(prefix):
-                completions.append(CompletionItem(
-                    text=f"/{cmd}",
-                    display=f"/{cmd}",
-                    description=info.get("description", ""),
-                    category="command",
-                    priority=10,
-                ))
+        for hit in self._get_matcher().match(prefix):
+            info = self.commands[hit.text]
+            completions.append(CompletionItem(
+                text=f"/{hit.text}",
+                display=f"/{hit.text}",
+                description=info.get("description", ""),
+                category="command",
+                priority=10,
+                score=hit.score,
+            ))
         
         return sorted(completions)
 
@@ -220,6 +238,12 @@ class CommandCompletionProvider(CompletionProvider):
 class MentionCompletionProvider(CompletionProvider):
     """
     Provides @mention completions for files, people, etc.
+    
+    Path mentions are ranked over the shared workspace FileIndex. Walking
+    the workspace and building the matchers happens on a background
+    thread; until it finishes, completions come from the previous
+    matchers (or are empty on first use), so keystrokes never wait for
+    the tree walk.
     """
     
     @property
@@ -229,10 +253,38 @@ class MentionCompletionProvider(CompletionProvider):
     def __init__(self, workspace_root: Optional[str] = None):
         self.workspace_root = Path(workspace_root) if workspace_root else None
         self._file_cache: List[str] = []
+        # Matchers keyed by mention type, with the index state they were built from
+        self._matchers: Dict[str, Tuple[Any, int, FuzzyMatcher, int]] = {}
+        self._build_lock = threading.Lock()
+        self._build_thread: Optional[threading.Thread] = None
+        # Next (workspace, refresh) to build, taken by the build thread
+        self._pending_build: Optional[Tuple[Path, bool]] = None
     
     def get_trigger_chars(self) -> List[str]:
         return ["@"]
     
+    def _get_path_matcher(self, index: Any, mention_type: str) -> Tuple[FuzzyMatcher, int]:
+        """
+        Get a matcher over the indexed paths for a mention type.
+        
+        The matcher is rebuilt only when the index changes, so successive
+        keystrokes narrow the previous results instead of starting over.
+        
+        Returns:
+            (matcher, first_dir) where candidates from first_dir on are directories
+        """
+        cached = self._matchers.get(mention_type)
+        if cached is not None and cached[0] is index and cached[1] == index.generation:
+            return cached[2], cached[3]
+        
+        # Read the generation first, so a concurrent change forces a rebuild
+        generation = index.generation
+        files = index.files if mention_type == "file" else []
+        candidates = files + index.dirs
+        matcher = FuzzyMatcher(candidates)
+        self._matchers[mention_type] = (index, generation, matcher, len(files))
+        return matcher, len(files)
+    
     def get_completions(
         self,
         text: str,
@@ -276,26 +328,29 @@ class MentionCompletionProvider(CompletionProvider):
         workspace = Path(context.get("workspace_root", self.workspace_root or "."))
         
         completions = []
-        prefix_lower = prefix.lower()
         
-        # Search for matching files
+        # Rank the shared workspace index instead of walking the tree
         try:
-            for file_path in workspace.rglob("*"):
-                if prefix_lower in str(file_path.relative_to(workspace)).lower():
-                    is_dir = file_path.is_dir()
-                    if mention_type == "dir" and not is_dir:
-                        continue
-                    
-                    completions.append(CompletionItem(
-                        text=f"@{mention_type}:{file_path.relative_to(workspace)}",
-                        display=f"@{mention_type}:{file_path.relative_to(workspace)}",
-                        description="directory" if is_dir else "file",
-                        category="mention",
-                        priority=5,
-                    ))
-                    
-                    if len(completions) >= 20:
-                        break
+            from opencode.tool.file_index import get_file_index
+            
+            index = get_file_index(workspace)
+            cached = self._matchers.get(mention_type)
+            if cached is None or cached[0] is not index or cached[1] != index.generation or index.needs_build:
+                self.build_in_background(workspace)
+            if cached is None or cached[0] is not index:
+                return completions
+            
+            matcher, first_dir = cached[2], cached[3]
+            for match in matcher.match(prefix, limit=20):
+                is_dir = match.index >= first_dir
+                completions.append(CompletionItem(
+                    text=f"@{mention_type}:{match.text}",
+                    display=f"@{mention_type}:{match.text}",
+                    description="directory" if is_dir else "file",
+                    category="mention",
+                    priority=5,
+                    score=match.score,
+                ))
         except Exception:
             pass
         
@@ -311,28 +366,87 @@ class MentionCompletionProvider(CompletionProvider):
         people = context.get("people", [])
         
         completions = []
-        prefix_lower = prefix.lower()
         
-        for person in people:
-            if prefix_lower in person.lower():
-                completions.append(CompletionItem(
-                    text=f"@{person}",
-                    display=f"@{person}",
-                    description="person",
-                    category="mention",
-                    priority=5,
-                ))
+        for match in fuzzy_filter(prefix, people):
+            completions.append(CompletionItem(
+                text=f"@{match.text}",
+                display=f"@{match.text}",
+                description="person",
+                category="mention",
+                priority=5,
+                score=match.score,
+            ))
         
         return completions
     
-    def refresh_file_cache(self, workspace: Path) -> None:
-        """Refresh the file cache for faster completions."""
-        self._file_cache = []
-        try:
-            for file_path in workspace.rglob("*"):
-                self._file_cache.append(str(file_path.relative_to(workspace)))
-        except Exception:
-            pass
+    def refresh_file_cache(self, workspace: Path) -> threading.Thread:
+        """
+        Re-walk the workspace and rebuild the matchers in the background.
+        
+        Returns:
+            The build thread
+        """
+        return self.build_in_background(workspace, refresh=True)
+    
+    def build_in_background(self, workspace: Path, refresh: bool = False) -> threading.Thread:
+        """
+        Build the index and path matchers for a workspace off the calling thread.
+        
+        Requests made while a build runs are coalesced into one follow-up
+        build.
+        
+        Args:
+            workspace: Workspace root
+            refresh: Re-walk the tree even if the index is current
+        
+        Returns:
+            The build thread
+        """
+        with self._build_lock:
+            if self._pending_build is not None:
+                refresh = refresh or self._pending_build[1]
+            self._pending_build = (Path(workspace), refresh)
+            if self._build_thread is None:
+                self._build_thread = threading.Thread(
+                    target=self._run_builds, name="mention-index", daemon=True
+                )
+                self._build_thread.start()
+            return self._build_thread
+    
+    def wait_for_index(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a background build to finish.
+        
+        Returns:
+            True if no build is running afterwards
+        """
+        thread = self._build_thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+    
+    def _run_builds(self) -> None:
+        """Build thread: run requested builds until none is pending."""
+        from opencode.tool.file_index import get_file_index
+        
+        while True:
+            with self._build_lock:
+                if self._pending_build is None:
+                    self._build_thread = None
+                    return
+                workspace, refresh = self._pending_build
+                self._pending_build = None
+            
+            try:
+                index = get_file_index(workspace)
+                if refresh:
+                    index.refresh()
+                    self._file_cache = sorted(index.files + index.dirs)
+                for mention_type in ("file", "dir"):
+                    self._get_path_matcher(index, mention_type)
+            except Exception as e:
+                logger.debug(f"Failed to index {workspace} for mentions: {e}")
 
 
 class CompletionManager:
@@ -379,25 +493,28 @@ class CompletionManager:
         Returns:
             Combined and sorted list of completions
         """
-        all_completions = []
+        ranked_lists = []
         
         for provider in self._providers:
             try:
                 completions = provider.get_completions(text, cursor_position, context)
-                all_completions.extend(completions)
+                # Providers normally return sorted lists, making this linear
+                ranked_lists.append(sorted(completions))
             except Exception as e:
                 logger.error(f"Completion provider {provider.name} error: {e}")
         
-        # Sort and deduplicate
+        # Merge lazily and deduplicate, stopping at the limit
         seen = set()
         unique_completions = []
         
-        for item in sorted(all_completions):
+        for item in heapq.merge(*ranked_lists):
             if item.text not in seen:
                 seen.add(item.text)
                 unique_completions.append(item)
+                if len(unique_completions) == 50:  # Limit to 50 items
+                    break
         
-        return unique_completions[:50]  # Limit to 50 items
+        return unique_completions
     
     def should_trigger(self, char: str) -> bool:
         """Check if a character should trigger completions."""
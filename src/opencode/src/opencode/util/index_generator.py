@@ -13,22 +13,67 @@ The index includes:
 - Test file locations
 - Database schema references
 - Git commit hash for staleness detection
+
+All collectors are fed from a single ``os.scandir`` walk. The listing of
+every directory is kept in a manifest keyed by directory mtime and
+persisted between runs, so regenerating an index only re-lists the
+subtrees that changed since the last scan.
 """
 
 from __future__ import annotations
 
+import fnmatch
+import hashlib
 import json
 import os
+import re
 import subprocess
+import threading
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+MANIFEST_VERSION = 1
+
+# A directory or file modified this recently may change again within the
+# same timestamp tick, so its cached listing is not trusted on the next scan
+RACY_WINDOW_NS = 2_000_000_000
+
+PYTHON_ENTRY_CANDIDATES = [
+    "__main__.py",
+    "main.py",
+    "app.py",
+    "run.py",
+    "cli.py",
+    "wsgi.py",
+    "asgi.py",
+]
+
+SCHEMA_PATTERNS = ["CREATE TABLE", "BaseModel", "Table(", "schema"]
+
+TEST_PATTERNS = [
+    "*.test.*",
+    "*.spec.*",
+    "test_*.py",
+    "*_test.py",
+    "*Test.java",
+    "*Tests.java",
+]
+
+_TEST_FILE_RE = re.compile("|".join(fnmatch.translate(pattern) for pattern in TEST_PATTERNS))
+
+
+def default_manifest_path(root: Path) -> Path:
+    """Get the on-disk location of the scan manifest for a project root."""
+    digest = hashlib.sha256(str(Path(root).resolve()).encode()).hexdigest()[:16]
+    return Path.home() / ".cache" / "opencode" / "index" / f"{digest}.json"
+
 
 class ProjectType(str, Enum):
     """Detected project types."""
@@ -65,6 +110,12 @@ class IndexConfig:
     
     # Index directory name
     index_dir: str = ".claude"
+    
+    # Persist the scan manifest so later runs only rescan changed directories
+    persist_manifest: bool = True
+    
+    # Directory for scan manifests (default: ~/.cache/opencode/index)
+    manifest_dir: Optional[Path] = None
 
 
 @dataclass
@@ -108,6 +159,65 @@ class ProjectIndex:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class DirectoryRecord:
+    """Listing of one directory as of its last scan."""
+    
+    # Directory mtime when listed, or -1 to force a rescan
+    mtime_ns: int
+    
+    # Subdirectories to descend into (excluded names already removed)
+    dirs: List[str] = field(default_factory=list)
+    
+    # Names of all non-directory entries
+    files: List[str] = field(default_factory=list)
+    
+    # Schema pattern found per .py file, keyed by name, as
+    # (mtime_ns, size, pattern or None)
+    schemas: Dict[str, Tuple[int, int, Optional[str]]] = field(default_factory=dict)
+    
+    def to_json(self) -> list:
+        return [self.mtime_ns, self.dirs, self.files, {k: list(v) for k, v in self.schemas.items()}]
+    
+    @classmethod
+    def from_json(cls, data: list) -> "DirectoryRecord":
+        mtime_ns, dirs, files, schemas = data
+        return cls(
+            mtime_ns=mtime_ns,
+            dirs=dirs,
+            files=files,
+            schemas={k: tuple(v) for k, v in schemas.items()},
+        )
+
+
+@dataclass
+class ProjectScan:
+    """Result of one walk over a project, shared by all collectors."""
+    
+    root: Path
+    
+    # Records keyed by POSIX path relative to root ("." for the root)
+    directories: Dict[str, DirectoryRecord] = field(default_factory=dict)
+    
+    # Number of directories that had to be listed again
+    rescanned: int = 0
+    
+    # Whether the manifest needs to be written back
+    dirty: bool = False
+    
+    def walk(self) -> Iterator[Tuple[str, DirectoryRecord]]:
+        """Iterate over (relative path, record) pairs in path order."""
+        for rel in sorted(self.directories):
+            yield rel, self.directories[rel]
+    
+    def path(self, rel: str, name: Optional[str] = None) -> str:
+        """Build a native relative path string for a directory or a file in it."""
+        parts = [] if rel == "." else rel.split("/")
+        if name is not None:
+            parts.append(name)
+        return os.path.join(*parts) if parts else "."
+
+
 class IndexGenerator:
     """
     Generates structural indexes for projects.
@@ -120,19 +230,30 @@ class IndexGenerator:
     
     def __init__(self, config: Optional[IndexConfig] = None):
         self.config = config or IndexConfig()
+        self._manifests: Dict[Path, Dict[str, DirectoryRecord]] = {}
+        self._git_info: Dict[Path, Tuple[tuple, Tuple[str, str, str]]] = {}
+        self._lock = threading.Lock()
+        self._exclude_patterns = [p for p in self.config.exclude_dirs if any(c in p for c in "*?[")]
     
     def generate(self, project_path: Path) -> ProjectIndex:
         """
         Generate an index for a project.
         
+        Safe to call from a worker thread; concurrent calls on one
+        generator are serialized.
+        
         Args:
             project_path: Root path of the project
             
         Returns:
             ProjectIndex with structural information
         """
-        project_path = project_path.resolve()
+        with self._lock:
+            return self._generate(project_path.resolve())
+    
+    def _generate(self, project_path: Path) -> ProjectIndex:
         project_name = project_path.name
+        scan = self.scan(project_path)
         
         # Detect project type
         project_type = self._detect_project_type(project_path)
@@ -141,10 +262,10 @@ class IndexGenerator:
         branch, commit, commit_date = self._get_git_info(project_path)
         
         # Generate directory tree
-        directory_tree = self._generate_tree(project_path)
+        directory_tree = self._generate_tree(project_path, scan)
         
         # Count files by extension
-        file_counts = self._count_files_by_extension(project_path)
+        file_counts = self._count_files_by_extension(project_path, scan)
         
         # Create base index
         index = ProjectIndex(
@@ -161,19 +282,156 @@ class IndexGenerator:
         
         # Add project-type-specific information
         if project_type in (ProjectType.PYTHON, ProjectType.MIXED):
-            self._add_python_info(index, project_path)
+            self._add_python_info(index, project_path, scan)
         
         if project_type in (ProjectType.NODE_TYPESCRIPT, ProjectType.MIXED):
             self._add_node_info(index, project_path)
         
         if project_type == ProjectType.PHP:
-            self._add_php_info(index, project_path)
+            self._add_php_info(index, project_path, scan)
         
         # Add test file information
-        self._add_test_info(index, project_path)
+        self._add_test_info(index, project_path, scan)
+        
+        if scan.dirty:
+            self._store_manifest(scan)
         
         return index
     
+    def scan(self, project_path: Path) -> ProjectScan:
+        """
+        Walk a project once, reusing listings of unchanged directories.
+        
+        Every directory is stat'ed, but only those whose mtime differs
+        from the previous scan are listed again.
+        
+        Args:
+            project_path: Root path of the project
+            
+        Returns:
+            ProjectScan with one record per included directory
+        """
+        root = project_path.resolve()
+        previous = self._manifests.get(root)
+        if previous is None:
+            previous = self._load_manifest(root)
+        
+        scan = ProjectScan(root=root)
+        now_ns = time.time_ns()
+        stack = ["."]
+        while stack:
+            rel = stack.pop()
+            path = root if rel == "." else root / rel
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            
+            record = previous.get(rel)
+            if record is None or record.mtime_ns != mtime_ns:
+                record = self._scan_directory(path, mtime_ns, record, now_ns)
+                if record is None:
+                    continue
+                scan.rescanned += 1
+                scan.dirty = True
+            
+            scan.directories[rel] = record
+            prefix = "" if rel == "." else rel + "/"
+            stack.extend(prefix + name for name in reversed(record.dirs))
+        
+        if len(scan.directories) != len(previous):
+            scan.dirty = True
+        self._manifests[root] = scan.directories
+        return scan
+    
+    def _scan_directory(
+        self,
+        path: Path,
+        mtime_ns: int,
+        previous: Optional[DirectoryRecord],
+        now_ns: int,
+    ) -> Optional[DirectoryRecord]:
+        """List a single directory into a fresh record."""
+        dirs: List[str] = []
+        files: List[str] = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            if not entry.is_symlink() and not self._is_excluded(entry.name):
+                                dirs.append(entry.name)
+                        else:
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        
+        dirs.sort()
+        files.sort()
+        
+        # Keep cached schema results for files that are still present;
+        # they are revalidated against the file mtime when used
+        schemas = {}
+        if previous is not None:
+            names = set(files)
+            schemas = {name: hit for name, hit in previous.schemas.items() if name in names}
+        
+        if now_ns - mtime_ns < RACY_WINDOW_NS:
+            mtime_ns = -1
+        return DirectoryRecord(mtime_ns=mtime_ns, dirs=dirs, files=files, schemas=schemas)
+    
+    def _is_excluded(self, name: str) -> bool:
+        if name in self.config.exclude_dirs:
+            return True
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self._exclude_patterns)
+    
+    def _manifest_path(self, root: Path) -> Path:
+        path = default_manifest_path(root)
+        if self.config.manifest_dir is not None:
+            return Path(self.config.manifest_dir) / path.name
+        return path
+    
+    def _load_manifest(self, root: Path) -> Dict[str, DirectoryRecord]:
+        """Load the persisted manifest, or an empty one if unusable."""
+        if not self.config.persist_manifest:
+            return {}
+        try:
+            data = json.loads(self._manifest_path(root).read_text(encoding="utf-8"))
+            if (
+                data.get("version") != MANIFEST_VERSION
+                or data.get("root") != str(root)
+                or data.get("exclude_dirs") != sorted(self.config.exclude_dirs)
+            ):
+                return {}
+            return {rel: DirectoryRecord.from_json(rec) for rel, rec in data["directories"].items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable index manifest: {e}")
+            return {}
+    
+    def _store_manifest(self, scan: ProjectScan) -> None:
+        """Write the manifest atomically."""
+        if not self.config.persist_manifest:
+            return
+        path = self._manifest_path(scan.root)
+        data = {
+            "version": MANIFEST_VERSION,
+            "root": str(scan.root),
+            "exclude_dirs": sorted(self.config.exclude_dirs),
+            "directories": {rel: rec.to_json() for rel, rec in scan.directories.items()},
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, path)
+            scan.dirty = False
+        except OSError as e:
+            logger.debug(f"Could not write index manifest: {e}")
+    
     def _detect_project_type(self, project_path: Path) -> ProjectType:
         """Detect the type of project."""
         has_python = bool(
@@ -207,147 +465,161 @@ class IndexGenerator:
             return ProjectType.UNKNOWN
     
     def _get_git_info(self, project_path: Path) -> tuple[str, str, str]:
-        """Get git branch, commit, and date."""
+        """
+        Get git branch, commit, and date.
+        
+        Uses a single git invocation, and none at all while HEAD and the
+        refs are unchanged since the last call.
+        """
+        from opencode.tool.git_executor import find_git_dir, repository_state
+        
+        git_dir = find_git_dir(project_path)
+        state = repository_state(git_dir) if git_dir is not None else None
+        cached = self._git_info.get(project_path)
+        if state is not None and cached is not None and cached[0] == state:
+            return cached[1]
+        
         try:
-            # Get branch
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            branch = result.stdout.strip() if result.returncode == 0 else "unknown"
-            
-            # Get commit hash
             result = subprocess.run(
-                ["git", "log", "-1", "--format=%h"],
+                ["git", "log", "-1", "--format=%h%n%ci%n%D"],
                 cwd=project_path,
                 capture_output=True,
                 text=True,
                 timeout=10,
             )
-            commit = result.stdout.strip() if result.returncode == 0 else "unknown"
-            
-            # Get commit date
-            result = subprocess.run(
-                ["git", "log", "-1", "--format=%ci"],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            commit_date = result.stdout.strip() if result.returncode == 0 else "unknown"
-            
-            return branch, commit, commit_date
-            
         except (subprocess.TimeoutExpired, FileNotFoundError, Exception) as e:
             logger.debug(f"Git info error: {e}")
             return "unknown", "unknown", "unknown"
-    
-    def _generate_tree(self, project_path: Path) -> str:
+        
+        if result.returncode != 0:
+            return "unknown", "unknown", "unknown"
+        
+        lines = result.stdout.splitlines() + ["", "", ""]
+        commit = lines[0].strip() or "unknown"
+        commit_date = lines[1].strip() or "unknown"
+        
+        # Decorations read "HEAD -> main, origin/main", or start with a bare
+        # "HEAD" when detached, matching `git rev-parse --abbrev-ref HEAD`
+        branch = "HEAD"
+        for ref in lines[2].split(","):
+            ref = ref.strip()
+            if ref.startswith("HEAD -> "):
+                branch = ref[len("HEAD -> "):]
+                break
+        
+        info = (branch, commit, commit_date)
+        if state is not None:
+            self._git_info[project_path] = (state, info)
+        return info
+    
+    def _generate_tree(self, project_path: Path, scan: Optional[ProjectScan] = None) -> str:
         """Generate a directory tree string."""
+        scan = scan or self.scan(project_path)
         lines = []
         
-        def should_exclude(name: str) -> bool:
-            return name in self.config.exclude_dirs or name.startswith(".")
-        
-        def build_tree(path: Path, prefix: str = "", depth: int = 0) -> None:
+        def build_tree(rel: str, prefix: str = "", depth: int = 0) -> None:
             if depth > self.config.tree_depth:
                 return
             
-            try:
-                entries = sorted(path.iterdir(), key=lambda e: (not e.is_dir(), e.name.lower()))
-            except PermissionError:
+            record = scan.directories.get(rel)
+            if record is None:
                 return
             
-            dirs = [e for e in entries if e.is_dir() and not should_exclude(e.name)]
+            dirs = sorted((d for d in record.dirs if not d.startswith(".")), key=str.lower)
             
-            for i, dir_entry in enumerate(dirs):
+            for i, name in enumerate(dirs):
                 is_last = i == len(dirs) - 1
                 connector = "└── " if is_last else "├── "
-                lines.append(f"{prefix}{connector}{dir_entry.name}/")
+                lines.append(f"{prefix}{connector}{name}/")
                 
                 extension = "    " if is_last else "│   "
-                build_tree(dir_entry, prefix + extension, depth + 1)
+                build_tree(name if rel == "." else f"{rel}/{name}", prefix + extension, depth + 1)
         
         lines.append(f"{project_path.name}/")
-        build_tree(project_path)
+        build_tree(".")
         
         return "\n".join(lines)
     
-    def _count_files_by_extension(self, project_path: Path) -> Dict[str, int]:
+    def _count_files_by_extension(self, project_path: Path, scan: Optional[ProjectScan] = None) -> Dict[str, int]:
         """Count files by extension."""
+        scan = scan or self.scan(project_path)
         counts: Dict[str, int] = {}
         
-        def should_exclude(name: str) -> bool:
-            return name in self.config.exclude_dirs
-        
-        for root, dirs, files in os.walk(project_path):
-            # Filter out excluded directories
-            dirs[:] = [d for d in dirs if not should_exclude(d)]
-            
-            for file in files:
-                ext = Path(file).suffix.lower()
-                if ext:
-                    ext = ext[1:]  # Remove leading dot
-                else:
-                    ext = "no_extension"
+        for _, record in scan.walk():
+            for name in record.files:
+                ext = os.path.splitext(name)[1][1:].lower() or "no_extension"
                 counts[ext] = counts.get(ext, 0) + 1
         
         # Sort by count descending
         return dict(sorted(counts.items(), key=lambda x: x[1], reverse=True)[:self.config.max_extension_count])
     
-    def _add_python_info(self, index: ProjectIndex, project_path: Path) -> None:
+    def _add_python_info(self, index: ProjectIndex, project_path: Path, scan: Optional[ProjectScan] = None) -> None:
         """Add Python-specific information to the index."""
+        scan = scan or self.scan(project_path)
+        
         # Find Python modules (directories with __init__.py)
         modules = []
-        for init_file in project_path.rglob("__init__.py"):
-            rel_path = init_file.parent.relative_to(project_path)
-            if not any(part in self.config.exclude_dirs for part in rel_path.parts):
-                modules.append(str(rel_path).replace(os.sep, "/"))
+        entry_points: Dict[str, List[str]] = {name: [] for name in PYTHON_ENTRY_CANDIDATES}
+        for rel, record in scan.walk():
+            names = set(record.files)
+            if "__init__.py" in names:
+                modules.append(rel)
+            for candidate in PYTHON_ENTRY_CANDIDATES:
+                if candidate in names:
+                    entry_points[candidate].append(scan.path(rel, candidate))
         
         index.python_modules = sorted(modules)[:50]
         
-        # Find database schema references
+        # Find database schema references, reading only files changed
+        # since their last check
         schemas = []
-        schema_patterns = ["CREATE TABLE", "BaseModel", "Table(", "schema"]
-        
-        for py_file in project_path.rglob("*.py"):
-            if any(part in self.config.exclude_dirs for part in py_file.relative_to(project_path).parts):
-                continue
-            
-            try:
-                content = py_file.read_text(encoding="utf-8", errors="ignore")
-                for pattern in schema_patterns:
-                    if pattern in content:
-                        rel_path = py_file.relative_to(project_path)
-                        schemas.append(f"{rel_path}: {pattern}")
-                        break
-            except Exception:
-                pass
+        now_ns = time.time_ns()
+        for rel, record in scan.walk():
+            if len(schemas) >= 20:
+                break
+            directory = scan.root if rel == "." else scan.root / rel
+            for name in record.files:
+                if not name.endswith(".py"):
+                    continue
+                pattern = self._schema_pattern(directory / name, record, name, now_ns, scan)
+                if pattern:
+                    schemas.append(f"{scan.path(rel, name)}: {pattern}")
         
         index.database_schemas = schemas[:20]
         
         # Find entry points
-        entry_points = []
-        entry_candidates = [
-            "__main__.py",
-            "main.py",
-            "app.py",
-            "run.py",
-            "cli.py",
-            "wsgi.py",
-            "asgi.py",
-        ]
+        for candidate in PYTHON_ENTRY_CANDIDATES:
+            index.entry_points.extend(entry_points[candidate])
+    
+    def _schema_pattern(
+        self,
+        path: Path,
+        record: DirectoryRecord,
+        name: str,
+        now_ns: int,
+        scan: ProjectScan,
+    ) -> Optional[str]:
+        """Get the first schema pattern in a file, cached by mtime and size."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
         
-        for candidate in entry_candidates:
-            for match in project_path.rglob(candidate):
-                if any(part in self.config.exclude_dirs for part in match.relative_to(project_path).parts):
-                    continue
-                entry_points.append(str(match.relative_to(project_path)))
+        cached = record.schemas.get(name)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
+        pattern = None
+        try:
+            content = path.read_text(encoding="utf-8", errors="ignore")
+            pattern = next((p for p in SCHEMA_PATTERNS if p in content), None)
+        except Exception:
+            pass
         
-        index.entry_points.extend(entry_points)
+        mtime_ns = -1 if now_ns - st.st_mtime_ns < RACY_WINDOW_NS else st.st_mtime_ns
+        record.schemas[name] = (mtime_ns, st.st_size, pattern)
+        scan.dirty = True
+        return pattern
     
     def _add_node_info(self, index: ProjectIndex, project_path: Path) -> None:
         """Add Node/TypeScript-specific information to the index."""
@@ -385,38 +657,29 @@ class IndexGenerator:
             if entry_path.exists():
                 index.entry_points.append(candidate)
     
-    def _add_php_info(self, index: ProjectIndex, project_path: Path) -> None:
+    def _add_php_info(self, index: ProjectIndex, project_path: Path, scan: Optional[ProjectScan] = None) -> None:
         """Add PHP-specific information to the index."""
+        scan = scan or self.scan(project_path)
+        
         # Find PHP entry points
         php_files = []
         
-        for php_file in project_path.rglob("*.php"):
-            if any(part in self.config.exclude_dirs for part in php_file.relative_to(project_path).parts):
-                continue
-            php_files.append(str(php_file.relative_to(project_path)))
+        for rel, record in scan.walk():
+            php_files.extend(scan.path(rel, name) for name in record.files if name.endswith(".php"))
+            if len(php_files) >= 20:
+                break
         
         index.metadata["php_files"] = php_files[:20]
     
-    def _add_test_info(self, index: ProjectIndex, project_path: Path) -> None:
+    def _add_test_info(self, index: ProjectIndex, project_path: Path, scan: Optional[ProjectScan] = None) -> None:
         """Add test file information to the index."""
-        test_patterns = [
-            "*.test.*",
-            "*.spec.*",
-            "test_*.py",
-            "*_test.py",
-            "*Test.java",
-            "*Tests.java",
-        ]
-        
+        scan = scan or self.scan(project_path)
         test_dirs: Dict[str, int] = {}
         
-        for pattern in test_patterns:
-            for test_file in project_path.rglob(pattern):
-                if any(part in self.config.exclude_dirs for part in test_file.relative_to(project_path).parts):
-                    continue
-                
-                test_dir = str(test_file.parent.relative_to(project_path))
-                test_dirs[test_dir] = test_dirs.get(test_dir, 0) + 1
+        for rel, record in scan.walk():
+            count = sum(1 for name in record.files if _TEST_FILE_RE.match(name))
+            if count:
+                test_dirs[scan.path(rel)] = count
         
         index.test_files = dict(sorted(test_dirs.items(), key=lambda x: x[1], reverse=True)[:self.config.max_test_locations])
     
@@ -538,7 +801,6 @@ class IndexGenerator:
         if not index_path.exists():
             return False
         
-        import time
         age_seconds = time.time() - index_path.stat().st_mtime
         return age_seconds < max_age_minutes * 60
     
@@ -13,6 +13,7 @@ from typing import Any, Callable, Dict, List, Optional, Set, AsyncGenerator
 import uuid
 
 from opencode.workflow.graph import WorkflowGraph, WorkflowNode, WorkflowEdge
+from opencode.workflow.http_pool import HttpClientPool
 from opencode.workflow.node import (
     BaseNode,
     ExecutionContext,
@@ -42,6 +43,9 @@ class WorkflowEngineConfig:
         max_retries: int = 3,
         continue_on_error: bool = False,
         enable_caching: bool = True,
+        http_max_connections: int = 100,
+        http_per_host_limit: int = 10,
+        http_cache_entries: int = 256,
     ):
         self.max_concurrent_nodes = max_concurrent_nodes
         self.default_timeout_seconds = default_timeout_seconds
@@ -49,6 +53,9 @@ class WorkflowEngineConfig:
         self.max_retries = max_retries
         self.continue_on_error = continue_on_error
         self.enable_caching = enable_caching
+        self.http_max_connections = http_max_connections
+        self.http_per_host_limit = http_per_host_limit
+        self.http_cache_entries = http_cache_entries
 
 
 class ExecutionEvent:
@@ -114,6 +121,15 @@ class WorkflowEngine:
         self._event_handlers: List[Callable[[ExecutionEvent], None]] = []
         self._running_executions: Set[str] = set()
         self._cancellation_tokens: Dict[str, asyncio.Event] = {}
+        self.http_pool = HttpClientPool(
+            max_connections=self.config.http_max_connections,
+            per_host_limit=self.config.http_per_host_limit,
+            cache_max_entries=self.config.http_cache_entries,
+        )
+    
+    async def close(self) -> None:
+        """Release resources shared across executions, such as HTTP connections."""
+        await self.http_pool.aclose()
     
     def add_event_handler(self, handler: Callable[[ExecutionEvent], None]) -> None:
         """
@@ -408,6 +424,14 @@ class WorkflowEngine:
             execution_id=state.execution_id,
             node_id=node_id,
             variables=state.variables,
+            http_pool=self.http_pool,
+            event_callback=lambda data: self._emit_event(ExecutionEvent(
+                event_type="node_progress",
+                workflow_id=workflow.id,
+                execution_id=state.execution_id,
+                node_id=node_id,
+                data=data,
+            )),
         )
         
         # Validate inputs
@@ -0,0 +1,284 @@
+"""
+HTTP Client Pool for Workflow Engine
+
+This module provides a shared HTTP client for workflow nodes so that
+connections and TLS sessions are reused across node executions instead
+of being rebuilt for every request.
+"""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+CacheKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class CachedResponse:
+    """A cached GET response and the validators used to revalidate it."""
+    response: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class HttpClientPool:
+    """
+    Shared, keep-alive HTTP client for workflow nodes.
+
+    The pool owns a single lazily created httpx.AsyncClient and adds:
+    - A per-host concurrency limit
+    - ETag/Last-Modified conditional caching of GET responses
+    - In-flight deduplication of identical GET requests
+
+    A WorkflowEngine owns one pool and hands it to nodes through the
+    ExecutionContext. The pool must be closed with aclose() when the
+    owner shuts down.
+
+    Example:
+        pool = HttpClientPool(per_host_limit=5)
+        response = await pool.request("GET", "https://api.example.com/items")
+        await pool.aclose()
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        per_host_limit: int = 10,
+        cache_max_entries: int = 256,
+        transport: Optional[Any] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_connections: Maximum open connections across all hosts
+            max_keepalive_connections: Idle connections kept alive for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+            per_host_limit: Maximum concurrent requests per host
+            cache_max_entries: Maximum cached GET responses (0 disables caching)
+            transport: Optional httpx transport (e.g. httpx.MockTransport)
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.per_host_limit = per_host_limit
+        self.cache_max_entries = cache_max_entries
+        self.transport = transport
+
+        self._client: Optional[Any] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._cache: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._closed = False
+
+    async def __aenter__(self) -> "HttpClientPool":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    @property
+    def client(self) -> Any:
+        """Get the underlying httpx.AsyncClient, creating it on first use."""
+        if self._closed:
+            raise RuntimeError("HttpClientPool is closed")
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Send a request through the shared client.
+
+        GET requests without a body are deduplicated while in flight and
+        revalidated against cached responses; other methods are sent as-is.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            params: Query parameters
+            **kwargs: Extra arguments for httpx.AsyncClient.request
+
+        Returns:
+            httpx.Response
+        """
+        method = method.upper()
+        if method != "GET" or any(k in kwargs for k in ("json", "data", "content", "files")):
+            return await self._send(method, url, headers, params, **kwargs)
+
+        key = self._cache_key(url, headers, params, kwargs)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._conditional_get(key, url, headers, params, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not logged as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _conditional_get(
+        self,
+        key: CacheKey,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+        **kwargs: Any,
+    ) -> Any:
+        """Send a GET, revalidating a cached response when one exists."""
+        request_headers = dict(headers or {})
+        cached = self._cache.get(key) if self.cache_max_entries else None
+        if cached is not None:
+            if cached.etag:
+                request_headers.setdefault("If-None-Match", cached.etag)
+            if cached.last_modified:
+                request_headers.setdefault("If-Modified-Since", cached.last_modified)
+
+        response = await self._send("GET", url, request_headers, params, **kwargs)
+
+        if cached is not None and response.status_code == 304:
+            self._cache.move_to_end(key)
+            return cached.response
+
+        self._store(key, response)
+        return response
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+        **kwargs: Any,
+    ) -> Any:
+        """Send a request, respecting the per-host concurrency limit."""
+        async with self._host_limit(url):
+            return await self.client.request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                **kwargs,
+            )
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent requests to a host."""
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_limits[host] = semaphore
+        return semaphore
+
+    def _store(self, key: CacheKey, response: Any) -> None:
+        """Cache a successful GET response that carries validators."""
+        if not self.cache_max_entries or response.status_code != 200:
+            return
+
+        response_headers = response.headers
+        cache_control = str(response_headers.get("cache-control", "")).lower()
+        etag = response_headers.get("etag")
+        last_modified = response_headers.get("last-modified")
+        if "no-store" in cache_control or not (etag or last_modified):
+            self._cache.pop(key, None)
+            return
+
+        self._cache[key] = CachedResponse(response=response, etag=etag, last_modified=last_modified)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _cache_key(
+        url: str,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> CacheKey:
+        """
+        Build the key identifying an equivalent GET request.
+
+        Request options such as follow_redirects and timeout are part of
+        the key, so requests that differ only in them are neither
+        coalesced nor served from each other's cache entries.
+        """
+        normalized_headers = sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items())
+        return (
+            url,
+            json.dumps(params or {}, sort_keys=True, default=str),
+            json.dumps(normalized_headers),
+            json.dumps(options or {}, sort_keys=True, default=str),
+        )
+
+    def clear_cache(self) -> None:
+        """Drop all cached responses."""
+        self._cache.clear()
+
+    async def aclose(self) -> None:
+        """Close the underlying client and release its connections."""
+        self._closed = True
+        self._cache.clear()
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+
+@asynccontextmanager
+async def pool_for(context: Any) -> AsyncIterator[HttpClientPool]:
+    """
+    Get the engine's shared pool from an execution context.
+
+    Nodes executed outside an engine get a temporary pool that is closed
+    when the block exits, matching the old one-client-per-request behavior.
+
+    Args:
+        context: ExecutionContext of the running node
+
+    Yields:
+        HttpClientPool
+    """
+    pool = getattr(context, "http_pool", None)
+    if isinstance(pool, HttpClientPool):
+        yield pool
+    else:
+        async with HttpClientPool() as temporary:
+            yield temporary
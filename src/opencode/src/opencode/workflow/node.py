@@ -79,6 +79,8 @@ class ExecutionContext(BaseModel):
     variables: Dict[str, Any] = Field(default_factory=dict, description="Workflow-level variables")
     parent_node_id: Optional[str] = Field(default=None, description="Parent node ID for nested executions")
     depth: int = Field(default=0, description="Nesting depth in execution tree")
+    http_pool: Optional[Any] = Field(default=None, description="Shared HttpClientPool owned by the engine")
+    event_callback: Optional[Any] = Field(default=None, description="Callable receiving progress data while the node runs")
 
     class Config:
         arbitrary_types_allowed = True
@@ -18,6 +18,7 @@ from opencode.workflow.node import (
     PortDataType,
     PortDirection,
 )
+from opencode.workflow.http_pool import pool_for
 from opencode.workflow.registry import NodeRegistry
 
 logger = logging.getLogger(__name__)
@@ -141,7 +142,7 @@ class DataSourceNode(BaseNode):
             elif source_type == SourceType.TEXT:
                 result = await self._handle_text_source()
             elif source_type == SourceType.URL:
-                result = await self._handle_url_source()
+                result = await self._handle_url_source(context)
             else:
                 return ExecutionResult(
                     success=False,
@@ -228,8 +229,8 @@ class DataSourceNode(BaseNode):
             outputs={"data": text_data, "raw": text_data},
         )
     
-    async def _handle_url_source(self) -> ExecutionResult:
-        """Handle URL source type."""
+    async def _handle_url_source(self, context: ExecutionContext) -> ExecutionResult:
+        """Handle URL source type using the engine's shared HTTP pool."""
         url = self.config.get("url")
         if not url:
             return ExecutionResult(
@@ -238,10 +239,8 @@ class DataSourceNode(BaseNode):
             )
         
         try:
-            import httpx
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, follow_redirects=True)
+            async with pool_for(context) as pool:
+                response = await pool.request("GET", url, follow_redirects=True)
                 response.raise_for_status()
                 
                 raw_data = response.text
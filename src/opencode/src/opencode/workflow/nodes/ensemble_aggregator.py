@@ -20,6 +20,7 @@ from opencode.workflow.node import (
     PortDataType,
     PortDirection,
 )
+from opencode.provider.pool import get_provider_pool
 from opencode.workflow.registry import NodeRegistry
 
 logger = logging.getLogger(__name__)
@@ -348,30 +349,39 @@ class EnsembleAggregatorNode(BaseNode):
         return {"output": responses[0]}
     
     def _get_provider(self, provider_name: str):
-        """Get the LLM provider instance."""
+        """Get a pooled LLM provider instance."""
+        pool = get_provider_pool()
         try:
-            from opencode.core.config import Config
-            
             if provider_name == "ollama":
                 from opencode.provider.ollama import OllamaProvider
-                return OllamaProvider()
+                return pool.get_or_create("ollama", OllamaProvider)
             elif provider_name == "lmstudio":
                 from opencode.provider.lmstudio import LMStudioProvider
-                return LMStudioProvider()
+                return pool.get_or_create("lmstudio", LMStudioProvider)
             elif provider_name == "openai":
-                from opencode.core.config import Config
-                config = Config.load()
                 from opencode.provider.openai import OpenAIProvider
+                config = pool.get_config()
                 api_key = config.get_api_key("openai")
+                base_url = config.get_provider_config("openai").base_url
                 if api_key:
-                    return OpenAIProvider(api_key=api_key)
+                    return pool.get_or_create(
+                        "openai",
+                        lambda: OpenAIProvider(api_key=api_key, base_url=base_url),
+                        base_url=base_url,
+                        credentials=api_key,
+                    )
             elif provider_name == "anthropic":
-                from opencode.core.config import Config
-                config = Config.load()
                 from opencode.provider.anthropic import AnthropicProvider
+                config = pool.get_config()
                 api_key = config.get_api_key("anthropic")
+                base_url = config.get_provider_config("anthropic").base_url
                 if api_key:
-                    return AnthropicProvider(api_key=api_key)
+                    return pool.get_or_create(
+                        "anthropic",
+                        lambda: AnthropicProvider(api_key=api_key, base_url=base_url),
+                        base_url=base_url,
+                        credentials=api_key,
+                    )
             else:
                 logger.warning(f"Unknown provider: {provider_name}")
                 return None
@@ -17,6 +17,7 @@ from opencode.workflow.node import (
     PortDataType,
     PortDirection,
 )
+from opencode.workflow.http_pool import pool_for
 from opencode.workflow.registry import NodeRegistry
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,10 @@ class HttpNode(BaseNode):
         body: Request body content
         timeout: Request timeout in seconds
         followRedirects: Whether to follow redirects
+    
+    Requests go through the engine's shared HttpClientPool, so connections
+    are kept alive across executions and identical GETs are coalesced and
+    revalidated with ETag/Last-Modified.
     """
     
     _schema = NodeSchema(
@@ -210,9 +215,9 @@ class HttpNode(BaseNode):
                 elif body_type == "raw":
                     request_kwargs["content"] = body_data if isinstance(body_data, (str, bytes)) else str(body_data)
             
-            # Make the request
-            async with httpx.AsyncClient() as client:
-                response = await client.request(**request_kwargs)
+            # Make the request through the shared pool
+            async with pool_for(context) as pool:
+                response = await pool.request(**request_kwargs)
             
             # Parse response
             raw_text = response.text
@@ -4,10 +4,13 @@ LLM Process Node
 Handles AI processing using the existing provider system.
 """
 
+import asyncio
 import json
+import re
 from typing import Any, Dict, List, Optional
 import logging
 
+from opencode.provider.pool import get_provider_pool
 from opencode.workflow.node import (
     BaseNode,
     NodePort,
@@ -38,6 +41,12 @@ class LlmProcessNode(BaseNode):
         temperature: Sampling temperature (0.0 - 2.0)
         maxTokens: Maximum tokens to generate
         jsonMode: Whether to request JSON output
+        mapMode: Treat an array input as a list of items, one response each
+        concurrency: Maximum requests in flight in map mode
+        batchSize: Items packed into one request in map mode (1 disables packing)
+    
+    In map mode the outputs are lists aligned with the input items, and a
+    node_progress event is emitted as each item finishes.
     """
     
     _schema = NodeSchema(
@@ -75,7 +84,7 @@ class LlmProcessNode(BaseNode):
                 data_type=PortDataType.STRING,
                 direction=PortDirection.OUTPUT,
                 required=True,
-                description="The LLM response text",
+                description="The LLM response text (a list of responses in map mode)",
             ),
             NodePort(
                 name="json",
@@ -132,6 +141,23 @@ class LlmProcessNode(BaseNode):
                     "default": False,
                     "description": "Request JSON output",
                 },
+                "mapMode": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Process each item of an array input separately",
+                },
+                "concurrency": {
+                    "type": "integer",
+                    "default": 4,
+                    "minimum": 1,
+                    "description": "Maximum concurrent requests in map mode",
+                },
+                "batchSize": {
+                    "type": "integer",
+                    "default": 1,
+                    "minimum": 1,
+                    "description": "Items packed into a single request in map mode",
+                },
             },
             "required": ["provider", "model"],
         },
@@ -162,14 +188,10 @@ class LlmProcessNode(BaseNode):
                     error=f"Provider '{provider_name}' not available",
                 )
             
-            # Build messages
-            messages = self._build_messages(inputs)
-            
             # Get model parameters
             model = self.config.get("model", "llama3.2")
             temperature = self.config.get("temperature", 0.7)
             max_tokens = self.config.get("maxTokens", 4096)
-            json_mode = self.config.get("jsonMode", False)
             
             # Build request options
             kwargs = {
@@ -184,32 +206,25 @@ class LlmProcessNode(BaseNode):
             if system_prompt:
                 kwargs["system"] = system_prompt
             
-            # Make the LLM request using complete_sync
-            response = await provider.complete_sync(
-                messages=messages,
-                model=model,
-                **kwargs
-            )
-            
-            # Extract response content
-            output_text = response.content
-            
-            # Build outputs
-            outputs = {
-                "output": output_text,
-                "tokens": {
-                    "prompt": response.usage.input_tokens if response.usage else 0,
-                    "completion": response.usage.output_tokens if response.usage else 0,
-                    "total": response.usage.total_tokens if response.usage else 0,
-                },
-            }
-            
-            # Parse JSON if in json mode
-            if json_mode:
-                try:
-                    outputs["json"] = json.loads(output_text)
-                except json.JSONDecodeError:
-                    outputs["json"] = None
+            if self.config.get("mapMode", False) and isinstance(inputs.get("input"), list):
+                outputs = await self._execute_map(provider, inputs, context, model, kwargs)
+            else:
+                # Make the LLM request using complete_sync
+                response = await provider.complete_sync(
+                    messages=self._build_messages(inputs),
+                    model=model,
+                    **kwargs
+                )
+                
+                # Build outputs
+                outputs = {
+                    "output": response.content,
+                    "tokens": self._usage_totals([response]),
+                }
+                
+                # Parse JSON if in json mode
+                if self.config.get("jsonMode", False):
+                    outputs["json"] = self._parse_json(response.content)
             
             duration_ms = (time.time() - start_time) * 1000
             return ExecutionResult(
@@ -225,59 +240,190 @@ class LlmProcessNode(BaseNode):
                 error=str(e),
             )
     
+    async def _execute_map(
+        self,
+        provider: Any,
+        inputs: Dict[str, Any],
+        context: ExecutionContext,
+        model: str,
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Process each item of an array input with bounded concurrency.
+        
+        Items are grouped into requests of batchSize prompts. A packed
+        request that does not come back as a JSON array of the right length
+        is retried one item at a time. Results are reported through the
+        context's event callback as soon as each request finishes.
+        """
+        items = inputs["input"]
+        batch_size = max(1, int(self.config.get("batchSize", 1)))
+        semaphore = asyncio.Semaphore(max(1, int(self.config.get("concurrency", 4))))
+        
+        outputs: List[Optional[str]] = [None] * len(items)
+        errors: Dict[int, str] = {}
+        responses: List[Any] = []
+        
+        def item_messages(index: int) -> List:
+            return self._build_messages({**inputs, "input": items[index]})
+        
+        async def run_single(index: int) -> None:
+            try:
+                async with semaphore:
+                    response = await provider.complete_sync(
+                        messages=item_messages(index),
+                        model=model,
+                        **kwargs
+                    )
+            except Exception as e:
+                errors[index] = str(e)
+                return
+            responses.append(response)
+            outputs[index] = response.content
+        
+        async def run_batch(indices: List[int]) -> List[int]:
+            answers = None
+            if len(indices) > 1:
+                try:
+                    async with semaphore:
+                        response = await provider.complete_sync(
+                            messages=self._build_packed_messages([item_messages(i) for i in indices]),
+                            model=model,
+                            **kwargs
+                        )
+                    responses.append(response)
+                    answers = self._unpack_response(response.content, len(indices))
+                except Exception as e:
+                    logger.debug(f"Packed request failed: {e}")
+            
+            if answers is None:
+                # Unpacked, or the packed reply could not be split: one request per item
+                await asyncio.gather(*(run_single(i) for i in indices))
+            else:
+                for i, answer in zip(indices, answers):
+                    outputs[i] = answer
+            return indices
+        
+        batches = [
+            list(range(start, min(start + batch_size, len(items))))
+            for start in range(0, len(items), batch_size)
+        ]
+        callback = getattr(context, "event_callback", None)
+        for finished in asyncio.as_completed([run_batch(batch) for batch in batches]):
+            indices = await finished
+            if callback is not None:
+                callback({
+                    "items": [
+                        {"index": i, "output": outputs[i], "error": errors.get(i)}
+                        for i in indices
+                    ],
+                    "total": len(items),
+                })
+        
+        if errors and len(errors) == len(items):
+            raise RuntimeError(f"All {len(items)} items failed: {next(iter(errors.values()))}")
+        
+        result: Dict[str, Any] = {
+            "output": outputs,
+            "tokens": self._usage_totals(responses),
+        }
+        if errors:
+            result["errors"] = {str(i): message for i, message in sorted(errors.items())}
+        if self.config.get("jsonMode", False):
+            result["json"] = [self._parse_json(o) if o is not None else None for o in outputs]
+        return result
+    
+    def _build_packed_messages(self, item_messages: List[List]) -> List:
+        """Pack several single-item prompts into one numbered request."""
+        from opencode.provider.base import Message, MessageRole
+        
+        parts = [
+            f"Answer each of the following {len(item_messages)} items independently.",
+            "Respond with only a JSON array of strings, one answer per item, in the same order.",
+            "",
+        ]
+        for number, messages in enumerate(item_messages, start=1):
+            parts.append(f"### Item {number}")
+            parts.append(messages[-1].content)
+            parts.append("")
+        
+        return [Message(role=MessageRole.USER, content="\n".join(parts))]
+    
+    def _unpack_response(self, content: str, expected: int) -> Optional[List[str]]:
+        """Split a packed response into per-item answers, or None if malformed."""
+        text = content.strip()
+        fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+        if fenced:
+            text = fenced.group(1).strip()
+        try:
+            answers = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(answers, list) or len(answers) != expected:
+            return None
+        return [a if isinstance(a, str) else json.dumps(a) for a in answers]
+    
+    def _usage_totals(self, responses: List[Any]) -> Dict[str, int]:
+        """Sum token usage across responses."""
+        prompt = sum(r.usage.input_tokens for r in responses if r.usage)
+        completion = sum(r.usage.output_tokens for r in responses if r.usage)
+        return {
+            "prompt": prompt,
+            "completion": completion,
+            "total": prompt + completion,
+        }
+    
+    def _parse_json(self, text: str) -> Any:
+        """Parse a JSON response, returning None if it is not valid JSON."""
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
+    
     def _get_provider(self, provider_name: str):
-        """Get the LLM provider instance."""
+        """Get a pooled LLM provider instance."""
+        pool = get_provider_pool()
         try:
-            from opencode.core.config import Config
-            
-            # Load config to get API keys
-            config = Config.load()
-            
-            # Import provider classes directly
+            # Local providers need no credentials
             if provider_name == "ollama":
                 from opencode.provider.ollama import OllamaProvider
-                return OllamaProvider()
-            elif provider_name == "openai":
-                from opencode.provider.openai import OpenAIProvider
-                api_key = config.get_provider_key("openai")
-                if not api_key:
-                    logger.error("OpenAI API key not configured")
-                    return None
-                return OpenAIProvider(api_key=api_key)
+                return pool.get_or_create("ollama", OllamaProvider)
+            elif provider_name == "lmstudio":
+                from opencode.provider.lmstudio import LMStudioProvider
+                return pool.get_or_create("lmstudio", LMStudioProvider)
+            
+            if provider_name == "openai":
+                from opencode.provider.openai import OpenAIProvider as provider_class
             elif provider_name == "anthropic":
-                from opencode.provider.anthropic import AnthropicProvider
-                api_key = config.get_provider_key("anthropic")
-                if not api_key:
-                    logger.error("Anthropic API key not configured")
-                    return None
-                return AnthropicProvider(api_key=api_key)
+                from opencode.provider.anthropic import AnthropicProvider as provider_class
             elif provider_name == "google":
-                from opencode.provider.google import GoogleProvider
-                api_key = config.get_provider_key("google")
-                if not api_key:
-                    logger.error("Google API key not configured")
-                    return None
-                return GoogleProvider(api_key=api_key)
+                from opencode.provider.google import GoogleProvider as provider_class
             elif provider_name == "groq":
-                from opencode.provider.groq import GroqProvider
-                api_key = config.get_provider_key("groq")
-                if not api_key:
-                    logger.error("Groq API key not configured")
-                    return None
-                return GroqProvider(api_key=api_key)
+                from opencode.provider.groq import GroqProvider as provider_class
             elif provider_name == "mistral":
-                from opencode.provider.mistral import MistralProvider
-                api_key = config.get_provider_key("mistral")
-                if not api_key:
-                    logger.error("Mistral API key not configured")
-                    return None
-                return MistralProvider(api_key=api_key)
-            elif provider_name == "lmstudio":
-                from opencode.provider.lmstudio import LMStudioProvider
-                return LMStudioProvider()
+                from opencode.provider.mistral import MistralProvider as provider_class
             else:
                 logger.warning(f"Unknown provider: {provider_name}")
                 return None
+            
+            # Load config (cached by the pool) to get API keys
+            config = pool.get_config()
+            api_key = config.get_api_key(provider_name)
+            if not api_key:
+                logger.error(f"{provider_name} API key not configured")
+                return None
+            kwargs = {"api_key": api_key}
+            base_url = None
+            if provider_name in ("openai", "anthropic"):
+                base_url = config.get_provider_config(provider_name).base_url
+                if base_url:
+                    kwargs["base_url"] = base_url
+            return pool.get_or_create(
+                provider_name,
+                lambda: provider_class(**kwargs),
+                base_url=base_url,
+                credentials=api_key,
+            )
         except Exception as e:
             logger.error(f"Failed to load provider {provider_name}: {e}")
             return None
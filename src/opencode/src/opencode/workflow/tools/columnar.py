@@ -0,0 +1,553 @@
+"""
+Columnar execution engine for the CSV/Array tool.
+
+Stores tabular data as one typed numpy array per column and evaluates
+chains of operations lazily, so a parse -> filter -> group -> sum pipeline
+runs over index arrays and boolean masks instead of lists of dicts.
+"""
+
+import csv
+import io
+import itertools
+import logging
+import operator as op
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Cell values treated as null when inferring a typed (numeric) column
+_NULL_TOKENS = frozenset(["", "null", "Null", "NULL", "none", "None", "NONE", "nil", "Nil", "NIL"])
+
+# Rows transposed into columns at a time while parsing CSV
+_CHUNK_ROWS = 65536
+
+_NUMERIC_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": op.eq,
+    "ne": op.ne,
+    "gt": op.gt,
+    "gte": op.ge,
+    "lt": op.lt,
+    "lte": op.le,
+}
+
+AGGREGATIONS = ("count", "sum", "avg", "min", "max")
+
+_ABSENT = object()
+
+
+def _is_number(value: Any) -> bool:
+    """Check if a value is a plain Python or numpy number."""
+    return isinstance(value, (int, float, np.number, np.bool_))
+
+
+def _chunks(rows: Iterable[List[str]]) -> Iterator[List[List[str]]]:
+    """Yield rows in lists of at most _CHUNK_ROWS."""
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, _CHUNK_ROWS))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _infer_column(
+    raw: np.ndarray,
+    present: np.ndarray,
+    parse_value: Callable[[str], Any],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Infer a typed array for a column of raw CSV strings.
+
+    Numeric columns are converted in a single vectorized cast. Other
+    columns are parsed once per distinct value rather than once per cell.
+
+    Args:
+        raw: Object array of stripped cell strings
+        present: Mask of cells that exist in their row
+        parse_value: Scalar parser used for non-numeric columns
+
+    Returns:
+        Tuple of (values, valid mask)
+    """
+    n = len(raw)
+    cells = raw[present]
+    positions = np.flatnonzero(present)
+
+    nulls = np.fromiter(map(_NULL_TOKENS.__contains__, cells), dtype=bool, count=len(cells))
+    candidates = cells[~nulls]
+    if len(candidates):
+        for dtype in (np.int64, np.float64):
+            try:
+                typed = candidates.astype(dtype)
+            except OverflowError:
+                break
+            except ValueError:
+                continue
+            values = np.zeros(n, dtype=dtype)
+            values[positions[~nulls]] = typed
+            valid = present.copy()
+            valid[positions[nulls]] = False
+            return values, valid
+
+    # Factorize with a dict: hashing beats sorting object arrays
+    codes = {value: code for code, value in enumerate(dict.fromkeys(cells.tolist()))}
+    inverse = np.fromiter(map(codes.__getitem__, cells.tolist()), dtype=np.int64, count=len(cells))
+    parsed = [parse_value(u) for u in codes]
+    if parsed and all(isinstance(p, bool) for p in parsed):
+        lookup = np.array(parsed, dtype=bool)
+        values = np.zeros(n, dtype=bool)
+    else:
+        lookup = np.empty(len(parsed), dtype=object)
+        for i, p in enumerate(parsed):
+            lookup[i] = p
+        values = np.empty(n, dtype=object)
+    values[present] = lookup[inverse]
+    return values, present.copy()
+
+
+def _narrow_objects(values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Build a typed array from already-parsed Python values."""
+    valid = np.fromiter((v is not _ABSENT and v is not None for v in values), dtype=bool, count=len(values))
+    kinds = {type(v) for v, ok in zip(values, valid) if ok}
+
+    dtype: Any = object
+    if kinds == {bool}:
+        dtype = bool
+    elif kinds == {int}:
+        dtype = np.int64
+    elif kinds and kinds <= {int, float}:
+        dtype = np.float64
+
+    if dtype is not object:
+        fill = False if dtype is bool else 0
+        try:
+            return np.array([v if ok else fill for v, ok in zip(values, valid)], dtype=dtype), valid
+        except OverflowError:
+            pass
+
+    array = np.empty(len(values), dtype=object)
+    for i, v in enumerate(values):
+        array[i] = None if v is _ABSENT else v
+    return array, valid
+
+
+class ColumnarTable:
+    """
+    Table stored as one typed numpy array per column.
+
+    Each column has a companion validity mask; cells that are missing from
+    their row, or null in a numeric column, are invalid and read back as None.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], valid: Dict[str, np.ndarray], length: int):
+        self.columns = columns
+        self.valid = valid
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    @property
+    def names(self) -> List[str]:
+        """Column names in their original order."""
+        return list(self.columns.keys())
+
+    @classmethod
+    def from_csv(
+        cls,
+        data: str,
+        parse_value: Callable[[str], Any],
+        delimiter: str = ",",
+        has_header: bool = True,
+        skip_empty: bool = True,
+    ) -> "ColumnarTable":
+        """
+        Parse a CSV string straight into columns.
+
+        Rows are streamed into per-column lists, so the intermediate list
+        of row dicts is never built.
+
+        Args:
+            data: CSV text
+            parse_value: Scalar parser for non-numeric cells
+            delimiter: Field delimiter
+            has_header: Whether the first row holds column names
+            skip_empty: Skip rows whose cells are all empty
+
+        Returns:
+            ColumnarTable
+        """
+        reader = csv.reader(io.StringIO(data), delimiter=delimiter)
+
+        first = next(reader, None)
+        if first is None:
+            return cls({}, {}, 0)
+
+        if has_header:
+            headers = [h.strip() for h in first]
+            pending: List[List[str]] = []
+        else:
+            headers = [f"col_{i}" for i in range(len(first))]
+            pending = [first]
+
+        width = len(headers)
+        cells: List[List[str]] = [[] for _ in range(width)]
+        row_lengths: List[int] = []
+
+        for chunk in _chunks(itertools.chain(pending, reader)):
+            if skip_empty:
+                chunk = [row for row in chunk if any(row)]
+            lengths = [min(len(row), width) for row in chunk]
+            row_lengths.extend(lengths)
+            if any(length != width for length in lengths):
+                chunk = [row[:width] + [""] * (width - len(row)) for row in chunk]
+            # Transpose the chunk in C rather than appending cell by cell
+            for column, values in zip(cells, zip(*chunk)):
+                column.extend(map(str.strip, values))
+
+        length = len(row_lengths)
+        row_widths = np.array(row_lengths, dtype=np.int64)
+
+        # Later duplicate headers win, as they would in a dict row
+        index_by_name: Dict[str, int] = {}
+        for i, name in enumerate(headers):
+            index_by_name[name] = i
+
+        columns: Dict[str, np.ndarray] = {}
+        valid: Dict[str, np.ndarray] = {}
+        for name, i in index_by_name.items():
+            raw = np.empty(length, dtype=object)
+            raw[:] = cells[i]
+            columns[name], valid[name] = _infer_column(raw, row_widths > i, parse_value)
+
+        return cls(columns, valid, length)
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "ColumnarTable":
+        """
+        Build a table from an array of objects.
+
+        Args:
+            records: List of dicts
+
+        Returns:
+            ColumnarTable
+        """
+        names: Dict[str, None] = {}
+        for record in records:
+            if not isinstance(record, dict):
+                raise ValueError("Columnar operations require an array of objects")
+            for key in record:
+                names.setdefault(key, None)
+
+        columns: Dict[str, np.ndarray] = {}
+        valid: Dict[str, np.ndarray] = {}
+        for name in names:
+            columns[name], valid[name] = _narrow_objects([r.get(name, _ABSENT) for r in records])
+
+        return cls(columns, valid, len(records))
+
+    def column(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the values and validity mask of a column."""
+        if name not in self.columns:
+            raise ValueError(f"Unknown field: {name}")
+        return self.columns[name], self.valid[name]
+
+    def python_values(self, name: str, indices: np.ndarray) -> List[Any]:
+        """Get column values at the given rows as Python objects."""
+        values, valid = self.column(name)
+        result = values[indices].tolist()
+        mask = valid[indices]
+        if not mask.all():
+            for i in np.flatnonzero(~mask).tolist():
+                result[i] = None
+        return result
+
+    def to_records(self, indices: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Materialize rows as a list of dicts.
+
+        Args:
+            indices: Row positions to materialize (all rows if None)
+
+        Returns:
+            List of dicts
+        """
+        if indices is None:
+            indices = np.arange(self.length)
+        names = self.names
+        if not names:
+            return [{} for _ in range(len(indices))]
+        columns = [self.python_values(name, indices) for name in names]
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+@dataclass
+class LazyStep:
+    """A deferred operation in a LazyFrame plan."""
+    operation: str
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+class LazyFrame:
+    """
+    Deferred chain of columnar operations.
+
+    Steps are only recorded until collect() is called. Consecutive filters
+    are fused into one boolean mask, row order is tracked as an index array,
+    and group aggregates are computed with bincount instead of per-row loops.
+
+    Example:
+        frame = LazyFrame(table, compare=tool._compare)
+        total = frame.filter("age", "gt", 30).group("city").aggregate("sum", "salary").collect()
+    """
+
+    def __init__(
+        self,
+        table: ColumnarTable,
+        compare: Callable[[Any, str, Any], bool],
+        steps: Optional[List[LazyStep]] = None,
+    ):
+        self.table = table
+        self.compare = compare
+        self.steps = steps or []
+
+    def _then(self, operation: str, **options: Any) -> "LazyFrame":
+        return LazyFrame(self.table, self.compare, self.steps + [LazyStep(operation, options)])
+
+    def filter(self, field: str, operator: str = "eq", value: Any = None) -> "LazyFrame":
+        """Keep rows where the field matches the condition."""
+        return self._then("filter", field=field, operator=operator, value=value)
+
+    def sort(self, field: str, reverse: bool = False) -> "LazyFrame":
+        """Order rows by a field."""
+        return self._then("sort", field=field, reverse=reverse)
+
+    def slice(self, start: int = 0, end: Optional[int] = None) -> "LazyFrame":
+        """Keep a range of rows."""
+        return self._then("slice", start=start, end=end)
+
+    def group(self, field: str) -> "LazyFrame":
+        """Group rows by a field."""
+        return self._then("group", field=field)
+
+    def aggregate(self, operation: str, field: Optional[str] = None) -> "LazyFrame":
+        """Reduce rows (or each group) to a single value."""
+        if operation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {operation}")
+        return self._then(operation, field=field)
+
+    def collect(self) -> Any:
+        """
+        Execute the plan.
+
+        Returns:
+            List of records, a dict of groups, a dict of per-group
+            aggregates, or a single aggregate value depending on the plan
+        """
+        indices = np.arange(len(self.table))
+        group_field: Optional[str] = None
+        pending_filters: List[LazyStep] = []
+
+        for position, step in enumerate(self.steps):
+            if step.operation == "filter":
+                pending_filters.append(step)
+                continue
+            if pending_filters:
+                indices = indices[self._filter_mask(indices, pending_filters)]
+                pending_filters = []
+
+            if group_field is not None and step.operation not in AGGREGATIONS:
+                raise ValueError("Only an aggregation can follow a group step")
+
+            if step.operation == "sort":
+                indices = indices[self._sort_order(indices, step.options["field"], step.options.get("reverse", False))]
+            elif step.operation == "slice":
+                indices = indices[step.options.get("start", 0):step.options.get("end")]
+            elif step.operation == "group":
+                group_field = step.options["field"]
+            elif step.operation in AGGREGATIONS:
+                if position != len(self.steps) - 1:
+                    raise ValueError(f"'{step.operation}' must be the last step")
+                if group_field is not None:
+                    return self._grouped_aggregate(indices, group_field, step.operation, step.options.get("field"))
+                return self._aggregate(indices, step.operation, step.options.get("field"))
+            else:
+                raise ValueError(f"Unsupported columnar step: {step.operation}")
+
+        if pending_filters:
+            indices = indices[self._filter_mask(indices, pending_filters)]
+
+        if group_field is not None:
+            labels, inverse = self._group_labels(indices, group_field)
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.cumsum(np.bincount(inverse, minlength=len(labels)))[:-1]
+            return {
+                label: self.table.to_records(indices[members])
+                for label, members in zip(labels, np.split(order, bounds))
+            }
+
+        return self.table.to_records(indices)
+
+    def _filter_mask(self, indices: np.ndarray, steps: List[LazyStep]) -> np.ndarray:
+        mask = np.ones(len(indices), dtype=bool)
+        for step in steps:
+            field_name = step.options.get("field")
+            if not field_name:
+                raise ValueError("Columnar filter requires a 'field'")
+            mask &= self._condition(indices, field_name, step.options.get("operator", "eq"), step.options.get("value"))
+        return mask
+
+    def _condition(self, indices: np.ndarray, field_name: str, operator: str, target: Any) -> np.ndarray:
+        values, valid = self.table.column(field_name)
+        values = values[indices]
+        valid = valid[indices]
+
+        if values.dtype.kind in "iufb":
+            if operator in _NUMERIC_OPERATORS and _is_number(target):
+                with np.errstate(invalid="ignore"):
+                    mask = _NUMERIC_OPERATORS[operator](values, target)
+                return mask | ~valid if operator == "ne" else mask & valid
+            if operator in ("in", "not_in") and isinstance(target, list) and all(_is_number(t) for t in target):
+                mask = np.isin(values, target)
+                return mask & valid if operator == "in" else ~mask | ~valid
+
+        # Fall back to scalar semantics for mixed or string columns
+        python_values = self.table.python_values(field_name, indices)
+        return np.fromiter(
+            (self.compare(v, operator, target) for v in python_values),
+            dtype=bool,
+            count=len(python_values),
+        )
+
+    def _sort_order(self, indices: np.ndarray, field_name: str, reverse: bool) -> np.ndarray:
+        values, valid = self.table.column(field_name)
+        values = values[indices]
+        valid = valid[indices]
+
+        present = np.flatnonzero(valid)
+        keys = values[present]
+        if reverse:
+            # Descending while keeping equal keys in their original order
+            order = len(keys) - 1 - np.argsort(keys[::-1], kind="stable")[::-1]
+        else:
+            order = np.argsort(keys, kind="stable")
+
+        # Rows without a value sort last
+        return np.concatenate([present[order], np.flatnonzero(~valid)])
+
+    def _group_labels(self, indices: np.ndarray, field_name: str) -> Tuple[List[str], np.ndarray]:
+        """Map rows to group ids ordered by first appearance."""
+        values, valid = self.table.column(field_name)
+        if values.dtype.kind in "iufb" and valid[indices].all():
+            keys = values[indices]
+        else:
+            keys = np.empty(len(indices), dtype=object)
+            keys[:] = [
+                "unknown" if v is None else str(v)
+                for v in self.table.python_values(field_name, indices)
+            ]
+
+        uniques, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        appearance = np.argsort(first, kind="stable")
+        rank = np.empty_like(appearance)
+        rank[appearance] = np.arange(len(appearance))
+        labels = [str(u) for u in uniques[appearance].tolist()]
+        return labels, rank[inverse]
+
+    def _numeric_values(self, indices: np.ndarray, field_name: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Get float values and a usable-value mask for an aggregation."""
+        if not field_name:
+            raise ValueError("Columnar aggregation requires a 'field'")
+        values, valid = self.table.column(field_name)
+        if values.dtype.kind in "iufb":
+            return values[indices].astype(np.float64), valid[indices]
+
+        numbers = np.zeros(len(indices), dtype=np.float64)
+        usable = np.zeros(len(indices), dtype=bool)
+        for i, v in enumerate(self.table.python_values(field_name, indices)):
+            if isinstance(v, (int, float)):
+                numbers[i] = v
+                usable[i] = True
+            elif isinstance(v, str):
+                try:
+                    numbers[i] = float(v)
+                    usable[i] = True
+                except ValueError:
+                    pass
+        return numbers, usable
+
+    def _aggregate(self, indices: np.ndarray, operation: str, field_name: Optional[str]) -> Any:
+        if operation == "count":
+            return len(indices)
+
+        if operation in ("min", "max"):
+            values, valid = self.table.column(field_name or "")
+            if values.dtype.kind in "iufb":
+                present = values[indices][valid[indices]]
+                if not len(present):
+                    return None
+                return (present.min() if operation == "min" else present.max()).item()
+            candidates = [v for v in self.table.python_values(field_name or "", indices) if v is not None]
+            if not candidates:
+                return None
+            return min(candidates) if operation == "min" else max(candidates)
+
+        numbers, usable = self._numeric_values(indices, field_name)
+        total = float(numbers[usable].sum())
+        if operation == "sum":
+            return total
+        count = int(usable.sum())
+        return total / count if count else 0.0
+
+    def _grouped_aggregate(
+        self,
+        indices: np.ndarray,
+        group_field: str,
+        operation: str,
+        field_name: Optional[str],
+    ) -> Dict[str, Any]:
+        labels, inverse = self._group_labels(indices, group_field)
+        size = len(labels)
+
+        if operation == "count":
+            counts = np.bincount(inverse, minlength=size)
+            return dict(zip(labels, counts.tolist()))
+
+        if operation in ("min", "max"):
+            values, valid = self.table.column(field_name or "")
+            if values.dtype.kind not in "iufb":
+                # Object columns: reduce each group with Python comparisons
+                result: Dict[str, Any] = {label: None for label in labels}
+                reducer = min if operation == "min" else max
+                for group, value in zip(inverse.tolist(), self.table.python_values(field_name or "", indices)):
+                    if value is None:
+                        continue
+                    current = result[labels[group]]
+                    result[labels[group]] = value if current is None else reducer(current, value)
+                return result
+
+            present = valid[indices]
+            groups = inverse[present]
+            picked = values[indices][present]
+            fill = np.inf if operation == "min" else -np.inf
+            out = np.full(size, fill, dtype=np.float64)
+            (np.minimum if operation == "min" else np.maximum).at(out, groups, picked)
+            seen = np.bincount(groups, minlength=size) > 0
+            cast = int if values.dtype.kind in "iu" else (bool if values.dtype.kind == "b" else float)
+            return {
+                label: cast(value) if has else None
+                for label, value, has in zip(labels, out.tolist(), seen.tolist())
+            }
+
+        numbers, usable = self._numeric_values(indices, field_name)
+        sums = np.bincount(inverse, weights=np.where(usable, numbers, 0.0), minlength=size)
+        if operation == "sum":
+            return dict(zip(labels, sums.tolist()))
+        counts = np.bincount(inverse, weights=usable.astype(np.float64), minlength=size)
+        averages = np.divide(sums, counts, out=np.zeros(size), where=counts > 0)
+        return dict(zip(labels, averages.tolist()))
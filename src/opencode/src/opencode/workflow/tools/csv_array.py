@@ -10,6 +10,7 @@ import json
 import logging
 from typing import Any, Dict, List, Optional, Union, ClassVar
 
+from opencode.workflow.tools.columnar import AGGREGATIONS, ColumnarTable, LazyFrame
 from opencode.workflow.tools.registry import BaseTool, ToolResult, ToolSchema, ToolRegistry
 
 logger = logging.getLogger(__name__)
@@ -35,6 +36,8 @@ class CsvArrayTool(BaseTool):
         - merge: Merge multiple arrays
         - flatten: Flatten nested arrays
         - unique: Get unique values
+        - pipeline: Run a chain of filter/sort/slice/group/aggregate steps
+          on the columnar engine in one pass
     
     Example:
         tool = CsvArrayTool()
@@ -42,6 +45,19 @@ class CsvArrayTool(BaseTool):
             "operation": "parse",
             "data": "name,age\\nJohn,30\\nJane,25"
         })
+        
+        # Parse, filter, group and sum without building row dicts
+        result = await tool.execute({
+            "operation": "pipeline",
+            "data": csv_text,
+            "options": {
+                "steps": [
+                    {"operation": "filter", "field": "age", "operator": "gte", "value": 30},
+                    {"operation": "group", "field": "city"},
+                    {"operation": "sum", "field": "salary"},
+                ],
+            },
+        })
     """
     
     _schema = ToolSchema(
@@ -56,7 +72,8 @@ class CsvArrayTool(BaseTool):
                     "enum": [
                         "parse", "stringify", "filter", "map", "reduce",
                         "sort", "group", "merge", "flatten", "unique",
-                        "slice", "reverse", "count", "sum", "avg"
+                        "slice", "reverse", "count", "sum", "avg",
+                        "pipeline"
                     ],
                 },
                 "data": {
@@ -126,6 +143,7 @@ class CsvArrayTool(BaseTool):
             "count": self._count,
             "sum": self._sum,
             "avg": self._avg,
+            "pipeline": self._pipeline,
         }
         
         handler = operations.get(operation)
@@ -398,6 +416,51 @@ class CsvArrayTool(BaseTool):
         
         return sum(values) / len(values) if values else 0.0
     
+    def _pipeline(self, data: Union[str, List[Dict[str, Any]]], options: Dict[str, Any]) -> Any:
+        """
+        Run a chain of steps on the columnar engine.
+        
+        CSV input is parsed straight into typed column arrays and the
+        steps are executed lazily, so filters are fused into one mask and
+        group aggregates never materialize row dicts. Numeric columns are
+        typed uniformly (a column mixing ints and floats becomes float) and
+        null or missing cells read back as None.
+        
+        Options:
+            steps: List of step dicts, each with an "operation" of
+                filter, sort, slice, group, count, sum, avg, min or max
+                plus that operation's own options
+            delimiter, has_header, skip_empty: CSV parsing options
+        """
+        if isinstance(data, str):
+            table = ColumnarTable.from_csv(
+                data,
+                self._parse_value,
+                delimiter=options.get("delimiter", ","),
+                has_header=options.get("has_header", True),
+                skip_empty=options.get("skip_empty", True),
+            )
+        else:
+            table = ColumnarTable.from_records(data)
+        
+        frame = LazyFrame(table, compare=self._compare)
+        for step in options.get("steps", []):
+            name = step.get("operation")
+            if name == "filter":
+                frame = frame.filter(step.get("field"), step.get("operator", "eq"), step.get("value"))
+            elif name == "sort":
+                frame = frame.sort(step.get("field"), step.get("reverse", False))
+            elif name == "slice":
+                frame = frame.slice(step.get("start", 0), step.get("end"))
+            elif name == "group":
+                frame = frame.group(step.get("field"))
+            elif name in AGGREGATIONS:
+                frame = frame.aggregate(name, step.get("field"))
+            else:
+                raise ValueError(f"Unsupported pipeline step: {name}")
+        
+        return frame.collect()
+    
     def _parse_value(self, value: str) -> Any:
         """Parse string value to appropriate type."""
         if not value:
@@ -112,6 +112,86 @@ class TestMemoryGraph:
             gc.collect()
 
 
+class TestMemoryGraphQueries:
+    """Test recursive and batched graph queries."""
+    
+    def test_get_tasks_batch(self):
+        """Test loading several tasks at once keeps the requested order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = MemoryStore(os.path.join(tmpdir, "test.db"))
+            graph = MemoryGraph(store)
+            
+            tasks = [graph.create_task(title=f"Task {i}", actor="test") for i in range(3)]
+            ids = [tasks[2].id, "missing", tasks[0].id]
+            
+            assert [t.title for t in graph.get_tasks(ids)] == ["Task 2", "Task 0"]
+            store.close()
+            gc.collect()
+    
+    def test_descendants_and_epic_tree(self):
+        """Test the subtree is returned depth-first and as a nested tree."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = MemoryStore(os.path.join(tmpdir, "test.db"))
+            graph = MemoryGraph(store)
+            
+            def add(title, parent=None):
+                task = Task(id=generate_task_id(), title=title, parent_id=parent.id if parent else None)
+                return store.create_task(task, actor="test")
+            
+            epic = add("Epic")
+            a = add("A", epic)
+            b = add("B", epic)
+            add("A1", a)
+            add("B1", b)
+            
+            assert [t.title for t in graph.get_descendants(epic.id)] == ["A", "A1", "B", "B1"]
+            
+            tree = graph.get_epic_tree(epic.id)
+            assert tree["title"] == "Epic"
+            assert [c["title"] for c in tree["children"]] == ["A", "B"]
+            assert tree["children"][0]["children"][0]["title"] == "A1"
+            assert graph.get_epic_tree("missing") == {}
+            store.close()
+            gc.collect()
+    
+    def test_blockers(self):
+        """Test direct, transitive and reverse blocker lookups."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = MemoryStore(os.path.join(tmpdir, "test.db"))
+            graph = MemoryGraph(store)
+            
+            a = graph.create_task(title="A", actor="test")
+            b = graph.create_task(title="B", actor="test")
+            c = graph.create_task(title="C", actor="test")
+            graph.add_dependency(a.id, b.id)
+            graph.add_dependency(b.id, c.id)
+            
+            assert [t.id for t in graph.get_blockers(a.id)] == [b.id]
+            assert {t.id for t in graph.get_blockers(a.id, recursive=True)} == {b.id, c.id}
+            assert [t.id for t in graph.get_blocked_tasks(b.id)] == [a.id]
+            assert not graph.is_ready(a.id)
+            store.close()
+            gc.collect()
+    
+    def test_detect_cycles(self):
+        """Test only real dependency cycles are reported."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = MemoryStore(os.path.join(tmpdir, "test.db"))
+            graph = MemoryGraph(store)
+            
+            a = graph.create_task(title="A", actor="test")
+            b = graph.create_task(title="B", actor="test")
+            c = graph.create_task(title="C", actor="test")
+            graph.add_dependency(a.id, b.id)
+            graph.add_dependency(b.id, c.id)
+            assert graph.detect_cycles() == []
+            
+            graph.add_dependency(c.id, a.id)
+            assert graph.detect_cycles() == [[a.id, b.id, c.id, a.id]]
+            store.close()
+            gc.collect()
+
+
 class TestTaskIDs:
     """Test task ID generation."""
     
@@ -0,0 +1,133 @@
+"""
+Tests for the multi-agent message bus.
+"""
+
+import asyncio
+import gc
+import os
+import tempfile
+
+import pytest
+
+from core.multiagent.messaging import AsyncMessageBus, MessageBus
+from core.multiagent.models import MessageType
+
+
+class TestMessageBus:
+    """Test MessageBus functionality."""
+
+    def test_send_receive_and_read(self):
+        """Test the inbox round trip and unread tracking."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with MessageBus(os.path.join(tmpdir, "mail.db")) as bus:
+                first = bus.send("lead", "builder", "start", "go")
+                second = bus.send("lead", "builder", "question", "?", MessageType.QUESTION)
+                bus.send("lead", "other", "ignored", "x")
+
+                assert [m.id for m in bus.receive("builder")] == [second.id, first.id]
+                assert second.thread_id == second.id
+
+                bus.mark_read(first.id)
+                assert bus.get_unread_count("builder") == 1
+                assert len(bus.receive("builder", unread_only=False)) == 2
+            gc.collect()
+
+    def test_wal_and_inbox_index(self):
+        """Test WAL mode is enabled and inbox queries use the composite index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with MessageBus(os.path.join(tmpdir, "mail.db")) as bus:
+                assert bus.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                for unread_only in (True, False):
+                    query = "SELECT * FROM messages WHERE to_agent = ?"
+                    if unread_only:
+                        query += " AND read_at IS NULL"
+                    plan = " ".join(
+                        row[-1] for row in bus.conn.execute(
+                            f"EXPLAIN QUERY PLAN {query} ORDER BY created_at DESC", ("a",)
+                        )
+                    )
+                    assert "USING INDEX" in plan
+                    assert "TEMP B-TREE" not in plan
+            gc.collect()
+
+    def test_batch_commits_once(self):
+        """Test sends inside a batch are invisible to other connections until it exits."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "mail.db")
+            with MessageBus(path) as writer, MessageBus(path) as reader:
+                with writer.batch():
+                    writer.send_many([
+                        {"from_agent": "lead", "to_agent": "builder", "subject": f"s{i}", "body": "b"}
+                        for i in range(3)
+                    ])
+                    assert reader.get_unread_count("builder") == 0
+                assert reader.get_unread_count("builder") == 3
+            gc.collect()
+
+    def test_rolled_back_send_does_not_hide_later_rows(self):
+        """Test a row another connection writes after a rollback is still polled."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "mail.db")
+            with MessageBus(path) as bus, MessageBus(path) as other:
+                with pytest.raises(RuntimeError):
+                    with bus.batch():
+                        bus.send("lead", "builder", "discarded", "b")
+                        raise RuntimeError("abort")
+                other.send("lead", "builder", "remote", "b")
+
+                assert [m.subject for m in bus.poll_changes()] == ["remote"]
+                assert bus.get_unread_count("builder") == 1
+
+                bus.send("lead", "builder", "local", "b")
+                other.send("lead", "builder", "remote-2", "b")
+                assert [m.subject for m in bus.poll_changes()] == ["remote-2"]
+            gc.collect()
+
+
+class TestAsyncMessageBus:
+    """Test AsyncMessageBus delivery."""
+
+    @pytest.mark.asyncio
+    async def test_local_subscriber_woken(self):
+        """Test a waiting recipient gets a message sent in the same process."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bus = AsyncMessageBus(os.path.join(tmpdir, "mail.db"))
+            try:
+                waiter = asyncio.create_task(bus.wait_for_message("builder", timeout=5))
+                await asyncio.sleep(0)
+                sent = await asyncio.gather(*[bus.send("lead", "builder", f"s{i}", "b") for i in range(5)])
+                received = await waiter
+                assert received.id == sent[0].id
+                assert await bus.get_unread_count("builder") == 5
+            finally:
+                await bus.close()
+            gc.collect()
+
+    @pytest.mark.asyncio
+    async def test_cross_connection_delivery(self):
+        """Test messages written by another connection reach listeners once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "mail.db")
+            bus = AsyncMessageBus(path, watch_interval=0.01)
+            other = MessageBus(path)
+            try:
+                seen = []
+
+                async def collect():
+                    async for message in bus.listen("builder"):
+                        seen.append(message.subject)
+                        if len(seen) == 3:
+                            return
+
+                listener = asyncio.create_task(collect())
+                await asyncio.sleep(0.02)
+                other.send("lead", "builder", "remote-1", "b")
+                await bus.send("lead", "builder", "local", "b")
+                other.send("lead", "builder", "remote-2", "b")
+                await asyncio.wait_for(listener, timeout=5)
+                await asyncio.sleep(0.05)
+                assert sorted(seen) == ["local", "remote-1", "remote-2"]
+            finally:
+                other.close()
+                await bus.close()
+            gc.collect()
@@ -0,0 +1,128 @@
+"""
+Tests for the multi-agent worktree pool.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from core.multiagent.coordinator import Coordinator
+from core.multiagent.messaging import MessageBus
+from core.multiagent.models import AgentType
+from core.multiagent.worktree import WorktreeManager, WorktreePool
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A git repository with one commit on main, used as the working directory."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    git("init", "-q", "-b", "main", cwd=root)
+    git("config", "user.email", "test@example.com", cwd=root)
+    git("config", "user.name", "Test", cwd=root)
+    (root / "README.md").write_text("hello\n")
+    git("add", "README.md", cwd=root)
+    git("commit", "-q", "-m", "init", cwd=root)
+    monkeypatch.chdir(root)
+    return root
+
+
+def worktree_count(root: Path) -> int:
+    return git("worktree", "list", "--porcelain", cwd=root).count("worktree ")
+
+
+class TestWorktreePool:
+    """Test WorktreePool functionality."""
+
+    def test_acquire_release_recycles(self, repo):
+        """Test pooled worktrees are handed out, cleaned and reused."""
+        manager = WorktreeManager(str(repo / ".overstory" / "worktrees"))
+        pool = WorktreePool(manager, size=1)
+        try:
+            pool.warm(wait=True)
+            assert pool.ready_count == 1
+
+            worktree = pool.acquire("builder-1")
+            path = Path(worktree.path)
+            assert path == manager.base_path / "builder-1"
+            assert git("branch", "--show-current", cwd=path).strip() == "agent/builder-1"
+            assert (path / "README.md").read_text() == "hello\n"
+            assert [wt.agent_id for wt in manager.list_worktrees()] == ["builder-1"]
+
+            (path / "README.md").write_text("changed\n")
+            (path / "scratch.txt").write_text("junk\n")
+            pool.warm(wait=True)
+            assert pool.ready_count == 1
+
+            pool.size = 2  # room for the released worktree
+            before = worktree_count(repo)
+            pool.release("builder-1")
+            assert not path.exists()
+            assert pool.ready_count == 2
+            assert worktree_count(repo) == before
+
+            again = pool.acquire("builder-2")
+            assert (Path(again.path) / "README.md").read_text() == "hello\n"
+            assert not (Path(again.path) / "scratch.txt").exists()
+
+            # With the pool full, a release removes the worktree
+            pool.warm(wait=True)
+            pool.release("builder-2")
+            assert worktree_count(repo) == before
+        finally:
+            pool.close()
+
+    def test_empty_pool_falls_back(self, repo):
+        """Test an empty pool creates the worktree directly and refills."""
+        manager = WorktreeManager(str(repo / ".overstory" / "worktrees"))
+        pool = WorktreePool(manager, size=1)
+        try:
+            worktree = pool.acquire("scout-1")
+            assert Path(worktree.path).is_dir()
+            assert worktree.branch == "agent/scout-1"
+            pool.warm(wait=True)
+            assert pool.ready_count == 1
+
+            # A new pool over the same directory adopts the ready worktree
+            assert WorktreePool(manager, size=1).ready_count == 1
+        finally:
+            pool.close()
+
+    def test_coordinator_uses_pool(self, repo):
+        """Test spawned agents get pooled worktrees that return on stop."""
+        manager = WorktreeManager(str(repo / ".overstory" / "worktrees"))
+        pool = WorktreePool(manager, size=1)
+        bus = MessageBus(str(repo / ".overstory" / "mail.db"))
+        try:
+            coordinator = Coordinator(message_bus=bus, worktree_pool=pool)
+            pool.warm(wait=True)
+            agent = coordinator.spawn_agent(AgentType.BUILDER, "builder")
+            assert agent.worktree_path == str(manager.base_path / agent.id)
+            assert agent.branch == f"agent/{agent.id}"
+
+            coordinator.stop_agent(agent.id)
+            assert not Path(agent.worktree_path).exists()
+        finally:
+            bus.close()
+            pool.close()
+
+    def test_one_shot_coordinator_does_not_refill(self, repo):
+        """Test a coordinator for a single command never queues checkouts."""
+        manager = WorktreeManager(str(repo / ".overstory" / "worktrees"))
+        pool = WorktreePool(manager, size=1, refill=False)
+        bus = MessageBus(str(repo / ".overstory" / "mail.db"))
+        try:
+            coordinator = Coordinator(message_bus=bus, worktree_pool=pool, warm_pool=False)
+            agent = coordinator.spawn_agent(AgentType.BUILDER, "builder")
+            assert Path(agent.worktree_path).is_dir()
+            assert pool.ready_count == 0
+            assert pool._creating == 0
+            assert worktree_count(repo) == 2
+        finally:
+            bus.close()
+            pool.close()